@@ -0,0 +1,4 @@
+"""
+벤치마크 모듈
+성능 측정 스크립트들을 모아둡니다. backend 디렉터리에서 python -m benchmarks.<이름> 으로 실행합니다.
+"""
@@ -0,0 +1,99 @@
+"""
+대량 데이터 사용자 삭제 벤치마크
+상호작용 로그가 많은 사용자를 삭제할 때 시간과 메모리가 제한 내에 있는지 확인합니다.
+(DB의 ON DELETE CASCADE로 삭제되므로 자식 행을 메모리에 불러오지 않아야 함)
+
+실행:
+    cd backend
+    python -m benchmarks.cascade_delete_bench --logs 100000
+예산을 넘으면 종료 코드 1을 반환합니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="대량 데이터 사용자 삭제 벤치마크")
+    parser.add_argument("--logs", type=int, default=100_000, help="생성할 상호작용 로그 수")
+    parser.add_argument("--personas", type=int, default=50, help="생성할 페르소나 수")
+    parser.add_argument("--max-seconds", type=float, default=10.0, help="삭제 시간 예산 (초)")
+    parser.add_argument("--max-mb", type=float, default=20.0, help="삭제 중 Python 메모리 최대 증가량 예산 (MB)")
+    return parser.parse_args()
+
+
+async def run(args) -> bool:
+    from sqlalchemy import insert, select, func
+    from database import engine, AsyncSessionLocal, init_db
+    from models import User, Category, Persona, InteractionLog, PersonaNote, OAuthProvider, InteractionType, InteractionDirection, NoteType
+    from services.user_service import UserService
+
+    await init_db()
+    user_id = str(uuid.uuid4())
+    category_id = str(uuid.uuid4())
+    persona_ids = [str(uuid.uuid4()) for _ in range(args.personas)]
+    base_time = datetime(2025, 1, 1)
+
+    # 시드 데이터 (Core bulk insert)
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(User), [{"id": user_id, "email": f"{user_id}@bench.local", "oauth_provider": OAuthProvider.EMAIL}])
+        await db.execute(insert(Category), [{"id": category_id, "user_id": user_id, "name": "bench"}])
+        await db.execute(insert(Persona), [
+            {"id": pid, "user_id": user_id, "category_id": category_id, "name": f"p{i}", "phone_number": f"010{i:08d}",
+             "birth_date": base_time, "anniversary_date": base_time}
+            for i, pid in enumerate(persona_ids)
+        ])
+        batch = []
+        for i in range(args.logs):
+            batch.append({
+                "id": str(uuid.uuid4()), "persona_id": persona_ids[i % len(persona_ids)],
+                "type": InteractionType.CALL, "direction": InteractionDirection.OUTBOUND,
+                "timestamp": base_time + timedelta(minutes=i), "summary_text": "벤치마크 로그",
+            })
+            if len(batch) == 10_000:
+                await db.execute(insert(InteractionLog), batch)
+                batch = []
+        if batch:
+            await db.execute(insert(InteractionLog), batch)
+        await db.execute(insert(PersonaNote), [
+            {"id": str(uuid.uuid4()), "persona_id": pid, "type": NoteType.MEMO, "content": "메모"} for pid in persona_ids
+        ])
+        await db.commit()
+
+    # 삭제 측정
+    tracemalloc.start()
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        await UserService.delete_user(db, user_id)
+        await db.commit()  # 서비스는 flush만 함 (요청에서는 get_db가 커밋)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    async with AsyncSessionLocal() as db:
+        remaining = (await db.execute(select(func.count()).select_from(InteractionLog))).scalar()
+    await engine.dispose()
+
+    peak_mb = peak / 1e6
+    print(f"logs={args.logs} delete_seconds={elapsed:.3f} peak_python_mb={peak_mb:.2f} remaining_logs={remaining}")
+    ok = remaining == 0 and elapsed <= args.max_seconds and peak_mb <= args.max_mb
+    print("OK" if ok else "FAIL (예산 초과 또는 남은 로그 있음)")
+    return ok
+
+
+def main():
+    args = parse_args()
+    # 임시 DB 사용 (database 모듈 import 전에 설정)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("SQL_ECHO", "false")
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+응답 압축 벤치마크
+실제와 비슷한 상호작용 로그 목록 JSON을 만들어, 인코딩/레벨별 전송 바이트와 CPU 시간을 측정합니다.
+
+실행:
+    cd backend
+    python -m benchmarks.compression_bench            # 표 출력
+    python -m benchmarks.compression_bench --json     # JSON 출력
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+
+from utils.compression import available_encodings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# 측정할 인코딩별 레벨
+LEVELS = {
+    "gzip": [1, 5, 6, 9],
+    "br": [1, 4, 6, 11],
+    "zstd": [1, 3, 6, 12],
+}
+
+# 로그 요약 문장 샘플 (실제 서비스처럼 한글 위주)
+SUMMARY_SAMPLES = [
+    "주말에 가족 모임 일정에 대해 이야기함. 엄마가 건강검진 결과를 걱정하심. 다음 주에 병원에 같이 가기로 함.",
+    "프로젝트 마감 때문에 야근 중이라고 함. 팀장님과의 갈등이 조금 있는 듯. 응원 메시지를 보내기로 함.",
+    "오랜만에 통화해서 근황을 나눔. 이직 준비 중이며 면접 일정이 잡힘. 결과 나오면 축하 자리 만들기로 함.",
+    "생일 선물로 무엇이 좋을지 물어봄. 최근 캠핑에 관심이 많다고 함. 캠핑 의자를 후보로 정함.",
+    "짧게 안부 문자만 주고받음.",
+]
+
+
+def build_payload(count: int, seed: int = 42) -> bytes:
+    """GET /api/interaction-logs/ 응답과 같은 형태의 JSON 본문 생성"""
+    rng = random.Random(seed)
+    persona_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(max(1, count // 50))]
+    base_time = datetime(2025, 1, 1)
+    logs = []
+    for _ in range(count):
+        timestamp = base_time + timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+        logs.append({
+            "type": rng.choice(["Call", "Message", "Meeting", "Note"]),
+            "direction": rng.choice(["Inbound", "Outbound"]),
+            "timestamp": timestamp.isoformat(),
+            "duration": rng.choice([None, rng.randint(10, 3600)]),
+            "sentiment_score": round(rng.uniform(-1, 1), 3),
+            "summary_text": rng.choice(SUMMARY_SAMPLES),
+            "raw_vector_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "persona_id": rng.choice(persona_ids),
+            "updated_at": timestamp.isoformat(),
+        })
+    return json.dumps(logs, ensure_ascii=False).encode("utf-8")
+
+
+def compress(encoding: str, level: int, data: bytes) -> bytes:
+    """지정한 인코딩/레벨로 한 번에 압축"""
+    if encoding == "gzip":
+        obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        return obj.compress(data) + obj.flush()
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def measure(encoding: str, level: int, data: bytes, min_seconds: float = 0.2) -> dict:
+    """압축 결과 크기와 1회당 CPU 시간(ms) 측정"""
+    compressed = compress(encoding, level, data)
+    iterations = 0
+    started = time.process_time()
+    while True:
+        compress(encoding, level, data)
+        iterations += 1
+        elapsed = time.process_time() - started
+        if elapsed >= min_seconds:
+            break
+    cpu_ms = elapsed / iterations * 1000
+    return {
+        "encoding": encoding,
+        "level": level,
+        "raw_bytes": len(data),
+        "wire_bytes": len(compressed),
+        "ratio": round(len(data) / len(compressed), 2),
+        "cpu_ms": round(cpu_ms, 3),
+        "mb_per_s": round(len(data) / 1e6 / (cpu_ms / 1000), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="응답 압축 벤치마크")
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="로그 개수 목록 (쉼표 구분)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    results = []
+    for count in [int(size) for size in args.sizes.split(",")]:
+        data = build_payload(count)
+        for encoding in available_encodings():
+            for level in LEVELS[encoding]:
+                results.append({"logs": count, **measure(encoding, level, data)})
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'logs':>6} {'enc':>5} {'lvl':>4} {'raw':>10} {'wire':>9} {'ratio':>6} {'cpu_ms':>9} {'MB/s':>7}")
+    for row in results:
+        print(
+            f"{row['logs']:>6} {row['encoding']:>5} {row['level']:>4} {row['raw_bytes']:>10} "
+            f"{row['wire_bytes']:>9} {row['ratio']:>6} {row['cpu_ms']:>9} {row['mb_per_s']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+연락처 일괄 가져오기 벤치마크
+연락처 수별로 POST /api/personas/import 한 번의 응답 시간을 재고,
+비교용으로 POST /api/personas/를 한 명씩 호출했을 때의 연락처당 시간을 잽니다.
+(요청 안에서 바로 가져오도록 PERSONA_IMPORT_SYNC_LIMIT를 크게 설정)
+
+실행:
+    cd backend
+    python -m benchmarks.import_bench
+    python -m benchmarks.import_bench --contacts 1000 10000 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+
+def build_vcards(count: int, rng: random.Random) -> bytes:
+    from tools.generate_data import CATEGORY_PROFILES, FIRST_NAMES, LAST_NAMES
+
+    cards = []
+    for i in range(count):
+        cards.append(
+            "BEGIN:VCARD\r\nVERSION:3.0\r\n"
+            f"FN:{rng.choice(LAST_NAMES)}{rng.choice(FIRST_NAMES)}\r\n"
+            f"TEL;TYPE=CELL:010-{i // 10000:04d}-{i % 10000:04d}\r\n"
+            f"CATEGORIES:{rng.choice(CATEGORY_PROFILES)[0]}\r\n"
+            f"BDAY:{rng.randint(1950, 2005)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}\r\n"
+            f"ANNIVERSARY:{rng.randint(1980, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}\r\n"
+            "END:VCARD\r\n"
+        )
+    return "".join(cards).encode()
+
+
+async def run(sizes, baseline_contacts: int) -> dict:
+    import httpx
+    from database import engine
+    from main import app
+
+    rng = random.Random(44)
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            async def login(email: str) -> dict:
+                token = (await client.post("/api/auth/register", json={"email": email, "password": "pw"})).json()["access_token"]
+                return {"Authorization": f"Bearer {token}"}
+
+            for size in sizes:
+                headers = await login(f"import{size}@bench.local")
+                data = build_vcards(size, rng)
+                started = time.perf_counter()
+                response = await client.post("/api/personas/import", files={"file": ("contacts.vcf", data)}, headers=headers)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                assert response.status_code == 201, response.text
+                body = response.json()
+                results[size] = {
+                    "import_ms": round(elapsed_ms, 1),
+                    "created": body["created_count"],
+                    "per_contact_ms": round(elapsed_ms / size, 3),
+                }
+
+            # 비교용: 한 명씩 생성 (요청마다 커밋)
+            headers = await login("baseline@bench.local")
+            category_id = (await client.post("/api/categories/", json={"name": "bench"}, headers=headers)).json()["id"]
+            started = time.perf_counter()
+            for i in range(baseline_contacts):
+                response = await client.post("/api/personas/", json={
+                    "name": f"인물{i}", "phone_number": f"010{i:08d}", "category_id": category_id,
+                    "birth_date": "1990-01-01T00:00:00", "anniversary_date": "2015-06-01T00:00:00",
+                }, headers=headers)
+                assert response.status_code == 201, response.text
+            one_by_one_ms = (time.perf_counter() - started) * 1000 / baseline_contacts
+
+    await engine.dispose()
+    return {"imports": results, "one_by_one_per_contact_ms": round(one_by_one_ms, 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="연락처 일괄 가져오기 벤치마크")
+    parser.add_argument("--contacts", type=int, nargs="+", default=[100, 1000, 10000], help="가져올 연락처 수 (여러 개 가능)")
+    parser.add_argument("--baseline-contacts", type=int, default=200, help="한 명씩 생성 비교에 사용할 연락처 수")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    # 임시 DB, SQL 로깅 끔, 속도 제한 완화, 모든 크기를 요청 안에서 처리 (database/main import 전에 설정)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ["SQL_ECHO"] = "false"
+    os.environ["RATE_LIMIT_API"] = "1000000/1"
+    os.environ["RATE_LIMIT_AUTH"] = "1000000/1"
+    os.environ["PERSONA_IMPORT_SYNC_LIMIT"] = str(max(args.contacts))
+    os.environ["PERSONA_IMPORT_MAX_CONTACTS"] = str(max(args.contacts))
+
+    result = asyncio.run(run(args.contacts, args.baseline_contacts))
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+    for size, row in result["imports"].items():
+        print(f"contacts {size:>6}: {row['import_ms']:>9} ms  ({row['per_contact_ms']} ms/contact, {row['created']} created)")
+    print(f"one-by-one POST /api/personas/: {result['one_by_one_per_contact_ms']} ms/contact")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+API 부하 테스트 / 벤치마크 하네스
+앱을 프로세스 안에서 띄우고(임시 SQLite 또는 지정한 DB), 현실적인 데이터를 시드한 뒤
+인증/CRUD/목록/AI(더미) 엔드포인트를 동시에 호출합니다.
+
+엔드포인트별 처리량, p50/p95/p99, 요청당 SQL 문 수를 JSON으로 출력하고,
+저장된 기준선(baseline)과 비교하여 성능 회귀가 있으면 종료 코드 1을 반환합니다.
+
+실행:
+    cd backend
+    python -m benchmarks.load_bench
+    python -m benchmarks.load_bench --users 20 --personas 30 --logs 50 --requests 5000 --concurrency 32
+    python -m benchmarks.load_bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.load_bench --baseline benchmarks/baseline.json --tolerance 0.25
+    python -m benchmarks.load_bench --database-url postgresql+asyncpg://user:pw@localhost/bench
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+# (시나리오 이름, 가중치) - 모바일 앱의 실제 호출 비율을 대략 반영 (조회 위주)
+SCENARIOS = [
+    ("list_personas", 25),
+    ("get_persona", 15),
+    ("list_interaction_logs", 15),
+    ("create_interaction_log", 10),
+    ("ai_chat", 7),
+    ("update_persona", 5),
+    ("create_persona_note", 5),
+    ("list_categories", 5),
+    ("sync", 5),
+    ("get_me", 5),
+    ("login", 3),
+]
+
+CATEGORY_NAMES = ["가족", "친구", "직장", "연인", "기타"]
+PASSWORD = "bench-password"
+
+# 현재 요청에서 실행된 SQL 문 수 (워커 태스크마다 설정)
+_query_counter: ContextVar[Optional[List[int]]] = ContextVar("bench_query_counter", default=None)
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """정렬된 값에서 nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def seed(client, args, rng: random.Random) -> List[dict]:
+    """
+    사용자는 API로 가입(토큰 발급), 나머지 데이터는 대량 INSERT로 직접 시드
+
+    Returns:
+        사용자별 {email, headers, persona_ids, category_ids}
+    """
+    from sqlalchemy import insert
+    from database import AsyncSessionLocal
+    from models import Category, Persona, InteractionLog, InteractionType, InteractionDirection, utcnow
+    from utils.phone import normalize_phone
+
+    run_id = uuid.uuid4().hex[:8]
+    users = []
+    for i in range(args.users):
+        email = f"bench-{run_id}-{i}@bench.local"
+        response = await client.post("/api/auth/register", json={"email": email, "password": PASSWORD})
+        response.raise_for_status()
+        users.append({
+            "email": email,
+            "headers": {"Authorization": f"Bearer {response.json()['access_token']}"},
+            "persona_ids": [],
+            "category_ids": [],
+        })
+
+    me_responses = await asyncio.gather(*(client.get("/api/users/me", headers=user["headers"]) for user in users))
+    now = utcnow()
+    async with AsyncSessionLocal() as db:
+        for user, me in zip(users, me_responses):
+            user_id = me.json()["id"]
+            categories = [{"id": str(uuid.uuid4()), "user_id": user_id, "name": name} for name in CATEGORY_NAMES]
+            user["category_ids"] = [category["id"] for category in categories]
+            personas, logs = [], []
+            for p in range(args.personas):
+                persona_id = str(uuid.uuid4())
+                phone_number = f"010{p:08d}"  # (user_id, normalized_phone) 고유 인덱스
+                personas.append({
+                    "id": persona_id,
+                    "user_id": user_id,
+                    "name": f"인물{p}",
+                    "phone_number": phone_number,
+                    "normalized_phone": normalize_phone(phone_number),
+                    "category_id": rng.choice(user["category_ids"]),
+                    "birth_date": datetime(1950 + rng.randrange(55), 1 + rng.randrange(12), 1 + rng.randrange(28)),
+                    "anniversary_date": datetime(2000 + rng.randrange(25), 1 + rng.randrange(12), 1 + rng.randrange(28)),
+                    "importance_weight": rng.randrange(101),
+                    "relationship_temp": rng.uniform(0, 100),
+                })
+                for _ in range(max(0, int(rng.gauss(args.logs, args.logs / 3)))):
+                    logs.append({
+                        "id": str(uuid.uuid4()),
+                        "persona_id": persona_id,
+                        "type": rng.choice(list(InteractionType)),
+                        "direction": rng.choice(list(InteractionDirection)),
+                        "timestamp": now - timedelta(minutes=rng.randrange(60 * 24 * 365)),
+                        "duration": rng.randrange(30, 3600),
+                        "sentiment_score": max(-1.0, min(1.0, rng.gauss(0.2, 0.4))),
+                        "summary_text": "통화 요약",
+                    })
+            user["persona_ids"] = [persona["id"] for persona in personas]
+            await db.execute(insert(Category), categories)
+            if personas:
+                await db.execute(insert(Persona), personas)
+            for start in range(0, len(logs), 5000):
+                await db.execute(insert(InteractionLog), logs[start:start + 5000])
+        await db.commit()
+    return users
+
+
+def build_request(name: str, user: dict, rng: random.Random) -> dict:
+    """시나리오 이름으로 요청 인자(method, url, json) 생성"""
+    headers = user["headers"]
+    persona_id = rng.choice(user["persona_ids"]) if user["persona_ids"] else "missing"
+    if name == "list_personas":
+        return {"method": "GET", "url": "/api/personas/", "headers": headers}
+    if name == "get_persona":
+        return {"method": "GET", "url": f"/api/personas/{persona_id}", "headers": headers}
+    if name == "list_interaction_logs":
+        return {"method": "GET", "url": "/api/interaction-logs/", "params": {"persona_id": persona_id, "limit": 50}, "headers": headers}
+    if name == "create_interaction_log":
+        return {"method": "POST", "url": "/api/interaction-logs/", "headers": headers, "json": {
+            "persona_id": persona_id, "type": "Call", "direction": rng.choice(["Inbound", "Outbound"]),
+            "timestamp": datetime.utcnow().isoformat(), "duration": rng.randrange(30, 600),
+        }}
+    if name == "update_persona":
+        return {"method": "PUT", "url": f"/api/personas/{persona_id}", "headers": headers, "json": {"importance_weight": rng.randrange(101)}}
+    if name == "create_persona_note":
+        return {"method": "POST", "url": "/api/persona-notes/", "headers": headers, "json": {
+            "persona_id": persona_id, "type": "Memo", "content": "벤치마크 메모",
+        }}
+    if name == "list_categories":
+        return {"method": "GET", "url": "/api/categories/", "headers": headers}
+    if name == "sync":
+        return {"method": "GET", "url": "/api/sync", "params": {"limit": 200}, "headers": headers}
+    if name == "get_me":
+        return {"method": "GET", "url": "/api/users/me", "headers": headers}
+    if name == "login":
+        return {"method": "POST", "url": "/api/auth/login", "json": {"email": user["email"], "password": PASSWORD}}
+    if name == "ai_chat":
+        return {"method": "POST", "url": "/api/ai/chat", "headers": headers, "json": {"prompt": "오늘 연락할 사람 추천해줘"}}
+    raise ValueError(f"알 수 없는 시나리오: {name}")
+
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy import event
+    from database import engine
+    from main import app
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _count_query(conn, cursor, statement, parameters, context, executemany):
+        counter = _query_counter.get()
+        if counter is not None:
+            counter[0] += 1
+
+    rng = random.Random(args.seed)
+    names = [name for name, _ in SCENARIOS]
+    weights = [weight for _, weight in SCENARIOS]
+    samples: Dict[str, dict] = {name: {"latencies": [], "errors": 0, "error_statuses": {}, "queries": 0} for name in names}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            seed_started = time.perf_counter()
+            users = await seed(client, args, rng)
+            seed_seconds = time.perf_counter() - seed_started
+
+            plan = [(rng.choices(names, weights)[0], rng.choice(users)) for _ in range(args.requests)]
+            request_rngs = [random.Random(args.seed + worker) for worker in range(args.concurrency)]
+            next_index = iter(range(len(plan)))
+
+            async def worker(worker_id: int):
+                worker_rng = request_rngs[worker_id]
+                for index in next_index:
+                    name, user = plan[index]
+                    request = build_request(name, user, worker_rng)
+                    counter = [0]
+                    _query_counter.set(counter)
+                    started = time.perf_counter()
+                    try:
+                        response = await client.request(**request)
+                        status = str(response.status_code)
+                    except Exception as e:
+                        status = e.__class__.__name__
+                    elapsed = time.perf_counter() - started
+                    sample = samples[name]
+                    sample["latencies"].append(elapsed)
+                    sample["queries"] += counter[0]
+                    if not status.isdigit() or int(status) >= 400:
+                        sample["errors"] += 1
+                        sample["error_statuses"][status] = sample["error_statuses"].get(status, 0) + 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+            total_seconds = time.perf_counter() - started
+
+    await engine.dispose()
+
+    endpoints = {}
+    for name, sample in samples.items():
+        latencies = sorted(sample["latencies"])
+        if not latencies:
+            continue
+        count = len(latencies)
+        endpoints[name] = {
+            "requests": count,
+            "errors": sample["errors"],
+            "error_statuses": sample["error_statuses"],
+            "throughput_rps": round(count / total_seconds, 1),
+            "mean_ms": round(sum(latencies) / count * 1000, 3),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "queries_per_request": round(sample["queries"] / count, 2),
+        }
+    all_latencies = sorted(latency for sample in samples.values() for latency in sample["latencies"])
+    return {
+        "config": {
+            "database": engine.dialect.name,
+            "users": args.users,
+            "personas_per_user": args.personas,
+            "logs_per_persona": args.logs,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "seed_seconds": round(seed_seconds, 2),
+        "totals": {
+            "requests": len(all_latencies),
+            "errors": sum(sample["errors"] for sample in samples.values()),
+            "seconds": round(total_seconds, 3),
+            "throughput_rps": round(len(all_latencies) / total_seconds, 1),
+            "p50_ms": round(percentile(all_latencies, 50) * 1000, 3),
+            "p95_ms": round(percentile(all_latencies, 95) * 1000, 3),
+            "p99_ms": round(percentile(all_latencies, 99) * 1000, 3),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def compare_with_baseline(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    기준선 대비 회귀 목록
+
+    - 전체 처리량이 tolerance 비율 이상 감소
+    - 엔드포인트 p95가 tolerance 비율 이상 증가 (1ms 미만 차이는 잡음으로 무시)
+    - 요청당 SQL 문 수 증가 (N+1 등 구조적 회귀, 0.5개 초과)
+    - 오류 발생
+    """
+    regressions = []
+    base_rps, rps = baseline["totals"]["throughput_rps"], result["totals"]["throughput_rps"]
+    if rps < base_rps * (1 - tolerance):
+        regressions.append(f"전체 처리량 {base_rps} -> {rps} rps")
+    for name, current in result["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance) and current["p95_ms"] - previous["p95_ms"] > 1.0:
+            regressions.append(f"{name}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+        if current["queries_per_request"] > previous["queries_per_request"] + 0.5:
+            regressions.append(f"{name}: 요청당 쿼리 {previous['queries_per_request']} -> {current['queries_per_request']}")
+        if current["errors"] > previous.get("errors", 0):
+            regressions.append(f"{name}: 오류 {previous.get('errors', 0)} -> {current['errors']}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="API 부하 테스트 / 벤치마크")
+    parser.add_argument("--users", type=int, default=10, help="사용자 수")
+    parser.add_argument("--personas", type=int, default=20, help="사용자당 페르소나 수")
+    parser.add_argument("--logs", type=int, default=30, help="페르소나당 평균 상호작용 로그 수")
+    parser.add_argument("--requests", type=int, default=2000, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (같은 시드 = 같은 데이터/요청 순서)")
+    parser.add_argument("--database-url", help="대상 DB (기본값: 임시 SQLite 파일)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본값: 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--save-baseline", help="이번 결과를 기준선으로 저장할 경로")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 회귀 비율 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # database/main import 전에 설정: SQL 로깅 끔, 속도 제한 해제, NIM은 더미 응답
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ["SQL_ECHO"] = "false"
+    for group in ("AUTH", "AI", "API"):
+        os.environ[f"RATE_LIMIT_{group}"] = "1000000000/1"
+    os.environ["NVIDIA_API_KEY"] = ""
+
+    result = asyncio.run(run(args))
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_with_baseline(result, json.load(f), args.tolerance)
+        if regressions:
+            print("성능 회귀 발견:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            sys.exit(1)
+        print("기준선 대비 회귀 없음", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+페르소나 자동 완성 벤치마크
+페르소나 수별로 트라이 생성 시간(캐시 미스)과 키 입력 1회 검색 시간(캐시 히트)을 측정합니다.
+DB/HTTP 없이 PersonaLookupIndex만 측정하므로, 실제 응답 시간은 여기에 인증 쿼리 1회가 더해집니다.
+
+실행:
+    cd backend
+    python -m benchmarks.lookup_bench
+    python -m benchmarks.lookup_bench --personas 500 5000 --json
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+
+from services.persona_lookup_service import PersonaLookupIndex
+from tools.generate_data import FIRST_NAMES, LAST_NAMES
+from utils.phone import normalize_phone
+
+# 사용자가 한 글자씩 입력하는 과정 (입력 중인 음절 포함)
+KEYSTROKES = ["ㄱ", "기", "김", "김미", "김민", "김민주", "김민준", "ㄱㅁ", "ㄱㅁㅈ", "김먼준", "0", "010", "010-12", "01012", "5678"]
+
+
+def build_rows(count: int, rng: random.Random):
+    rows = []
+    for _ in range(count):
+        phone_number = f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}"
+        rows.append((
+            str(uuid.uuid4()),
+            rng.choice(LAST_NAMES) + rng.choice(FIRST_NAMES),
+            phone_number,
+            normalize_phone(phone_number),
+            str(uuid.uuid4()),
+            rng.randrange(101),
+        ))
+    return rows
+
+
+def run(sizes, iterations: int, limit: int) -> dict:
+    rng = random.Random(39)
+    results = {}
+    for size in sizes:
+        rows = build_rows(size, rng)
+        started = time.perf_counter()
+        index = PersonaLookupIndex(0, rows)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        keystrokes = {}
+        for query in KEYSTROKES:
+            timings = []
+            for _ in range(iterations):
+                started = time.perf_counter()
+                hits = index.search(query, limit)
+                timings.append((time.perf_counter() - started) * 1000)
+            keystrokes[query] = {"hits": len(hits), "median_ms": round(statistics.median(timings), 4)}
+        results[size] = {
+            "build_ms": round(build_ms, 2),
+            "max_keystroke_ms": max(row["median_ms"] for row in keystrokes.values()),
+            "keystrokes": keystrokes,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페르소나 자동 완성 벤치마크")
+    parser.add_argument("--personas", type=int, nargs="+", default=[100, 1000, 10000], help="사용자당 페르소나 수 (여러 개 가능)")
+    parser.add_argument("--iterations", type=int, default=200, help="검색어별 반복 횟수")
+    parser.add_argument("--limit", type=int, default=10, help="검색 결과 수")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    results = run(args.personas, args.iterations, args.limit)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    for size, row in results.items():
+        print(f"personas {size:>6}: build {row['build_ms']:>9} ms, slowest keystroke {row['max_keystroke_ms']} ms")
+        for query, stats in row["keystrokes"].items():
+            print(f"    {query:<8} {stats['hits']:>3} hits  {stats['median_ms']:>8} ms")
+
+
+if __name__ == "__main__":
+    main()
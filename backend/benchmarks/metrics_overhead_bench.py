@@ -0,0 +1,92 @@
+"""
+메트릭 수집 오버헤드 벤치마크
+같은 CRUD 요청 묶음을 메트릭 켜기/끄기로 번갈아 실행하고, 라운드별 최솟값을 비교합니다.
+
+실행:
+    cd backend
+    python -m benchmarks.metrics_overhead_bench
+    python -m benchmarks.metrics_overhead_bench --rounds 10 --max-overhead 2.0
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+
+async def run(rounds: int, requests_per_round: int) -> dict:
+    import httpx
+    from database import engine
+    from main import app
+    from utils import metrics
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await client.post("/api/auth/register", json={"email": "bench@bench.local", "password": "pw"})).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            category = (await client.post("/api/categories/", json={"name": "bench"}, headers=headers)).json()
+            persona = (await client.post("/api/personas/", headers=headers, json={
+                "name": "p", "phone_number": "01000000000", "category_id": category["id"],
+                "birth_date": "1990-01-01T00:00:00", "anniversary_date": "2020-01-01T00:00:00",
+            })).json()
+
+            async def crud_round() -> float:
+                started = time.perf_counter()
+                for i in range(requests_per_round // 4):
+                    await client.get("/api/personas/", headers=headers)
+                    await client.get(f"/api/personas/{persona['id']}", headers=headers)
+                    await client.put(f"/api/personas/{persona['id']}", json={"importance_weight": i % 100}, headers=headers)
+                    await client.get("/api/categories/", headers=headers)
+                return time.perf_counter() - started
+
+            # 워밍업
+            await crud_round()
+
+            timings = {True: [], False: []}
+            for _ in range(rounds):
+                for state in (False, True):
+                    metrics.enabled = state
+                    timings[state].append(await crud_round())
+            metrics.enabled = True
+
+    await engine.dispose()
+    baseline, instrumented = min(timings[False]), min(timings[True])
+    return {
+        "requests_per_round": requests_per_round,
+        "rounds": rounds,
+        "baseline_ms_per_request": round(baseline / requests_per_round * 1000, 4),
+        "instrumented_ms_per_request": round(instrumented / requests_per_round * 1000, 4),
+        "overhead_percent": round((instrumented - baseline) / baseline * 100, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메트릭 수집 오버헤드 벤치마크")
+    parser.add_argument("--rounds", type=int, default=7, help="켜기/끄기 반복 횟수")
+    parser.add_argument("--requests", type=int, default=400, help="라운드당 요청 수")
+    parser.add_argument("--max-overhead", type=float, default=2.0, help="허용 오버헤드 (%%), 초과 시 종료 코드 1")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    # 임시 DB, SQL 로깅 끔, 속도 제한 완화 (database/main import 전에 설정)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ["SQL_ECHO"] = "false"
+    os.environ["RATE_LIMIT_API"] = "1000000/1"
+    os.environ["RATE_LIMIT_AUTH"] = "1000000/1"
+
+    result = asyncio.run(run(args.rounds, args.requests))
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"metrics off: {result['baseline_ms_per_request']} ms/req")
+        print(f"metrics on:  {result['instrumented_ms_per_request']} ms/req")
+        print(f"overhead:    {result['overhead_percent']}% (budget {args.max_overhead}%)")
+    if result["overhead_percent"] > args.max_overhead:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+전문 검색 벤치마크
+노트가 많은 사용자 한 명을 시드하고, /api/search 응답 시간을 검색어 종류별로 측정합니다.
+(3글자 이상 → FTS5 trigram, 2글자 → FTS5 bigram, 1글자 → LIKE 스캔, 비교용으로 전체 LIKE 스캔도 측정)
+
+실행:
+    cd backend
+    python -m benchmarks.search_bench
+    python -m benchmarks.search_bench --notes 100000 --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+WORDS = [
+    "생일", "선물", "꽃다발", "케이크", "등산", "북한산", "주말", "회사", "이직", "결혼식", "병원", "건강검진",
+    "여행", "제주도", "강아지", "고양이", "커피", "와인", "골프", "독서", "영화", "콘서트", "이사", "졸업",
+]
+QUERIES = {
+    "fts_single": "꽃다발",
+    "fts_multi": "생일 케이크",
+    "fts_mixed": "북한산 등산",
+    "short_term": "이사",
+    "short_mixed": "이사 북한산",
+    "one_char": "산",
+    "no_match": "존재하지않는단어",
+}
+
+
+async def run(notes: int, personas: int, iterations: int) -> dict:
+    import httpx
+    from sqlalchemy import insert, text
+    from database import engine, AsyncSessionLocal
+    from main import app
+    from models import Category, Persona, PersonaNote, NoteType
+
+    rng = random.Random(38)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await client.post("/api/auth/register", json={"email": "bench@bench.local", "password": "pw"})).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            user_id = (await client.get("/api/users/me", headers=headers)).json()["id"]
+
+            seed_started = time.perf_counter()
+            async with AsyncSessionLocal() as db:
+                category_id = str(uuid.uuid4())
+                await db.execute(insert(Category), [{"id": category_id, "user_id": user_id, "name": "bench"}])
+                persona_ids = [str(uuid.uuid4()) for _ in range(personas)]
+                await db.execute(insert(Persona), [{
+                    "id": persona_id, "user_id": user_id, "name": f"인물{i}", "phone_number": f"010{i:08d}",
+                    "category_id": category_id, "birth_date": datetime(1990, 1, 1), "anniversary_date": datetime(2020, 1, 1),
+                } for i, persona_id in enumerate(persona_ids)])
+                batch = []
+                for i in range(notes):
+                    batch.append({
+                        "id": str(uuid.uuid4()),
+                        "persona_id": rng.choice(persona_ids),
+                        "type": NoteType.MEMO,
+                        "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12))),
+                    })
+                    if len(batch) == 5000:
+                        await db.execute(insert(PersonaNote), batch)
+                        batch = []
+                if batch:
+                    await db.execute(insert(PersonaNote), batch)
+                await db.commit()
+            seed_seconds = time.perf_counter() - seed_started
+
+            results = {}
+            for name, query in QUERIES.items():
+                timings, hits = [], 0
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    response = await client.get("/api/search", params={"q": query}, headers=headers)
+                    timings.append((time.perf_counter() - started) * 1000)
+                    assert response.status_code == 200, response.text
+                    hits = len(response.json())
+                results[name] = {"query": query, "hits": hits, "median_ms": round(statistics.median(timings), 2), "max_ms": round(max(timings), 2)}
+
+            # 비교용: 인덱스 없이 LIKE로 전체 노트 스캔
+            timings = []
+            async with engine.connect() as conn:
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    await conn.execute(
+                        text("SELECT id FROM persona_notes WHERE content LIKE :pattern LIMIT 20"),
+                        {"pattern": f"%{QUERIES['no_match']}%"},
+                    )
+                    timings.append((time.perf_counter() - started) * 1000)
+            results["full_like_scan"] = {"query": QUERIES["no_match"], "median_ms": round(statistics.median(timings), 2), "max_ms": round(max(timings), 2)}
+
+    await engine.dispose()
+    return {"notes": notes, "personas": personas, "seed_seconds": round(seed_seconds, 1), "queries": results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전문 검색 벤치마크")
+    parser.add_argument("--notes", type=int, default=100_000, help="시드할 노트 수")
+    parser.add_argument("--personas", type=int, default=200, help="노트를 나눠 가질 페르소나 수")
+    parser.add_argument("--iterations", type=int, default=20, help="검색어별 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    # 임시 DB, SQL 로깅 끔, 속도 제한 완화, 검색만 측정하도록 백그라운드 작업/아웃박스 끔 (database/main import 전에 설정)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ["SQL_ECHO"] = "false"
+    os.environ["JOBS_ENABLED"] = "false"
+    os.environ["OUTBOX_ENABLED"] = "false"
+    os.environ["RATE_LIMIT_API"] = "1000000/1"
+    os.environ["RATE_LIMIT_AUTH"] = "1000000/1"
+
+    result = asyncio.run(run(args.notes, args.personas, args.iterations))
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+    print(f"notes: {result['notes']} (seeded in {result['seed_seconds']}s)")
+    for name, row in result["queries"].items():
+        hits = f"{row['hits']:>3} hits" if "hits" in row else "        "
+        print(f"{name:<15} {row['query']:<14} {hits}  median {row['median_ms']:>8} ms  max {row['max_ms']:>8} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+서버 설정별 처리량 벤치마크 (serve.py)
+워커 수 × 이벤트 루프 × HTTP 파서 조합마다 serve.py를 별도 프로세스로 실행하고,
+CRUD/인증 엔드포인트의 초당 요청 수와 p50/p99 지연 시간을 표로 출력합니다.
+
+클라이언트는 HTTP/1.1 keep-alive 연결을 직접 다루는 가벼운 asyncio 클라이언트이므로, 측정값에는 서버 비용이 주로 반영됩니다.
+(클라이언트와 서버가 같은 머신의 CPU를 나눠 쓰므로, 코어 수보다 많은 워커는 효과가 없거나 느려질 수 있음)
+
+실행:
+    cd backend
+    python -m benchmarks.serve_bench
+    python -m benchmarks.serve_bench --workers 1,4 --loops uvloop --http httptools --duration 10 --output serve.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ("auth_login", "personas_list", "persona_get", "persona_create")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="서버 설정별 처리량 벤치마크")
+    parser.add_argument("--workers", default="1,2", help="SERVER_WORKERS 값 목록 (쉼표 구분)")
+    parser.add_argument("--loops", default="asyncio,uvloop", help="SERVER_LOOP 값 목록")
+    parser.add_argument("--http", default="h11,httptools", help="SERVER_HTTP 값 목록")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="측정할 엔드포인트 목록")
+    parser.add_argument("--connections", type=int, default=32, help="동시 keep-alive 연결 수")
+    parser.add_argument("--duration", type=float, default=5.0, help="엔드포인트당 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="엔드포인트당 워밍업 시간 (초)")
+    parser.add_argument("--personas", type=int, default=50, help="목록 조회용 페르소나 수")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--output", help="결과 JSON 파일 경로")
+    return parser.parse_args()
+
+
+class HttpConnection:
+    """HTTP/1.1 keep-alive 연결 하나 (Content-Length와 chunked 응답만 지원)"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+
+    @classmethod
+    async def open(cls, host: str, port: int) -> "HttpConnection":
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, f"{host}:{port}")
+
+    async def request(self, method: str, path: str, body: Optional[dict] = None, token: Optional[str] = None) -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        headers = [f"{method} {path} HTTP/1.1", f"Host: {self.host}", f"Content-Length: {len(payload)}"]
+        if body is not None:
+            headers.append("Content-Type: application/json")
+        if token:
+            headers.append(f"Authorization: Bearer {token}")
+        self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + payload)
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        fields = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in lines[1:] if line)}
+        if fields.get("transfer-encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            return status, b"".join(chunks)
+        return status, await self.reader.readexactly(int(fields.get("content-length", "0")))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+async def seed(connection: HttpConnection, personas: int) -> dict:
+    """사용자 1명(로그인용), 카테고리, 페르소나 생성"""
+    credentials = {"email": "bench@bench.local", "password": "bench-password"}
+    status, body = await connection.request("POST", "/api/auth/register", credentials)
+    assert status == 201, body
+    token = json.loads(body)["access_token"]
+    _, body = await connection.request("POST", "/api/categories/", {"name": "bench"}, token)
+    category_id = json.loads(body)["id"]
+    persona_ids = []
+    for i in range(personas):
+        _, body = await connection.request("POST", "/api/personas/", persona_body(category_id, i), token)
+        persona_ids.append(json.loads(body)["id"])
+    return {"credentials": credentials, "token": token, "category_id": category_id, "persona_ids": persona_ids}
+
+
+def persona_body(category_id: str, index: int) -> dict:
+    return {
+        "name": f"벤치마크 {index}",
+        "phone_number": f"010{index:08d}",
+        "category_id": category_id,
+        "birth_date": "1990-01-01T00:00:00",
+        "anniversary_date": "2015-06-01T00:00:00",
+    }
+
+
+def build_request(endpoint: str, data: dict, counter: itertools.count) -> tuple:
+    """(method, path, body, token)"""
+    if endpoint == "auth_login":
+        return "POST", "/api/auth/login", data["credentials"], None
+    if endpoint == "personas_list":
+        return "GET", "/api/personas/", None, data["token"]
+    if endpoint == "persona_get":
+        persona_id = data["persona_ids"][next(counter) % len(data["persona_ids"])]
+        return "GET", f"/api/personas/{persona_id}", None, data["token"]
+    if endpoint == "persona_create":
+        return "POST", "/api/personas/", persona_body(data["category_id"], 10_000_000 + next(counter)), data["token"]
+    raise ValueError(f"알 수 없는 엔드포인트: {endpoint}")
+
+
+async def measure(args, endpoint: str, data: dict) -> dict:
+    """엔드포인트 하나를 warmup 후 duration초 동안 측정"""
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+    measuring = False
+
+    async def worker(deadline: float):
+        nonlocal errors
+        connection = await HttpConnection.open("127.0.0.1", args.port)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                status, _ = await connection.request(*build_request(endpoint, data, counter))
+                if measuring:
+                    latencies.append(time.perf_counter() - started)
+                    if status >= 400:
+                        errors += 1
+        finally:
+            connection.close()
+
+    await asyncio.gather(*(worker(time.perf_counter() + args.warmup) for _ in range(args.connections)))
+    measuring = True
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(started + args.duration) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+
+    def percentile(percent: float) -> float:
+        return latencies[min(int(len(latencies) * percent / 100), len(latencies) - 1)] * 1000 if latencies else 0.0
+
+    return {
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(50), 2),
+        "p99_ms": round(percentile(99), 2),
+        "errors": errors,
+    }
+
+
+async def run_config(args, workers: int, loop: str, http: str, endpoints: List[str]) -> Dict[str, dict]:
+    """설정 하나로 서버를 띄우고 모든 엔드포인트 측정"""
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db",
+        SQL_ECHO="false",
+        PORT=str(args.port),
+        HOST="127.0.0.1",
+        SERVER_WORKERS=str(workers),
+        SERVER_LOOP=loop,
+        SERVER_HTTP=http,
+        SERVER_LOG_LEVEL="warning",
+        # 같은 IP에서 많은 요청을 보내므로 속도 제한을 사실상 끔
+        RATE_LIMIT_AUTH="1000000/1",
+        RATE_LIMIT_API="1000000/1",
+    )
+    server = subprocess.Popen([sys.executable, "serve.py"], cwd=BACKEND_DIR, env=env)
+    try:
+        for _ in range(300):
+            try:
+                connection = await HttpConnection.open("127.0.0.1", args.port)
+                status, _ = await connection.request("GET", "/health/live")
+                if status == 200:
+                    break
+                connection.close()
+            except (OSError, asyncio.IncompleteReadError):
+                pass
+            await asyncio.sleep(0.1)
+        else:
+            raise RuntimeError("서버가 시작되지 않았습니다.")
+        data = await seed(connection, args.personas)
+        connection.close()
+        return {endpoint: await measure(args, endpoint, data) for endpoint in endpoints}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def run(args) -> List[dict]:
+    endpoints = args.endpoints.split(",")
+    results = []
+    for workers, loop, http in itertools.product(
+        [int(value) for value in args.workers.split(",")], args.loops.split(","), args.http.split(",")
+    ):
+        label = f"workers={workers} loop={loop} http={http}"
+        print(f"측정 중: {label}", file=sys.stderr)
+        results.append({"workers": workers, "loop": loop, "http": http,
+                        "endpoints": await run_config(args, workers, loop, http, endpoints)})
+    return results
+
+
+def print_table(results: List[dict]) -> None:
+    """설정별 req/s (p99 ms) 표"""
+    endpoints = list(results[0]["endpoints"])
+    print(f"{'workers':>7} {'loop':>8} {'http':>10} " + " ".join(f"{name:>22}" for name in endpoints))
+    for result in results:
+        cells = []
+        for name in endpoints:
+            stats = result["endpoints"][name]
+            cell = f"{stats['requests_per_second']:.0f}/s ({stats['p99_ms']:.0f}ms)"
+            cells.append(f"{cell + ('!' if stats['errors'] else ''):>22}")
+        print(f"{result['workers']:>7} {result['loop']:>8} {result['http']:>10} " + " ".join(cells))
+    print(f"(req/s, 괄호는 p99, !는 오류 응답 포함, CPU {os.cpu_count()}개)")
+
+
+def main():
+    args = parse_args()
+    results = asyncio.run(run(args))
+    print_table(results)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump({"connections": args.connections, "duration": args.duration, "results": results}, output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
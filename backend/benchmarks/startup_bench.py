@@ -0,0 +1,154 @@
+"""
+콜드 스타트(시작 시간) 벤치마크 / 예산 검사
+새 인터프리터에서 `import main`과 lifespan 시작(마이그레이션 확인, 백그라운드 작업 시작)까지 걸린 시간을 여러 번 측정하고,
+예산을 넘거나 시작 시 불러오면 안 되는 무거운 선택 모듈(openai, numpy 등)이 import되었으면 종료 코드 1을 반환합니다.
+
+- 첫 실행은 워밍업입니다. (임시 DB 마이그레이션, .pyc 생성. 컨테이너 이미지에는 .pyc가 들어 있다고 가정)
+- 무거운 모듈은 실제로 쓰는 함수 안에서 import합니다. (services/nim_service.py의 openai, services/export_service.py의 pyarrow)
+- 패키지별 import 시간(-X importtime의 self 시간 합)을 함께 출력하므로 어느 의존성이 느려졌는지 바로 볼 수 있습니다.
+- NVIDIA_API_KEY가 없을 때(더미 응답 모드)와 있을 때(운영 경로, 더미 키) 두 가지로 측정하고 둘 다 예산을 확인합니다.
+  키가 있어도 시작할 때 NIM을 호출하거나 openai를 import하면 안 됩니다. (NIM 헬스 프로브는 첫 백그라운드 주기에서 실행)
+
+실행:
+    cd backend
+    python -m benchmarks.startup_bench
+    python -m benchmarks.startup_bench --runs 10 --budget-ms 1500 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 시작 시 import되면 안 되는 모듈 (사용하는 함수 안에서 지연 import)
+HEAVY_MODULES = ("openai", "httpx", "numpy", "pandas", "pyarrow", "redis", "faiss")
+
+# 자식 프로세스: import main → lifespan 시작까지 측정 후 종료
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def startup():
+    async with main.app.router.lifespan_context(main.app):
+        return time.perf_counter()
+
+ready = asyncio.run(startup())
+heavy = [name for name in sys.argv[1].split(",") if name in sys.modules]
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="콜드 스타트 시간 벤치마크 / 예산 검사")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수 (중앙값 사용)")
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="import + lifespan 시작 중앙값 예산 (ms)")
+    parser.add_argument("--top", type=int, default=12, help="출력할 패키지 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    return parser.parse_args()
+
+
+# 측정 모드 이름 -> NVIDIA_API_KEY
+MODES = {"no_nim_key": "", "nim_key": "startup-bench-dummy-key"}
+
+
+def child_env(nvidia_api_key: str) -> Dict[str, str]:
+    """임시 DB, SQL 로깅 끔 (.env보다 우선)"""
+    return dict(
+        os.environ,
+        DATABASE_URL=f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db",
+        SQL_ECHO="false",
+        NVIDIA_API_KEY=nvidia_api_key,
+    )
+
+
+def run_child(env: Dict[str, str]) -> dict:
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", CHILD, ",".join(HEAVY_MODULES)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - started) * 1000  # 인터프리터 시작/종료 포함
+    return result
+
+
+def import_profile(env: Dict[str, str]) -> Counter:
+    """-X importtime의 모듈별 self 시간을 최상위 패키지별로 합산 (ms)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    packages = Counter()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        packages[name.strip().split(".")[0]] += int(self_us) / 1000
+    return packages
+
+
+def measure(env: Dict[str, str], runs: int) -> dict:
+    """워밍업 후 runs번 측정한 중앙값"""
+    run_child(env)  # 워밍업
+    results = [run_child(env) for _ in range(runs)]
+
+    def median(key: str) -> float:
+        return round(statistics.median(result[key] for result in results), 1)
+
+    return {
+        "import_ms": median("import_ms"),
+        "startup_ms": median("startup_ms"),
+        "total_ms": round(median("import_ms") + median("startup_ms"), 1),
+        "process_ms": median("process_ms"),
+        "heavy_modules": sorted({name for result in results for name in result["heavy_modules"]}),
+    }
+
+
+def main():
+    args = parse_args()
+    modes = {name: measure(child_env(key), args.runs) for name, key in MODES.items()}
+    packages = import_profile(child_env(MODES["nim_key"]))
+
+    result = {
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "modes": modes,
+        "packages_ms": {name: round(ms, 1) for name, ms in packages.most_common(args.top)},
+    }
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    problems: List[str] = []
+    for name, mode in modes.items():
+        if mode["total_ms"] > args.budget_ms:
+            problems.append(f"[{name}] 시작 시간 {mode['total_ms']}ms > 예산 {args.budget_ms:.0f}ms")
+        if mode["heavy_modules"]:
+            problems.append(
+                f"[{name}] 시작 시 import된 무거운 모듈: {', '.join(mode['heavy_modules'])} (사용하는 함수 안에서 import하세요)"
+            )
+    if problems:
+        print("시작 시간 회귀 발견:", file=sys.stderr)
+        for problem in problems:
+            print(f"  - {problem}", file=sys.stderr)
+        sys.exit(1)
+    print("시작 시간 예산 통과", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
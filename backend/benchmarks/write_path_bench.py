@@ -0,0 +1,106 @@
+"""
+쓰기 경로 DB 왕복(round trip) 벤치마크
+앱을 프로세스 안에서 실행하고, 생성/수정/삭제 요청 하나당 실행되는 SQL 문과 COMMIT 수를 셉니다.
+
+실행:
+    cd backend
+    python -m benchmarks.write_path_bench
+    python -m benchmarks.write_path_bench --json
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+async def run(iterations: int) -> dict:
+    import httpx
+    from sqlalchemy import event
+    from database import engine
+    from main import app
+
+    counter = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_statement(conn, cursor, statement, parameters, context, executemany):
+        counter["statements"] += 1
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _count_commit(conn):
+        counter["commits"] += 1
+
+    results = {}
+
+    async def measure(name: str, method: str, url: str, **kwargs):
+        counter["statements"] = counter["commits"] = 0
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        assert response.status_code < 400, response.text
+        row = results.setdefault(name, {"requests": 0, "statements": 0, "commits": 0, "seconds": 0.0})
+        row["requests"] += 1
+        row["statements"] += counter["statements"]
+        row["commits"] += counter["commits"]
+        row["seconds"] += elapsed
+        return response
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            token = (await client.post("/api/auth/register", json={"email": "bench@bench.local", "password": "pw"})).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+
+            for i in range(iterations):
+                category = (await measure("create_category", "POST", "/api/categories/", json={"name": f"c{i}"}, headers=headers)).json()
+                await measure("update_category", "PUT", f"/api/categories/{category['id']}", json={"name": f"c{i}-renamed"}, headers=headers)
+                persona = (await measure("create_persona", "POST", "/api/personas/", headers=headers, json={
+                    "name": f"p{i}", "phone_number": f"010{i:08d}", "category_id": category["id"],
+                    "birth_date": "1990-01-01T00:00:00", "anniversary_date": "2020-01-01T00:00:00",
+                })).json()
+                await measure("update_persona", "PUT", f"/api/personas/{persona['id']}", json={"importance_weight": 70}, headers=headers)
+                await measure("create_interaction_log", "POST", "/api/interaction-logs/", headers=headers, json={
+                    "persona_id": persona["id"], "type": "Call", "direction": "Outbound", "timestamp": "2025-01-01T00:00:00",
+                })
+                note = (await measure("create_persona_note", "POST", "/api/persona-notes/", headers=headers, json={
+                    "persona_id": persona["id"], "type": "Memo", "content": "메모",
+                })).json()
+                await measure("update_persona_note", "PUT", f"/api/persona-notes/{note['id']}", json={"content": "수정"}, headers=headers)
+                await measure("update_user", "PUT", "/api/users/me", json={"timezone": "Asia/Seoul"}, headers=headers)
+                await measure("delete_persona", "DELETE", f"/api/personas/{persona['id']}", headers=headers)
+
+    await engine.dispose()
+    return {
+        name: {
+            "statements_per_request": round(row["statements"] / row["requests"], 2),
+            "commits_per_request": round(row["commits"] / row["requests"], 2),
+            "ms_per_request": round(row["seconds"] / row["requests"] * 1000, 2),
+        }
+        for name, row in results.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="쓰기 경로 DB 왕복 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20, help="엔드포인트별 반복 횟수")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    # 임시 DB, SQL 로깅 끔, 속도 제한 완화 (database/main import 전에 설정)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ["SQL_ECHO"] = "false"
+    os.environ["RATE_LIMIT_API"] = "1000000/1"
+    os.environ["RATE_LIMIT_AUTH"] = "1000000/1"
+
+    results = asyncio.run(run(args.iterations))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'endpoint':<24} {'stmts/req':>10} {'commits/req':>12} {'ms/req':>8}")
+    for name, row in results.items():
+        print(f"{name:<24} {row['statements_per_request']:>10} {row['commits_per_request']:>12} {row['ms_per_request']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+WebSocket 푸시 유휴 연결 벤치마크
+uvicorn 워커 하나에 유휴 푸시 연결을 많이 열고, 연결당 서버 메모리(RSS 증가량)와
+알림 하나가 사용자 기기에 도착하기까지의 시간을 측정합니다.
+
+서버는 별도 프로세스로 실행하므로 클라이언트 메모리는 측정에 포함되지 않습니다.
+per-message deflate는 연결마다 압축 컨텍스트(수십~수백 KB)를 잡으므로 끄고 실행합니다. (--deflate로 비교)
+
+실행:
+    cd backend
+    python -m benchmarks.ws_bench --connections 10000
+예산을 넘으면 종료 코드 1을 반환합니다. (파일 디스크립터 한도가 연결 수보다 커야 함: ulimit -n)
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="WebSocket 푸시 유휴 연결 벤치마크")
+    parser.add_argument("--connections", type=int, default=10_000, help="열어 둘 WebSocket 연결 수")
+    parser.add_argument("--devices", type=int, default=10, help="사용자당 기기(연결) 수")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--deflate", action="store_true", help="per-message deflate를 켜고 실행 (비교용)")
+    parser.add_argument("--max-kb-per-connection", type=float, default=64.0, help="연결당 서버 RSS 증가량 예산 (KB)")
+    # 벤치마크 프로세스에서 기록한 알림은 서버가 다음 폴링(OUTBOX_POLL_INTERVAL)에 읽음
+    parser.add_argument("--max-delivery-ms", type=float, default=1500.0, help="알림 도착 시간 예산 (ms)")
+    return parser.parse_args()
+
+
+def rss_kb(pid: int) -> int:
+    """프로세스의 현재 RSS (KB, Linux /proc)"""
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+async def seed(users: int) -> list:
+    """사용자 생성 후 (사용자 ID, 토큰) 목록 반환 (비밀번호 해시를 피하려고 DB에 직접 삽입)"""
+    from sqlalchemy import insert
+    from database import engine, init_db
+    from models import OAuthProvider, User
+    from utils.auth import create_access_token
+
+    await init_db()
+    rows = [{"id": str(uuid.uuid4()), "email": f"ws{i}@bench.local", "oauth_provider": OAuthProvider.EMAIL} for i in range(users)]
+    async with engine.begin() as connection:
+        await connection.execute(insert(User), rows)
+    await engine.dispose()
+    return [(row["id"], create_access_token({"sub": row["id"]})) for row in rows]
+
+
+async def run(args) -> bool:
+    import websockets
+
+    users = await seed(-(-args.connections // args.devices))
+    env = dict(os.environ, PUSH_MAX_DEVICES=str(args.devices), JOBS_ENABLED="false", METRICS_ENABLED="false")
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning",
+            "--ws-per-message-deflate", "true" if args.deflate else "false",
+        ],
+        env=env,
+    )
+    sockets = []
+    try:
+        url = f"ws://127.0.0.1:{args.port}/ws"
+        for _ in range(100):
+            try:
+                probe = await websockets.connect(f"{url}?token={users[0][1]}&device_id=probe")
+                await probe.close()
+                break
+            except OSError:
+                await asyncio.sleep(0.1)
+        await asyncio.sleep(0.5)
+        baseline = rss_kb(server.pid)
+
+        async def open_one(index: int):
+            _, token = users[index // args.devices]
+            ws = await websockets.connect(
+                f"{url}?token={token}&device_id=d{index % args.devices}",
+                compression="deflate" if args.deflate else None, ping_interval=None, max_queue=4,
+            )
+            await ws.recv()  # hello
+            return ws
+
+        started = time.perf_counter()
+        for start in range(0, args.connections, 200):
+            sockets += await asyncio.gather(*(open_one(i) for i in range(start, min(start + 200, args.connections))))
+        connect_seconds = time.perf_counter() - started
+        await asyncio.sleep(1.0)
+        per_connection_kb = (rss_kb(server.pid) - baseline) / args.connections
+
+        # 알림 하나를 기록하고 첫 사용자의 모든 기기에 도착할 때까지 시간 측정
+        from database import AsyncSessionLocal, engine
+        from models import NotificationLog, NotificationType
+        user_id = users[0][0]
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as db:
+            db.add(NotificationLog(user_id=user_id, type=list(NotificationType)[0], content="벤치마크 알림"))
+            await db.commit()
+        await engine.dispose()
+
+        async def wait_notification(ws):
+            while json.loads(await ws.recv())["type"] != "notification.created":
+                pass
+
+        await asyncio.wait_for(asyncio.gather(*(wait_notification(ws) for ws in sockets[:args.devices])), timeout=10)
+        delivery_ms = (time.perf_counter() - started) * 1000
+    finally:
+        await asyncio.gather(*(ws.close() for ws in sockets), return_exceptions=True)
+        server.terminate()
+        server.wait()
+
+    print(
+        f"connections={args.connections} deflate={args.deflate} connect_seconds={connect_seconds:.1f} "
+        f"server_rss_baseline_mb={baseline / 1024:.1f} rss_per_connection_kb={per_connection_kb:.1f} "
+        f"delivery_ms={delivery_ms:.0f}"
+    )
+    ok = per_connection_kb <= args.max_kb_per_connection and delivery_ms <= args.max_delivery_ms
+    print("OK" if ok else "FAIL (예산 초과)")
+    return ok
+
+
+def main():
+    args = parse_args()
+    # 서버와 클라이언트 연결 수만큼 파일 디스크립터 필요
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (min(max(soft, args.connections + 1024), hard), hard))
+    # 임시 DB 사용 (database 모듈 import 전에 설정, 서버 프로세스도 같은 DB 사용)
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db"
+    os.environ.setdefault("SQL_ECHO", "false")
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
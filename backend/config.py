@@ -0,0 +1,169 @@
+"""
+애플리케이션 설정
+.env를 한 번만 읽고(load_dotenv) 모든 환경 변수를 Settings 하나로 모읍니다.
+모듈은 os.getenv를 직접 호출하지 않고 `from config import settings`로 읽습니다.
+
+- import 시점에 한 번 만들어지므로, 벤치마크/도구에서 설정을 바꾸려면 앱 모듈을 import하기 전에 os.environ을 바꿉니다.
+- 빈 값은 설정하지 않은 것으로 보고 기본값을 사용합니다.
+- 항목을 추가하면 backend/.env.example에도 추가하세요.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+
+def _env(name: str, default, cast=None):
+    """환경 변수 name을 기본값의 타입(또는 cast)으로 변환해 채우는 dataclass 필드"""
+    cast = cast or type(default)
+
+    def read():
+        value = os.getenv(name)
+        if not value:
+            return default
+        if cast is bool:
+            return value.lower() == "true"
+        return cast(value)
+
+    return field(default_factory=read)
+
+
+def _rate_limits() -> Dict[str, str]:
+    """RATE_LIMIT_<GROUP> 환경 변수 (그룹 이름 소문자 → "요청 수/초")"""
+    return {
+        name[len("RATE_LIMIT_"):].lower(): value
+        for name, value in os.environ.items()
+        if name.startswith("RATE_LIMIT_") and name not in ("RATE_LIMIT_BACKEND", "RATE_LIMIT_SQLITE_PATH") and value
+    }
+
+
+@dataclass(frozen=True)
+class Settings:
+    """환경 변수 설정 (프로세스당 한 번 생성)"""
+
+    # 서버 (serve.py, SERVER_WORKERS=auto면 CPU 코어 수)
+    host: str = _env("HOST", "0.0.0.0")
+    port: int = _env("PORT", 8000)
+    server_workers: str = _env("SERVER_WORKERS", "1")
+    server_loop: str = _env("SERVER_LOOP", "auto")
+    server_http: str = _env("SERVER_HTTP", "auto")
+    server_keepalive: int = _env("SERVER_KEEPALIVE", 5)
+    server_backlog: int = _env("SERVER_BACKLOG", 2048)
+    server_limit_concurrency: Optional[int] = _env("SERVER_LIMIT_CONCURRENCY", None, int)
+    server_graceful_timeout: int = _env("SERVER_GRACEFUL_TIMEOUT", 30)
+    server_ws_per_message_deflate: bool = _env("SERVER_WS_PER_MESSAGE_DEFLATE", False)
+    server_access_log: bool = _env("SERVER_ACCESS_LOG", False)
+    server_log_level: str = _env("SERVER_LOG_LEVEL", "info")
+    forwarded_allow_ips: str = _env("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+    # 데이터베이스
+    database_url: str = _env("DATABASE_URL", "sqlite+aiosqlite:///./app.db")
+    sql_echo: bool = _env("SQL_ECHO", True)  # SQL 쿼리 로깅 (개발 환경용, 벤치마크 시 false)
+    # false면 시작 시 적용하지 않음 (배포 전에 python -m tools.migrate로 적용, 적용할 것이 남아 있으면 시작 중단)
+    migrate_on_startup: bool = _env("MIGRATE_ON_STARTUP", True)
+    # 다른 워커의 마이그레이션을 기다리는 최대 시간 (초)
+    migration_lock_timeout: float = _env("MIGRATION_LOCK_TIMEOUT", 600.0)
+
+    # 인증 (JWT 서명 키)
+    secret_key: str = _env("SECRET_KEY", "your-secret-key-change-in-production")
+
+    # NVIDIA NIM (API 키가 없으면 AI 라우터가 더미 응답, 연속 실패 N회 후 일정 시간 503)
+    nvidia_api_key: Optional[str] = _env("NVIDIA_API_KEY", None, str)
+    nim_base_url: str = _env("NIM_BASE_URL", "https://integrate.api.nvidia.com/v1")
+    nim_model: str = _env("NIM_MODEL", "meta/llama-3.1-8b-instruct")
+    nim_timeout: float = _env("NIM_TIMEOUT", 30.0)
+    nim_breaker_failures: int = _env("NIM_BREAKER_FAILURES", 5)
+    nim_breaker_reset_seconds: float = _env("NIM_BREAKER_RESET_SECONDS", 30.0)
+
+    # 응답 압축 (기본 레벨은 benchmarks/compression_bench.py 결과 기준)
+    compression_min_size: int = _env("COMPRESSION_MIN_SIZE", 1024)
+    compression_gzip_level: int = _env("COMPRESSION_GZIP_LEVEL", 5)
+    compression_brotli_quality: int = _env("COMPRESSION_BROTLI_QUALITY", 4)
+    compression_zstd_level: int = _env("COMPRESSION_ZSTD_LEVEL", 1)
+
+    # 속도 제한 (그룹별 제한은 RATE_LIMIT_<GROUP>)
+    rate_limit_backend: str = _env("RATE_LIMIT_BACKEND", "memory")  # memory / sqlite
+    rate_limit_sqlite_path: str = _env("RATE_LIMIT_SQLITE_PATH", "./rate_limit.db")
+    rate_limits: Dict[str, str] = field(default_factory=_rate_limits)
+
+    # 메트릭 / SQL 프로파일러 / 디버그 API (토큰이 없으면 /api/debug 비활성화)
+    metrics_enabled: bool = _env("METRICS_ENABLED", True)
+    query_profiler_mode: str = _env("QUERY_PROFILER_MODE", "off")
+    query_profiler_sample_rate: float = _env("QUERY_PROFILER_SAMPLE_RATE", 0.01)
+    slow_query_ms: float = _env("SLOW_QUERY_MS", 100.0)
+    n_plus_one_threshold: int = _env("N_PLUS_ONE_THRESHOLD", 3)
+    debug_token: Optional[str] = _env("DEBUG_TOKEN", None, str)
+
+    # 헬스 체크 (프로브 주기/타임아웃 초)
+    health_probe_interval: float = _env("HEALTH_PROBE_INTERVAL", 5.0)
+    health_probe_timeout: float = _env("HEALTH_PROBE_TIMEOUT", 2.0)
+    # NIM은 외부 API이므로 더 드물게 확인
+    health_nim_interval: float = _env("HEALTH_NIM_INTERVAL", 30.0)
+    # 커넥션 풀 사용률이 이 값 이상이면 준비되지 않음(503)으로 응답
+    health_pool_saturation_limit: float = _env("HEALTH_POOL_SATURATION_LIMIT", 1.0)
+
+    # 국가 번호 없이 입력된 전화번호에 붙일 기본 국가 번호 (한국)
+    phone_default_country_code: str = _env("PHONE_DEFAULT_COUNTRY_CODE", "82")
+    # 트라이/발신자 확인 결과를 캐시할 최대 사용자 수 (LRU)
+    persona_lookup_cache_users: int = _env("PERSONA_LOOKUP_CACHE_USERS", 1024)
+    # 사용자당 캐시할 최대 전화번호 수 (초과하면 해당 사용자 캐시를 비움)
+    persona_resolve_cache_numbers: int = _env("PERSONA_RESOLVE_CACHE_NUMBERS", 1000)
+
+    # 이 개월 수보다 오래된 원본 로그는 일별 집계로 압축
+    log_retention_months: int = _env("LOG_RETENTION_MONTHS", 12)
+    # PostgreSQL: 이번 달 이후로 미리 만들어 둘 월 파티션 수
+    log_partition_months_ahead: int = _env("LOG_PARTITION_MONTHS_AHEAD", 3)
+    # 삭제 기록 보관 기간 (일, 이보다 오래전에 발급된 since 토큰은 전체 재동기화 필요)
+    tombstone_retention_days: int = _env("TOMBSTONE_RETENTION_DAYS", 30)
+    # 델타 동기화에서 다음 동기화 때 다시 읽는 구간 (초, 가장 긴 쓰기 트랜잭션과 서버 간 시계 차이보다 길게)
+    sync_lag_seconds: float = _env("SYNC_LAG_SECONDS", 10.0)
+
+    # 내보내기: 한 번에 읽어 파일에 쓰는 행 수 (Parquet row group 크기) / NDJSON: 한 번에 읽어 전송하는 행 수
+    export_chunk_rows: int = _env("EXPORT_CHUNK_ROWS", 10000)
+    ndjson_chunk_rows: int = _env("NDJSON_CHUNK_ROWS", 500)
+
+    # 이 개수 이하의 연락처는 요청 안에서 바로 가져오고, 넘으면 백그라운드 작업으로 실행
+    persona_import_sync_limit: int = _env("PERSONA_IMPORT_SYNC_LIMIT", 1000)
+    # 한 번에 가져올 수 있는 최대 연락처 수 / 파일 크기
+    persona_import_max_contacts: int = _env("PERSONA_IMPORT_MAX_CONTACTS", 50000)
+    persona_import_max_bytes: int = _env("PERSONA_IMPORT_MAX_BYTES", 10 * 1024 * 1024)
+    # 이 시간(분) 동안 진행이 없는 연락처 가져오기 작업은 실패로 표시 (실행하던 워커가 재시작됨)
+    persona_import_stale_minutes: int = _env("PERSONA_IMPORT_STALE_MINUTES", 30)
+
+    # 백그라운드 작업 (false면 이 워커에서는 작업을 실행하지 않음, 등록은 가능)
+    jobs_enabled: bool = _env("JOBS_ENABLED", True)
+    # 큐별 워커당 동시 실행 수 (목록에 없는 큐는 1)
+    job_queues: str = _env("JOB_QUEUES", "default=4,maintenance=1")
+    job_poll_interval: float = _env("JOB_POLL_INTERVAL", 1.0)
+    # 임대 시간 (초), 하트비트는 이 값의 1/3마다
+    job_lease_seconds: float = _env("JOB_LEASE_SECONDS", 60.0)
+    job_drain_timeout: float = _env("JOB_DRAIN_TIMEOUT", 30.0)
+    # 재시도 대기 시간 = JOB_RETRY_BASE_SECONDS * 2^(시도 횟수 - 1)
+    job_retry_base_seconds: float = _env("JOB_RETRY_BASE_SECONDS", 10.0)
+    # 끝난 작업 행 보관 기간 (일)
+    job_retention_days: int = _env("JOB_RETENTION_DAYS", 7)
+
+    # 아웃박스 (false면 이 워커에서는 이벤트를 전달하지 않음, 기록은 항상 함)
+    outbox_enabled: bool = _env("OUTBOX_ENABLED", True)
+    outbox_poll_interval: float = _env("OUTBOX_POLL_INTERVAL", 1.0)
+    # 소비자에게 한 번에 전달하는 최대 이벤트 수
+    outbox_batch_size: int = _env("OUTBOX_BATCH_SIZE", 200)
+    outbox_lease_seconds: float = _env("OUTBOX_LEASE_SECONDS", 30.0)
+    outbox_gap_timeout: float = _env("OUTBOX_GAP_TIMEOUT", 10.0)
+    # 모든 공유 소비자가 처리한 이벤트를 보관하는 시간 (시간)
+    outbox_retention_hours: int = _env("OUTBOX_RETENTION_HOURS", 24)
+
+    # 실시간 푸시
+    push_backend: str = _env("PUSH_BACKEND", "memory")  # memory / redis
+    push_redis_url: str = _env("PUSH_REDIS_URL", "redis://localhost:6379/0")
+    push_ping_interval: float = _env("PUSH_PING_INTERVAL", 30.0)
+    # 이 시간(초) 동안 클라이언트에게서 아무것도 받지 못하면 연결을 끊음 (pong 포함)
+    push_idle_timeout: float = _env("PUSH_IDLE_TIMEOUT", 75.0)
+    push_send_timeout: float = _env("PUSH_SEND_TIMEOUT", 5.0)
+    # 사용자당 최대 기기 수 (넘으면 가장 오래 조용한 연결을 끊음)
+    push_max_devices: int = _env("PUSH_MAX_DEVICES", 10)
+
+
+load_dotenv()
+settings = Settings()
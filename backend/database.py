@@ -2,26 +2,39 @@
 데이터베이스 연결 설정
 SQLite를 사용하며, 필요시 PostgreSQL로 쉽게 전환 가능하도록 구성
 """
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+from config import settings
 
-# 데이터베이스 URL (환경 변수에서 가져오거나 기본값 사용)
-DATABASE_URL = os.getenv(
-    "DATABASE_URL",
-    "sqlite+aiosqlite:///./app.db"  # SQLite 기본값
-)
-
-# 비동기 엔진 생성
+# 비동기 엔진 생성 (DATABASE_URL, 기본값 SQLite)
 engine = create_async_engine(
-    DATABASE_URL,
-    echo=True,  # SQL 쿼리 로깅 (개발 환경용)
+    settings.database_url,
+    echo=settings.sql_echo,  # SQL 쿼리 로깅 (개발 환경용, 벤치마크 시 false)
     future=True
 )
 
+
+# SQLite는 기본적으로 외래 키 제약(ON DELETE CASCADE 포함)이 꺼져 있으므로 연결마다 켜줌
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
+# fork로 만든 자식 프로세스(gunicorn --preload 등)는 부모의 커넥션 풀을 물려받으므로, 자식에서 풀을 비움
+# (close=False: 부모가 쓰는 연결은 닫지 않고 자식의 참조만 버림, uvicorn --workers는 spawn이라 해당 없음)
+def _dispose_pool_after_fork():
+    engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):  # Windows에는 fork가 없음
+    os.register_at_fork(after_in_child=_dispose_pool_after_fork)
+
 # 세션 팩토리 생성
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -33,10 +46,25 @@ AsyncSessionLocal = async_sessionmaker(
 Base = declarative_base()
 
 
+def dialect_insert(model):
+    """
+    현재 DB 방언(SQLite/PostgreSQL)에 맞는 INSERT 문 생성
+    ON CONFLICT ... DO UPDATE / DO NOTHING ... RETURNING 업서트를 두 DB에서 같은 코드로 쓰기 위함
+    """
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
 async def get_db():
     """
-    의존성 주입용 DB 세션 생성기
-    FastAPI 라우터에서 사용: async def route(db: AsyncSession = Depends(get_db))
+    의존성 주입용 DB 세션 생성기 (요청 단위 Unit of Work)
+    FastAPI 라우터에서 사용: async def route(db: AsyncSession = Depends(get_db, scope="function"))
+    
+    서비스 레이어는 commit/refresh 없이 flush만 하고, 요청이 끝나면 여기서 한 번만 커밋합니다.
+    scope="function"이어야 응답을 보내기 전에 커밋되어, 커밋 실패가 500으로 전달됩니다.
     """
     async with AsyncSessionLocal() as session:
         try:
@@ -51,10 +79,21 @@ async def get_db():
 
 async def init_db():
     """
-    데이터베이스 초기화 (테이블 생성)
-    앱 시작 시 한 번 호출
+    데이터베이스 스키마를 최신 버전으로 맞춤 (migrations/, utils/migrations.py)
+    앱 시작 시 한 번 호출, 이미 최신이면 schema_migrations만 읽고 DDL 없이 끝납니다.
+
+    MIGRATE_ON_STARTUP=false면 적용하지 않고, 적용할 마이그레이션이 남아 있으면 시작을 중단합니다.
+    (배포 전에 python -m tools.migrate로 적용)
     """
-    async with engine.begin() as conn:
-        # 모든 테이블 생성
-        await conn.run_sync(Base.metadata.create_all)
+    from utils.migrations import migrate, pending_migrations
 
+    if settings.migrate_on_startup:
+        await migrate(engine)
+        return
+    pending = await pending_migrations(engine)
+    if pending:
+        raise RuntimeError(
+            "적용하지 않은 마이그레이션이 있습니다: "
+            + ", ".join(migration.name for migration in pending)
+            + " (python -m tools.migrate)"
+        )
@@ -1,11 +1,22 @@
 """
 FastAPI 애플리케이션 진입점
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from routes import ai_router, personas, categories, interaction_logs, auth, users, persona_notes
-from database import init_db
+from config import settings
+from routes import ai_router, personas, categories, interaction_logs, auth, users, persona_notes, sync, debug, health, search, export, ws
+from database import init_db, engine, AsyncSessionLocal
+from utils.compression import CompressionMiddleware
+from utils.rate_limit import rate_limit
+from utils.metrics import MetricsMiddleware, instrument_engine, registry
+from utils import query_profiler
+from utils.health import HealthMonitor
+from utils.jobs import JobRunner
+from utils.outbox import OutboxDispatcher
+from utils.push import push_hub
+from services import maintenance_jobs  # noqa: F401 (주기 유지보수 작업 등록)
 
 # 앱 시작/종료 시 실행할 함수
 @asynccontextmanager
@@ -13,8 +24,27 @@ async def lifespan(app: FastAPI):
     """앱 시작 시 DB 초기화, 종료 시 정리"""
     # 시작 시
     await init_db()
+    # 헬스 체크 프로브는 백그라운드에서 실행하고 /health/ready는 캐시된 결과만 읽음
+    # 시작할 때는 DB만 확인 (NIM 프로브는 openai import와 네트워크 호출로 워커 시작을 늦추므로 첫 백그라운드 주기에서)
+    app.state.health_monitor = HealthMonitor(engine)
+    await app.state.health_monitor.probe_db()
+    app.state.health_monitor.start()
+    # 백그라운드 작업 실행기 (background_jobs 테이블 폴링, cron 작업 등록)
+    app.state.job_runner = JobRunner(AsyncSessionLocal)
+    if settings.jobs_enabled:
+        app.state.job_runner.start()
+    # 아웃박스 이벤트를 등록된 소비자에게 전달
+    app.state.outbox_dispatcher = OutboxDispatcher(AsyncSessionLocal)
+    if settings.outbox_enabled:
+        app.state.outbox_dispatcher.start()
+    # 실시간 푸시 허브 (WebSocket 하트비트, PUSH_BACKEND 구독)
+    await push_hub.start()
     yield
-    # 종료 시 (필요시 정리 작업)
+    # 종료 시 (푸시 연결을 닫아 클라이언트가 다른 워커로 재연결, 실행 중인 작업은 JOB_DRAIN_TIMEOUT초까지 기다림)
+    await push_hub.stop()
+    await app.state.outbox_dispatcher.stop()
+    await app.state.job_runner.stop()
+    await app.state.health_monitor.stop()
 
 
 # FastAPI 앱 생성
@@ -34,14 +64,36 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 헤더 허용
 )
 
+# 응답 압축 미들웨어 (zstd/br/gzip, 작은 응답과 이미 압축된 응답은 건너뜀)
+app.add_middleware(CompressionMiddleware)
+
+# 요청별 SQL 프로파일러 (N+1 탐지, 느린 쿼리 로그, Server-Timing, QUERY_PROFILER_MODE로 제어)
+app.add_middleware(query_profiler.QueryProfilerMiddleware, engine=engine)
+query_profiler.instrument_engine(engine)
+
+# 요청/DB 메트릭 (가장 바깥에서 전체 처리 시간을 측정하도록 마지막에 추가)
+app.add_middleware(MetricsMiddleware)
+instrument_engine(engine)
+
+# 라우트 그룹별 속도 제한 (RATE_LIMIT_AUTH / RATE_LIMIT_AI / RATE_LIMIT_API 환경 변수로 조정)
+auth_limit = [Depends(rate_limit("auth", by="ip"))]
+ai_limit = [Depends(rate_limit("ai", by="token_or_ip"))]
+api_limit = [Depends(rate_limit("api"))]
+
 # 라우터 등록
-app.include_router(ai_router.router, prefix="/api/ai", tags=["AI"])
-app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
-app.include_router(users.router, prefix="/api/users", tags=["Users"])
-app.include_router(personas.router, prefix="/api/personas", tags=["Personas"])
-app.include_router(categories.router, prefix="/api/categories", tags=["Categories"])
-app.include_router(interaction_logs.router, prefix="/api/interaction-logs", tags=["InteractionLogs"])
-app.include_router(persona_notes.router, prefix="/api/persona-notes", tags=["PersonaNotes"])
+app.include_router(ai_router.router, prefix="/api/ai", tags=["AI"], dependencies=ai_limit)
+app.include_router(auth.router, prefix="/api/auth", tags=["Auth"], dependencies=auth_limit)
+app.include_router(users.router, prefix="/api/users", tags=["Users"], dependencies=api_limit)
+app.include_router(personas.router, prefix="/api/personas", tags=["Personas"], dependencies=api_limit)
+app.include_router(categories.router, prefix="/api/categories", tags=["Categories"], dependencies=api_limit)
+app.include_router(interaction_logs.router, prefix="/api/interaction-logs", tags=["InteractionLogs"], dependencies=api_limit)
+app.include_router(persona_notes.router, prefix="/api/persona-notes", tags=["PersonaNotes"], dependencies=api_limit)
+app.include_router(sync.router, prefix="/api/sync", tags=["Sync"], dependencies=api_limit)
+app.include_router(search.router, prefix="/api/search", tags=["Search"], dependencies=api_limit)
+app.include_router(export.router, prefix="/api/export", tags=["Export"], dependencies=api_limit)
+app.include_router(health.router, prefix="/health", tags=["Health"])
+app.include_router(ws.router, tags=["Push"])
+app.include_router(debug.router, prefix="/api/debug", tags=["Debug"], include_in_schema=False)
 
 
 @app.get("/")
@@ -52,6 +104,12 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """헬스 체크 엔드포인트"""
+    """헬스 체크 엔드포인트 (하위 호환용, 상세 상태는 /health/ready)"""
     return {"status": "healthy"}
 
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus 스크레이프 엔드포인트"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
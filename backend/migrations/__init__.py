@@ -0,0 +1 @@
+# 스키마 마이그레이션 (vNNNN_<이름>.py, utils/migrations.py가 버전 순서대로 적용)
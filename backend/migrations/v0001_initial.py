@@ -0,0 +1,93 @@
+"""
+기준 스키마
+마이그레이션 도입 전에 init_db(create_all)가 만들던 7개 테이블입니다. 이후의 변경은 모두 0002부터의 마이그레이션에 있으므로
+이 파일은 고치지 않습니다.
+
+그때 만든 DB에서는 이미 있는 테이블을 건너뛰고, 새 DB에서는 이 스키마에서 시작해 이후 마이그레이션을 차례로 적용합니다.
+Enum은 멤버 이름(EMAIL, CALL 등)으로 저장되며, PostgreSQL에서는 같은 이름의 ENUM 타입을 만듭니다.
+"""
+from sqlalchemy import Boolean, Column, DateTime, Enum, Float, ForeignKey, Integer, MetaData, String, Table, Text, func
+
+DESCRIPTION = "기준 스키마"
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", String, primary_key=True),
+    Column("email", String, unique=True, nullable=False, index=True),
+    Column("password_hash", String, nullable=True),
+    Column("oauth_provider", Enum("EMAIL", "KAKAO", "GOOGLE", "APPLE", name="oauthprovider"), nullable=False),
+    Column("oauth_id", String, nullable=True),
+    Column("profile_image", String, nullable=True),
+    Column("timezone", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+Table(
+    "categories", metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("name", String, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+Table(
+    "personas", metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("name", String, nullable=False),
+    Column("phone_number", String, nullable=False),
+    Column("category_id", String, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("birth_date", DateTime, nullable=False),
+    Column("anniversary_date", DateTime, nullable=False),
+    Column("importance_weight", Integer, nullable=False),
+    Column("relationship_temp", Float, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+Table(
+    "interaction_logs", metadata,
+    Column("id", String, primary_key=True),
+    Column("persona_id", String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("type", Enum("CALL", "MESSAGE", "MEETING", "NOTE", name="interactiontype"), nullable=False),
+    Column("direction", Enum("INBOUND", "OUTBOUND", name="interactiondirection"), nullable=False),
+    Column("timestamp", DateTime, nullable=False, index=True),
+    Column("duration", Integer, nullable=True),
+    Column("sentiment_score", Float, nullable=True),
+    Column("summary_text", Text, nullable=True),
+    Column("raw_vector_id", String, nullable=True),
+)
+
+Table(
+    "persona_profiles", metadata,
+    Column("id", String, primary_key=True),
+    Column("persona_id", String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, unique=True, index=True),
+    Column("character", Text, nullable=True),
+    Column("communication_style", Text, nullable=True),
+    Column("sensitive_topics", Text, nullable=True),
+)
+
+Table(
+    "persona_notes", metadata,
+    Column("id", String, primary_key=True),
+    Column("persona_id", String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("type", Enum("MEMO", "QUESTION", name="notetype"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+Table(
+    "notification_logs", metadata,
+    Column("id", String, primary_key=True),
+    Column("persona_id", String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=True, index=True),
+    Column("user_id", String, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True),
+    Column("type", Enum("REMINDER", "RISK", "ACTION", name="notificationtype"), nullable=False),
+    Column("content", Text, nullable=False),
+    Column("sent_at", DateTime, server_default=func.now(), nullable=False),
+    Column("action_taken", Boolean, nullable=False),
+)
+
+
+def upgrade(connection) -> None:
+    metadata.create_all(connection)
@@ -0,0 +1,13 @@
+"""
+users.data_version 컬럼
+사용자 데이터가 바뀔 때마다 1씩 올려 조건부 GET(ETag)을 만드는 데 씁니다.
+"""
+from sqlalchemy import Column, Integer
+
+from utils.migrations import add_column
+
+DESCRIPTION = "users.data_version 컬럼"
+
+
+def upgrade(connection) -> None:
+    add_column(connection, "users", Column("data_version", Integer, server_default="0", nullable=False))
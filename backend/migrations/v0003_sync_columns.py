@@ -0,0 +1,46 @@
+"""
+델타 동기화 컬럼과 인덱스
+모든 사용자 데이터 테이블에 updated_at을, 소프트 삭제하는 테이블에 deleted_at(tombstone)을 추가하고
+동기화 커서로 읽는 (소유자, updated_at) 인덱스를 만듭니다.
+
+기존 행의 updated_at은 적용 시각으로 채워지므로, 첫 동기화에서는 모든 행이 변경분으로 전달됩니다.
+SQLite는 CURRENT_TIMESTAMP 기본값 컬럼을 ALTER TABLE로 추가할 수 없어 테이블을 다시 만듭니다. (utils/migrations.py의 add_column)
+"""
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, func
+
+from utils.migrations import add_column, create_index
+
+DESCRIPTION = "updated_at / deleted_at 컬럼과 동기화 인덱스"
+# PostgreSQL: CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+TRANSACTIONAL = False
+
+UPDATED_AT_TABLES = [
+    "users", "categories", "personas", "interaction_logs", "persona_profiles", "persona_notes", "notification_logs",
+]
+SOFT_DELETE_TABLES = ["categories", "personas", "interaction_logs", "persona_notes"]
+
+metadata = MetaData()
+
+
+def _sync_index(name: str, table_name: str, owner: str) -> Index:
+    """(소유자, updated_at) 인덱스"""
+    table = Table(table_name, metadata, Column(owner, String), Column("updated_at", DateTime))
+    return Index(name, table.c[owner], table.c.updated_at)
+
+
+SYNC_INDEXES = [
+    _sync_index("ix_categories_user_updated", "categories", "user_id"),
+    _sync_index("ix_personas_user_updated", "personas", "user_id"),
+    _sync_index("ix_interaction_logs_persona_updated", "interaction_logs", "persona_id"),
+    _sync_index("ix_persona_notes_persona_updated", "persona_notes", "persona_id"),
+]
+
+
+def upgrade(connection) -> None:
+    # deleted_at을 먼저 추가해야 SQLite에서 updated_at을 추가하며 테이블을 한 번만 다시 만듦
+    for table in SOFT_DELETE_TABLES:
+        add_column(connection, table, Column("deleted_at", DateTime, nullable=True))
+    for table in UPDATED_AT_TABLES:
+        add_column(connection, table, Column("updated_at", DateTime, server_default=func.now(), nullable=False))
+    for index in SYNC_INDEXES:
+        create_index(connection, index)
@@ -0,0 +1,27 @@
+"""
+외래 키가 가리키는 행이 없는 행 삭제
+SQLite는 외래 키 검사(ON DELETE CASCADE 포함)를 연결마다 켜기 전까지 꺼져 있었으므로,
+부모를 지워도 자식 행이 남아 있을 수 있습니다. 부모 테이블부터 차례로 지워 CASCADE가 했을 일을 대신합니다.
+(PostgreSQL은 항상 검사하므로 지울 행이 없음)
+"""
+DESCRIPTION = "부모가 없는 행 삭제"
+
+# (테이블, 외래 키 컬럼, 부모 테이블) - 부모부터 순서대로
+FOREIGN_KEYS = [
+    ("categories", "user_id", "users"),
+    ("personas", "user_id", "users"),
+    ("personas", "category_id", "categories"),
+    ("interaction_logs", "persona_id", "personas"),
+    ("persona_profiles", "persona_id", "personas"),
+    ("persona_notes", "persona_id", "personas"),
+    ("notification_logs", "persona_id", "personas"),
+    ("notification_logs", "user_id", "users"),
+]
+
+
+def upgrade(connection) -> None:
+    for table, column, parent in FOREIGN_KEYS:
+        connection.exec_driver_sql(
+            f"DELETE FROM {table} WHERE {column} IS NOT NULL "
+            f"AND NOT EXISTS (SELECT 1 FROM {parent} WHERE {parent}.id = {table}.{column})"
+        )
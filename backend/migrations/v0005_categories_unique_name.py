@@ -0,0 +1,55 @@
+"""
+카테고리 이름 고유 인덱스 (user_id, name), 삭제되지 않은 행만
+이전에는 서비스에서 조회 후 생성해서 동시 요청으로 같은 이름이 두 번 만들어질 수 있었습니다.
+인덱스를 만들기 전에, 먼저 만든 카테고리는 그대로 두고 나중 것의 이름을 "이름 (2)"처럼 바꿉니다.
+"""
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, text
+
+from utils.migrations import create_index
+
+DESCRIPTION = "카테고리 (user_id, name) 고유 인덱스"
+# PostgreSQL: CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음 (이름 변경은 다시 실행해도 안전)
+TRANSACTIONAL = False
+
+categories = Table(
+    "categories", MetaData(),
+    Column("user_id", String),
+    Column("name", String),
+    Column("deleted_at", DateTime),
+)
+UQ_CATEGORIES_USER_NAME = Index(
+    "uq_categories_user_name", categories.c.user_id, categories.c.name, unique=True,
+    sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL")
+)
+
+
+def _rename_duplicates(connection) -> None:
+    """먼저 만든 카테고리부터 이름을 차지하고, 겹치는 이름에는 " (2)", " (3)" ...을 붙임"""
+    rows = connection.execute(text(
+        "SELECT id, user_id, name FROM categories WHERE deleted_at IS NULL ORDER BY user_id, created_at, id"
+    )).all()
+    names = {}  # user_id -> 사용 중인 이름
+    for row in rows:
+        names.setdefault(row.user_id, set()).add(row.name)
+    seen = {}
+    for row in rows:
+        taken = seen.setdefault(row.user_id, set())
+        if row.name not in taken:
+            taken.add(row.name)
+            continue
+        suffix = 2
+        while f"{row.name} ({suffix})" in names[row.user_id]:
+            suffix += 1
+        renamed = f"{row.name} ({suffix})"
+        names[row.user_id].add(renamed)
+        taken.add(renamed)
+        # updated_at을 갱신해 동기화 중인 클라이언트도 바뀐 이름을 받음
+        connection.execute(
+            text("UPDATE categories SET name = :name, updated_at = CURRENT_TIMESTAMP WHERE id = :id"),
+            {"name": renamed, "id": row.id}
+        )
+
+
+def upgrade(connection) -> None:
+    _rename_duplicates(connection)
+    create_index(connection, UQ_CATEGORIES_USER_NAME)
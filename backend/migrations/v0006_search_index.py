@@ -0,0 +1,110 @@
+"""
+전문 검색 인덱스 (노트 content, 로그 summary_text)
+- PostgreSQL: pg_trgm 확장과 trigram GIN 인덱스
+- SQLite: FTS5 검색 테이블(trigram)과 동기화 트리거를 만들고 기존 행으로 채움
+  DDL은 이 시점의 services/search_service.py와 같으며, 서비스가 바뀌어도 이 파일은 바꾸지 않습니다.
+"""
+from typing import List
+
+from sqlalchemy import Column, Index, MetaData, Table, Text
+
+from utils.migrations import create_index
+
+DESCRIPTION = "전문 검색 인덱스"
+# PostgreSQL: CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+TRANSACTIONAL = False
+
+metadata = MetaData()
+interaction_logs = Table("interaction_logs", metadata, Column("summary_text", Text))
+persona_notes = Table("persona_notes", metadata, Column("content", Text))
+TRGM_INDEXES = [
+    Index(
+        "ix_interaction_logs_summary_trgm", interaction_logs.c.summary_text,
+        postgresql_using="gin", postgresql_ops={"summary_text": "gin_trgm_ops"}
+    ),
+    Index(
+        "ix_persona_notes_content_trgm", persona_notes.c.content,
+        postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"}
+    ),
+]
+
+# (엔티티 이름, 원본 테이블, 본문 컬럼)
+SEARCH_SOURCES = [
+    ("persona_note", "persona_notes", "content"),
+    ("interaction_log", "interaction_logs", "summary_text"),
+]
+
+
+def _sqlite_search_ddl() -> List[str]:
+    """search_docs, search_fts와 동기화 트리거 (여러 번 실행해도 안전)"""
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS search_docs (
+            doc_id INTEGER PRIMARY KEY,
+            entity TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            persona_id TEXT NOT NULL,
+            body TEXT NOT NULL,
+            updated_at DATETIME NOT NULL,
+            UNIQUE (entity, entity_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_search_docs_persona ON search_docs (persona_id)",
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+            body, content='search_docs', content_rowid='doc_id', tokenize='trigram'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+            INSERT INTO search_fts(rowid, body) VALUES (new.doc_id, new.body);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS search_docs_ad AFTER DELETE ON search_docs BEGIN
+            INSERT INTO search_fts(search_fts, rowid, body) VALUES ('delete', old.doc_id, old.body);
+        END
+        """,
+    ]
+    for entity, table, column in SEARCH_SOURCES:
+        insert_doc = f"""
+            INSERT INTO search_docs (entity, entity_id, persona_id, body, updated_at)
+            SELECT '{entity}', new.id, new.persona_id, new.{column}, new.updated_at
+            WHERE new.deleted_at IS NULL AND new.{column} IS NOT NULL AND new.{column} != '';
+        """
+        delete_doc = f"DELETE FROM search_docs WHERE entity = '{entity}' AND entity_id = old.id;"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert_doc} END",
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {column}, deleted_at, persona_id ON {table}
+            BEGIN {delete_doc} {insert_doc} END
+            """,
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete_doc} END",
+        ]
+    return statements
+
+
+def _upgrade_sqlite(connection) -> None:
+    """검색 테이블과 트리거를 만들고, 처음 만든 경우 기존 행으로 채움"""
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_docs'"
+    ).first()
+    for statement in _sqlite_search_ddl():
+        connection.exec_driver_sql(statement)
+    if exists:
+        return
+    for entity, table, column in SEARCH_SOURCES:
+        connection.exec_driver_sql(f"""
+            INSERT INTO search_docs (entity, entity_id, persona_id, body, updated_at)
+            SELECT '{entity}', id, persona_id, {column}, updated_at FROM {table}
+            WHERE deleted_at IS NULL AND {column} IS NOT NULL AND {column} != ''
+        """)
+
+
+def upgrade(connection) -> None:
+    if connection.dialect.name != "postgresql":
+        _upgrade_sqlite(connection)
+        return
+    connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index in TRGM_INDEXES:
+        create_index(connection, index)
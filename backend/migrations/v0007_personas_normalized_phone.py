@@ -0,0 +1,77 @@
+"""
+personas.normalized_phone 컬럼과 (user_id, name) 인덱스
+전화번호를 E.164 형식으로 정규화해 저장하고(utils/phone.py), 자동 완성 인덱스를 만들 때 이름순으로 읽습니다.
+
+기존 행은 phone_number로 채웁니다. 다음 마이그레이션에서 (user_id, normalized_phone)이 고유해지므로,
+같은 사용자의 삭제되지 않은 페르소나끼리 번호가 겹치면 먼저 만든 페르소나만 채우고 나머지는 비워 둡니다.
+(비어 있는 행은 자동 완성 인덱스를 만들 때 phone_number에서 계산됨)
+정규화 규칙은 이 시점의 utils/phone.py normalize_phone과 같으며, 유틸리티가 바뀌어도 이 파일은 바꾸지 않습니다.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import Column, Index, MetaData, String, Table, text
+
+from config import settings
+from utils.migrations import add_column, create_index
+
+DESCRIPTION = "personas.normalized_phone 컬럼과 (user_id, name) 인덱스"
+# PostgreSQL: CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음 (채우기는 다시 실행해도 안전)
+TRANSACTIONAL = False
+
+personas = Table("personas", MetaData(), Column("user_id", String), Column("name", String))
+IX_PERSONAS_USER_NAME = Index("ix_personas_user_name", personas.c.user_id, personas.c.name)
+
+_NON_DIGIT = re.compile(r"\D")
+
+
+def _normalize_phone(raw: Optional[str], country_code: str = settings.phone_default_country_code) -> Optional[str]:
+    """E.164 형식으로 정규화 (전화번호로 볼 수 없으면 None)"""
+    if not raw:
+        return None
+    stripped = raw.strip()
+    digits = _NON_DIGIT.sub("", stripped)
+    if stripped.startswith("+"):
+        e164 = digits
+    elif digits.startswith("00"):
+        e164 = digits[2:]
+    elif digits.startswith("0"):
+        e164 = country_code + digits[1:]
+    elif digits.startswith(country_code) and len(digits) >= 7 + len(country_code):
+        e164 = digits
+    else:
+        e164 = country_code + digits
+    if not 7 <= len(e164) <= 15:
+        return None
+    return f"+{e164}"
+
+
+def _backfill(connection) -> None:
+    taken = {
+        (row.user_id, row.normalized_phone)
+        for row in connection.execute(text(
+            "SELECT user_id, normalized_phone FROM personas "
+            "WHERE normalized_phone IS NOT NULL AND deleted_at IS NULL"
+        ))
+    }
+    updates = []
+    for row in connection.execute(text(
+        "SELECT id, user_id, phone_number, deleted_at FROM personas "
+        "WHERE normalized_phone IS NULL ORDER BY created_at, id"
+    )):
+        normalized = _normalize_phone(row.phone_number)
+        if normalized is None:
+            continue
+        if row.deleted_at is None:
+            if (row.user_id, normalized) in taken:
+                continue
+            taken.add((row.user_id, normalized))
+        updates.append({"id": row.id, "normalized_phone": normalized})
+    if updates:
+        connection.execute(text("UPDATE personas SET normalized_phone = :normalized_phone WHERE id = :id"), updates)
+
+
+def upgrade(connection) -> None:
+    add_column(connection, "personas", Column("normalized_phone", String, nullable=True))
+    _backfill(connection)
+    create_index(connection, IX_PERSONAS_USER_NAME)
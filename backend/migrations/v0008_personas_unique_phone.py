@@ -0,0 +1,39 @@
+"""
+페르소나 전화번호 고유 인덱스 (user_id, normalized_phone), 삭제되지 않은 행만
+발신자 확인(resolve)과 연락처 가져오기의 ON CONFLICT 대상입니다.
+이 인덱스가 대신하는 고유하지 않은 ix_personas_user_normalized_phone이 있으면 지웁니다.
+
+그 사이 앱이 저장한 번호가 겹치면, 0007의 채우기와 같이 먼저 만든 페르소나만 남기고 나머지는 비웁니다.
+"""
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table, text
+
+from utils.migrations import create_index
+
+DESCRIPTION = "페르소나 (user_id, normalized_phone) 고유 인덱스"
+# PostgreSQL: CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+TRANSACTIONAL = False
+
+personas = Table(
+    "personas", MetaData(),
+    Column("user_id", String),
+    Column("normalized_phone", String),
+    Column("deleted_at", DateTime),
+)
+UQ_PERSONAS_USER_NORMALIZED_PHONE = Index(
+    "uq_personas_user_normalized_phone", personas.c.user_id, personas.c.normalized_phone, unique=True,
+    sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL")
+)
+
+
+def upgrade(connection) -> None:
+    connection.exec_driver_sql(
+        "UPDATE personas SET normalized_phone = NULL "
+        "WHERE deleted_at IS NULL AND normalized_phone IS NOT NULL AND EXISTS ("
+        "SELECT 1 FROM personas AS earlier WHERE earlier.user_id = personas.user_id "
+        "AND earlier.normalized_phone = personas.normalized_phone AND earlier.deleted_at IS NULL "
+        "AND (earlier.created_at < personas.created_at "
+        "OR (earlier.created_at = personas.created_at AND earlier.id < personas.id)))"
+    )
+    create_index(connection, UQ_PERSONAS_USER_NORMALIZED_PHONE)
+    concurrently = "CONCURRENTLY " if connection.dialect.name == "postgresql" else ""
+    connection.exec_driver_sql(f"DROP INDEX {concurrently}IF EXISTS ix_personas_user_normalized_phone")
@@ -0,0 +1,136 @@
+"""
+상호작용 로그 파티션과 일별 집계 테이블
+- interaction_logs의 기본 키를 (id, timestamp)로 바꾸고 (persona_id, timestamp) 인덱스를 추가합니다.
+  - PostgreSQL: 파티션 키가 기본 키에 포함되어야 하므로, 기존 테이블을 timestamp 기준 월별 RANGE 파티션 테이블로 옮깁니다.
+    행 수만큼 복사하고 그동안 테이블을 잠그므로 사용량이 적을 때 적용하세요.
+  - SQLite: 파티션이 없으므로 기본 키만 바꿔 테이블을 다시 만듭니다. (검색 트리거 유지)
+- 보존 기간이 지난 로그를 압축해 두는 interaction_log_rollups 테이블을 만듭니다.
+
+이후의 파티션은 매일 실행되는 ensure_log_partitions 작업(services/interaction_log_service.py)이 만듭니다.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column, Date, DateTime, Enum, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text, func, inspect, text
+)
+
+from utils.migrations import create_index, rebuild_table
+
+DESCRIPTION = "interaction_logs (id, timestamp) 기본 키, 월별 파티션과 일별 집계 테이블"
+
+metadata = MetaData()
+Table("personas", metadata, Column("id", String, primary_key=True))
+
+interaction_type = Enum("CALL", "MESSAGE", "MEETING", "NOTE", name="interactiontype")
+interaction_direction = Enum("INBOUND", "OUTBOUND", name="interactiondirection")
+
+interaction_logs = Table(
+    "interaction_logs", metadata,
+    Column("id", String, primary_key=True),
+    Column("persona_id", String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("type", interaction_type, nullable=False),
+    Column("direction", interaction_direction, nullable=False),
+    Column("timestamp", DateTime, primary_key=True, nullable=False, index=True),
+    Column("duration", Integer, nullable=True),
+    Column("sentiment_score", Float, nullable=True),
+    Column("summary_text", Text, nullable=True),
+    Column("raw_vector_id", String, nullable=True),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    Column("deleted_at", DateTime, nullable=True),
+    Index("ix_interaction_logs_persona_updated", "persona_id", "updated_at"),
+    Index("ix_interaction_logs_persona_timestamp", "persona_id", "timestamp"),
+    Index(
+        "ix_interaction_logs_summary_trgm", "summary_text",
+        postgresql_using="gin", postgresql_ops={"summary_text": "gin_trgm_ops"}
+    ),
+    postgresql_partition_by="RANGE (timestamp)",
+)
+
+interaction_log_rollups = Table(
+    "interaction_log_rollups", metadata,
+    Column("id", String, primary_key=True),
+    Column("persona_id", String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False),
+    Column("day", Date, nullable=False),
+    Column("type", interaction_type, nullable=False),
+    Column("direction", interaction_direction, nullable=False),
+    Column("interaction_count", Integer, nullable=False),
+    Column("total_duration", Integer, nullable=False),
+    Column("sentiment_sum", Float, nullable=False),
+    Column("sentiment_count", Integer, nullable=False),
+    Column("first_timestamp", DateTime, nullable=False),
+    Column("last_timestamp", DateTime, nullable=False),
+    Column("raw_vector_ids", Text, nullable=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+    Index("uq_interaction_log_rollups_key", "persona_id", "day", "type", "direction", unique=True),
+)
+
+IX_PERSONA_TIMESTAMP = next(
+    index for index in interaction_logs.indexes if index.name == "ix_interaction_logs_persona_timestamp"
+)
+
+# 파티션 이름 접두어 (interaction_logs_p202401)와 이번 달 이후로 미리 만들 파티션 수
+PARTITION_PREFIX = "interaction_logs_p"
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _month_start(value: datetime, offset: int = 0) -> datetime:
+    """value가 속한 달의 1일 0시에서 offset개월 이동한 시각"""
+    months = value.year * 12 + value.month - 1 + offset
+    return datetime(months // 12, months % 12 + 1, 1)
+
+
+def _create_partitions(connection, since) -> None:
+    """DEFAULT 파티션과 since(없으면 지난달)가 속한 달부터 PARTITION_MONTHS_AHEAD개월 후까지의 월 파티션 (빈 테이블에 만듦)"""
+    connection.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS interaction_logs_default PARTITION OF interaction_logs DEFAULT"
+    )
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    first = _month_start(since or now, 0 if since else -1)
+    last = _month_start(now, PARTITION_MONTHS_AHEAD)
+    for offset in range((last.year - first.year) * 12 + last.month - first.month + 1):
+        lower, upper = _month_start(first, offset), _month_start(first, offset + 1)
+        connection.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {PARTITION_PREFIX}{lower:%Y%m} PARTITION OF interaction_logs "
+            f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+        )
+
+
+def _partition_postgresql(connection) -> None:
+    """기존 테이블을 옮겨 두고 파티션 테이블을 만든 뒤 행을 복사 (이미 파티션 테이블이면 건너뜀)"""
+    partitioned = connection.execute(text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('interaction_logs')"
+    )).first()
+    if partitioned:
+        return
+    connection.exec_driver_sql("ALTER TABLE interaction_logs RENAME TO interaction_logs_unpartitioned")
+    # 인덱스 이름은 스키마 안에서 고유하므로, 새 테이블의 인덱스와 겹치지 않게 기존 인덱스를 지우고 기본 키 이름을 바꿈
+    for name in connection.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'interaction_logs_unpartitioned' "
+        "AND indexname != 'interaction_logs_pkey'"
+    )).scalars().all():
+        connection.exec_driver_sql(f"DROP INDEX {name}")
+    connection.exec_driver_sql(
+        "ALTER TABLE interaction_logs_unpartitioned RENAME CONSTRAINT interaction_logs_pkey "
+        "TO interaction_logs_unpartitioned_pkey"
+    )
+    interaction_logs.create(connection, checkfirst=True)
+    since = connection.exec_driver_sql("SELECT min(timestamp) FROM interaction_logs_unpartitioned").scalar()
+    _create_partitions(connection, since)
+    columns = ", ".join(f'"{column.name}"' for column in interaction_logs.columns)
+    connection.exec_driver_sql(
+        f"INSERT INTO interaction_logs ({columns}) SELECT {columns} FROM interaction_logs_unpartitioned"
+    )
+    connection.exec_driver_sql("DROP TABLE interaction_logs_unpartitioned")
+
+
+def upgrade(connection) -> None:
+    if connection.dialect.name == "postgresql":
+        _partition_postgresql(connection)
+    else:
+        primary_key = inspect(connection).get_pk_constraint("interaction_logs")["constrained_columns"]
+        if set(primary_key) != {"id", "timestamp"}:
+            rebuild_table(connection, "interaction_logs", primary_key=["id", "timestamp"])
+    # 파티션 테이블의 부모에는 CONCURRENTLY를 쓸 수 없음
+    create_index(connection, IX_PERSONA_TIMESTAMP, concurrently=False)
+    interaction_log_rollups.create(connection, checkfirst=True)
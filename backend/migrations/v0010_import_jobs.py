@@ -0,0 +1,30 @@
+"""
+import_jobs 테이블
+연락처 일괄 가져오기를 백그라운드로 실행할 때의 상태와 결과를 저장해, 어느 워커에서든 진행 상황을 조회할 수 있게 합니다.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, MetaData, String, Table, Text, func
+
+DESCRIPTION = "import_jobs 테이블"
+
+metadata = MetaData()
+Table("users", metadata, Column("id", String, primary_key=True))
+
+import_jobs = Table(
+    "import_jobs", metadata,
+    Column("id", String, primary_key=True),
+    Column("user_id", String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True),
+    Column("status", String, nullable=False),
+    Column("total", Integer, nullable=False),
+    Column("created_count", Integer, nullable=False),
+    Column("duplicate_count", Integer, nullable=False),
+    Column("invalid_count", Integer, nullable=False),
+    Column("categories_created", Integer, nullable=False),
+    Column("error", Text, nullable=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Column("finished_at", DateTime, nullable=True),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+
+def upgrade(connection) -> None:
+    import_jobs.create(connection, checkfirst=True)
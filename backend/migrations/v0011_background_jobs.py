@@ -0,0 +1,32 @@
+"""
+background_jobs 테이블
+여러 워커가 폴링하며 임대(lease)를 먼저 얻은 워커가 실행하는 백그라운드 작업 큐입니다. (utils/jobs.py)
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, MetaData, String, Table, Text, func
+
+DESCRIPTION = "background_jobs 테이블"
+
+background_jobs = Table(
+    "background_jobs", MetaData(),
+    Column("id", String, primary_key=True),
+    Column("queue", String, nullable=False),
+    Column("name", String, nullable=False),
+    Column("payload", Text, nullable=True),
+    Column("status", String, nullable=False),
+    Column("dedupe_key", String, nullable=True, unique=True),
+    Column("attempts", Integer, nullable=False),
+    Column("max_attempts", Integer, nullable=False),
+    Column("run_at", DateTime, nullable=False),
+    Column("locked_by", String, nullable=True),
+    Column("lease_expires_at", DateTime, nullable=True),
+    Column("started_at", DateTime, nullable=True),
+    Column("finished_at", DateTime, nullable=True),
+    Column("result", Text, nullable=True),
+    Column("last_error", Text, nullable=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    Index("ix_background_jobs_status_run_at", "status", "run_at"),
+)
+
+
+def upgrade(connection) -> None:
+    background_jobs.create(connection, checkfirst=True)
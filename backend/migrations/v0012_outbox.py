@@ -0,0 +1,34 @@
+"""
+outbox_events / outbox_consumers 테이블
+서비스 레이어가 쓰기와 같은 트랜잭션에서 도메인 이벤트를 기록하고(utils/outbox.py), 소비자별 처리 위치를 저장합니다.
+"""
+from sqlalchemy import BigInteger, Column, DateTime, Integer, MetaData, String, Table, Text, func
+
+DESCRIPTION = "outbox_events / outbox_consumers 테이블"
+
+metadata = MetaData()
+
+Table(
+    "outbox_events", metadata,
+    # SQLite는 AUTOINCREMENT여야 삭제된 id를 재사용하지 않음
+    Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+    Column("event_type", String, nullable=False),
+    Column("entity_id", String, nullable=True),
+    Column("user_id", String, nullable=True),
+    Column("payload", Text, nullable=True),
+    Column("created_at", DateTime, server_default=func.now(), nullable=False),
+    sqlite_autoincrement=True,
+)
+
+Table(
+    "outbox_consumers", metadata,
+    Column("name", String, primary_key=True),
+    Column("last_event_id", BigInteger, nullable=False),
+    Column("locked_by", String, nullable=True),
+    Column("lease_expires_at", DateTime, nullable=True),
+    Column("updated_at", DateTime, server_default=func.now(), nullable=False),
+)
+
+
+def upgrade(connection) -> None:
+    metadata.create_all(connection)
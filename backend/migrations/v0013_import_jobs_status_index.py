@@ -0,0 +1,18 @@
+"""
+import_jobs (status, updated_at) 인덱스
+10분마다 실행되는 expire_import_jobs가 테이블 전체를 읽지 않도록 합니다.
+"""
+from sqlalchemy import Column, DateTime, Index, MetaData, String, Table
+
+from utils.migrations import create_index
+
+DESCRIPTION = "import_jobs (status, updated_at) 인덱스"
+# PostgreSQL: CREATE INDEX CONCURRENTLY는 트랜잭션 안에서 실행할 수 없음
+TRANSACTIONAL = False
+
+import_jobs = Table("import_jobs", MetaData(), Column("status", String), Column("updated_at", DateTime))
+IX_IMPORT_JOBS_STATUS_UPDATED = Index("ix_import_jobs_status_updated", import_jobs.c.status, import_jobs.c.updated_at)
+
+
+def upgrade(connection) -> None:
+    create_index(connection, IX_IMPORT_JOBS_STATUS_UPDATED)
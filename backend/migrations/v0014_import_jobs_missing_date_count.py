@@ -0,0 +1,13 @@
+"""
+import_jobs.missing_date_count 컬럼
+생일/기념일이 없어 건너뛴 연락처 수를 작업 결과에 기록합니다.
+"""
+from sqlalchemy import Column, Integer
+
+from utils.migrations import add_column
+
+DESCRIPTION = "import_jobs.missing_date_count 컬럼"
+
+
+def upgrade(connection) -> None:
+    add_column(connection, "import_jobs", Column("missing_date_count", Integer, server_default="0", nullable=False))
@@ -0,0 +1,11 @@
+"""
+personas.birth_date / anniversary_date NULL 허용
+연락처 가져오기에서 생일/기념일이 없는 연락처도 페르소나로 만들 수 있도록 합니다. (날짜는 나중에 수정)
+"""
+from utils.migrations import drop_not_null
+
+DESCRIPTION = "personas 생일/기념일 NULL 허용"
+
+
+def upgrade(connection) -> None:
+    drop_not_null(connection, "personas", ["birth_date", "anniversary_date"])
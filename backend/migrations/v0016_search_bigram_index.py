@@ -0,0 +1,40 @@
+"""
+2글자 검색어용 bigram 검색 테이블 (SQLite)
+trigram 토크나이저는 3글자 미만 검색어를 찾을 수 없으므로, search_docs 본문의 2-gram을 공백으로 이어 넣은
+contentless FTS5 테이블 search_bigram_fts와 동기화 트리거를 만들고 기존 문서로 채웁니다.
+DDL은 이 시점의 services/search_service.py와 같으며, 서비스가 바뀌어도 이 파일은 바꾸지 않습니다.
+PostgreSQL은 pg_trgm GIN 인덱스가 짧은 검색어도 처리하므로 할 일이 없습니다.
+"""
+DESCRIPTION = "2글자 검색어용 bigram 검색 테이블"
+
+
+def _bigrams_sql(body: str) -> str:
+    """본문의 2-gram을 공백으로 이은 문자열을 만드는 SQL 식 (1글자 본문은 그대로)"""
+    return f"""(
+        WITH RECURSIVE positions(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM positions WHERE i < length({body}) - 1)
+        SELECT group_concat(substr({body}, i, 2), ' ') FROM positions
+    )"""
+
+
+def upgrade(connection) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_bigram_fts'"
+    ).first()
+    connection.exec_driver_sql("CREATE VIRTUAL TABLE IF NOT EXISTS search_bigram_fts USING fts5(grams, content='')")
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS search_docs_bigram_ai AFTER INSERT ON search_docs BEGIN
+            INSERT INTO search_bigram_fts(rowid, grams) SELECT new.doc_id, {_bigrams_sql("new.body")};
+        END
+    """)
+    connection.exec_driver_sql(f"""
+        CREATE TRIGGER IF NOT EXISTS search_docs_bigram_ad AFTER DELETE ON search_docs BEGIN
+            INSERT INTO search_bigram_fts(search_bigram_fts, rowid, grams)
+            SELECT 'delete', old.doc_id, {_bigrams_sql("old.body")};
+        END
+    """)
+    if not exists:
+        connection.exec_driver_sql(
+            f"INSERT INTO search_bigram_fts(rowid, grams) SELECT doc_id, {_bigrams_sql('body')} FROM search_docs"
+        )
@@ -1,15 +1,66 @@
 """
 SQLAlchemy 데이터베이스 모델 정의
 """
-from sqlalchemy import Column, String, Integer, Float, Boolean, DateTime, ForeignKey, Text, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Boolean, Date, DateTime, ForeignKey, Text, Index, Enum as SQLEnum, event, text, DDL
+from sqlalchemy.orm import relationship, Session, with_loader_criteria
 from sqlalchemy.sql import func
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 from enum import Enum
 from database import Base
 
 
+def utcnow() -> datetime:
+    """
+    현재 UTC 시각 (naive, 마이크로초 포함) - SQLite CURRENT_TIMESTAMP와 같은 기준
+    created_at 등의 기본값을 클라이언트(Python) 쪽에서 채워, INSERT 후 refresh 없이 응답을 만들 수 있게 합니다.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+# 공통 컬럼 Mixin
+class TimestampMixin:
+    """수정 시각 컬럼 (델타 동기화 커서로 사용)"""
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, server_default=func.now(), nullable=False)
+
+
+class SoftDeleteMixin:
+    """
+    소프트 삭제(tombstone) 컬럼
+    deleted_at이 설정된 행은 일반 조회에서 자동으로 제외되고, 동기화 API에서만 삭제 기록으로 노출됩니다.
+    """
+    deleted_at = Column(DateTime, nullable=True)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _exclude_soft_deleted(execute_state):
+    """
+    모든 ORM SELECT에 deleted_at IS NULL 조건을 자동으로 추가
+    삭제된 행까지 조회하려면 .execution_options(include_deleted=True)를 사용합니다.
+    """
+    if (
+        execute_state.is_select
+        and not execute_state.is_column_load
+        and not execute_state.is_relationship_load
+        and not execute_state.execution_options.get("include_deleted", False)
+    ):
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(
+                SoftDeleteMixin,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True
+            )
+        )
+
+
+# PostgreSQL: 검색용 trigram GIN 인덱스보다 먼저 pg_trgm 확장 활성화
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
 # Enum 타입 정의
 class OAuthProvider(str, Enum):
     """소셜 로그인 제공자"""
@@ -55,7 +106,7 @@ class NotificationType(str, Enum):
     ACTION = "Action"
 
 
-class User(Base):
+class User(TimestampMixin, Base):
     """사용자 정보 테이블"""
     __tablename__ = "users"
 
@@ -66,60 +117,97 @@ class User(Base):
     oauth_id = Column(String, nullable=True)  # 소셜 로그인 제공자의 사용자 ID
     profile_image = Column(String, nullable=True)  # URL
     timezone = Column(String, default="Asia/Seoul", nullable=False)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    # 사용자 데이터 버전 (쓰기 작업마다 +1, ETag 생성에 사용)
+    data_version = Column(Integer, default=0, server_default="0", nullable=False)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
 
-    # 관계
-    personas = relationship("Persona", back_populates="user", cascade="all, delete-orphan")
-    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan")
+    # 관계 (passive_deletes: 자식 삭제는 DB의 ON DELETE CASCADE에 맡기고 ORM으로 불러오지 않음)
+    personas = relationship("Persona", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    categories = relationship("Category", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 
-class Category(Base):
+class Category(TimestampMixin, SoftDeleteMixin, Base):
     """카테고리 테이블 (사용자별 관계 유형 관리)"""
     __tablename__ = "categories"
+    __table_args__ = (
+        Index("ix_categories_user_updated", "user_id", "updated_at"),  # 델타 동기화용
+        # 같은 사용자의 (삭제되지 않은) 카테고리 이름은 고유 - ON CONFLICT 대상
+        Index(
+            "uq_categories_user_name", "user_id", "name", unique=True,
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL")
+        ),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)  # 카테고리 이름 (예: "가족", "직장", "친구")
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
 
     # 관계
     user = relationship("User", back_populates="categories")
-    personas = relationship("Persona", back_populates="category", cascade="all, delete-orphan")
+    personas = relationship("Persona", back_populates="category", cascade="all, delete-orphan", passive_deletes=True)
 
 
-class Persona(Base):
+class Persona(TimestampMixin, SoftDeleteMixin, Base):
     """페르소나 (관리 대상 인물) 테이블"""
     __tablename__ = "personas"
+    __table_args__ = (
+        Index("ix_personas_user_updated", "user_id", "updated_at"),  # 델타 동기화용
+        Index("ix_personas_user_name", "user_id", "name"),  # 자동 완성 인덱스 생성용
+        # 같은 사용자의 (삭제되지 않은) 페르소나 전화번호는 고유 - 발신자 확인(resolve)과 ON CONFLICT 대상
+        Index(
+            "uq_personas_user_normalized_phone", "user_id", "normalized_phone", unique=True,
+            sqlite_where=text("deleted_at IS NULL"), postgresql_where=text("deleted_at IS NULL")
+        ),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String, nullable=False)
     phone_number = Column(String, nullable=False)  # 필수
+    normalized_phone = Column(String, nullable=True)  # E.164 형식 (utils/phone.py, 입력 형식과 무관하게 번호 검색)
     category_id = Column(String, ForeignKey("categories.id", ondelete="CASCADE"), nullable=False, index=True)
-    birth_date = Column(DateTime, nullable=False)  # 필수
-    anniversary_date = Column(DateTime, nullable=False)  # 필수
+    birth_date = Column(DateTime, nullable=True)  # 가져온 연락처에 없으면 NULL
+    anniversary_date = Column(DateTime, nullable=True)  # 가져온 연락처에 없으면 NULL
     importance_weight = Column(Integer, default=50, nullable=False)  # 0~100
     relationship_temp = Column(Float, default=50.0, nullable=False)  # 0~100도, AI 계산
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
 
     # 관계
     user = relationship("User", back_populates="personas")
     category = relationship("Category", back_populates="personas")
-    interaction_logs = relationship("InteractionLog", back_populates="persona", cascade="all, delete-orphan")
-    persona_profiles = relationship("PersonaProfile", back_populates="persona", cascade="all, delete-orphan")
-    persona_notes = relationship("PersonaNote", back_populates="persona", cascade="all, delete-orphan")
-    notification_logs = relationship("NotificationLog", back_populates="persona", cascade="all, delete-orphan")
+    interaction_logs = relationship("InteractionLog", back_populates="persona", cascade="all, delete-orphan", passive_deletes=True)
+    interaction_log_rollups = relationship("InteractionLogRollup", back_populates="persona", cascade="all, delete-orphan", passive_deletes=True)
+    persona_profiles = relationship("PersonaProfile", back_populates="persona", cascade="all, delete-orphan", passive_deletes=True)
+    persona_notes = relationship("PersonaNote", back_populates="persona", cascade="all, delete-orphan", passive_deletes=True)
+    notification_logs = relationship("NotificationLog", back_populates="persona", cascade="all, delete-orphan", passive_deletes=True)
 
 
-class InteractionLog(Base):
-    """상호작용 기록 테이블"""
+class InteractionLog(TimestampMixin, SoftDeleteMixin, Base):
+    """
+    상호작용 기록 테이블
+
+    PostgreSQL에서는 timestamp 기준 월별 RANGE 파티션 테이블입니다. (파티션은 services/interaction_log_service.py에서 생성)
+    파티션 키가 기본 키에 포함되어야 하므로 기본 키는 (id, timestamp)입니다.
+    """
     __tablename__ = "interaction_logs"
+    __table_args__ = (
+        Index("ix_interaction_logs_persona_updated", "persona_id", "updated_at"),  # 델타 동기화용
+        # 페르소나별 최신순 목록/기간 조회 (SQLite에서는 이 인덱스 범위 스캔이 파티션 프루닝 역할)
+        Index("ix_interaction_logs_persona_timestamp", "persona_id", "timestamp"),
+        # 전문 검색 (PostgreSQL pg_trgm, SQLite는 services/search_service.py의 FTS5)
+        Index(
+            "ix_interaction_logs_summary_trgm", "summary_text",
+            postgresql_using="gin", postgresql_ops={"summary_text": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (timestamp)"},
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     persona_id = Column(String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, index=True)
     type = Column(SQLEnum(InteractionType), nullable=False)
     direction = Column(SQLEnum(InteractionDirection), nullable=False)  # 핵심: 능동적 노력 점수 계산용
-    timestamp = Column(DateTime, nullable=False, index=True)
+    timestamp = Column(DateTime, primary_key=True, nullable=False, index=True)  # 파티션 키
     duration = Column(Integer, nullable=True)  # 초 단위 (통화/만남일 때만)
     sentiment_score = Column(Float, nullable=True)  # -1.0 ~ +1.0
     summary_text = Column(Text, nullable=True)  # 대화 내용 3줄 요약
@@ -129,7 +217,37 @@ class InteractionLog(Base):
     persona = relationship("Persona", back_populates="interaction_logs")
 
 
-class PersonaProfile(Base):
+class InteractionLogRollup(TimestampMixin, Base):
+    """
+    상호작용 로그 일별 집계 테이블 (보존 기간이 지난 원본 로그를 압축한 결과)
+
+    (persona_id, day, type, direction)마다 한 행이며, 원본 로그의 raw_vector_id는
+    raw_vector_ids에 모아 두어 Vector DB의 원본 대화는 계속 찾을 수 있습니다.
+    """
+    __tablename__ = "interaction_log_rollups"
+    __table_args__ = (
+        Index("uq_interaction_log_rollups_key", "persona_id", "day", "type", "direction", unique=True),
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    persona_id = Column(String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False)
+    day = Column(Date, nullable=False)  # UTC 기준 날짜
+    type = Column(SQLEnum(InteractionType), nullable=False)
+    direction = Column(SQLEnum(InteractionDirection), nullable=False)
+    interaction_count = Column(Integer, nullable=False)
+    total_duration = Column(Integer, default=0, nullable=False)  # 초 단위 합계
+    sentiment_sum = Column(Float, default=0.0, nullable=False)  # 평균 = sentiment_sum / sentiment_count
+    sentiment_count = Column(Integer, default=0, nullable=False)
+    first_timestamp = Column(DateTime, nullable=False)
+    last_timestamp = Column(DateTime, nullable=False)
+    raw_vector_ids = Column(Text, nullable=True)  # JSON 형태 (예: ["vec-1", "vec-2"])
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
+
+    # 관계
+    persona = relationship("Persona", back_populates="interaction_log_rollups")
+
+
+class PersonaProfile(TimestampMixin, Base):
     """AI 분석 성향 테이블"""
     __tablename__ = "persona_profiles"
 
@@ -143,21 +261,29 @@ class PersonaProfile(Base):
     persona = relationship("Persona", back_populates="persona_profiles")
 
 
-class PersonaNote(Base):
+class PersonaNote(TimestampMixin, SoftDeleteMixin, Base):
     """메모 및 질문 테이블"""
     __tablename__ = "persona_notes"
+    __table_args__ = (
+        Index("ix_persona_notes_persona_updated", "persona_id", "updated_at"),  # 델타 동기화용
+        # 전문 검색 (PostgreSQL pg_trgm, SQLite는 services/search_service.py의 FTS5)
+        Index(
+            "ix_persona_notes_content_trgm", "content",
+            postgresql_using="gin", postgresql_ops={"content": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     persona_id = Column(String, ForeignKey("personas.id", ondelete="CASCADE"), nullable=False, index=True)
     type = Column(SQLEnum(NoteType), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
 
     # 관계
     persona = relationship("Persona", back_populates="persona_notes")
 
 
-class NotificationLog(Base):
+class NotificationLog(TimestampMixin, Base):
     """알림 및 리스크 로그 테이블"""
     __tablename__ = "notification_logs"
 
@@ -167,9 +293,93 @@ class NotificationLog(Base):
     user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
     type = Column(SQLEnum(NotificationType), nullable=False)
     content = Column(Text, nullable=False)  # 알림 메시지 본문
-    sent_at = Column(DateTime, server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
     action_taken = Column(Boolean, default=False, nullable=False)  # 사용자가 실제 행동을 취했는지 여부
 
     # 관계
     persona = relationship("Persona", back_populates="notification_logs")
 
+
+
+class ImportJob(TimestampMixin, Base):
+    """연락처 일괄 가져오기 작업 (백그라운드 실행 상태와 결과, 여러 워커에서 조회 가능)"""
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        Index("ix_import_jobs_status_updated", "status", "updated_at"),  # 중단된 작업 정리 (expire_import_jobs)
+    )
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued / running / succeeded / failed
+    total = Column(Integer, nullable=False, default=0)  # 파일에서 읽은 연락처 수
+    created_count = Column(Integer, nullable=False, default=0)  # 새로 만든 페르소나 수
+    duplicate_count = Column(Integer, nullable=False, default=0)  # 파일 안 또는 기존 페르소나와 전화번호가 같아 건너뜀
+    invalid_count = Column(Integer, nullable=False, default=0)  # 전화번호가 없거나 잘못되어 건너뜀
+    # 생일/기념일이 없거나 연도가 없어 비워 두고 만든 페르소나 수
+    missing_date_count = Column(Integer, nullable=False, default=0, server_default="0")
+    categories_created = Column(Integer, nullable=False, default=0)  # 새로 만든 카테고리 수
+    error = Column(Text, nullable=True)  # 실패 사유
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class BackgroundJob(Base):
+    """
+    백그라운드 작업 큐 (utils/jobs.py의 JobRunner가 실행)
+
+    여러 uvicorn 워커가 같은 테이블을 폴링하며, 임대(lease)를 먼저 얻은 워커만 실행합니다.
+    실행 중인 워커는 하트비트로 lease_expires_at을 연장하고, 워커가 죽어 임대가 만료되면 다른 워커가 다시 가져갑니다.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    queue = Column(String, nullable=False, default="default")
+    name = Column(String, nullable=False)  # 등록된 작업 이름 (예: purge_tombstones)
+    payload = Column(Text, nullable=True)  # JSON 인자
+    status = Column(String, nullable=False, default="queued")  # queued / running / succeeded / failed
+    # 같은 키의 작업은 한 번만 등록 (cron 실행 시각별 중복 방지, NULL은 제한 없음)
+    dedupe_key = Column(String, nullable=True, unique=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_at = Column(DateTime, default=utcnow, nullable=False)  # 이 시각 이후에 실행 (재시도 시 뒤로 미룸)
+    locked_by = Column(String, nullable=True)  # 실행 중인 워커 ID
+    lease_expires_at = Column(DateTime, nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    result = Column(Text, nullable=True)  # 성공 시 반환값 (JSON)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_background_jobs_status_run_at", "status", "run_at"),  # 폴링용
+    )
+
+
+class OutboxEvent(Base):
+    """
+    도메인 이벤트 아웃박스 (utils/outbox.py)
+
+    서비스 레이어가 쓰기와 같은 트랜잭션에서 기록하므로, 커밋된 변경에는 항상 이벤트가 있고 롤백되면 이벤트도 없습니다.
+    id는 단조 증가하며 소비자별 처리 위치(watermark)로 사용됩니다.
+    """
+    __tablename__ = "outbox_events"
+
+    # SQLite는 AUTOINCREMENT여야 삭제된 id를 재사용하지 않음
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    event_type = Column(String, nullable=False)  # 예: persona.created, persona_note.deleted
+    entity_id = Column(String, nullable=True)
+    user_id = Column(String, nullable=True)  # 사용자가 삭제되어도 이벤트는 남도록 외래 키 없음
+    payload = Column(Text, nullable=True)  # JSON
+    created_at = Column(DateTime, default=utcnow, server_default=func.now(), nullable=False)
+
+    __table_args__ = ({"sqlite_autoincrement": True},)
+
+
+class OutboxConsumer(TimestampMixin, Base):
+    """아웃박스 소비자별 처리 위치 (여러 워커 중 임대를 가진 워커 하나만 전달)"""
+    __tablename__ = "outbox_consumers"
+
+    name = Column(String, primary_key=True)
+    last_event_id = Column(BigInteger, nullable=False, default=0)  # 이 id까지 전달 완료
+    locked_by = Column(String, nullable=True)  # 전달 중인 워커 ID
+    lease_expires_at = Column(DateTime, nullable=True)
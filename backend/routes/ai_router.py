@@ -3,11 +3,10 @@ NVIDIA NIM API를 호출하는 라우터
 """
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-import os
-from dotenv import load_dotenv
 
-# 환경 변수 로드
-load_dotenv()
+from config import settings
+from services.nim_service import call_nim_api
+from utils.circuit_breaker import CircuitOpenError
 
 router = APIRouter()
 
@@ -27,32 +26,27 @@ class AIResponse(BaseModel):
 @router.post("/chat", response_model=AIResponse)
 async def chat_with_nim(request: AIRequest):
     """
-    NVIDIA NIM API를 호출하는 더미 엔드포인트
-    
-    실제 구현 시:
-    1. services/nim_service.py에서 실제 API 호출 로직 구현
-    2. openai 라이브러리를 사용하여 NVIDIA NIM 엔드포인트에 연결
+    NVIDIA NIM API 호출
+
+    NVIDIA_API_KEY가 없으면 더미 응답을 반환합니다. (개발용)
     """
     try:
-        api_key = os.getenv("NVIDIA_API_KEY")
-        
-        if not api_key:
+        if not settings.nvidia_api_key:
             # API 키가 없어도 더미 응답 반환 (개발용)
             return AIResponse(
                 response=f"[더미 응답] 입력된 프롬프트: {request.prompt}",
                 model="nvidia-nim-dummy"
             )
         
-        # TODO: 실제 NVIDIA NIM API 호출 구현
-        # from services.nim_service import call_nim_api
-        # response = await call_nim_api(request.prompt, request.max_tokens)
+        response, model = await call_nim_api(request.prompt, request.max_tokens)
+        return AIResponse(response=response, model=model)
         
-        # 현재는 더미 응답 반환
-        return AIResponse(
-            response=f"[더미 응답] 입력된 프롬프트: {request.prompt}",
-            model="nvidia-nim-dummy"
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="AI 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(int(e.retry_after + 0.999))}
         )
-        
     except Exception as e:
         raise HTTPException(
             status_code=500,
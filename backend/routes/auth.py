@@ -15,7 +15,7 @@ router = APIRouter()
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserRegister,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     로컬 회원가입 (이메일 + 비밀번호)
@@ -40,7 +40,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     login_data: UserLogin,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     로컬 로그인 (이메일 + 비밀번호)
@@ -56,7 +56,7 @@ async def login(
 @router.post("/social", response_model=Token)
 async def social_login(
     social_data: SocialLogin,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     소셜 로그인 (Kakao, Google, Apple)
@@ -2,14 +2,15 @@
 카테고리 관련 API 라우터
 HTTP 요청/응답만 처리하고, 실제 비즈니스 로직은 서비스 레이어에 위임
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from database import get_db
 from schemas import CategoryCreate, CategoryUpdate, CategoryResponse
 from services.category_service import CategoryService
-from utils.dependencies import get_current_user
+from utils.dependencies import get_current_user, conditional_get
+from utils.ndjson import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 from models import User
 
 router = APIRouter()
@@ -19,7 +20,7 @@ router = APIRouter()
 async def create_category(
     category_data: CategoryCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     새로운 카테고리 생성
@@ -32,25 +33,32 @@ async def create_category(
     return await CategoryService.create_category(db, category_data, current_user.id)
 
 
-@router.get("/", response_model=List[CategoryResponse])
+@router.get(
+    "/", response_model=List[CategoryResponse], dependencies=[Depends(conditional_get)], responses=NDJSON_RESPONSES
+)
 async def get_categories(
+    response: Response,
+    ndjson: bool = Depends(wants_ndjson),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     현재 로그인한 사용자의 모든 카테고리 조회
     
     JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
     생성일 기준 내림차순으로 정렬됩니다.
+    Accept: application/x-ndjson 헤더를 보내면 전체 목록을 만들지 않고 한 줄에 하나씩 스트리밍합니다.
     """
+    if ndjson:
+        return ndjson_response(CategoryService.query_by_user(current_user.id), CategoryResponse, response)
     return await CategoryService.get_categories_by_user(db, current_user.id)
 
 
-@router.get("/{category_id}", response_model=CategoryResponse)
+@router.get("/{category_id}", response_model=CategoryResponse, dependencies=[Depends(conditional_get)])
 async def get_category(
     category_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     특정 카테고리 상세 조회
@@ -68,7 +76,7 @@ async def update_category(
     category_id: str,
     category_data: CategoryUpdate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     카테고리 정보 업데이트
@@ -88,7 +96,7 @@ async def update_category(
 async def delete_category(
     category_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     카테고리 삭제
@@ -0,0 +1,70 @@
+"""
+운영 중 디버그 설정 API 라우터
+DEBUG_TOKEN 환경 변수가 설정된 경우에만 활성화되며, X-Debug-Token 헤더로 인증합니다.
+
+프로파일러 설정은 워커별 메모리에 있으므로, 변경은 아웃박스 이벤트(debug.query_profiler_updated)로 모든 워커에 알립니다.
+"""
+import secrets
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import get_db
+from schemas import QueryProfilerSettingsResponse, QueryProfilerSettingsUpdate
+from utils import query_profiler
+from utils.outbox import OutboxRecord, consumer, record_event
+
+QUERY_PROFILER_UPDATED = "debug.query_profiler_updated"
+
+router = APIRouter()
+
+
+async def verify_debug_token(x_debug_token: Optional[str] = Header(None)):
+    """
+    디버그 토큰 확인
+
+    Raises:
+        HTTPException: DEBUG_TOKEN이 설정되지 않았으면 404, 토큰이 다르면 403
+    """
+    expected = settings.debug_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_debug_token or not secrets.compare_digest(x_debug_token, expected):
+        raise HTTPException(status_code=403, detail="디버그 토큰이 올바르지 않습니다.")
+
+
+@router.get("/query-profiler", response_model=QueryProfilerSettingsResponse, dependencies=[Depends(verify_debug_token)])
+async def get_query_profiler():
+    """SQL 프로파일러 현재 설정 조회"""
+    return QueryProfilerSettingsResponse.model_validate(vars(query_profiler.settings))
+
+
+@router.put("/query-profiler", response_model=QueryProfilerSettingsResponse, dependencies=[Depends(verify_debug_token)])
+async def update_query_profiler(
+    settings_data: QueryProfilerSettingsUpdate,
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    SQL 프로파일러 설정 변경 (재시작 없이 적용)
+
+    요청을 처리한 워커에는 바로, 다른 워커에는 OUTBOX_POLL_INTERVAL 이내에 적용됩니다.
+    변경은 메모리에만 있으므로 나중에 시작되거나 재시작된 워커, OUTBOX_ENABLED=false인 워커는 환경 변수 값을 사용합니다.
+
+    - **mode**: off / sample / on
+    - **sample_rate**: sample 모드에서 프로파일링할 요청 비율 (0~1)
+    - **slow_query_ms**: 느린 쿼리 기준 (밀리초)
+    - **n_plus_one_threshold**: 같은 모양의 쿼리가 몇 번 이상 반복되면 N+1로 볼지
+    """
+    for key, value in settings_data.model_dump(exclude_unset=True, exclude_none=True).items():
+        setattr(query_profiler.settings, key, value.value if key == "mode" else value)
+    await record_event(db, QUERY_PROFILER_UPDATED, None, payload=vars(query_profiler.settings))
+    return QueryProfilerSettingsResponse.model_validate(vars(query_profiler.settings))
+
+
+@consumer("query_profiler_settings", events=(QUERY_PROFILER_UPDATED,), local=True)
+async def _apply_query_profiler_settings(db: AsyncSession, events: List[OutboxRecord]) -> None:
+    """다른 워커에서 바꾼 프로파일러 설정을 이 워커에도 적용 (마지막 변경이 최종 설정)"""
+    for key, value in events[-1].payload.items():
+        setattr(query_profiler.settings, key, value)
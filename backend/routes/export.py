@@ -0,0 +1,60 @@
+"""
+분석용 데이터 내보내기 API 라우터
+HTTP 요청/응답만 처리하고, 실제 비즈니스 로직은 서비스 레이어에 위임
+"""
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from database import AsyncSessionLocal
+from services.export_service import EXPORT_FORMATS, ExportService, export_filename, parse_cursor
+from utils.dependencies import get_current_user
+from models import User
+
+router = APIRouter()
+
+
+@router.get("/{table}")
+async def export_table(
+    table: Literal["interaction_logs", "personas", "persona_notes"],
+    format: Literal["parquet", "arrow", "csv"] = Query("parquet", description="파일 형식"),
+    since: Optional[datetime] = Query(None, description="이 시각 이후 (포함)"),
+    until: Optional[datetime] = Query(None, description="이 시각 이전 (미포함)"),
+    cursor: Optional[str] = Query(None, description="이어받기 커서: 마지막으로 받은 행의 '<시각>,<id>'"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    내 데이터를 분석용 파일로 내보내기 (스트리밍)
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    서버 측 커서로 청크 단위로 읽어 바로 전송하므로 데이터 크기와 무관하게 메모리 사용량이 일정합니다.
+
+    - **table**: interaction_logs (정렬: timestamp) / personas, persona_notes (정렬: created_at)
+    - **format**: parquet (zstd 압축) / arrow (Arrow IPC 스트림) / csv
+    - **since**, **until**: 정렬 시각 컬럼 기준 기간
+    - **cursor**: 전송이 끊겼을 때, 마지막으로 받은 행의 정렬 시각과 id를 "2025-01-01T09:00:00,<id>"로 넘기면 그 다음 행부터 이어서 보냅니다.
+
+    행은 (정렬 시각, id) 순서이며, 삭제된 항목은 포함되지 않습니다.
+    """
+    ExportService.check_format(format)
+    if cursor:
+        parse_cursor(cursor)  # 스트림 시작 전에 형식 오류를 400으로 반환
+
+    async def body():
+        # 요청 세션은 응답 본문 전송 전에 닫히므로 스트리밍 전용 세션 사용
+        async with AsyncSessionLocal() as db:
+            async for chunk in ExportService.stream(
+                db, table, format,
+                user_id=current_user.id, since=since, until=until, cursor=cursor
+            ):
+                if chunk:
+                    yield chunk
+
+    media_type, _ = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export_filename(table, format)}"'},
+    )
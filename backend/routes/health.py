@@ -0,0 +1,28 @@
+"""
+헬스 체크 API 라우터
+로드밸런서/오케스트레이터용 liveness, readiness 엔드포인트
+"""
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def liveness():
+    """
+    프로세스가 살아 있고 이벤트 루프가 응답하는지 확인 (외부 의존성 확인 없음)
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+async def readiness(request: Request):
+    """
+    트래픽을 받을 준비가 되었는지 확인
+
+    백그라운드에서 주기적으로 갱신된 DB/NIM 프로브 결과와 커넥션 풀 사용률, 서킷 브레이커 상태를 반환합니다.
+    요청 시점에 DB나 NIM을 호출하지 않습니다. 준비되지 않았으면 503을 반환합니다.
+    """
+    report = request.app.state.health_monitor.readiness()
+    return JSONResponse(report, status_code=200 if report["status"] == "ready" else 503)
@@ -6,11 +6,13 @@ from fastapi import APIRouter, Depends, Query, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List, Optional
+from datetime import date, datetime
 
 from database import get_db
-from schemas import InteractionLogCreate, InteractionLogResponse
+from schemas import InteractionLogCreate, InteractionLogResponse, InteractionLogRollupResponse
 from services.interaction_log_service import InteractionLogService
 from utils.dependencies import get_current_user
+from utils.ndjson import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 from models import User, Persona, InteractionLog
 
 router = APIRouter()
@@ -20,7 +22,7 @@ router = APIRouter()
 async def create_interaction_log(
     log_data: InteractionLogCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     새로운 상호작용 로그 생성
@@ -73,13 +75,16 @@ async def create_interaction_log(
     return await InteractionLogService.create_interaction_log(db, log_data)
 
 
-@router.get("/", response_model=List[InteractionLogResponse])
+@router.get("/", response_model=List[InteractionLogResponse], responses=NDJSON_RESPONSES)
 async def get_interaction_logs(
     persona_id: Optional[str] = Query(None, description="페르소나 ID (특정 페르소나의 로그만 조회, 선택적)"),
     limit: Optional[int] = Query(None, description="최대 조회 개수"),
     offset: int = Query(0, description="시작 위치 (페이지네이션)"),
+    since: Optional[datetime] = Query(None, description="이 시각 이후 로그만 (선택적)"),
+    until: Optional[datetime] = Query(None, description="이 시각 이전 로그만 (선택적)"),
+    ndjson: bool = Depends(wants_ndjson),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     상호작용 로그 조회
@@ -90,9 +95,12 @@ async def get_interaction_logs(
     - **persona_id**: 페르소나 ID (선택적, 제공하면 해당 페르소나의 로그만 조회)
     - **limit**: 최대 조회 개수 (선택적)
     - **offset**: 시작 위치 (페이지네이션용, 기본값: 0)
+    - **since** / **until**: 조회 기간 (선택적, 기간을 주면 해당 월 파티션만 조회)
     
     persona_id가 없으면 현재 사용자의 모든 페르소나 로그를 조회합니다.
     최신순으로 정렬됩니다.
+    보존 기간(LOG_RETENTION_MONTHS)이 지난 로그는 일별 집계로 압축되어 `/rollups`에서 조회합니다.
+    Accept: application/x-ndjson 헤더를 보내면 limit 없이도 전체 목록을 메모리에 만들지 않고 한 줄에 하나씩 스트리밍합니다.
     """
     if persona_id:
         # 페르소나가 현재 사용자의 것인지 확인
@@ -113,21 +121,52 @@ async def get_interaction_logs(
                 detail="다른 사용자의 페르소나 로그는 조회할 수 없습니다."
             )
         
+        if ndjson:
+            return ndjson_response(
+                InteractionLogService.query_by_persona(persona_id, limit, offset, since, until),
+                InteractionLogResponse
+            )
         return await InteractionLogService.get_interaction_logs_by_persona(
-            db, persona_id, limit, offset
+            db, persona_id, limit, offset, since, until
         )
     else:
         # 현재 사용자의 모든 페르소나 로그 조회
+        if ndjson:
+            return ndjson_response(
+                InteractionLogService.query_by_user(current_user.id, limit, offset, since, until),
+                InteractionLogResponse
+            )
         return await InteractionLogService.get_interaction_logs_by_user(
-            db, current_user.id, limit, offset
+            db, current_user.id, limit, offset, since, until
         )
 
 
+@router.get("/rollups", response_model=List[InteractionLogRollupResponse])
+async def get_interaction_log_rollups(
+    persona_id: Optional[str] = Query(None, description="페르소나 ID (선택적)"),
+    since: Optional[date] = Query(None, description="이 날짜 이후 (포함, 선택적)"),
+    until: Optional[date] = Query(None, description="이 날짜 이전 (미포함, 선택적)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    압축된 상호작용 로그 일별 집계 조회
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    보존 기간이 지난 원본 로그는 (페르소나, 날짜, 유형, 방향)별 건수/통화 시간/평균 감정 점수로 압축되며,
+    raw_vector_ids로 Vector DB의 원본 대화를 계속 찾을 수 있습니다.
+
+    - **persona_id**: 페르소나 ID (선택적)
+    - **since** / **until**: 조회 기간 (선택적)
+    """
+    return await InteractionLogService.get_rollups(db, current_user.id, persona_id, since, until)
+
+
 @router.get("/{log_id}", response_model=InteractionLogResponse)
 async def get_interaction_log(
     log_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     특정 상호작용 로그 상세 조회
@@ -159,7 +198,7 @@ async def get_interaction_log(
 async def delete_interaction_log(
     log_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     상호작용 로그 삭제
@@ -2,7 +2,7 @@
 페르소나 노트 관련 API 라우터
 HTTP 요청/응답만 처리하고, 실제 비즈니스 로직은 서비스 레이어에 위임
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import List
@@ -10,7 +10,8 @@ from typing import List
 from database import get_db
 from schemas import PersonaNoteCreate, PersonaNoteUpdate, PersonaNoteResponse
 from services.persona_note_service import PersonaNoteService
-from utils.dependencies import get_current_user
+from utils.dependencies import get_current_user, conditional_get
+from utils.ndjson import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 from models import User, Persona
 
 router = APIRouter()
@@ -20,7 +21,7 @@ router = APIRouter()
 async def create_persona_note(
     note_data: PersonaNoteCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     새로운 페르소나 노트 생성
@@ -53,11 +54,15 @@ async def create_persona_note(
     return await PersonaNoteService.create_persona_note(db, note_data)
 
 
-@router.get("/", response_model=List[PersonaNoteResponse])
+@router.get(
+    "/", response_model=List[PersonaNoteResponse], dependencies=[Depends(conditional_get)], responses=NDJSON_RESPONSES
+)
 async def get_persona_notes(
     persona_id: str,
+    response: Response,
+    ndjson: bool = Depends(wants_ndjson),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     특정 페르소나의 모든 노트 조회
@@ -68,6 +73,7 @@ async def get_persona_notes(
     - **persona_id**: 페르소나 ID (쿼리 파라미터)
     
     최신순으로 정렬됩니다.
+    Accept: application/x-ndjson 헤더를 보내면 전체 목록을 만들지 않고 한 줄에 하나씩 스트리밍합니다.
     """
     # 페르소나가 현재 사용자의 것인지 확인
     persona_result = await db.execute(
@@ -87,14 +93,16 @@ async def get_persona_notes(
             detail="다른 사용자의 페르소나 노트는 조회할 수 없습니다."
         )
     
+    if ndjson:
+        return ndjson_response(PersonaNoteService.query_by_persona(persona_id), PersonaNoteResponse, response)
     return await PersonaNoteService.get_persona_notes_by_persona(db, persona_id)
 
 
-@router.get("/{note_id}", response_model=PersonaNoteResponse)
+@router.get("/{note_id}", response_model=PersonaNoteResponse, dependencies=[Depends(conditional_get)])
 async def get_persona_note(
     note_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     특정 페르소나 노트 상세 조회
@@ -127,7 +135,7 @@ async def update_persona_note(
     note_id: str,
     note_data: PersonaNoteUpdate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     페르소나 노트 정보 업데이트
@@ -161,7 +169,7 @@ async def update_persona_note(
 async def delete_persona_note(
     note_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     페르소나 노트 삭제
@@ -2,14 +2,21 @@
 페르소나 관련 API 라우터
 HTTP 요청/응답만 처리하고, 실제 비즈니스 로직은 서비스 레이어에 위임
 """
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Query, Response, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Literal, Optional
 
+from config import settings
 from database import get_db
-from schemas import PersonaCreate, PersonaUpdate, PersonaResponse
+from schemas import (
+    PersonaCreate, PersonaUpdate, PersonaResponse, PersonaLookupResult,
+    PersonaResolveRequest, PersonaResolveResult, PersonaImportResult
+)
 from services.persona_service import PersonaService
-from utils.dependencies import get_current_user
+from services.persona_import_service import PersonaImportService
+from services.persona_lookup_service import PersonaLookupService
+from utils.dependencies import get_current_user, conditional_get
+from utils.ndjson import NDJSON_RESPONSES, ndjson_response, wants_ndjson
 from models import User
 
 router = APIRouter()
@@ -19,7 +26,7 @@ router = APIRouter()
 async def create_persona(
     persona_data: PersonaCreate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     새로운 페르소나 생성
@@ -29,33 +36,138 @@ async def create_persona(
     - **name**: 표시 이름 (예: "우리 엄마")
     - **phone_number**: 연락처 (필수)
     - **category_id**: 카테고리 ID (필수)
-    - **birth_date**: 생일 (필수)
-    - **anniversary_date**: 기념일 (필수)
+    - **birth_date**: 생일 (선택적)
+    - **anniversary_date**: 기념일 (선택적)
     - **importance_weight**: 중요도 가중치 (0~100, 기본값: 50)
     - **relationship_temp**: 관계 온도 (0~100도, 기본값: 50.0)
     """
     return await PersonaService.create_persona(db, persona_data, current_user.id)
 
 
-@router.get("/", response_model=List[PersonaResponse])
+@router.get(
+    "/", response_model=List[PersonaResponse], dependencies=[Depends(conditional_get)], responses=NDJSON_RESPONSES
+)
 async def get_personas(
+    response: Response,
+    ndjson: bool = Depends(wants_ndjson),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     현재 로그인한 사용자의 모든 페르소나 조회
     
     JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
     생성일 기준 내림차순으로 정렬됩니다.
+    Accept: application/x-ndjson 헤더를 보내면 전체 목록을 만들지 않고 한 줄에 하나씩 스트리밍합니다.
     """
+    if ndjson:
+        return ndjson_response(PersonaService.query_by_user(current_user.id), PersonaResponse, response)
     return await PersonaService.get_personas_by_user(db, current_user.id)
 
 
-@router.get("/{persona_id}", response_model=PersonaResponse)
+@router.get("/lookup", response_model=List[PersonaLookupResult])
+async def lookup_personas(
+    prefix: str = Query(..., min_length=1, max_length=50, description="입력 중인 이름, 초성 또는 전화번호 일부"),
+    limit: int = Query(10, ge=1, le=50, description="최대 결과 수"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    페르소나 자동 완성 (연락처 화면 type-ahead)
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    페르소나가 바뀌지 않았다면 메모리에 캐시된 인덱스로 DB 조회 없이 응답합니다.
+
+    - **prefix**: 이름 접두어("홍길", 입력 중인 "홍기"도 가능), 초성("ㅎㄱㄷ"),
+      전화번호 일부("010-12", "+8210", 뒷자리 "5678")
+    - **limit**: 최대 결과 수 (기본값: 10)
+
+    일치하는 접두어가 부족하면 오타를 허용한 결과(match=fuzzy)를 뒤에 붙입니다.
+    """
+    return await PersonaLookupService.lookup(db, current_user, prefix, limit)
+
+
+@router.post("/resolve", response_model=List[PersonaResolveResult])
+async def resolve_personas(
+    request: PersonaResolveRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    수신 전화번호로 페르소나 확인 (발신자 표시)
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    번호는 형식과 관계없이 정규화되어 비교됩니다. (010-1234-5678 = +82 10 1234 5678)
+    한 번 확인한 번호는 페르소나/노트가 바뀌기 전까지 DB 조회 없이 응답합니다.
+
+    - **phone_numbers**: 수신 전화번호 목록 (최대 100개)
+
+    요청 순서대로 페르소나 ID, 관계 온도, 최신 노트를 반환하며, 일치하지 않는 번호는 persona_id가 null입니다.
+    """
+    return await PersonaLookupService.resolve(db, current_user, request.phone_numbers)
+
+
+@router.post(
+    "/import",
+    response_model=PersonaImportResult,
+    status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": PersonaImportResult, "description": "백그라운드 작업으로 등록됨 (job_id로 진행 상황 조회)"}}
+)
+async def import_personas(
+    background_tasks: BackgroundTasks,
+    response: Response,
+    file: UploadFile = File(..., description="vCard(.vcf) 또는 CSV 연락처 파일"),
+    format: Optional[Literal["vcard", "csv"]] = Query(None, description="파일 형식 (생략하면 내용으로 판단)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    연락처 일괄 가져오기 (온보딩)
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    휴대폰/구글 주소록에서 내보낸 vCard 또는 CSV(이름, 전화번호, 카테고리, 생일, 기념일)를 페르소나로 한 번에 만듭니다.
+
+    - 없는 카테고리는 자동으로 만들고, 그룹이 없는 연락처는 "미분류" 카테고리에 넣습니다.
+    - 전화번호가 파일 안 또는 기존 페르소나와 같으면 건너뛰고(duplicate_count), 전화번호가 없으면 건너뜁니다(invalid_count).
+    - 생일/기념일이 없거나 연도가 없는 연락처는 날짜를 비워 두고 만듭니다(missing_date_count).
+    - 전체가 한 트랜잭션이므로, 실패하면 아무것도 만들어지지 않습니다.
+
+    연락처가 많으면(기본 1000개 초과) 202와 job_id를 반환하고 백그라운드에서 가져옵니다.
+    `GET /api/personas/import/{job_id}`로 진행 상황(processed / total)과 결과를 확인하세요.
+    """
+    contacts = PersonaImportService.parse(await file.read(), format)
+    if len(contacts) <= settings.persona_import_sync_limit:
+        return await PersonaImportService.import_now(db, current_user.id, contacts)
+
+    job = await PersonaImportService.create_job(db, current_user.id, len(contacts))
+    # 작업 행은 응답 전에 커밋되고(get_db), 가져오기는 응답 전송 후 실행
+    background_tasks.add_task(PersonaImportService.run_job, job.job_id, current_user.id, contacts)
+    response.status_code = status.HTTP_202_ACCEPTED
+    return job
+
+
+@router.get("/import/{job_id}", response_model=PersonaImportResult)
+async def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    연락처 가져오기 작업 상태 조회
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+
+    - **status**: queued → running → succeeded / failed
+    - **processed** / **total**: 진행률
+    """
+    return await PersonaImportService.get_job(db, current_user.id, job_id)
+
+
+@router.get("/{persona_id}", response_model=PersonaResponse, dependencies=[Depends(conditional_get)])
 async def get_persona(
     persona_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     특정 페르소나 상세 조회
@@ -73,7 +185,7 @@ async def update_persona(
     persona_id: str,
     persona_data: PersonaUpdate,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     페르소나 정보 업데이트
@@ -91,7 +203,7 @@ async def update_persona(
 async def delete_persona(
     persona_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ):
     """
     페르소나 삭제
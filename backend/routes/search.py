@@ -0,0 +1,38 @@
+"""
+전문 검색 API 라우터
+HTTP 요청/응답만 처리하고, 실제 비즈니스 로직은 서비스 레이어에 위임
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from database import get_db
+from schemas import SearchResult
+from services.search_service import SearchService
+from utils.dependencies import get_current_user
+from models import User
+
+router = APIRouter()
+
+
+@router.get("", response_model=List[SearchResult])
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="검색어 (공백으로 구분한 단어를 모두 포함)"),
+    limit: int = Query(20, ge=1, le=100, description="최대 결과 수"),
+    offset: int = Query(0, ge=0, description="시작 위치 (페이지네이션)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    페르소나 노트와 상호작용 로그 요약 전문 검색
+
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    자신의 페르소나에 속한 항목만 검색되며, 관련도순으로 정렬됩니다.
+
+    - **q**: 검색어 (예: "생일 선물")
+    - **limit**: 최대 결과 수 (기본값: 20)
+    - **offset**: 시작 위치 (기본값: 0)
+
+    각 결과의 highlight는 HTML 이스케이프한 본문 일부이며, 일치한 부분만 `<mark>...</mark>`로 감쌉니다.
+    """
+    return await SearchService.search(db, current_user.id, q, limit, offset)
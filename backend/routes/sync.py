@@ -0,0 +1,38 @@
+"""
+델타 동기화 API 라우터
+HTTP 요청/응답만 처리하고, 실제 비즈니스 로직은 서비스 레이어에 위임
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from database import get_db
+from schemas import SyncResponse
+from services.sync_service import SyncService
+from utils.dependencies import get_current_user
+from models import User
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncResponse)
+async def sync_changes(
+    since: Optional[str] = Query(None, description="이전 응답의 next_token (없으면 전체 동기화)"),
+    limit: int = Query(500, ge=1, le=1000, description="한 페이지 최대 항목 수"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db, scope="function")
+):
+    """
+    마지막 동기화 이후 변경 사항 조회 (델타 동기화)
+    
+    JWT 토큰에서 자동으로 사용자 ID를 가져옵니다.
+    카테고리, 페르소나, 상호작용 로그, 노트의 생성/수정 항목과 삭제 기록(deleted)을 한 번에 반환합니다.
+    
+    - **since**: 이전 응답의 `next_token` (처음 동기화할 때는 생략)
+    - **limit**: 한 페이지 최대 항목 수 (기본값: 500)
+    
+    `has_more`가 true면 `next_token`으로 바로 다음 페이지를 요청하세요.
+    카테고리/페르소나의 삭제 기록은 하위 페르소나/로그/노트의 삭제 기록과 함께 전달됩니다.
+    마지막 몇 초(SYNC_LAG_SECONDS)의 변경은 다음 동기화에서 다시 전달될 수 있으므로 id 기준으로 덮어쓰세요.
+    """
+    return await SyncService.get_changes(db, current_user.id, since, limit)
@@ -0,0 +1,67 @@
+"""
+실시간 푸시 WebSocket 라우터
+알림과 백그라운드 작업 결과를 폴링 없이 받는 연결 (utils/push.py)
+
+연결: ws(s)://<host>/ws?device_id=<기기 ID>  (Authorization: Bearer <토큰> 헤더 또는 ?token=<토큰>)
+- 서버 → 클라이언트: {"type": "hello"}, {"type": "ping"}, {"type": "<이벤트 유형>", "id": <이벤트 ID>, "data": {...}}
+- 클라이언트 → 서버: {"type": "pong"} (ping에 응답), {"type": "ping"} (서버가 pong으로 응답)
+같은 device_id로 다시 연결하면 이전 연결은 4000으로 닫힙니다. 연결이 끊긴 동안의 알림은 REST API로 조회합니다.
+"""
+import json
+import time
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+
+from config import settings
+from database import AsyncSessionLocal
+from utils.dependencies import authenticate_token
+from utils.push import PushConnection, push_hub
+
+router = APIRouter()
+
+
+def _bearer_token(websocket: WebSocket, token: Optional[str]) -> str:
+    """Authorization 헤더 우선, 브라우저처럼 헤더를 못 넣는 클라이언트는 쿼리 파라미터"""
+    scheme, _, credentials = websocket.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and credentials:
+        return credentials
+    return token or ""
+
+
+@router.websocket("/ws")
+async def push_socket(websocket: WebSocket, token: Optional[str] = None, device_id: Optional[str] = None):
+    """
+    실시간 푸시 연결
+
+    인증은 연결 시 한 번만 하고 DB 세션을 바로 닫으므로, 유휴 연결이 DB 커넥션을 잡고 있지 않습니다.
+    토큰이 유효하지 않으면 1008(policy violation)로 닫습니다.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            user = await authenticate_token(db, _bearer_token(websocket, token))
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    connection = PushConnection(websocket, user.id, (device_id or str(uuid.uuid4()))[:128])
+    await push_hub.register(connection)
+    try:
+        await websocket.send_text(json.dumps(
+            {"type": "hello", "device_id": connection.device_id, "ping_interval": settings.push_ping_interval}
+        ))
+        while True:
+            text = await websocket.receive_text()
+            connection.last_seen = time.monotonic()
+            try:
+                message_type = json.loads(text).get("type")
+            except (ValueError, AttributeError):
+                continue  # 알 수 없는 메시지는 무시 (last_seen만 갱신)
+            if message_type == "ping":
+                await websocket.send_text('{"type": "pong"}')
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # 클라이언트가 끊었거나 허브가 닫은 연결
+    finally:
+        push_hub.unregister(connection)
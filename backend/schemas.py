@@ -4,7 +4,7 @@ API 요청/응답 검증 및 직렬화에 사용
 """
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 
 
@@ -47,6 +47,12 @@ class NotificationType(str, Enum):
     ACTION = "Action"
 
 
+class QueryProfilerMode(str, Enum):
+    OFF = "off"
+    SAMPLE = "sample"
+    ON = "on"
+
+
 # ========== Users 스키마 ==========
 class UserBase(BaseModel):
     """사용자 기본 스키마"""
@@ -127,6 +133,7 @@ class CategoryResponse(CategoryBase):
     id: str
     user_id: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -137,8 +144,8 @@ class PersonaBase(BaseModel):
     name: str
     phone_number: str
     category_id: str  # 카테고리 ID
-    birth_date: datetime
-    anniversary_date: datetime
+    birth_date: Optional[datetime] = None
+    anniversary_date: Optional[datetime] = None
     importance_weight: int = Field(default=50, ge=0, le=100)
     relationship_temp: float = Field(default=50.0, ge=0.0, le=100.0)
 
@@ -164,10 +171,20 @@ class PersonaResponse(PersonaBase):
     id: str
     user_id: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class PersonaLookupResult(BaseModel):
+    """페르소나 자동 완성 결과"""
+    id: str
+    name: str
+    phone_number: str
+    category_id: str
+    match: str = Field(..., description="일치 방식 (prefix: 이름 접두어, initials: 초성, phone: 전화번호, fuzzy: 오타 허용)")
+
+
 # ========== InteractionLogs 스키마 ==========
 class InteractionLogBase(BaseModel):
     """상호작용 로그 기본 스키마"""
@@ -189,10 +206,25 @@ class InteractionLogResponse(InteractionLogBase):
     """상호작용 로그 응답"""
     id: str
     persona_id: str
+    updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class InteractionLogRollupResponse(BaseModel):
+    """상호작용 로그 일별 집계 응답 (보존 기간이 지나 압축된 로그)"""
+    persona_id: str
+    day: date
+    type: InteractionType
+    direction: InteractionDirection
+    interaction_count: int
+    total_duration: int  # 초 단위 합계
+    average_sentiment: Optional[float] = None
+    first_timestamp: datetime
+    last_timestamp: datetime
+    raw_vector_ids: List[str] = []
+
+
 # ========== PersonaProfiles 스키마 ==========
 class PersonaProfileBase(BaseModel):
     """페르소나 프로필 기본 스키마"""
@@ -242,6 +274,42 @@ class PersonaNoteResponse(PersonaNoteBase):
     id: str
     persona_id: str
     created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# ========== 발신자 확인 스키마 ==========
+class PersonaResolveRequest(BaseModel):
+    """발신자 확인 요청 (전화번호 일괄)"""
+    phone_numbers: List[str] = Field(..., min_length=1, max_length=100, description="수신 전화번호 목록 (형식 무관)")
+
+
+class PersonaResolveResult(BaseModel):
+    """발신자 확인 결과 (요청 순서대로, 일치하는 페르소나가 없으면 persona_id가 null)"""
+    phone_number: str
+    normalized_phone: Optional[str] = None
+    persona_id: Optional[str] = None
+    name: Optional[str] = None
+    relationship_temp: Optional[float] = None
+    latest_note: Optional[PersonaNoteResponse] = None
+
+
+# ========== 연락처 가져오기 스키마 ==========
+class PersonaImportResult(BaseModel):
+    """연락처 가져오기 결과 (작은 파일은 바로 완료, 큰 파일은 job_id로 진행 상황 조회)"""
+    job_id: Optional[str] = None
+    status: str = Field(..., description="queued / running / succeeded / failed")
+    total: int = Field(0, description="파일에서 읽은 연락처 수")
+    processed: int = Field(0, description="처리한 연락처 수 (진행률)")
+    created_count: int = Field(0, description="새로 만든 페르소나 수")
+    duplicate_count: int = Field(0, description="전화번호가 파일 안 또는 기존 페르소나와 같아 건너뛴 수")
+    invalid_count: int = Field(0, description="전화번호가 없거나 잘못되어 건너뛴 수")
+    missing_date_count: int = Field(0, description="생일 또는 기념일이 없거나 연도가 없어 비워 두고 만든 수")
+    categories_created: int = Field(0, description="새로 만든 카테고리 수")
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -270,6 +338,56 @@ class NotificationLogResponse(NotificationLogBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ========== Sync 스키마 ==========
+class SyncTombstone(BaseModel):
+    """삭제 기록 (tombstone)"""
+    entity: str  # categories, personas, interaction_logs, persona_notes
+    id: str
+    deleted_at: datetime
+
+
+class SyncResponse(BaseModel):
+    """
+    델타 동기화 응답
+    since 토큰 이후 변경된(생성/수정) 항목과 삭제 기록을 한 번에 반환합니다.
+    """
+    categories: List[CategoryResponse] = []
+    personas: List[PersonaResponse] = []
+    interaction_logs: List[InteractionLogResponse] = []
+    persona_notes: List[PersonaNoteResponse] = []
+    deleted: List[SyncTombstone] = []
+    next_token: Optional[str] = None  # 다음 동기화 시 since로 전달
+    has_more: bool = False  # True면 next_token으로 바로 다음 페이지 요청
+
+
+# ========== 검색 스키마 ==========
+class SearchResult(BaseModel):
+    """검색 결과 항목"""
+    entity: str  # persona_note, interaction_log
+    id: str
+    persona_id: str
+    highlight: str  # HTML 이스케이프한 본문 일부, 일치한 부분은 <mark>...</mark>로 감쌈
+    score: float  # 클수록 관련도가 높음
+    updated_at: datetime
+
+
+# ========== 디버그 스키마 ==========
+class QueryProfilerSettingsResponse(BaseModel):
+    """SQL 프로파일러 현재 설정"""
+    mode: QueryProfilerMode
+    sample_rate: float
+    slow_query_ms: float
+    n_plus_one_threshold: int
+
+
+class QueryProfilerSettingsUpdate(BaseModel):
+    """SQL 프로파일러 설정 변경 (보낸 값만 변경)"""
+    mode: Optional[QueryProfilerMode] = None
+    sample_rate: Optional[float] = Field(None, ge=0.0, le=1.0)
+    slow_query_ms: Optional[float] = Field(None, ge=0.0)
+    n_plus_one_threshold: Optional[int] = Field(None, ge=2)
+
+
 # ========== 복합 응답 스키마 ==========
 class PersonaDetailResponse(PersonaResponse):
     """페르소나 상세 정보 (관계 데이터 포함)"""
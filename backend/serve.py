@@ -0,0 +1,68 @@
+"""
+운영용 서버 실행 진입점
+uvicorn 설정(워커 수, 이벤트 루프, HTTP 파서, keep-alive, backlog 등)을 환경 변수로 지정해 실행합니다.
+개발 중에는 README의 `uvicorn main:app --reload`를 그대로 사용하세요.
+
+실행:
+    cd backend
+    python serve.py                           # .env의 HOST, PORT, SERVER_* 설정
+    SERVER_WORKERS=auto python serve.py       # CPU 코어 수만큼 워커
+
+- 마이그레이션은 워커를 띄우기 전에 이 프로세스에서 한 번 적용하므로, 워커는 "최신" 확인만 하고 시작합니다.
+- uvicorn 워커는 spawn으로 만들어져 부모의 DB 연결을 물려받지 않습니다.
+  fork로 워커를 만드는 서버를 쓰더라도 database.py가 fork 직후 자식의 커넥션 풀을 비웁니다.
+- 속도 제한 카운터, 캐시, 푸시 연결은 워커마다 따로 있습니다. 워커가 여러 개면
+  RATE_LIMIT_BACKEND=sqlite(또는 공유 백엔드), PUSH_BACKEND 설정을 함께 확인하세요.
+"""
+import asyncio
+import os
+
+import uvicorn
+
+from config import settings
+
+
+def server_options() -> dict:
+    """설정(config.settings)으로 uvicorn.run() 옵션 구성"""
+    workers = settings.server_workers
+    return {
+        "host": settings.host,
+        "port": settings.port,
+        "workers": (os.cpu_count() or 1) if workers == "auto" else int(workers),
+        # auto: uvloop/httptools가 설치되어 있으면 사용 (uvicorn[standard])
+        "loop": settings.server_loop,
+        "http": settings.server_http,
+        # 로드밸런서 뒤에서는 로드밸런서의 유휴 타임아웃보다 길게 (예: ALB 60초 → 65)
+        "timeout_keep_alive": settings.server_keepalive,
+        "backlog": settings.server_backlog,
+        # 워커당 동시 연결 상한 (넘으면 503, 비우면 제한 없음, 푸시 WebSocket 연결도 포함)
+        "limit_concurrency": settings.server_limit_concurrency,
+        # 종료 시 진행 중인 요청/스트리밍 응답을 기다리는 최대 시간 (그 뒤 lifespan 종료에서 작업을 JOB_DRAIN_TIMEOUT까지 기다림)
+        "timeout_graceful_shutdown": settings.server_graceful_timeout,
+        # 유휴 WebSocket 연결 메모리 절약 (benchmarks/ws_bench.py)
+        "ws_per_message_deflate": settings.server_ws_per_message_deflate,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.forwarded_allow_ips,
+        "access_log": settings.server_access_log,  # 요청 메트릭은 /metrics
+        "server_header": False,
+        "log_level": settings.server_log_level,
+    }
+
+
+async def prepare_database() -> None:
+    """워커 시작 전 마이그레이션 적용 (MIGRATE_ON_STARTUP=false면 최신인지 확인만), 부모의 연결은 모두 닫음"""
+    from database import engine, init_db
+
+    try:
+        await init_db()
+    finally:
+        await engine.dispose()
+
+
+def main():
+    asyncio.run(prepare_database())
+    uvicorn.run("main:app", **server_options())
+
+
+if __name__ == "__main__":
+    main()
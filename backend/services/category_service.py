@@ -2,13 +2,17 @@
 카테고리 관련 비즈니스 로직 서비스
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, select
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from typing import List, Optional
 import uuid
 
-from models import Category
+from database import dialect_insert
+from models import Category, Persona, utcnow
 from schemas import CategoryCreate, CategoryUpdate, CategoryResponse
+from utils.data_version import bump_data_version
+from services.sync_service import SyncService
 
 
 class CategoryService:
@@ -31,29 +35,32 @@ class CategoryService:
         Returns:
             생성된 카테고리 정보
         """
-        # 중복 체크 (같은 사용자의 같은 이름 카테고리)
-        existing = await db.execute(
-            select(Category).where(
-                Category.user_id == user_id,
-                Category.name == category_data.name
+        # 새 카테고리 생성 (INSERT ... ON CONFLICT DO NOTHING RETURNING)
+        # (user_id, name) 고유 인덱스로 중복 체크와 생성을 한 문장에 처리하여 경쟁 조건 제거
+        stmt = (
+            dialect_insert(Category)
+            .values(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                name=category_data.name
             )
+            .on_conflict_do_nothing(
+                index_elements=[Category.user_id, Category.name],
+                index_where=Category.deleted_at.is_(None)
+            )
+            .returning(Category)
         )
-        if existing.scalar_one_or_none():
+        new_category = (await db.execute(stmt)).scalar_one_or_none()
+        
+        # 같은 사용자의 같은 이름 카테고리가 이미 있음 (RETURNING 결과 없음)
+        if new_category is None:
             raise HTTPException(
                 status_code=400,
                 detail=f"이미 존재하는 카테고리입니다: {category_data.name}"
             )
         
-        # 새 카테고리 인스턴스 생성
-        new_category = Category(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            name=category_data.name
-        )
-        
-        db.add(new_category)
-        await db.commit()
-        await db.refresh(new_category)
+        await bump_data_version(db, user_id)
+        await db.flush()
         
         return CategoryResponse.model_validate(new_category)
 
@@ -93,6 +100,11 @@ class CategoryService:
         
         return CategoryResponse.model_validate(category)
 
+    @staticmethod
+    def query_by_user(user_id: str) -> Select:
+        """사용자의 카테고리 조회 쿼리 (생성일 내림차순, 목록 조회와 NDJSON 스트리밍 공용)"""
+        return select(Category).where(Category.user_id == user_id).order_by(Category.created_at.desc())
+
     @staticmethod
     async def get_categories_by_user(
         db: AsyncSession,
@@ -108,8 +120,7 @@ class CategoryService:
         Returns:
             카테고리 목록
         """
-        query = select(Category).where(Category.user_id == user_id).order_by(Category.created_at.desc())
-        result = await db.execute(query)
+        result = await db.execute(CategoryService.query_by_user(user_id))
         categories = result.scalars().all()
         
         return [CategoryResponse.model_validate(c) for c in categories]
@@ -173,8 +184,18 @@ class CategoryService:
         for field, value in update_data.items():
             setattr(category, field, value)
         
-        await db.commit()
-        await db.refresh(category)
+        # 위 확인 뒤에 동시 요청이 같은 이름으로 바꾼 경우 (user_id, name) 고유 인덱스 위반
+        # (요청 트랜잭션은 get_db에서 롤백됨)
+        try:
+            await db.flush()
+        except IntegrityError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"이미 존재하는 카테고리입니다: {category_data.name}"
+            )
+        
+        await bump_data_version(db, category.user_id)
+        await db.flush()
         
         return CategoryResponse.model_validate(category)
 
@@ -187,7 +208,8 @@ class CategoryService:
         """
         카테고리 삭제
         
-        카테고리를 삭제하면, CASCADE 설정에 의해 연결된 모든 페르소나도 함께 삭제됩니다.
+        카테고리를 삭제하면, 연결된 모든 페르소나(와 로그/노트)도 함께 삭제됩니다.
+        델타 동기화를 위해 행을 지우지 않고 deleted_at만 기록합니다 (소프트 삭제).
         
         Args:
             db: 데이터베이스 세션
@@ -214,9 +236,13 @@ class CategoryService:
                 detail=f"카테고리를 찾을 수 없습니다. (ID: {category_id})"
             )
         
-        # CASCADE 삭제: 연결된 모든 페르소나도 함께 삭제됨
-        await db.delete(category)
-        await db.commit()
+        # 소프트 삭제: 연결된 모든 페르소나도 함께 삭제 표시
+        now = utcnow()
+        await SyncService.tombstone_personas(db, Persona.category_id == category_id, now)
+        category.deleted_at = now
+        category.updated_at = now
+        await bump_data_version(db, category.user_id)
+        await db.flush()
         
         return True
 
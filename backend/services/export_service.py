@@ -0,0 +1,272 @@
+"""
+분석용 데이터 내보내기 서비스
+상호작용 로그 / 페르소나 / 노트를 서버 측 커서로 청크 단위로 읽어 Parquet, Arrow IPC 스트림, CSV로 바로 흘려보냅니다.
+ORM 객체를 만들지 않고 한 번에 한 청크만 메모리에 두므로, 데이터 크기와 무관하게 메모리 사용량이 일정합니다.
+
+- 정렬은 (시각 컬럼, id) 순서이며, 중단된 내보내기는 마지막으로 받은 행의 "시각,id"를 cursor로 넘겨 이어받습니다.
+- Parquet / Arrow는 선택 의존성 pyarrow가 필요합니다. (없으면 CSV만 사용 가능, 사용할 때만 import)
+"""
+import csv
+import enum
+import io
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import InteractionLog, Persona, PersonaNote
+
+# 테이블 이름 → (모델, 정렬/기간 필터 시각 컬럼)
+EXPORT_TABLES = {
+    "interaction_logs": (InteractionLog, InteractionLog.timestamp),
+    "personas": (Persona, Persona.created_at),
+    "persona_notes": (PersonaNote, PersonaNote.created_at),
+}
+
+EXPORT_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+
+def parse_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    "<ISO 시각>,<id>" 형식 커서 해석
+
+    Raises:
+        HTTPException: 형식이 잘못되었을 때
+    """
+    try:
+        sort_value, row_id = cursor.split(",", 1)
+        return datetime.fromisoformat(sort_value), row_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="cursor는 '<ISO 시각>,<id>' 형식이어야 합니다.")
+
+
+def format_cursor(sort_value: datetime, row_id: str) -> str:
+    """마지막 행의 정렬 값으로 다음 내보내기 커서 생성"""
+    return f"{sort_value.isoformat()},{row_id}"
+
+
+def _arrow_type(pa, column):
+    """SQLAlchemy 컬럼 타입 → Arrow 타입"""
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column.type, Date):
+        return pa.date32()
+    if isinstance(column.type, Boolean):
+        return pa.bool_()
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, Float):
+        return pa.float64()
+    return pa.string()  # 문자열, Enum 값
+
+
+def _plain(value):
+    """Enum은 값 문자열로 (CSV/Arrow 공통)"""
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+class _StreamBuffer:
+    """pyarrow 작성기가 쓰는 파일 객체 (쓴 바이트를 모아 두었다가 drain()으로 꺼내 응답으로 전송)"""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ExportService:
+    """분석용 데이터 내보내기 서비스"""
+
+    @staticmethod
+    def check_format(format: str) -> None:
+        """
+        내보내기 형식 사용 가능 여부 확인
+
+        Raises:
+            HTTPException: 지원하지 않거나 pyarrow가 필요한 형식일 때
+        """
+        if format not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"지원하지 않는 형식입니다: {format}")
+        if format in ("parquet", "arrow"):
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise HTTPException(
+                    status_code=501,
+                    detail=f"{format} 형식에는 pyarrow가 필요합니다. (pip install pyarrow, 또는 format=csv 사용)"
+                )
+
+    @staticmethod
+    def columns(table: str) -> list:
+        """내보낼 컬럼 목록 (테이블 정의 순서)"""
+        model, _ = EXPORT_TABLES[table]
+        return list(model.__table__.columns)
+
+    @staticmethod
+    async def iter_chunks(
+        db: AsyncSession,
+        table: str,
+        user_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[str] = None,
+        include_deleted: bool = False,
+        limit: Optional[int] = None,
+        chunk_rows: int = settings.export_chunk_rows
+    ) -> AsyncIterator[List[tuple]]:
+        """
+        서버 측 커서로 행을 chunk_rows개씩 읽기 (ORM 객체 없이 컬럼 튜플)
+
+        Args:
+            db: 데이터베이스 세션 (내보내기가 끝날 때까지 열려 있어야 함)
+            table: interaction_logs / personas / persona_notes
+            user_id: 이 사용자의 데이터만 (None이면 전체 사용자, CLI 전용)
+            since: 시각 컬럼이 이 시각 이후 (포함)
+            until: 시각 컬럼이 이 시각 이전 (미포함)
+            cursor: 이전 내보내기에서 마지막으로 받은 행의 "시각,id" (이 행 다음부터)
+            include_deleted: 소프트 삭제된 행 포함 여부
+            limit: 최대 행 수 (None이면 끝까지)
+            chunk_rows: 청크 크기
+
+        Yields:
+            행 튜플 목록 (columns(table) 순서)
+        """
+        model, sort_column = EXPORT_TABLES[table]
+        query = select(*ExportService.columns(table)).order_by(sort_column, model.id)
+        if model is Persona:
+            if user_id is not None:
+                query = query.where(Persona.user_id == user_id)
+        elif user_id is not None or not include_deleted:
+            # 로그/메모는 소유 페르소나로 사용자를 거르고, 삭제된 페르소나의 로그/메모도 제외
+            owned = select(Persona.id)
+            if user_id is not None:
+                owned = owned.where(Persona.user_id == user_id)
+            if not include_deleted:
+                owned = owned.where(Persona.deleted_at.is_(None))
+            query = query.where(model.persona_id.in_(owned))
+        if not include_deleted:
+            query = query.where(model.deleted_at.is_(None))
+        if since is not None:
+            query = query.where(sort_column >= since)
+        if until is not None:
+            query = query.where(sort_column < until)
+        if cursor:
+            query = query.where(tuple_(sort_column, model.id) > tuple_(*parse_cursor(cursor)))
+        if limit is not None:
+            query = query.limit(limit)
+
+        # 삭제된 행 포함 여부는 위에서 직접 조건으로 처리 (Core 컬럼 SELECT라 자동 필터 대상 아님)
+        result = await db.stream(query.execution_options(yield_per=chunk_rows, include_deleted=True))
+        async for rows in result.partitions(chunk_rows):
+            yield [tuple(row) for row in rows]
+
+    @staticmethod
+    def cursor_of(table: str, row: tuple) -> str:
+        """행 튜플의 이어받기 커서 ("시각,id")"""
+        _, sort_column = EXPORT_TABLES[table]
+        names = [column.name for column in ExportService.columns(table)]
+        return format_cursor(row[names.index(sort_column.name)], row[names.index("id")])
+
+    @staticmethod
+    async def encode(
+        table: str,
+        format: str,
+        chunks: AsyncIterator[List[tuple]]
+    ) -> AsyncIterator[bytes]:
+        """
+        행 청크를 지정 형식으로 인코딩 (청크마다 인코딩된 바이트를 바로 반환)
+
+        Args:
+            table: 내보낼 테이블 (컬럼 구성)
+            format: parquet / arrow / csv
+            chunks: iter_chunks()가 반환한 행 청크
+
+        Yields:
+            인코딩된 바이트 청크 (빈 바이트일 수 있음)
+        """
+        columns = ExportService.columns(table)
+        names = [column.name for column in columns]
+
+        if format == "csv":
+            text = io.StringIO()
+            writer = csv.writer(text)
+            writer.writerow(names)
+            async for rows in chunks:
+                writer.writerows([[_plain(value) for value in row] for row in rows])
+                yield text.getvalue().encode("utf-8")
+                text.seek(0)
+                text.truncate()
+            if text.tell():
+                yield text.getvalue().encode("utf-8")
+            return
+
+        import pyarrow as pa
+        import pyarrow.ipc
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([pa.field(column.name, _arrow_type(pa, column)) for column in columns])
+        sink = _StreamBuffer()
+        if format == "parquet":
+            writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        else:
+            writer = pa.ipc.new_stream(pa.PythonFile(sink, mode="w"), schema)
+        try:
+            async for rows in chunks:
+                batch = pa.RecordBatch.from_arrays(
+                    [
+                        pa.array([_plain(row[i]) for row in rows], type=field.type)
+                        for i, field in enumerate(schema)
+                    ],
+                    schema=schema,
+                )
+                writer.write_batch(batch)  # Parquet은 청크마다 row group 하나
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def stream(db: AsyncSession, table: str, format: str, **filters) -> AsyncIterator[bytes]:
+        """
+        테이블을 읽어 지정 형식 바이트 스트림으로 반환
+
+        Args:
+            db: 데이터베이스 세션 (스트림이 끝날 때까지 열려 있어야 함)
+            table: 내보낼 테이블
+            format: parquet / arrow / csv
+            **filters: iter_chunks()의 필터 인자 (user_id, since, until, cursor, include_deleted, limit)
+        """
+        return ExportService.encode(table, format, ExportService.iter_chunks(db, table, **filters))
+
+
+def export_filename(table: str, format: str, day: Optional[date] = None) -> str:
+    """다운로드 파일 이름 (예: interaction_logs-20250101.parquet)"""
+    return f"{table}-{(day or date.today()):%Y%m%d}.{EXPORT_FORMATS[format][1]}"
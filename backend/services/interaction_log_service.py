@@ -1,20 +1,180 @@
 """
 상호작용 로그 관련 비즈니스 로직 서비스
+
+보존 정책
+- PostgreSQL: interaction_logs는 timestamp 기준 월별 RANGE 파티션 테이블입니다.
+  ensure_log_partitions()가 앞으로 쓸 달의 파티션을 미리 만들고, 범위를 벗어난 행은 DEFAULT 파티션에 들어갑니다.
+- SQLite: 파티션이 없으므로 (persona_id, timestamp) 인덱스 범위 스캔으로 같은 효과를 냅니다.
+- 두 DB 모두 LOG_RETENTION_MONTHS보다 오래된 원본 로그는 compact_logs()가 페르소나별 일별 집계
+  (interaction_log_rollups)로 압축하고 삭제합니다. PostgreSQL은 비워진 월 파티션도 제거합니다.
 """
+import json
+import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import Date, Select, select, delete, text, and_, cast, func, literal, type_coerce
 from fastapi import HTTPException
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
-from datetime import datetime
+from datetime import date, datetime
+
+from config import settings
+from database import dialect_insert
+from models import InteractionLog, InteractionLogRollup, Persona, utcnow
+from schemas import InteractionLogCreate, InteractionLogResponse, InteractionLogRollupResponse
+from utils.data_version import bump_data_version_by_persona
+from utils.outbox import record_event
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "interaction_logs_p"
+# 집계 쿼리에서 raw_vector_id를 이어 붙일 때 쓰는 구분자 (ID에 나오지 않는 제어 문자)
+VECTOR_ID_SEPARATOR = "\x1f"
+
+
+def month_start(value: datetime, offset: int = 0) -> datetime:
+    """value가 속한 달의 1일 0시에서 offset개월 이동한 시각"""
+    months = value.year * 12 + value.month - 1 + offset
+    return datetime(months // 12, months % 12 + 1, 1)
+
+
+def ensure_log_partitions(
+    connection,
+    months_ahead: int = settings.log_partition_months_ahead,
+    since: Optional[datetime] = None
+) -> List[str]:
+    """
+    PostgreSQL 월별 파티션 생성 (since(기본값: 지난달) ~ months_ahead개월 후, 이미 있으면 건너뜀)
+
+    매일 실행되는 ensure_log_partitions 작업과 tools/generate_data.py에서 호출합니다. (마이그레이션 0009는 같은 규칙의 복사본 사용)
+    DEFAULT 파티션에 이미 그 달의 행이 있으면 만들 수 없으므로 경고만 남기고 계속합니다.
+
+    Args:
+        connection: 동기 커넥션 (run_sync)
+        months_ahead: 이번 달 이후로 미리 만들 파티션 수
+        since: 과거 데이터를 대량으로 넣기 전이라면 그 데이터의 시작 시각
+
+    Returns:
+        새로 만든 파티션 이름 목록
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+    connection.exec_driver_sql(
+        "CREATE TABLE IF NOT EXISTS interaction_logs_default PARTITION OF interaction_logs DEFAULT"
+    )
+    created = []
+    now = utcnow()
+    first = month_start(since or now, 0 if since else -1)
+    last = month_start(now, months_ahead)
+    months = (last.year - first.year) * 12 + last.month - first.month + 1
+    for offset in range(months):
+        lower, upper = month_start(first, offset), month_start(first, offset + 1)
+        name = f"{PARTITION_PREFIX}{lower:%Y%m}"
+        if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.exec_driver_sql(
+                    f"CREATE TABLE {name} PARTITION OF interaction_logs "
+                    f"FOR VALUES FROM ('{lower:%Y-%m-%d}') TO ('{upper:%Y-%m-%d}')"
+                )
+            created.append(name)
+        except Exception as e:
+            logger.warning("파티션 %s 생성 실패 (DEFAULT 파티션에 같은 기간 행이 있을 수 있음): %s", name, e)
+    return created
+
+
+def drop_partitions_before(connection, cutoff: datetime) -> List[str]:
+    """
+    PostgreSQL: cutoff 이전 달의 월 파티션 제거 (compact_logs가 비운 뒤 호출)
 
-from models import InteractionLog, Persona
-from schemas import InteractionLogCreate, InteractionLogResponse
+    Returns:
+        제거한 파티션 이름 목록
+    """
+    if connection.dialect.name != "postgresql":
+        return []
+    names = connection.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'interaction_logs'::regclass"
+    )).scalars().all()
+    dropped = []
+    for name in names:
+        suffix = name[len(PARTITION_PREFIX):]
+        if not name.startswith(PARTITION_PREFIX) or not suffix.isdigit():
+            continue
+        lower = datetime(int(suffix[:4]), int(suffix[4:]), 1)
+        if month_start(lower, 1) <= cutoff:
+            connection.exec_driver_sql(f"DROP TABLE {name}")
+            dropped.append(name)
+    return dropped
+
+
+def _rollup_response(rollup: InteractionLogRollup) -> InteractionLogRollupResponse:
+    return InteractionLogRollupResponse(
+        persona_id=rollup.persona_id,
+        day=rollup.day,
+        type=rollup.type,
+        direction=rollup.direction,
+        interaction_count=rollup.interaction_count,
+        total_duration=rollup.total_duration,
+        average_sentiment=(
+            round(rollup.sentiment_sum / rollup.sentiment_count, 4) if rollup.sentiment_count else None
+        ),
+        first_timestamp=rollup.first_timestamp,
+        last_timestamp=rollup.last_timestamp,
+        raw_vector_ids=json.loads(rollup.raw_vector_ids) if rollup.raw_vector_ids else [],
+    )
 
 
 class InteractionLogService:
     """상호작용 로그 CRUD 서비스"""
 
+    @staticmethod
+    def _period(since: Optional[datetime], until: Optional[datetime]) -> list:
+        """timestamp 범위 조건 (파티션 프루닝 / 인덱스 범위 스캔용)"""
+        conditions = []
+        if since is not None:
+            conditions.append(InteractionLog.timestamp >= since)
+        if until is not None:
+            conditions.append(InteractionLog.timestamp < until)
+        return conditions
+
+    @staticmethod
+    def query_by_persona(
+        persona_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Select:
+        """특정 페르소나의 로그 조회 쿼리 (최신순, 목록 조회와 NDJSON 스트리밍 공용)"""
+        query = (
+            select(InteractionLog)
+            .where(InteractionLog.persona_id == persona_id, *InteractionLogService._period(since, until))
+            .order_by(InteractionLog.timestamp.desc())
+        )
+        if limit:
+            query = query.limit(limit).offset(offset)
+        return query
+
+    @staticmethod
+    def query_by_user(
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> Select:
+        """사용자의 모든 페르소나 로그 조회 쿼리 (최신순, 목록 조회와 NDJSON 스트리밍 공용)"""
+        query = (
+            select(InteractionLog)
+            .join(Persona)
+            .where(Persona.user_id == user_id, *InteractionLogService._period(since, until))
+            .order_by(InteractionLog.timestamp.desc())
+        )
+        if limit:
+            query = query.limit(limit).offset(offset)
+        return query
+
     @staticmethod
     async def create_interaction_log(
         db: AsyncSession,
@@ -34,10 +194,10 @@ class InteractionLogService:
             HTTPException: 페르소나를 찾을 수 없을 때
         """
         # 페르소나 존재 확인
-        persona = await db.execute(
+        persona = (await db.execute(
             select(Persona).where(Persona.id == log_data.persona_id)
-        )
-        if not persona.scalar_one_or_none():
+        )).scalar_one_or_none()
+        if not persona:
             raise HTTPException(
                 status_code=404,
                 detail=f"페르소나를 찾을 수 없습니다. (ID: {log_data.persona_id})"
@@ -57,10 +217,14 @@ class InteractionLogService:
         )
         
         db.add(new_log)
-        await db.commit()
-        await db.refresh(new_log)
+        await bump_data_version_by_persona(db, log_data.persona_id)
+        await db.flush()
         
-        return InteractionLogResponse.model_validate(new_log)
+        response = InteractionLogResponse.model_validate(new_log)
+        await record_event(
+            db, "interaction_log.created", new_log.id, user_id=persona.user_id, payload=response.model_dump(mode="json")
+        )
+        return response
 
     @staticmethod
     async def get_interaction_log_by_id(
@@ -98,7 +262,9 @@ class InteractionLogService:
         db: AsyncSession,
         persona_id: str,
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
     ) -> List[InteractionLogResponse]:
         """
         특정 페르소나의 모든 상호작용 로그 조회
@@ -108,19 +274,13 @@ class InteractionLogService:
             persona_id: 페르소나 ID
             limit: 최대 조회 개수 (선택적)
             offset: 시작 위치 (페이지네이션용)
+            since: 이 시각 이후 로그만 (선택적, PostgreSQL은 해당 파티션만 스캔)
+            until: 이 시각 이전 로그만 (선택적)
             
         Returns:
             상호작용 로그 목록 (최신순 정렬)
         """
-        query = (
-            select(InteractionLog)
-            .where(InteractionLog.persona_id == persona_id)
-            .order_by(InteractionLog.timestamp.desc())
-        )
-        
-        if limit:
-            query = query.limit(limit).offset(offset)
-        
+        query = InteractionLogService.query_by_persona(persona_id, limit, offset, since, until)
         result = await db.execute(query)
         logs = result.scalars().all()
         
@@ -131,7 +291,9 @@ class InteractionLogService:
         db: AsyncSession,
         user_id: str,
         limit: Optional[int] = None,
-        offset: int = 0
+        offset: int = 0,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
     ) -> List[InteractionLogResponse]:
         """
         사용자의 모든 페르소나에 대한 상호작용 로그 조회
@@ -141,20 +303,13 @@ class InteractionLogService:
             user_id: 사용자 ID
             limit: 최대 조회 개수 (선택적)
             offset: 시작 위치 (페이지네이션용)
+            since: 이 시각 이후 로그만 (선택적, PostgreSQL은 해당 파티션만 스캔)
+            until: 이 시각 이전 로그만 (선택적)
             
         Returns:
             상호작용 로그 목록 (최신순 정렬)
         """
-        query = (
-            select(InteractionLog)
-            .join(Persona)
-            .where(Persona.user_id == user_id)
-            .order_by(InteractionLog.timestamp.desc())
-        )
-        
-        if limit:
-            query = query.limit(limit).offset(offset)
-        
+        query = InteractionLogService.query_by_user(user_id, limit, offset, since, until)
         result = await db.execute(query)
         logs = result.scalars().all()
         
@@ -168,6 +323,8 @@ class InteractionLogService:
         """
         상호작용 로그 삭제
         
+        델타 동기화를 위해 행을 지우지 않고 deleted_at만 기록합니다 (소프트 삭제).
+        
         Args:
             db: 데이터베이스 세션
             log_id: 삭제할 상호작용 로그 ID
@@ -189,8 +346,203 @@ class InteractionLogService:
                 detail=f"상호작용 로그를 찾을 수 없습니다. (ID: {log_id})"
             )
         
-        await db.delete(log)
-        await db.commit()
+        log.deleted_at = utcnow()
+        await record_event(db, "interaction_log.deleted", log.id, persona_id=log.persona_id, payload={"persona_id": log.persona_id})
+        await bump_data_version_by_persona(db, log.persona_id)
+        await db.flush()
         
         return True
 
+    @staticmethod
+    async def get_rollups(
+        db: AsyncSession,
+        user_id: str,
+        persona_id: Optional[str] = None,
+        since: Optional[date] = None,
+        until: Optional[date] = None
+    ) -> List[InteractionLogRollupResponse]:
+        """
+        압축된 일별 집계 조회 (보존 기간이 지난 로그)
+
+        Args:
+            db: 데이터베이스 세션
+            user_id: 사용자 ID (삭제되지 않은 자신의 페르소나만)
+            persona_id: 특정 페르소나만 (선택적)
+            since: 이 날짜 이후 (선택적, 포함)
+            until: 이 날짜 이전 (선택적, 미포함)
+
+        Returns:
+            일별 집계 목록 (최신 날짜순)
+        """
+        query = (
+            select(InteractionLogRollup)
+            .join(Persona)
+            .where(Persona.user_id == user_id)
+            .order_by(InteractionLogRollup.day.desc(), InteractionLogRollup.type, InteractionLogRollup.direction)
+        )
+        if persona_id:
+            query = query.where(InteractionLogRollup.persona_id == persona_id)
+        if since is not None:
+            query = query.where(InteractionLogRollup.day >= since)
+        if until is not None:
+            query = query.where(InteractionLogRollup.day < until)
+        result = await db.execute(query)
+        return [_rollup_response(rollup) for rollup in result.scalars().all()]
+
+    @staticmethod
+    async def compact_logs(
+        db: AsyncSession,
+        retention_months: int = settings.log_retention_months,
+        batch_personas: int = 200,
+        now: Optional[datetime] = None
+    ) -> Dict[str, object]:
+        """
+        보존 기간이 지난 원본 로그를 페르소나별 일별 집계로 압축하고 삭제
+
+        요청 밖(CLI/백그라운드 작업)에서 실행하며, 페르소나 batch_personas명마다 커밋합니다.
+        일별 집계는 DB의 GROUP BY로 계산하므로 메모리 사용량은 원본 로그 수가 아니라 집계 행 수에 비례합니다.
+        같은 날짜의 집계가 이미 있으면(늦게 들어온 옛 로그) 합쳐서 갱신하므로 여러 번 실행해도 안전합니다.
+        소프트 삭제된 로그는 집계하지 않고 함께 제거합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            retention_months: 원본을 보존할 개월 수 (이번 달 1일 기준)
+            batch_personas: 한 트랜잭션에서 처리할 페르소나 수
+            now: 기준 시각 (테스트용, 기본값은 현재 UTC)
+
+        Returns:
+            처리 결과 (cutoff, personas, logs_compacted, logs_purged, rollups_written, partitions_dropped)
+        """
+        cutoff = month_start(now or utcnow(), -retention_months)
+        persona_ids = (await db.execute(
+            select(InteractionLog.persona_id)
+            .where(InteractionLog.timestamp < cutoff)
+            .distinct()
+            .execution_options(include_deleted=True)
+        )).scalars().all()
+
+        stats = {"cutoff": cutoff.isoformat(), "personas": len(persona_ids), "logs_compacted": 0,
+                 "logs_purged": 0, "rollups_written": 0, "partitions_dropped": []}
+        for start in range(0, len(persona_ids), batch_personas):
+            batch = persona_ids[start:start + batch_personas]
+            expired = and_(InteractionLog.persona_id.in_(batch), InteractionLog.timestamp < cutoff)
+            stats["logs_purged"] += (await db.execute(
+                select(func.count())
+                .select_from(InteractionLog)
+                .where(expired, InteractionLog.deleted_at.is_not(None))
+                .execution_options(include_deleted=True)
+            )).scalar_one()
+
+            # 일별 집계는 DB에서 GROUP BY로 계산 (원본 로그를 메모리로 읽지 않음)
+            rollups: Dict[Tuple, dict] = {}
+            for row in (await db.execute(InteractionLogService._rollup_query(db.bind.dialect.name, expired))).all():
+                rollups[(row.persona_id, row.day, row.type, row.direction)] = {
+                    "interaction_count": row.interaction_count,
+                    "total_duration": row.total_duration or 0,
+                    "sentiment_sum": row.sentiment_sum or 0.0,
+                    "sentiment_count": row.sentiment_count,
+                    "first_timestamp": row.first_timestamp,
+                    "last_timestamp": row.last_timestamp,
+                    "raw_vector_ids": row.raw_vector_ids.split(VECTOR_ID_SEPARATOR) if row.raw_vector_ids else [],
+                }
+                stats["logs_compacted"] += row.interaction_count
+
+            if rollups:
+                await InteractionLogService._merge_rollups(db, batch, rollups)
+                stats["rollups_written"] += len(rollups)
+            await db.execute(
+                delete(InteractionLog)
+                .where(expired)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+
+        if db.bind.dialect.name == "postgresql":
+            connection = await db.connection()
+            stats["partitions_dropped"] = await connection.run_sync(drop_partitions_before, cutoff)
+            await db.commit()
+        return stats
+
+    @staticmethod
+    def _rollup_query(dialect: str, expired) -> Select:
+        """
+        (persona_id, 날짜, type, direction)별 집계 SELECT (소프트 삭제된 로그 제외)
+
+        raw_vector_id는 SQLite group_concat / PostgreSQL string_agg로 모읍니다.
+        """
+        if dialect == "postgresql":
+            day = cast(InteractionLog.timestamp, Date)
+            vector_ids = func.string_agg(InteractionLog.raw_vector_id, literal(VECTOR_ID_SEPARATOR))
+        else:
+            day = type_coerce(func.date(InteractionLog.timestamp), Date)
+            vector_ids = func.group_concat(InteractionLog.raw_vector_id, literal(VECTOR_ID_SEPARATOR))
+        return (
+            select(
+                InteractionLog.persona_id,
+                day.label("day"),
+                InteractionLog.type,
+                InteractionLog.direction,
+                func.count().label("interaction_count"),
+                func.sum(InteractionLog.duration).label("total_duration"),
+                func.sum(InteractionLog.sentiment_score).label("sentiment_sum"),
+                func.count(InteractionLog.sentiment_score).label("sentiment_count"),
+                func.min(InteractionLog.timestamp).label("first_timestamp"),
+                func.max(InteractionLog.timestamp).label("last_timestamp"),
+                vector_ids.label("raw_vector_ids"),
+            )
+            .where(expired, InteractionLog.deleted_at.is_(None))
+            .group_by(InteractionLog.persona_id, day, InteractionLog.type, InteractionLog.direction)
+            .execution_options(include_deleted=True)
+        )
+
+    @staticmethod
+    async def _merge_rollups(db: AsyncSession, persona_ids: List[str], rollups: Dict[Tuple, dict]) -> None:
+        """기존 집계와 합친 뒤 (persona_id, day, type, direction) 기준 업서트"""
+        days = {key[1] for key in rollups}
+        existing = (await db.execute(
+            select(InteractionLogRollup).where(
+                InteractionLogRollup.persona_id.in_(persona_ids),
+                InteractionLogRollup.day.in_(days)
+            )
+        )).scalars().all()
+        for rollup in existing:
+            row = rollups.get((rollup.persona_id, rollup.day, rollup.type, rollup.direction))
+            if row is None:
+                continue
+            row["interaction_count"] += rollup.interaction_count
+            row["total_duration"] += rollup.total_duration
+            row["sentiment_sum"] += rollup.sentiment_sum
+            row["sentiment_count"] += rollup.sentiment_count
+            row["first_timestamp"] = min(row["first_timestamp"], rollup.first_timestamp)
+            row["last_timestamp"] = max(row["last_timestamp"], rollup.last_timestamp)
+            row["raw_vector_ids"] = (json.loads(rollup.raw_vector_ids) if rollup.raw_vector_ids else []) + row["raw_vector_ids"]
+
+        values = [
+            {
+                "id": str(uuid.uuid4()),
+                "persona_id": persona_id,
+                "day": day,
+                "type": type_,
+                "direction": direction,
+                **row,
+                "raw_vector_ids": json.dumps(row["raw_vector_ids"]) if row["raw_vector_ids"] else None,
+            }
+            for (persona_id, day, type_, direction), row in rollups.items()
+        ]
+        # SQLite 바인드 변수 개수 제한을 넘지 않도록 나눠서 실행
+        for start in range(0, len(values), 1000):
+            stmt = dialect_insert(InteractionLogRollup).values(values[start:start + 1000])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    InteractionLogRollup.persona_id, InteractionLogRollup.day,
+                    InteractionLogRollup.type, InteractionLogRollup.direction
+                ],
+                set_={
+                    column: stmt.excluded[column]
+                    for column in (
+                        "interaction_count", "total_duration", "sentiment_sum", "sentiment_count",
+                        "first_timestamp", "last_timestamp", "raw_vector_ids"
+                    )
+                } | {"updated_at": utcnow()}
+            )
+            await db.execute(stmt)
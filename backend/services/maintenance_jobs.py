@@ -0,0 +1,65 @@
+"""
+주기 유지보수 작업 (utils/jobs.py의 JobRunner가 cron에 따라 실행, 시각은 UTC)
+
+main.py에서 import하면 작업이 등록됩니다.
+tools/compact_logs.py 등 CLI는 그대로 두어 수동 실행이나 외부 스케줄러에서도 쓸 수 있습니다.
+"""
+from datetime import timedelta
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import ImportJob, utcnow
+from services.interaction_log_service import InteractionLogService, ensure_log_partitions
+from services.sync_service import SyncService
+from utils.jobs import job, purge_finished_jobs
+from utils.outbox import purge_outbox_events
+
+
+@job("purge_tombstones", queue="maintenance", cron="30 3 * * *")
+async def purge_tombstones(db: AsyncSession, payload: dict) -> dict:
+    """보관 기간(TOMBSTONE_RETENTION_DAYS)이 지난 삭제 기록 정리"""
+    return {"purged": await SyncService.purge_tombstones(db)}
+
+
+@job("compact_logs", queue="maintenance", cron="0 4 * * *", max_attempts=2)
+async def compact_logs(db: AsyncSession, payload: dict) -> dict:
+    """보존 기간이 지난 상호작용 로그를 일별 집계로 압축 (페르소나 배치마다 커밋)"""
+    return await InteractionLogService.compact_logs(db)
+
+
+@job("ensure_log_partitions", queue="maintenance", cron="15 0 * * *")
+async def create_log_partitions(db: AsyncSession, payload: dict) -> dict:
+    """PostgreSQL: 앞으로 쓸 달의 로그 파티션 미리 생성 (SQLite는 아무것도 하지 않음)"""
+    connection = await db.connection()
+    return {"created": await connection.run_sync(ensure_log_partitions)}
+
+
+@job("expire_import_jobs", queue="maintenance", cron="*/10 * * * *")
+async def expire_import_jobs(db: AsyncSession, payload: dict) -> dict:
+    """
+    실행하던 워커가 재시작되어 끝나지 못한 연락처 가져오기 작업을 실패로 표시
+
+    연락처는 실행 중인 워커의 메모리에만 있으므로 이어서 실행할 수 없고, 사용자가 다시 가져와야 합니다.
+    """
+    cutoff = utcnow() - timedelta(minutes=settings.persona_import_stale_minutes)
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.status.in_(("queued", "running")), ImportJob.updated_at < cutoff)
+        .values(status="failed", error="서버가 재시작되어 가져오기가 중단되었습니다. 다시 시도해 주세요.", finished_at=utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    return {"expired": result.rowcount}
+
+
+@job("purge_finished_jobs", queue="maintenance", cron="45 4 * * *")
+async def purge_old_jobs(db: AsyncSession, payload: dict) -> dict:
+    """보관 기간(JOB_RETENTION_DAYS)이 지난 완료/실패 작업 행 삭제"""
+    return {"purged": await purge_finished_jobs(db)}
+
+
+@job("purge_outbox", queue="maintenance", cron="50 * * * *")
+async def purge_outbox(db: AsyncSession, payload: dict) -> dict:
+    """모든 소비자가 처리했고 보관 기간(OUTBOX_RETENTION_HOURS)이 지난 아웃박스 이벤트 삭제"""
+    return {"purged": await purge_outbox_events(db)}
@@ -0,0 +1,70 @@
+"""
+NVIDIA NIM API 호출 서비스
+OpenAI 호환 엔드포인트를 openai 라이브러리로 호출하고, 응답 시간과 토큰 사용량을 메트릭으로 기록합니다.
+"""
+import time
+from typing import Tuple
+
+from config import settings
+from utils.circuit_breaker import CircuitBreaker
+from utils.metrics import record_nim_call
+
+# 연속 실패 시 NIM 호출 차단 (요청이 타임아웃까지 묶이지 않도록)
+nim_breaker = CircuitBreaker(
+    "nim",
+    failure_threshold=settings.nim_breaker_failures,
+    reset_timeout=settings.nim_breaker_reset_seconds,
+)
+
+_client = None
+
+
+def _get_client():
+    """AsyncOpenAI 클라이언트 (최초 호출 시 생성, 커넥션 재사용)"""
+    global _client
+    if _client is None:
+        # openai는 실제로 NIM을 호출할 때만 import (API 키가 없는 개발 환경의 시작 시간 절약)
+        from openai import AsyncOpenAI
+        _client = AsyncOpenAI(
+            base_url=settings.nim_base_url, api_key=settings.nvidia_api_key, timeout=settings.nim_timeout
+        )
+    return _client
+
+
+async def call_nim_api(prompt: str, max_tokens: int = 100) -> Tuple[str, str]:
+    """
+    NIM 채팅 완성 API 호출
+
+    Args:
+        prompt: 사용자 프롬프트
+        max_tokens: 최대 생성 토큰 수
+
+    Returns:
+        (응답 텍스트, 모델 이름)
+
+    Raises:
+        CircuitOpenError: 최근 연속 실패로 서킷이 열려 있을 때
+    """
+    nim_breaker.before_call()
+    started = time.perf_counter()
+    try:
+        completion = await _get_client().chat.completions.create(
+            model=settings.nim_model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=max_tokens,
+        )
+    except Exception:
+        nim_breaker.record_failure()
+        record_nim_call(settings.nim_model, time.perf_counter() - started, "error")
+        raise
+
+    nim_breaker.record_success()
+    usage = completion.usage
+    record_nim_call(
+        settings.nim_model,
+        time.perf_counter() - started,
+        "success",
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+    )
+    return completion.choices[0].message.content or "", completion.model or settings.nim_model
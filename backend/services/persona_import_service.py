@@ -0,0 +1,266 @@
+"""
+연락처 일괄 가져오기 서비스
+vCard/CSV 연락처를 페르소나로 한 번에 만듭니다.
+
+- 없는 카테고리는 자동 생성하고(연락처에 그룹이 없으면 DEFAULT_IMPORT_CATEGORY),
+  전화번호는 정규화해 파일 안 중복과 기존 페르소나와의 중복을 건너뜁니다. ((user_id, normalized_phone) 고유 인덱스)
+- 생일/기념일이 없거나 연도가 없는 연락처는 임의의 날짜로 채우지 않고 비워 둔 채 만들며, 그 수를 missing_date_count로 알려줍니다.
+- 카테고리와 페르소나를 INSERT ... ON CONFLICT DO NOTHING RETURNING executemany로 넣으며, 전체가 한 트랜잭션입니다.
+- PERSONA_IMPORT_SYNC_LIMIT개를 넘는 파일은 import_jobs에 작업을 기록하고 응답 후 백그라운드로 실행합니다.
+  진행률(processed)은 작업을 실행 중인 워커의 메모리에만 있고, 상태와 결과는 DB에 있어 어느 워커에서든 조회됩니다.
+"""
+import csv
+import logging
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal, dialect_insert
+from models import Category, ImportJob, Persona, utcnow
+from schemas import PersonaImportResult
+from utils.contacts import ContactRecord, parse_contacts
+from utils.data_version import bump_data_version
+from utils.outbox import record_event
+from utils.phone import normalize_phone
+
+logger = logging.getLogger(__name__)
+
+# 연락처에 그룹이 없을 때 사용할 카테고리
+DEFAULT_IMPORT_CATEGORY = "미분류"
+
+# 진행률을 갱신하는 단위 (청크마다 executemany 한 번, SQLAlchemy가 여러 행 INSERT ... RETURNING으로 묶어 실행)
+_INSERT_CHUNK = 2000
+
+# 작업 ID → 처리한 연락처 수 (이 워커에서 실행 중인 작업만)
+_progress: Dict[str, int] = {}
+
+
+class PersonaImportService:
+    """연락처 일괄 가져오기 서비스"""
+
+    @staticmethod
+    def parse(data: bytes, file_format: Optional[str] = None) -> List[ContactRecord]:
+        """
+        업로드된 연락처 파일 해석
+
+        Raises:
+            HTTPException: 파일이 너무 크거나, 해석할 수 없거나, 연락처가 너무 많을 때
+        """
+        if len(data) > settings.persona_import_max_bytes:
+            raise HTTPException(
+                status_code=413,
+                detail=f"파일이 너무 큽니다. (최대 {settings.persona_import_max_bytes // (1024 * 1024)}MB)"
+            )
+        try:
+            contacts = parse_contacts(data, file_format)
+        except (ValueError, csv.Error) as exc:
+            raise HTTPException(status_code=400, detail=f"연락처 파일을 읽을 수 없습니다: {exc}")
+        if not contacts:
+            raise HTTPException(status_code=400, detail="연락처 파일에 연락처가 없습니다.")
+        if len(contacts) > settings.persona_import_max_contacts:
+            raise HTTPException(
+                status_code=413,
+                detail=f"연락처가 너무 많습니다. (최대 {settings.persona_import_max_contacts}개, 파일을 나눠서 가져오세요)"
+            )
+        return contacts
+
+    @staticmethod
+    async def import_contacts(
+        db: AsyncSession,
+        user_id: str,
+        contacts: List[ContactRecord],
+        on_progress: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, int]:
+        """
+        연락처를 페르소나로 일괄 생성 (커밋은 호출한 쪽에서, 전체가 한 트랜잭션)
+
+        Args:
+            db: 데이터베이스 세션
+            user_id: 소유자 사용자 ID
+            contacts: 해석된 연락처 목록
+            on_progress: 청크마다 처리한 연락처 수로 호출 (선택적)
+
+        Returns:
+            total, created_count, duplicate_count, invalid_count, missing_date_count, categories_created
+        """
+        # 1. 전화번호 정규화 + 파일 안 중복 제거 (먼저 나온 연락처 우선)
+        seen = set()
+        valid = []
+        invalid_count = duplicate_count = 0
+        for contact in contacts:
+            normalized = normalize_phone(contact.phone_number) if contact.phone_number else None
+            if normalized is None:
+                invalid_count += 1
+            elif normalized in seen:
+                duplicate_count += 1
+            else:
+                seen.add(normalized)
+                valid.append((contact, normalized))
+        processed = len(contacts) - len(valid)
+
+        # 2. 없는 카테고리를 한 문장으로 만들고, 이름 → ID 조회
+        names = {contact.category or DEFAULT_IMPORT_CATEGORY for contact, _ in valid}
+        categories_created = 0
+        category_ids: Dict[str, str] = {}
+        if names:
+            now = utcnow()
+            created = await db.execute(
+                dialect_insert(Category)
+                .on_conflict_do_nothing(
+                    index_elements=[Category.user_id, Category.name],
+                    index_where=Category.deleted_at.is_(None)
+                )
+                .returning(Category.id),
+                [
+                    {"id": str(uuid.uuid4()), "user_id": user_id, "name": name, "created_at": now, "updated_at": now}
+                    for name in sorted(names)
+                ]
+            )
+            categories_created = len(created.all())
+            rows = await db.execute(
+                select(Category.id, Category.name).where(Category.user_id == user_id, Category.name.in_(names))
+            )
+            category_ids = {name: category_id for category_id, name in rows.all()}
+
+        # 3. 페르소나 INSERT ... ON CONFLICT DO NOTHING (기존 페르소나와 같은 번호는 건너뜀)
+        insert_persona = (
+            dialect_insert(Persona)
+            .on_conflict_do_nothing(
+                index_elements=[Persona.user_id, Persona.normalized_phone],
+                index_where=Persona.deleted_at.is_(None)
+            )
+            .returning(Persona.id)
+        )
+        created_count = missing_date_count = 0
+        for start in range(0, len(valid), _INSERT_CHUNK):
+            now = utcnow()
+            chunk = valid[start:start + _INSERT_CHUNK]
+            values = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user_id,
+                    "name": contact.name or contact.phone_number,
+                    "phone_number": contact.phone_number,
+                    "normalized_phone": normalized,
+                    "category_id": category_ids[contact.category or DEFAULT_IMPORT_CATEGORY],
+                    "birth_date": contact.birth_date,
+                    "anniversary_date": contact.anniversary_date,
+                    "importance_weight": 50,
+                    "relationship_temp": 50.0,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for contact, normalized in chunk
+            ]
+            created_ids = set((await db.execute(insert_persona, values)).scalars().all())
+            created_count += len(created_ids)
+            # 날짜를 비워 두고 만든 페르소나 수 (중복으로 건너뛴 연락처는 제외)
+            missing_date_count += sum(
+                1 for row in values
+                if row["id"] in created_ids and (row["birth_date"] is None or row["anniversary_date"] is None)
+            )
+            processed += len(chunk)
+            if on_progress is not None:
+                on_progress(processed)
+
+        counts = {
+            "total": len(contacts),
+            "created_count": created_count,
+            "duplicate_count": duplicate_count + len(valid) - created_count,
+            "invalid_count": invalid_count,
+            "missing_date_count": missing_date_count,
+            "categories_created": categories_created,
+        }
+        if created_count or categories_created:
+            # 페르소나마다 이벤트를 남기지 않고 가져오기 단위로 하나만 기록
+            await record_event(db, "persona.imported", None, user_id=user_id, payload=counts)
+            await bump_data_version(db, user_id)
+        await db.flush()
+        return counts
+
+    @staticmethod
+    async def import_now(db: AsyncSession, user_id: str, contacts: List[ContactRecord]) -> PersonaImportResult:
+        """요청 트랜잭션 안에서 바로 가져오기 (작은 파일)"""
+        counts = await PersonaImportService.import_contacts(db, user_id, contacts)
+        return PersonaImportResult(status="succeeded", processed=counts["total"], finished_at=utcnow(), **counts)
+
+    @staticmethod
+    async def create_job(db: AsyncSession, user_id: str, total: int) -> PersonaImportResult:
+        """백그라운드 가져오기 작업 등록 (요청 트랜잭션과 함께 커밋)"""
+        job = ImportJob(id=str(uuid.uuid4()), user_id=user_id, status="queued", total=total)
+        db.add(job)
+        await db.flush()
+        return PersonaImportService._result(job)
+
+    @staticmethod
+    async def run_job(job_id: str, user_id: str, contacts: List[ContactRecord]) -> None:
+        """
+        백그라운드 가져오기 실행 (응답 전송 후 BackgroundTasks에서 호출)
+
+        가져온 데이터와 작업 결과(succeeded)를 같은 트랜잭션으로 커밋하므로,
+        작업이 succeeded면 모든 페르소나가 들어가 있고 failed면 하나도 없습니다.
+        """
+        _progress[job_id] = 0
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(update(ImportJob).where(ImportJob.id == job_id).values(status="running"))
+                await db.commit()
+            async with AsyncSessionLocal() as db:
+                counts = await PersonaImportService.import_contacts(
+                    db, user_id, contacts, on_progress=lambda processed: _progress.__setitem__(job_id, processed)
+                )
+                await db.execute(
+                    update(ImportJob).where(ImportJob.id == job_id)
+                    .values(status="succeeded", finished_at=utcnow(), **counts)
+                )
+                await db.commit()
+        except Exception as exc:
+            logger.exception("연락처 가져오기 실패 (job %s)", job_id)
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(ImportJob).where(ImportJob.id == job_id)
+                    .values(status="failed", error=str(exc)[:500], finished_at=utcnow())
+                )
+                await db.commit()
+        finally:
+            _progress.pop(job_id, None)
+
+    @staticmethod
+    async def get_job(db: AsyncSession, user_id: str, job_id: str) -> PersonaImportResult:
+        """
+        가져오기 작업 상태 조회
+
+        Raises:
+            HTTPException: 작업이 없거나 다른 사용자의 작업일 때
+        """
+        job = (await db.execute(
+            select(ImportJob).where(ImportJob.id == job_id, ImportJob.user_id == user_id)
+        )).scalar_one_or_none()
+        if job is None:
+            raise HTTPException(status_code=404, detail=f"가져오기 작업을 찾을 수 없습니다. (ID: {job_id})")
+        return PersonaImportService._result(job)
+
+    @staticmethod
+    def _result(job: ImportJob) -> PersonaImportResult:
+        if job.status == "succeeded":
+            processed = job.total
+        else:
+            processed = _progress.get(job.id, 0)
+        return PersonaImportResult(
+            job_id=job.id,
+            status=job.status,
+            total=job.total,
+            processed=processed,
+            created_count=job.created_count or 0,
+            duplicate_count=job.duplicate_count or 0,
+            invalid_count=job.invalid_count or 0,
+            missing_date_count=job.missing_date_count or 0,
+            categories_created=job.categories_created or 0,
+            error=job.error,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+        )
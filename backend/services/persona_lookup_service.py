@@ -0,0 +1,321 @@
+"""
+페르소나 조회 서비스 (자동 완성, 발신자 확인)
+- 자동 완성: 사용자별 페르소나 이름/전화번호로 트라이(trie)를 만들어 메모리에 캐시하고,
+  키 입력마다 DB 조회 없이 접두어/초성/오타 허용 검색을 수행합니다.
+- 발신자 확인: 수신 전화번호를 정규화해 (user_id, normalized_phone) 고유 인덱스로 찾고, 결과를 메모리에 캐시합니다.
+
+두 캐시 모두 사용자 data_version(페르소나/노트 쓰기마다 +1)을 함께 저장하므로,
+get_current_user에서 이미 읽은 data_version과 다르면 버리고 다시 만듭니다. (여러 워커에서도 일관됨)
+캐시에 있는 사용자의 트라이는 아웃박스 이벤트를 받아 요청 밖에서 미리 다시 만들어 두므로,
+쓰기 직후 첫 자동 완성 요청이 재구성 비용을 내지 않습니다.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import Persona, PersonaNote, User
+from schemas import PersonaLookupResult, PersonaNoteResponse, PersonaResolveResult
+from utils.hangul import decompose, initials, is_initials_query
+from utils.outbox import OutboxRecord, consumer
+from utils.phone import normalize_phone, phone_digits, phone_search_keys
+
+_PHONE_CHARS = set("0123456789+-() ")
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: List[int] = []  # 이 노드를 지나는 모든 키의 항목 번호 (항목 번호 = 순위이므로 오름차순)
+
+
+class _Trie:
+    """접두어 트라이 (각 노드에 하위 항목 목록을 미리 저장해 접두어 조회가 O(접두어 길이))"""
+
+    def __init__(self):
+        self.root = _TrieNode()
+
+    def insert(self, key: str, entry: int) -> None:
+        """항목 번호 오름차순으로, 한 항목의 키를 연달아 넣어야 ids가 중복 없이 정렬됨"""
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            if not node.ids or node.ids[-1] != entry:
+                node.ids.append(entry)
+
+    def prefix(self, key: str) -> List[int]:
+        node = self.root
+        for char in key:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return node.ids
+
+    def fuzzy_prefix(self, key: str, max_distance: int) -> List[int]:
+        """
+        편집 거리 max_distance 이내로 key와 일치하는 접두어를 가진 항목 (오타 허용)
+
+        트라이를 따라 내려가며 Levenshtein 행을 갱신하고, 행의 최솟값이
+        max_distance를 넘는 가지는 더 내려가지 않습니다.
+        """
+        matches: List[int] = []
+        first_row = list(range(len(key) + 1))
+        stack = [(child, char, first_row) for char, child in self.root.children.items()]
+        while stack:
+            node, char, previous = stack.pop()
+            row = [previous[0] + 1]
+            for i in range(1, len(key) + 1):
+                row.append(min(
+                    row[i - 1] + 1,
+                    previous[i] + 1,
+                    previous[i - 1] + (key[i - 1] != char),
+                ))
+            if row[-1] <= max_distance:
+                matches.extend(node.ids)  # key 전체가 이 접두어와 일치 → 하위 항목 모두 포함
+                continue
+            if min(row) <= max_distance:
+                stack.extend((child, next_char, row) for next_char, child in node.children.items())
+        return matches
+
+
+class PersonaLookupIndex:
+    """한 사용자의 페르소나 자동 완성 인덱스"""
+
+    def __init__(self, data_version: int, rows: Iterable):
+        self.data_version = data_version
+        self.entries: List[PersonaLookupResult] = []
+        self.names = _Trie()     # 이름 자모 (단어마다 따로 넣어 "엄마"로 "우리 엄마" 검색)
+        self.initials = _Trie()  # 이름 초성
+        self.phones = _Trie()    # 전화번호 (국내 표기, 국가 번호 포함, 뒷자리 4개)
+
+        # 중요도 높은 순, 이름순으로 번호를 매겨 트라이 노드의 ids가 그대로 순위순이 되게 함
+        rows = sorted(rows, key=lambda row: (-(row[5] or 0), row[1]))
+        for entry, (persona_id, name, phone_number, normalized_phone, category_id, _) in enumerate(rows):
+            self.entries.append(PersonaLookupResult(
+                id=persona_id, name=name, phone_number=phone_number, category_id=category_id, match="prefix"
+            ))
+            words = name.split()
+            for start in range(len(words)):
+                self.names.insert(decompose(" ".join(words[start:])), entry)
+                self.initials.insert(initials(" ".join(words[start:])), entry)
+            e164 = normalized_phone or normalize_phone(phone_number)
+            if e164:
+                for key in phone_search_keys(e164):
+                    self.phones.insert(key, entry)
+
+    def search(self, query: str, limit: int) -> List[PersonaLookupResult]:
+        """
+        접두어 → 초성 → 오타 허용 순서로 찾아 limit개까지 반환
+
+        같은 단계 안에서는 중요도(importance_weight) 높은 순, 이름순입니다.
+        """
+        query = query.strip()
+        found: Dict[int, str] = {}
+
+        def collect(ids: Iterable[int], match: str) -> None:
+            for entry in ids:
+                if len(found) >= limit:
+                    return
+                found.setdefault(entry, match)
+
+        if set(query) <= _PHONE_CHARS:
+            digits = phone_digits(query)
+            if digits:
+                collect(self.phones.prefix(digits), "phone")
+        else:
+            jamo = decompose(query)
+            collect(self.names.prefix(jamo), "prefix")
+            if is_initials_query(query):
+                collect(self.initials.prefix(query.replace(" ", "")), "initials")
+            if len(found) < limit and len(jamo) >= 3:
+                # 짧은 입력은 1글자(자모)까지, 긴 입력은 2글자까지 오타 허용
+                max_distance = 1 if len(jamo) <= 6 else 2
+                fuzzy = sorted(set(self.names.fuzzy_prefix(jamo, max_distance)))
+                collect(fuzzy, "fuzzy")
+
+        return [
+            self.entries[entry].model_copy(update={"match": match})
+            for entry, match in found.items()
+        ]
+
+
+# 사용자 ID → 자동 완성 인덱스 (LRU)
+_indexes: "OrderedDict[str, PersonaLookupIndex]" = OrderedDict()
+# 사용자 ID → (data_version, 정규화 번호 → 확인 결과, 없는 번호는 None) (LRU)
+_resolved: "OrderedDict[str, Tuple[int, Dict[str, Optional[PersonaResolveResult]]]]" = OrderedDict()
+
+
+def _remember(cache: OrderedDict, user_id: str, value) -> None:
+    """LRU 캐시에 저장하고 오래된 사용자부터 제거"""
+    cache[user_id] = value
+    cache.move_to_end(user_id)
+    while len(cache) > settings.persona_lookup_cache_users:
+        cache.popitem(last=False)
+
+
+class PersonaLookupService:
+    """페르소나 자동 완성 서비스"""
+
+    @staticmethod
+    async def _get_index(db: AsyncSession, user: User) -> PersonaLookupIndex:
+        """캐시된 인덱스가 현재 data_version과 같으면 재사용, 아니면 DB에서 다시 만듦"""
+        index = _indexes.get(user.id)
+        if index is not None and index.data_version == user.data_version:
+            _indexes.move_to_end(user.id)
+            return index
+
+        result = await db.execute(
+            select(
+                Persona.id, Persona.name, Persona.phone_number, Persona.normalized_phone,
+                Persona.category_id, Persona.importance_weight
+            ).where(Persona.user_id == user.id)
+        )
+        index = PersonaLookupIndex(user.data_version, result.all())
+        _remember(_indexes, user.id, index)
+        return index
+
+    @staticmethod
+    async def refresh_index(db: AsyncSession, user_id: str) -> None:
+        """
+        사용자의 자동 완성 인덱스를 다시 만들어 캐시에 저장
+
+        data_version을 먼저 읽으므로, 사이에 다른 쓰기가 커밋되어도 인덱스가 실제보다 새 버전으로 표시되지는 않습니다.
+        """
+        data_version = (await db.execute(select(User.data_version).where(User.id == user_id))).scalar_one_or_none()
+        if data_version is None:
+            _indexes.pop(user_id, None)
+            return
+        result = await db.execute(
+            select(
+                Persona.id, Persona.name, Persona.phone_number, Persona.normalized_phone,
+                Persona.category_id, Persona.importance_weight
+            ).where(Persona.user_id == user_id)
+        )
+        _indexes[user_id] = PersonaLookupIndex(data_version, result.all())
+
+    @staticmethod
+    async def lookup(
+        db: AsyncSession,
+        user: User,
+        prefix: str,
+        limit: int = 10
+    ) -> List[PersonaLookupResult]:
+        """
+        이름/전화번호 자동 완성
+
+        Args:
+            db: 데이터베이스 세션 (캐시가 없거나 오래된 경우에만 사용)
+            user: 현재 사용자 (id, data_version 사용)
+            prefix: 입력 중인 검색어 (이름, 초성, 전화번호 일부)
+            limit: 최대 결과 수
+
+        Returns:
+            일치한 페르소나 목록 (match: prefix / initials / phone / fuzzy)
+        """
+        index = await PersonaLookupService._get_index(db, user)
+        return index.search(prefix, limit)
+
+    @staticmethod
+    async def _fetch_resolved(
+        db: AsyncSession,
+        user_id: str,
+        normalized_phones: List[str]
+    ) -> Dict[str, PersonaResolveResult]:
+        """
+        정규화 번호로 페르소나와 최신 노트를 조회 (번호 개수와 무관하게 쿼리 2회)
+
+        Returns:
+            정규화 번호 → 확인 결과 (일치하는 페르소나가 있는 번호만)
+        """
+        personas = (await db.execute(
+            select(Persona.id, Persona.name, Persona.normalized_phone, Persona.relationship_temp)
+            .where(Persona.user_id == user_id, Persona.normalized_phone.in_(normalized_phones))
+        )).all()
+        if not personas:
+            return {}
+
+        # 페르소나별 가장 최근 노트 1개 (ROW_NUMBER 윈도 함수)
+        ranked = (
+            select(
+                PersonaNote.id,
+                func.row_number().over(
+                    partition_by=PersonaNote.persona_id,
+                    order_by=(PersonaNote.created_at.desc(), PersonaNote.id.desc())
+                ).label("position")
+            )
+            .where(PersonaNote.persona_id.in_([persona.id for persona in personas]), PersonaNote.deleted_at.is_(None))
+            .subquery()
+        )
+        notes = (await db.execute(
+            select(PersonaNote).join(ranked, ranked.c.id == PersonaNote.id).where(ranked.c.position == 1)
+        )).scalars().all()
+        latest_notes = {note.persona_id: PersonaNoteResponse.model_validate(note) for note in notes}
+
+        return {
+            persona.normalized_phone: PersonaResolveResult(
+                phone_number=persona.normalized_phone,
+                normalized_phone=persona.normalized_phone,
+                persona_id=persona.id,
+                name=persona.name,
+                relationship_temp=persona.relationship_temp,
+                latest_note=latest_notes.get(persona.id),
+            )
+            for persona in personas
+        }
+
+    @staticmethod
+    async def resolve(
+        db: AsyncSession,
+        user: User,
+        phone_numbers: List[str]
+    ) -> List[PersonaResolveResult]:
+        """
+        수신 전화번호로 페르소나 확인 (발신자 표시용)
+
+        캐시에 있는 번호(일치 없음 포함)는 DB를 조회하지 않고, 나머지만 한 번에 조회합니다.
+
+        Args:
+            db: 데이터베이스 세션 (캐시에 없는 번호가 있을 때만 사용)
+            user: 현재 사용자 (id, data_version 사용)
+            phone_numbers: 수신 전화번호 목록 (형식 무관)
+
+        Returns:
+            요청 순서대로의 확인 결과 (일치하는 페르소나가 없으면 persona_id가 null)
+        """
+        cached = _resolved.get(user.id)
+        if cached is None or cached[0] != user.data_version:
+            cached = (user.data_version, {})
+        _remember(_resolved, user.id, cached)
+        known = cached[1]
+
+        normalized = [normalize_phone(raw) for raw in phone_numbers]
+        missing = list({phone for phone in normalized if phone and phone not in known})
+        if missing:
+            found = await PersonaLookupService._fetch_resolved(db, user.id, missing)
+            if len(known) + len(missing) > settings.persona_resolve_cache_numbers:
+                known.clear()
+            for phone in missing:
+                known[phone] = found.get(phone)
+
+        results = []
+        for raw, phone in zip(phone_numbers, normalized):
+            hit = known.get(phone) if phone else None
+            if hit is None:
+                results.append(PersonaResolveResult(phone_number=raw, normalized_phone=phone))
+            else:
+                results.append(hit.model_copy(update={"phone_number": raw}))
+        return results
+
+
+@consumer("persona_lookup_cache", local=True)
+async def _refresh_cached_indexes(db: AsyncSession, events: List[OutboxRecord]) -> None:
+    """이 워커에 캐시된 사용자의 쓰기 이벤트마다 트라이를 미리 다시 만듦 (배치 안에서 사용자당 1회)"""
+    for user_id in {event.user_id for event in events if event.user_id in _indexes}:
+        await PersonaLookupService.refresh_index(db, user_id)
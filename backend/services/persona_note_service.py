@@ -2,13 +2,15 @@
 페르소나 노트 관련 비즈니스 로직 서비스
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from fastapi import HTTPException
 from typing import List, Optional
 import uuid
 
-from models import PersonaNote, Persona
+from models import PersonaNote, Persona, utcnow
 from schemas import PersonaNoteCreate, PersonaNoteUpdate, PersonaNoteResponse
+from utils.data_version import bump_data_version_by_persona
+from utils.outbox import record_event
 
 
 class PersonaNoteService:
@@ -33,10 +35,10 @@ class PersonaNoteService:
             HTTPException: 페르소나를 찾을 수 없을 때
         """
         # 페르소나 존재 확인
-        persona = await db.execute(
+        persona = (await db.execute(
             select(Persona).where(Persona.id == note_data.persona_id)
-        )
-        if not persona.scalar_one_or_none():
+        )).scalar_one_or_none()
+        if not persona:
             raise HTTPException(
                 status_code=404,
                 detail=f"페르소나를 찾을 수 없습니다. (ID: {note_data.persona_id})"
@@ -51,10 +53,14 @@ class PersonaNoteService:
         )
         
         db.add(new_note)
-        await db.commit()
-        await db.refresh(new_note)
+        await bump_data_version_by_persona(db, note_data.persona_id)
+        await db.flush()
         
-        return PersonaNoteResponse.model_validate(new_note)
+        response = PersonaNoteResponse.model_validate(new_note)
+        await record_event(
+            db, "persona_note.created", new_note.id, user_id=persona.user_id, payload=response.model_dump(mode="json")
+        )
+        return response
 
     @staticmethod
     async def get_persona_note_by_id(
@@ -87,6 +93,15 @@ class PersonaNoteService:
         
         return PersonaNoteResponse.model_validate(note)
 
+    @staticmethod
+    def query_by_persona(persona_id: str) -> Select:
+        """특정 페르소나의 노트 조회 쿼리 (최신순, 목록 조회와 NDJSON 스트리밍 공용)"""
+        return (
+            select(PersonaNote)
+            .where(PersonaNote.persona_id == persona_id)
+            .order_by(PersonaNote.created_at.desc())
+        )
+
     @staticmethod
     async def get_persona_notes_by_persona(
         db: AsyncSession,
@@ -102,13 +117,7 @@ class PersonaNoteService:
         Returns:
             노트 목록 (최신순 정렬)
         """
-        query = (
-            select(PersonaNote)
-            .where(PersonaNote.persona_id == persona_id)
-            .order_by(PersonaNote.created_at.desc())
-        )
-        
-        result = await db.execute(query)
+        result = await db.execute(PersonaNoteService.query_by_persona(persona_id))
         notes = result.scalars().all()
         
         return [PersonaNoteResponse.model_validate(note) for note in notes]
@@ -149,10 +158,14 @@ class PersonaNoteService:
         for field, value in update_data.items():
             setattr(note, field, value)
         
-        await db.commit()
-        await db.refresh(note)
+        await bump_data_version_by_persona(db, note.persona_id)
+        await db.flush()
         
-        return PersonaNoteResponse.model_validate(note)
+        response = PersonaNoteResponse.model_validate(note)
+        await record_event(
+            db, "persona_note.updated", note.id, persona_id=note.persona_id, payload=response.model_dump(mode="json")
+        )
+        return response
 
     @staticmethod
     async def delete_persona_note(
@@ -162,6 +175,8 @@ class PersonaNoteService:
         """
         페르소나 노트 삭제
         
+        델타 동기화를 위해 행을 지우지 않고 deleted_at만 기록합니다 (소프트 삭제).
+        
         Args:
             db: 데이터베이스 세션
             note_id: 삭제할 노트 ID
@@ -183,8 +198,10 @@ class PersonaNoteService:
                 detail=f"페르소나 노트를 찾을 수 없습니다. (ID: {note_id})"
             )
         
-        await db.delete(note)
-        await db.commit()
+        note.deleted_at = utcnow()
+        await record_event(db, "persona_note.deleted", note.id, persona_id=note.persona_id, payload={"persona_id": note.persona_id})
+        await bump_data_version_by_persona(db, note.persona_id)
+        await db.flush()
         
         return True
 
@@ -2,20 +2,47 @@
 페르소나 관련 비즈니스 로직 서비스
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException
 from typing import List, Optional
 import uuid
 from datetime import datetime
 
-from models import Persona
+from database import dialect_insert
+from models import Persona, Category
+from services.sync_service import SyncService
 from schemas import PersonaCreate, PersonaUpdate, PersonaResponse
+from utils.data_version import bump_data_version
+from utils.outbox import record_event
+from utils.phone import normalize_phone
 
 
 class PersonaService:
     """페르소나 CRUD 서비스"""
 
+    @staticmethod
+    async def _ensure_category(
+        db: AsyncSession,
+        category_id: str,
+        user_id: str
+    ) -> None:
+        """
+        카테고리가 존재하고 해당 사용자의 것인지 확인
+        (외래 키 제약이 켜져 있으므로 잘못된 category_id는 500 대신 404로 안내)
+        
+        Raises:
+            HTTPException: 카테고리를 찾을 수 없을 때
+        """
+        result = await db.execute(
+            select(Category.id).where(Category.id == category_id, Category.user_id == user_id)
+        )
+        if result.scalar_one_or_none() is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"카테고리를 찾을 수 없습니다. (ID: {category_id})"
+            )
+
     @staticmethod
     async def create_persona(
         db: AsyncSession,
@@ -32,25 +59,49 @@ class PersonaService:
             
         Returns:
             생성된 페르소나 정보
+            
+        Raises:
+            HTTPException: 카테고리를 찾을 수 없거나 전화번호가 중복될 때
         """
-        # 새 페르소나 인스턴스 생성
-        new_persona = Persona(
-            id=str(uuid.uuid4()),
-            user_id=user_id,
-            name=persona_data.name,
-            phone_number=persona_data.phone_number,
-            category_id=persona_data.category_id,
-            birth_date=persona_data.birth_date,
-            anniversary_date=persona_data.anniversary_date,
-            importance_weight=persona_data.importance_weight,
-            relationship_temp=persona_data.relationship_temp
+        await PersonaService._ensure_category(db, persona_data.category_id, user_id)
+        
+        # 새 페르소나 생성 (INSERT ... ON CONFLICT DO NOTHING RETURNING)
+        # (user_id, normalized_phone) 고유 인덱스로 전화번호 중복 체크와 생성을 한 문장에 처리
+        stmt = (
+            dialect_insert(Persona)
+            .values(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                name=persona_data.name,
+                phone_number=persona_data.phone_number,
+                normalized_phone=normalize_phone(persona_data.phone_number),
+                category_id=persona_data.category_id,
+                birth_date=persona_data.birth_date,
+                anniversary_date=persona_data.anniversary_date,
+                importance_weight=persona_data.importance_weight,
+                relationship_temp=persona_data.relationship_temp
+            )
+            .on_conflict_do_nothing(
+                index_elements=[Persona.user_id, Persona.normalized_phone],
+                index_where=Persona.deleted_at.is_(None)
+            )
+            .returning(Persona)
         )
+        new_persona = (await db.execute(stmt)).scalar_one_or_none()
+        
+        # 같은 사용자의 같은 전화번호 페르소나가 이미 있음 (RETURNING 결과 없음)
+        if new_persona is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"이미 같은 전화번호로 등록된 페르소나가 있습니다: {persona_data.phone_number}"
+            )
         
-        db.add(new_persona)
-        await db.commit()
-        await db.refresh(new_persona)
+        response = PersonaResponse.model_validate(new_persona)
+        await record_event(db, "persona.created", response.id, user_id=user_id, payload=response.model_dump(mode="json"))
+        await bump_data_version(db, user_id)
+        await db.flush()
         
-        return PersonaResponse.model_validate(new_persona)
+        return response
 
     @staticmethod
     async def get_persona_by_id(
@@ -89,6 +140,11 @@ class PersonaService:
         
         return PersonaResponse.model_validate(persona)
 
+    @staticmethod
+    def query_by_user(user_id: str) -> Select:
+        """사용자의 페르소나 조회 쿼리 (생성일 내림차순, 목록 조회와 NDJSON 스트리밍 공용)"""
+        return select(Persona).where(Persona.user_id == user_id).order_by(Persona.created_at.desc())
+
     @staticmethod
     async def get_personas_by_user(
         db: AsyncSession,
@@ -104,8 +160,7 @@ class PersonaService:
         Returns:
             페르소나 목록
         """
-        query = select(Persona).where(Persona.user_id == user_id).order_by(Persona.created_at.desc())
-        result = await db.execute(query)
+        result = await db.execute(PersonaService.query_by_user(user_id))
         personas = result.scalars().all()
         
         return [PersonaResponse.model_validate(p) for p in personas]
@@ -130,7 +185,7 @@ class PersonaService:
             업데이트된 페르소나 정보
             
         Raises:
-            HTTPException: 페르소나를 찾을 수 없거나 권한이 없을 때
+            HTTPException: 페르소나를 찾을 수 없거나 권한이 없거나 전화번호가 중복될 때
         """
         query = select(Persona).where(Persona.id == persona_id)
         
@@ -148,13 +203,34 @@ class PersonaService:
         
         # 제공된 필드만 업데이트
         update_data = persona_data.model_dump(exclude_unset=True)
+        if update_data.get("category_id"):
+            await PersonaService._ensure_category(db, update_data["category_id"], persona.user_id)
+        if update_data.get("phone_number"):
+            normalized_phone = normalize_phone(update_data["phone_number"])
+            # 같은 사용자의 다른 페르소나가 이미 같은 번호를 사용 중인지 확인
+            if normalized_phone and normalized_phone != persona.normalized_phone:
+                existing = await db.execute(
+                    select(Persona.id).where(
+                        Persona.user_id == persona.user_id,
+                        Persona.normalized_phone == normalized_phone,
+                        Persona.id != persona.id
+                    )
+                )
+                if existing.first() is not None:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"이미 같은 전화번호로 등록된 페르소나가 있습니다: {update_data['phone_number']}"
+                    )
+            update_data["normalized_phone"] = normalized_phone
         for field, value in update_data.items():
             setattr(persona, field, value)
         
-        await db.commit()
-        await db.refresh(persona)
+        await bump_data_version(db, persona.user_id)
+        await db.flush()
         
-        return PersonaResponse.model_validate(persona)
+        response = PersonaResponse.model_validate(persona)
+        await record_event(db, "persona.updated", persona.id, user_id=persona.user_id, payload=response.model_dump(mode="json"))
+        return response
 
     @staticmethod
     async def delete_persona(
@@ -165,6 +241,9 @@ class PersonaService:
         """
         페르소나 삭제
         
+        델타 동기화를 위해 행을 지우지 않고 deleted_at만 기록합니다 (소프트 삭제).
+        연결된 상호작용 로그와 노트도 함께 삭제 표시됩니다.
+        
         Args:
             db: 데이터베이스 세션
             persona_id: 삭제할 페르소나 ID
@@ -190,8 +269,10 @@ class PersonaService:
                 detail=f"페르소나를 찾을 수 없습니다. (ID: {persona_id})"
             )
         
-        await db.delete(persona)
-        await db.commit()
+        await SyncService.tombstone_personas(db, Persona.id == persona_id)
+        await record_event(db, "persona.deleted", persona.id, user_id=persona.user_id)
+        await bump_data_version(db, persona.user_id)
+        await db.flush()
         
         return True
 
@@ -0,0 +1,342 @@
+"""
+전문 검색 관련 비즈니스 로직 서비스
+페르소나 노트(content)와 상호작용 로그 요약(summary_text)을 검색합니다.
+
+SQLite
+- search_docs: 검색 대상 문서 (INTEGER PRIMARY KEY라 VACUUM 후에도 FTS rowid가 유지됨)
+- search_fts: search_docs를 content로 쓰는 FTS5 테이블 (trigram 토크나이저 = 한국어에 맞는 3-gram)
+- search_bigram_fts: 2글자 검색어(예: "엄마")용 FTS5 테이블 (trigram은 3글자 미만을 찾을 수 없음)
+  본문을 한 글자씩 밀며 자른 2-gram을 공백으로 이어 넣으므로, 2글자 검색어가 토큰 하나로 일치하고 bm25로 정렬됩니다.
+  본문은 search_docs에 있으므로 내용을 저장하지 않는 contentless 테이블입니다.
+- 원본 테이블의 트리거가 search_docs를, search_docs의 트리거가 두 FTS 테이블을 갱신하므로
+  서비스 코드, 일괄 UPDATE(tombstone), CASCADE 삭제, 데이터 생성기 모두 자동으로 반영됩니다.
+- 3글자 이상 검색어와 함께 쓴 짧은 검색어, 1글자 검색어, 문장 부호가 섞인 2글자 검색어는 LIKE 조건으로 찾습니다.
+
+PostgreSQL
+- pg_trgm GIN 인덱스(models.py)에 ILIKE로 검색하고 similarity()로 정렬합니다.
+"""
+import html
+import re
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from schemas import SearchResult
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# 이스케이프 전 원문에 표시하는 하이라이트 경계 (유니코드 비문자라 본문에 나오지 않음, HTML 변환 시 <mark>로 바꿈)
+MARK_START = "\ufdd0"
+MARK_END = "\ufdd1"
+SNIPPET_TOKENS = 16  # 하이라이트 주변으로 잘라낼 길이 (FTS5 snippet 토큰 수)
+
+# (엔티티 이름, 원본 테이블, 본문 컬럼)
+SEARCH_SOURCES = [
+    ("persona_note", "persona_notes", "content"),
+    ("interaction_log", "interaction_logs", "summary_text"),
+]
+
+# 3-gram 토크나이저는 3글자 이상 검색어만 인덱스로 찾을 수 있음
+TRIGRAM_MIN_LENGTH = 3
+# search_bigram_fts로 찾는 검색어 길이
+BIGRAM_LENGTH = 2
+
+
+def _bigrams_sql(body: str) -> str:
+    """본문의 2-gram을 공백으로 이은 문자열을 만드는 SQL 식 (트리거에서 쓰므로 SQL만 사용, 1글자 본문은 그대로)"""
+    return f"""(
+        WITH RECURSIVE positions(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM positions WHERE i < length({body}) - 1)
+        SELECT group_concat(substr({body}, i, 2), ' ') FROM positions
+    )"""
+
+
+def _sqlite_search_ddl() -> List[str]:
+    """SQLite 검색 인덱스 테이블과 동기화 트리거 DDL (여러 번 실행해도 안전)"""
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS search_docs (
+            doc_id INTEGER PRIMARY KEY,
+            entity TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            persona_id TEXT NOT NULL,
+            body TEXT NOT NULL,
+            updated_at DATETIME NOT NULL,
+            UNIQUE (entity, entity_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_search_docs_persona ON search_docs (persona_id)",
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+            body, content='search_docs', content_rowid='doc_id', tokenize='trigram'
+        )
+        """,
+        # search_docs -> search_fts (외부 콘텐츠 FTS5 표준 트리거)
+        """
+        CREATE TRIGGER IF NOT EXISTS search_docs_ai AFTER INSERT ON search_docs BEGIN
+            INSERT INTO search_fts(rowid, body) VALUES (new.doc_id, new.body);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS search_docs_ad AFTER DELETE ON search_docs BEGIN
+            INSERT INTO search_fts(search_fts, rowid, body) VALUES ('delete', old.doc_id, old.body);
+        END
+        """,
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_bigram_fts USING fts5(grams, content='')",
+        # search_docs -> search_bigram_fts (contentless 테이블은 삭제할 때 넣었던 값을 다시 만들어 전달)
+        f"""
+        CREATE TRIGGER IF NOT EXISTS search_docs_bigram_ai AFTER INSERT ON search_docs BEGIN
+            INSERT INTO search_bigram_fts(rowid, grams) SELECT new.doc_id, {_bigrams_sql("new.body")};
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS search_docs_bigram_ad AFTER DELETE ON search_docs BEGIN
+            INSERT INTO search_bigram_fts(search_bigram_fts, rowid, grams)
+            SELECT 'delete', old.doc_id, {_bigrams_sql("old.body")};
+        END
+        """,
+    ]
+    # 원본 테이블 -> search_docs (삭제되지 않았고 본문이 있는 행만)
+    for entity, table, column in SEARCH_SOURCES:
+        insert_doc = f"""
+            INSERT INTO search_docs (entity, entity_id, persona_id, body, updated_at)
+            SELECT '{entity}', new.id, new.persona_id, new.{column}, new.updated_at
+            WHERE new.deleted_at IS NULL AND new.{column} IS NOT NULL AND new.{column} != '';
+        """
+        delete_doc = f"DELETE FROM search_docs WHERE entity = '{entity}' AND entity_id = old.id;"
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ai AFTER INSERT ON {table} BEGIN {insert_doc} END",
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_search_au AFTER UPDATE OF {column}, deleted_at, persona_id ON {table}
+            BEGIN {delete_doc} {insert_doc} END
+            """,
+            f"CREATE TRIGGER IF NOT EXISTS {table}_search_ad AFTER DELETE ON {table} BEGIN {delete_doc} END",
+        ]
+    return statements
+
+
+def _backfill_sql() -> List[str]:
+    """기존 행으로 search_docs 채우기 (인덱스를 처음 만들 때만, 두 FTS 테이블은 트리거가 채움)"""
+    return [
+        f"""
+        INSERT INTO search_docs (entity, entity_id, persona_id, body, updated_at)
+        SELECT '{entity}', id, persona_id, {column}, updated_at FROM {table}
+        WHERE deleted_at IS NULL AND {column} IS NOT NULL AND {column} != ''
+        """
+        for entity, table, column in SEARCH_SOURCES
+    ]
+
+
+def ensure_search_index(connection) -> None:
+    """
+    검색 인덱스 생성 (create_all로 만든 DB용, tools/generate_data.py에서 호출)
+
+    SQLite는 FTS5 테이블/트리거를 만들고, 처음 만든 경우 기존 데이터를 채웁니다.
+    PostgreSQL은 할 일 없음 (pg_trgm 확장과 GIN 인덱스는 마이그레이션에서 생성, create_all에는 models.py의 선언으로 포함)
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    existing = set(connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('search_docs', 'search_bigram_fts')"
+    ).scalars().all())
+    for statement in _sqlite_search_ddl():
+        connection.exec_driver_sql(statement)
+    if "search_docs" not in existing:
+        for statement in _backfill_sql():
+            connection.exec_driver_sql(statement)
+    elif "search_bigram_fts" not in existing:
+        connection.exec_driver_sql(
+            f"INSERT INTO search_bigram_fts(rowid, grams) SELECT doc_id, {_bigrams_sql('body')} FROM search_docs"
+        )
+
+
+def split_terms(query: str) -> List[str]:
+    """공백 기준 검색어 분리 (중복 제거, 순서 유지)"""
+    return list(dict.fromkeys(term for term in query.split() if term))
+
+
+def _fts_phrase(term: str) -> str:
+    """FTS5 MATCH용 문자열 (큰따옴표로 감싸 연산자/특수문자를 그대로 검색)"""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _like_pattern(term: str) -> str:
+    """LIKE 패턴 (%, _ 이스케이프)"""
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _wrap_terms(pattern: "re.Pattern[str]", text: str) -> str:
+    """원문에서 검색어를 MARK_START/MARK_END로 감쌈"""
+    return pattern.sub(lambda m: f"{MARK_START}{m.group(0)}{MARK_END}", text)
+
+
+def _to_html(excerpt: str) -> str:
+    """
+    하이라이트 경계가 표시된 원문을 HTML로 변환
+
+    본문은 사용자 입력이므로 전체를 먼저 HTML 이스케이프하고, 그다음 경계만 <mark> 태그로 바꿉니다.
+    """
+    return html.escape(excerpt).replace(MARK_START, HIGHLIGHT_START).replace(MARK_END, HIGHLIGHT_END)
+
+
+def highlight(body: str, terms: List[str], context: int = 40) -> str:
+    """
+    본문에서 검색어를 <mark>로 감싸고, 첫 일치 위치 주변만 잘라서 HTML로 반환 (LIKE/PostgreSQL 경로용)
+    """
+    if not terms:
+        return html.escape(body)
+    pattern = re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(body)
+    start = max(0, first.start() - context) if first else 0
+    end = min(len(body), (first.end() if first else 0) + context * 2)
+    excerpt = _to_html(_wrap_terms(pattern, body[start:end]))
+    return ("…" if start > 0 else "") + excerpt + ("…" if end < len(body) else "")
+
+
+def _mark_terms(excerpt: str, terms: List[str]) -> str:
+    """이미 잘라낸 snippet에 짧은 검색어 경계 추가 (기존 경계 안은 건드리지 않음, 이스케이프 전 원문 기준)"""
+    parts: List[Tuple[bool, str]] = []
+    for index, part in enumerate(re.split(f"({MARK_START}.*?{MARK_END})", excerpt)):
+        parts.append((index % 2 == 1, part))
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    return "".join(part if marked else _wrap_terms(pattern, part) for marked, part in parts)
+
+
+class SearchService:
+    """노트/상호작용 로그 전문 검색 서비스"""
+
+    @staticmethod
+    async def search(
+        db: AsyncSession,
+        user_id: str,
+        query: str,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[SearchResult]:
+        """
+        현재 사용자의 페르소나에 속한 노트/로그 요약 검색
+
+        공백으로 나눈 검색어는 모두 포함되어야 합니다. (AND)
+
+        Args:
+            db: 데이터베이스 세션
+            user_id: 사용자 ID (검색 범위)
+            query: 검색어
+            limit: 최대 결과 수
+            offset: 시작 위치
+
+        Returns:
+            관련도순 검색 결과 (HTML 이스케이프한 본문 일부에 <mark> 하이라이트)
+        """
+        terms = split_terms(query)
+        if not terms:
+            return []
+        if db.bind.dialect.name == "postgresql":
+            return await SearchService._search_postgresql(db, user_id, terms, limit, offset)
+        return await SearchService._search_sqlite(db, user_id, terms, limit, offset)
+
+    @staticmethod
+    async def _search_sqlite(
+        db: AsyncSession,
+        user_id: str,
+        terms: List[str],
+        limit: int,
+        offset: int
+    ) -> List[SearchResult]:
+        """
+        FTS5 검색 (3글자 이상은 trigram, 2글자는 bigram 테이블, 나머지 짧은 검색어는 LIKE 조건으로 추가)
+
+        3글자 이상 검색어가 있으면 search_fts의 bm25로, 2글자 이하 검색어만 있으면 search_bigram_fts의 bm25로 정렬합니다.
+        """
+        long_terms = [term for term in terms if len(term) >= TRIGRAM_MIN_LENGTH]
+        # 3글자 이상 검색어가 있으면 그 결과를 LIKE로 거르는 편이 싸므로 bigram 테이블은 짧은 검색어만 있을 때 사용
+        # (문장 부호가 섞이면 토크나이저가 나눠 버리므로 글자/숫자로만 된 2글자 검색어만)
+        bigram_terms = [] if long_terms else [
+            term for term in terms if len(term) == BIGRAM_LENGTH and term.isalnum()
+        ]
+        like_terms = [term for term in terms if term not in long_terms and term not in bigram_terms]
+        short_terms = bigram_terms + like_terms  # trigram snippet()이 하이라이트하지 않는 검색어
+        params = {"user_id": user_id, "limit": limit, "offset": offset}
+        conditions = ["d.persona_id IN (SELECT id FROM personas WHERE user_id = :user_id AND deleted_at IS NULL)"]
+        for i, term in enumerate(like_terms):
+            params[f"like_{i}"] = _like_pattern(term)
+            conditions.append(f"d.body LIKE :like_{i} ESCAPE '\\'")
+
+        if long_terms or bigram_terms:
+            fts = "search_fts" if long_terms else "search_bigram_fts"
+            params["match"] = " AND ".join(_fts_phrase(term) for term in long_terms or bigram_terms)
+            conditions.append(f"{fts} MATCH :match")
+            source = f"{fts} JOIN search_docs d ON d.doc_id = {fts}.rowid"
+            score, order = f"bm25({fts})", "score"
+        else:
+            # FTS를 쓸 수 없으므로 사용자 페르소나 범위(ix_search_docs_persona) 안에서 LIKE
+            source, score, order = "search_docs d", "0.0", "d.updated_at DESC"
+        if long_terms:
+            params["mark_start"], params["mark_end"] = MARK_START, MARK_END
+            excerpt = f"snippet(search_fts, 0, :mark_start, :mark_end, '…', {SNIPPET_TOKENS})"
+        else:
+            excerpt = "d.body"  # contentless bigram 테이블은 snippet()을 쓸 수 없으므로 Python에서 하이라이트
+        sql = f"""
+            SELECT d.entity, d.entity_id, d.persona_id, d.updated_at, {excerpt} AS excerpt, {score} AS score
+            FROM {source}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {order}
+            LIMIT :limit OFFSET :offset
+        """
+
+        rows = (await db.execute(text(sql), params)).all()
+        results = []
+        for entity, entity_id, persona_id, updated_at, excerpt, score in rows:
+            if not long_terms:
+                excerpt = highlight(excerpt, short_terms)
+            else:
+                # snippet() 하이라이트에는 짧은 검색어가 없으므로 Python에서 추가한 뒤 HTML로 변환
+                excerpt = _to_html(_mark_terms(excerpt, short_terms) if short_terms else excerpt)
+            results.append(SearchResult(
+                entity=entity,
+                id=entity_id,
+                persona_id=persona_id,
+                highlight=excerpt,
+                score=round(-score, 4) if score else 0.0,  # bm25는 작을수록 관련도가 높으므로 부호를 바꿔 반환
+                updated_at=updated_at,
+            ))
+        return results
+
+    @staticmethod
+    async def _search_postgresql(
+        db: AsyncSession,
+        user_id: str,
+        terms: List[str],
+        limit: int,
+        offset: int
+    ) -> List[SearchResult]:
+        """pg_trgm GIN 인덱스 기반 ILIKE 검색, 유사도(similarity)순 정렬"""
+        params = {"user_id": user_id, "limit": limit, "offset": offset, "query": " ".join(terms)}
+        conditions = []
+        for i, term in enumerate(terms):
+            params[f"like_{i}"] = _like_pattern(term)
+            conditions.append(f"{{column}} ILIKE :like_{i}")
+        scope = "persona_id IN (SELECT id FROM personas WHERE user_id = :user_id AND deleted_at IS NULL)"
+        selects = []
+        for entity, table, column in SEARCH_SOURCES:
+            where = " AND ".join(condition.format(column=column) for condition in conditions)
+            selects.append(f"""
+                SELECT '{entity}' AS entity, id, persona_id, updated_at, {column} AS body,
+                       similarity({column}, :query) AS score
+                FROM {table}
+                WHERE deleted_at IS NULL AND {scope} AND {where}
+            """)
+        sql = " UNION ALL ".join(selects) + " ORDER BY score DESC, updated_at DESC LIMIT :limit OFFSET :offset"
+        rows = (await db.execute(text(sql), params)).all()
+        return [
+            SearchResult(
+                entity=entity,
+                id=entity_id,
+                persona_id=persona_id,
+                highlight=highlight(body, terms),
+                score=round(float(score), 4),
+                updated_at=updated_at,
+            )
+            for entity, entity_id, persona_id, updated_at, body, score in rows
+        ]
+
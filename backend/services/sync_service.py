@@ -0,0 +1,235 @@
+"""
+델타 동기화 관련 비즈니스 로직 서비스
+모바일 클라이언트가 마지막 동기화 이후 변경분만 받아갈 수 있도록
+updated_at 커서 기반으로 모든 엔티티의 변경/삭제 기록을 한 번에 조회합니다.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, tuple_
+from fastapi import HTTPException
+from typing import Optional, Tuple
+from datetime import datetime, timedelta
+import base64
+import json
+
+from config import settings
+from models import Category, Persona, InteractionLog, PersonaNote, utcnow
+from schemas import (
+    CategoryResponse,
+    PersonaResponse,
+    InteractionLogResponse,
+    PersonaNoteResponse,
+    SyncTombstone,
+    SyncResponse,
+)
+
+# (순서, 엔티티 이름, 모델, 응답 스키마) - 순서는 같은 updated_at 내 정렬 기준
+SYNC_ENTITIES = [
+    (0, "categories", Category, CategoryResponse),
+    (1, "personas", Persona, PersonaResponse),
+    (2, "interaction_logs", InteractionLog, InteractionLogResponse),
+    (3, "persona_notes", PersonaNote, PersonaNoteResponse),
+]
+
+# 커서: (updated_at, 엔티티 순서, id)
+SyncCursor = Tuple[datetime, int, str]
+
+
+def encode_sync_token(cursor: Optional[SyncCursor], synced_at: datetime, paging: bool = False) -> str:
+    """
+    커서와 동기화 시각을 불투명한(opaque) 동기화 토큰 문자열로 인코딩
+
+    Args:
+        cursor: 다음 요청에서 이 위치 다음부터 읽음 (None이면 처음부터)
+        synced_at: 서버가 변경 사항을 읽기 시작한 시각 (토큰 만료 기준)
+        paging: 다음 페이지가 남아 있음 (has_more)
+    """
+    updated_at, rank, entity_id = cursor or (None, None, None)
+    raw = json.dumps(
+        [updated_at.isoformat() if updated_at else None, rank, entity_id, synced_at.isoformat(), paging],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[Optional[SyncCursor], datetime, bool]:
+    """
+    동기화 토큰을 (커서, 동기화 시각, 페이지 이어받기 여부)로 디코딩
+
+    동기화 시각이 없는 이전 형식 토큰은 커서 시각을 동기화 시각으로 봅니다.
+
+    Raises:
+        HTTPException: 토큰 형식이 잘못되었을 때
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        updated_at, rank, entity_id = values[:3]
+        synced_at = datetime.fromisoformat(values[3] if len(values) > 3 else updated_at)
+        cursor = (datetime.fromisoformat(updated_at), int(rank), str(entity_id)) if updated_at else None
+        return cursor, synced_at, bool(values[4]) if len(values) > 4 else False
+    except Exception:
+        raise HTTPException(
+            status_code=400,
+            detail="유효하지 않은 동기화 토큰입니다. since 없이 전체 동기화를 다시 요청해주세요."
+        )
+
+
+class SyncService:
+    """델타 동기화 및 소프트 삭제(tombstone) 서비스"""
+
+    @staticmethod
+    async def tombstone_personas(
+        db: AsyncSession,
+        persona_filter,
+        deleted_at: Optional[datetime] = None
+    ) -> None:
+        """
+        조건에 맞는 페르소나와 하위 로그/노트를 일괄 소프트 삭제
+
+        ORM으로 자식 행을 불러오지 않고 UPDATE 문만 실행합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            persona_filter: 대상 페르소나 조건 (예: Persona.category_id == category_id)
+            deleted_at: 삭제 시각 (기본값: 현재 시각)
+        """
+        now = deleted_at or utcnow()
+        persona_ids = select(Persona.id).where(persona_filter).scalar_subquery()
+
+        # 하위 로그/노트 먼저 삭제 표시
+        for child in (InteractionLog, PersonaNote):
+            await db.execute(
+                update(child)
+                .where(child.persona_id.in_(persona_ids), child.deleted_at.is_(None))
+                .values(deleted_at=now, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+        await db.execute(
+            update(Persona)
+            .where(persona_filter, Persona.deleted_at.is_(None))
+            .values(deleted_at=now, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def get_changes(
+        db: AsyncSession,
+        user_id: str,
+        since: Optional[str] = None,
+        limit: int = 500
+    ) -> SyncResponse:
+        """
+        since 토큰 이후의 모든 변경 사항 조회
+
+        각 엔티티에서 (updated_at, id) 인덱스를 따라 최대 limit + 1개씩 가져온 뒤
+        (updated_at, 엔티티 순서, id) 기준으로 병합하여 limit개만 반환합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            user_id: 사용자 ID
+            since: 이전 응답의 next_token (None이면 전체 동기화)
+            limit: 한 페이지 최대 항목 수
+
+        Returns:
+            변경 항목, 삭제 기록, 다음 동기화 토큰
+
+        토큰 만료는 마지막 항목의 updated_at이 아니라 이전 동기화 시각(synced_at) 기준입니다.
+        (변경이 없는 계정도 주기적으로 동기화하면 토큰이 만료되지 않음)
+
+        updated_at은 커밋 전에 앱에서 정하므로, 동시에 실행된 트랜잭션은 updated_at과 반대 순서로 커밋될 수 있습니다.
+        (먼저 읽은 쪽이 더 이른 updated_at의 행을 아직 보지 못함) 그래서 마지막 페이지의 토큰은
+        min(마지막 항목, 동기화 시작 시각 - SYNC_LAG_SECONDS) 위치를 가리키고, 다음 동기화에서 그 구간을 다시 읽습니다.
+        클라이언트는 같은 항목을 다시 받을 수 있으므로 id 기준으로 덮어씁니다.
+        """
+        now = utcnow()  # 이 시각 이후에 읽으므로, 이전에 커밋된 변경은 모두 이번 응답에 포함
+        cursor, last_synced_at, paging = decode_sync_token(since) if since else (None, None, False)
+        if last_synced_at and last_synced_at < now - timedelta(days=settings.tombstone_retention_days):
+            # 그 사이 삭제 기록이 정리되었을 수 있으므로 델타 동기화 불가
+            raise HTTPException(
+                status_code=410,
+                detail="동기화 토큰이 만료되었습니다. since 없이 전체 동기화를 다시 요청해주세요."
+            )
+        # 페이지를 이어받는 중이면 첫 페이지를 읽기 시작한 시각을 유지 (다시 읽을 구간의 기준)
+        synced_at = last_synced_at if paging else now
+        owned_persona_ids = select(Persona.id).where(Persona.user_id == user_id).scalar_subquery()
+
+        rows = []
+        for rank, name, model, schema in SYNC_ENTITIES:
+            if model in (Category, Persona):
+                query = select(model).where(model.user_id == user_id)
+            else:
+                query = select(model).where(model.persona_id.in_(owned_persona_ids))
+
+            if cursor:
+                cursor_at, cursor_rank, cursor_id = cursor
+                if rank > cursor_rank:
+                    query = query.where(model.updated_at >= cursor_at)
+                elif rank < cursor_rank:
+                    query = query.where(model.updated_at > cursor_at)
+                else:
+                    query = query.where(tuple_(model.updated_at, model.id) > tuple_(cursor_at, cursor_id))
+
+            query = (
+                query.order_by(model.updated_at, model.id)
+                .limit(limit + 1)
+                .execution_options(include_deleted=True)
+            )
+            result = await db.execute(query)
+            rows.extend((obj.updated_at, rank, obj.id, name, schema, obj) for obj in result.scalars().all())
+
+        rows.sort(key=lambda row: row[:3])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        response = SyncResponse(has_more=has_more)
+        for updated_at, rank, entity_id, name, schema, obj in rows:
+            if obj.deleted_at is not None:
+                response.deleted.append(
+                    SyncTombstone(entity=name, id=entity_id, deleted_at=obj.deleted_at)
+                )
+            else:
+                getattr(response, name).append(schema.model_validate(obj))
+
+        if rows:
+            cursor = rows[-1][:3]
+        if not has_more:
+            # 늦게 커밋된 행을 놓치지 않도록 마지막 SYNC_LAG_SECONDS 구간은 다음 동기화에서 다시 읽음
+            # (엔티티 순서 -1: 이 시각의 모든 엔티티 포함)
+            floor = (synced_at - timedelta(seconds=settings.sync_lag_seconds), -1, "")
+            if cursor is None or floor < cursor:
+                cursor = floor
+        response.next_token = encode_sync_token(cursor, synced_at, has_more)
+
+        return response
+
+    @staticmethod
+    async def purge_tombstones(
+        db: AsyncSession,
+        older_than: Optional[datetime] = None
+    ) -> int:
+        """
+        보관 기간이 지난 삭제 기록(tombstone)을 실제로 삭제
+
+        DELETE 문만 실행하며, 하위 행(로그/노트/프로필/알림)은 DB의 ON DELETE CASCADE로 함께 삭제됩니다.
+        커밋은 호출자가 합니다.
+
+        Args:
+            db: 데이터베이스 세션
+            older_than: 이 시각 이전에 삭제된 행만 정리 (기본값: 보관 기간 이전)
+
+        Returns:
+            직접 삭제된 행 수 (CASCADE로 삭제된 하위 행 제외)
+        """
+        cutoff = older_than or utcnow() - timedelta(days=settings.tombstone_retention_days)
+        purged = 0
+        # 부모부터 삭제하면 자식은 CASCADE로 함께 정리되어 이후 DELETE가 가벼워짐
+        for model in (Category, Persona, InteractionLog, PersonaNote):
+            result = await db.execute(
+                delete(model)
+                .where(model.deleted_at.is_not(None), model.deleted_at < cutoff)
+                .execution_options(synchronize_session=False)
+            )
+            purged += result.rowcount
+        await db.flush()
+        return purged
@@ -2,18 +2,20 @@
 사용자 관련 비즈니스 로직 서비스
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, delete, func
 from fastapi import HTTPException, status
 from typing import Optional
 import uuid
 
-from models import User
+from database import dialect_insert
+from models import User, utcnow
 from schemas import UserRegister, UserLogin, SocialLogin, UserCreate, UserUpdate, UserResponse, Token, OAuthProvider
 from utils.auth import (
     get_password_hash,
     verify_password,
     create_access_token
 )
+from utils.data_version import bump_data_version
 
 
 class UserService:
@@ -37,30 +39,30 @@ class UserService:
         Raises:
             HTTPException: 이메일이 이미 존재하는 경우
         """
-        # 이메일 중복 체크
-        existing = await db.execute(
-            select(User).where(User.email == user_data.email)
+        # 새 사용자 생성 (INSERT ... ON CONFLICT (email) DO NOTHING RETURNING)
+        # 중복 체크와 생성을 한 문장으로 처리하여 동시 가입 경쟁 조건을 제거
+        stmt = (
+            dialect_insert(User)
+            .values(
+                id=str(uuid.uuid4()),
+                email=user_data.email,
+                password_hash=get_password_hash(user_data.password),
+                oauth_provider=OAuthProvider.EMAIL,  # 로컬 로그인은 EMAIL로 표시
+                oauth_id=None,
+                timezone=user_data.timezone
+            )
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User)
         )
-        if existing.scalar_one_or_none():
+        new_user = (await db.execute(stmt)).scalar_one_or_none()
+        
+        # 이메일 중복 (RETURNING 결과 없음)
+        if new_user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="이미 등록된 이메일입니다."
             )
         
-        # 새 사용자 생성
-        new_user = User(
-            id=str(uuid.uuid4()),
-            email=user_data.email,
-            password_hash=get_password_hash(user_data.password),
-            oauth_provider=OAuthProvider.EMAIL,  # 로컬 로그인은 EMAIL로 표시
-            oauth_id=None,
-            timezone=user_data.timezone
-        )
-        
-        db.add(new_user)
-        await db.commit()
-        await db.refresh(new_user)
-        
         # JWT 토큰 생성
         access_token = create_access_token(data={"sub": new_user.id})
         
@@ -130,6 +132,10 @@ class UserService:
         """
         소셜 로그인 (Kakao, Google, Apple)
         
+        INSERT ... ON CONFLICT (email) DO UPDATE ... RETURNING 한 문장으로
+        신규 사용자는 생성하고 기존 사용자는 정보를 업데이트합니다.
+        같은 계정의 첫 로그인이 동시에 들어와도 이메일 고유 인덱스에서 충돌하지 않습니다.
+        
         Args:
             db: 데이터베이스 세션
             social_data: 소셜 로그인 데이터
@@ -137,37 +143,29 @@ class UserService:
         Returns:
             JWT 토큰 및 사용자 정보
         """
-        # 기존 사용자 조회 (이메일 또는 oauth_id로)
-        result = await db.execute(
-            select(User).where(
-                (User.email == social_data.email) |
-                (User.oauth_id == social_data.oauth_id)
-            )
+        stmt = dialect_insert(User).values(
+            id=str(uuid.uuid4()),
+            email=social_data.email,
+            password_hash=None,  # 소셜 로그인은 비밀번호 없음
+            oauth_provider=social_data.oauth_provider,
+            oauth_id=social_data.oauth_id,
+            profile_image=social_data.profile_image,
+            timezone=social_data.timezone
         )
-        user = result.scalar_one_or_none()
-        
-        if user:
-            # 기존 사용자: 정보 업데이트
-            user.oauth_provider = social_data.oauth_provider
-            user.oauth_id = social_data.oauth_id
-            if social_data.profile_image:
-                user.profile_image = social_data.profile_image
-            user.timezone = social_data.timezone
-        else:
-            # 신규 사용자: 생성
-            user = User(
-                id=str(uuid.uuid4()),
-                email=social_data.email,
-                password_hash=None,  # 소셜 로그인은 비밀번호 없음
-                oauth_provider=social_data.oauth_provider,
-                oauth_id=social_data.oauth_id,
-                profile_image=social_data.profile_image,
-                timezone=social_data.timezone
-            )
-            db.add(user)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.email],
+            set_={
+                # 기존 사용자: 정보 업데이트 (프로필 이미지는 새 값이 있을 때만)
+                "oauth_provider": stmt.excluded.oauth_provider,
+                "oauth_id": stmt.excluded.oauth_id,
+                "profile_image": func.coalesce(stmt.excluded.profile_image, User.profile_image),
+                "timezone": stmt.excluded.timezone,
+                "updated_at": utcnow(),
+            }
+        ).returning(User)
         
-        await db.commit()
-        await db.refresh(user)
+        result = await db.execute(stmt, execution_options={"populate_existing": True})
+        user = result.scalar_one()
         
         # JWT 토큰 생성
         access_token = create_access_token(data={"sub": user.id})
@@ -242,8 +240,8 @@ class UserService:
         for field, value in update_data.items():
             setattr(user, field, value)
         
-        await db.commit()
-        await db.refresh(user)
+        await bump_data_version(db, user_id)
+        await db.flush()
         
         return UserResponse.model_validate(user)
 
@@ -255,6 +253,9 @@ class UserService:
         """
         사용자 삭제
         
+        DELETE 문 하나만 실행하고, 카테고리/페르소나/로그/노트/알림 등 하위 데이터는
+        DB의 ON DELETE CASCADE로 함께 삭제됩니다 (ORM으로 자식 행을 불러오지 않음).
+        
         Args:
             db: 데이터베이스 세션
             user_id: 사용자 ID
@@ -263,18 +264,18 @@ class UserService:
             삭제 성공 여부
         """
         result = await db.execute(
-            select(User).where(User.id == user_id)
+            delete(User)
+            .where(User.id == user_id)
+            .execution_options(synchronize_session=False)
         )
-        user = result.scalar_one_or_none()
         
-        if not user:
+        if result.rowcount == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"사용자를 찾을 수 없습니다. (ID: {user_id})"
             )
         
-        await db.delete(user)
-        await db.commit()
+        await db.flush()
         
         return True
 
@@ -0,0 +1,45 @@
+"""
+상호작용 로그 보존 작업 CLI
+보존 기간(LOG_RETENTION_MONTHS)이 지난 원본 로그를 페르소나별 일별 집계로 압축하고 삭제합니다.
+PostgreSQL에서는 앞으로 쓸 월 파티션을 미리 만들고, 비워진 옛 파티션을 제거합니다.
+
+실행:
+    cd backend
+    python -m tools.compact_logs                # .env의 DATABASE_URL, LOG_RETENTION_MONTHS 사용
+    python -m tools.compact_logs --months 6 --batch-personas 500
+"""
+import argparse
+import asyncio
+import json
+
+from config import settings
+
+
+
+async def run(months: int, batch_personas: int) -> dict:
+    from database import engine, AsyncSessionLocal
+    from services.interaction_log_service import InteractionLogService, ensure_log_partitions
+
+    try:
+        async with engine.begin() as conn:
+            created = await conn.run_sync(ensure_log_partitions)
+        async with AsyncSessionLocal() as db:
+            stats = await InteractionLogService.compact_logs(db, months, batch_personas)
+        stats["partitions_created"] = created
+        return stats
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상호작용 로그 보존 작업 (일별 집계로 압축)")
+    parser.add_argument("--months", type=int, default=settings.log_retention_months, help="원본을 보존할 개월 수")
+    parser.add_argument("--batch-personas", type=int, default=200, help="한 트랜잭션에서 처리할 페르소나 수")
+    args = parser.parse_args()
+
+    stats = asyncio.run(run(args.months, args.batch_personas))
+    print(json.dumps(stats, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+분석용 데이터 내보내기 CLI
+상호작용 로그 / 페르소나 / 노트를 서버 측 커서로 읽어 Parquet, Arrow IPC, CSV 파트 파일로 저장합니다.
+메모리 사용량은 청크 크기(EXPORT_CHUNK_ROWS)에만 비례합니다.
+
+- 파트 파일 하나(--rows-per-file행)를 다 쓸 때마다 마지막 행의 커서를 <출력 디렉터리>/_state.json에 기록하므로,
+  중단된 내보내기는 --resume으로 마지막 완료 파트 다음부터 이어서 진행합니다.
+- 쓰는 중인 파트는 .tmp 파일로 두었다가 다 쓴 뒤에 이름을 바꾸므로, 완성되지 않은 파일이 남지 않습니다.
+
+실행:
+    cd backend
+    python -m tools.export_data --output-dir ./export                      # 전체 사용자, 모든 테이블, Parquet
+    python -m tools.export_data --output-dir ./export --user-id <ID> --tables interaction_logs \\
+        --since 2025-01-01 --until 2025-07-01 --format arrow
+    python -m tools.export_data --output-dir ./export --resume             # 중단된 내보내기 이어받기
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import datetime
+from typing import Optional
+
+from services.export_service import EXPORT_FORMATS, EXPORT_TABLES
+
+STATE_FILE = "_state.json"
+
+
+def _load_state(output_dir: str) -> dict:
+    path = os.path.join(output_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _save_state(output_dir: str, state: dict) -> None:
+    path = os.path.join(output_dir, STATE_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as handle:
+        json.dump(state, handle, indent=2, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+async def export_table(
+    db,
+    table: str,
+    file_format: str,
+    output_dir: str,
+    rows_per_file: int,
+    state: dict,
+    user_id: Optional[str],
+    since: Optional[datetime],
+    until: Optional[datetime]
+) -> int:
+    """
+    테이블 하나를 파트 파일로 내보내기 (파트마다 커서를 이어받아 새 쿼리)
+
+    Returns:
+        이번 실행에서 내보낸 행 수
+    """
+    from services.export_service import ExportService
+
+    progress = state.setdefault(table, {"cursor": None, "parts": 0, "rows": 0})
+    extension = EXPORT_FORMATS[file_format][1]
+    exported = 0
+    while True:
+        last_row = None
+        count = 0
+
+        async def tracked():
+            nonlocal last_row, count
+            async for rows in ExportService.iter_chunks(
+                db, table, user_id=user_id, since=since, until=until,
+                cursor=progress["cursor"], limit=rows_per_file
+            ):
+                last_row = rows[-1]
+                count += len(rows)
+                yield rows
+
+        path = os.path.join(output_dir, f"{table}-{progress['parts']:05d}.{extension}")
+        with open(path + ".tmp", "wb") as handle:
+            async for chunk in ExportService.encode(table, file_format, tracked()):
+                handle.write(chunk)
+        if count == 0:
+            os.remove(path + ".tmp")
+            return exported
+
+        os.replace(path + ".tmp", path)
+        progress["cursor"] = ExportService.cursor_of(table, last_row)
+        progress["parts"] += 1
+        progress["rows"] += count
+        exported += count
+        _save_state(output_dir, state)
+        print(f"{table}: {os.path.basename(path)} {count:,}행 (누적 {progress['rows']:,}행)", file=sys.stderr)
+        if count < rows_per_file:
+            return exported
+
+
+async def run(args) -> dict:
+    from database import engine, AsyncSessionLocal
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    state = _load_state(args.output_dir) if args.resume else {}
+    if args.resume and state:
+        # 이어받을 때는 처음 실행의 필터/형식을 그대로 사용
+        options = state["options"]
+        args.format, args.user_id = options["format"], options["user_id"]
+        args.since = datetime.fromisoformat(options["since"]) if options["since"] else None
+        args.until = datetime.fromisoformat(options["until"]) if options["until"] else None
+    else:
+        args.format = args.format or "parquet"
+        state = {"options": {
+            "format": args.format,
+            "user_id": args.user_id,
+            "since": args.since.isoformat() if args.since else None,
+            "until": args.until.isoformat() if args.until else None,
+        }}
+
+    if args.format in ("parquet", "arrow"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            sys.exit(f"{args.format} 형식에는 pyarrow가 필요합니다: pip install pyarrow (또는 --format csv)")
+
+    counts = {}
+    try:
+        for table in args.tables:
+            async with AsyncSessionLocal() as db:
+                counts[table] = await export_table(
+                    db, table, args.format, args.output_dir, args.rows_per_file,
+                    state, args.user_id, args.since, args.until
+                )
+        return counts
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석용 데이터 내보내기 (Parquet / Arrow IPC / CSV)")
+    parser.add_argument("--output-dir", required=True, help="파트 파일과 _state.json을 저장할 디렉터리")
+    parser.add_argument("--tables", nargs="+", choices=list(EXPORT_TABLES), default=list(EXPORT_TABLES), help="내보낼 테이블")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), help="파일 형식 (기본값: parquet, --resume이면 처음 실행의 형식)")
+    parser.add_argument("--user-id", help="이 사용자의 데이터만 (생략하면 전체 사용자)")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="이 시각 이후 (포함, ISO 형식)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="이 시각 이전 (미포함, ISO 형식)")
+    parser.add_argument("--rows-per-file", type=int, default=1_000_000, help="파트 파일당 최대 행 수")
+    parser.add_argument("--resume", action="store_true", help="_state.json의 커서부터 이어서 내보내기")
+    args = parser.parse_args()
+
+    counts = asyncio.run(run(args))
+    print(", ".join(f"{table} {count:,}행" for table, count in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
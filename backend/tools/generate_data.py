@@ -0,0 +1,368 @@
+"""
+대용량 합성 데이터 생성기
+models.py 스키마에 맞는 사용자/카테고리/페르소나/상호작용 로그/노트를 현실적인 분포로 만들어
+DB에 대량 INSERT로 바로 넣거나, CSV/Parquet 스냅샷으로 저장합니다.
+
+- 같은 --seed면 항상 같은 데이터 (사용자마다 독립된 난수 스트림이라 규모를 바꿔도 앞부분은 동일)
+  단, users.password_hash는 bcrypt salt가 실행마다 달라 예외입니다.
+- 행을 배치 단위로 흘려보내므로 메모리 사용량은 --batch-size에만 비례 (5천만 행도 가능)
+
+분포
+- 카테고리별 페르소나 수: 친구/직장이 대부분, 연인은 0~1명
+- 로그 타임스탬프: 페르소나마다 몇 개의 "몰아서 연락한 시기"(burst)에 집중 + 약간의 배경 연락
+- 방향: 페르소나마다 Outbound 비율이 다름 (Beta 분포, 평균적으로 Inbound 쪽으로 치우침)
+- 감정 점수: 페르소나별 기준값에서 시간순으로 천천히 변하는 랜덤 워크
+
+실행:
+    cd backend
+    python -m tools.generate_data --users 1000 --seed 7
+    python -m tools.generate_data --users 200000 --personas 25 --logs 10 --database-url sqlite:///./big.db
+    python -m tools.generate_data --users 1000 --no-db --snapshot-dir ./snapshot --format parquet
+"""
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from models import OAuthProvider, InteractionType, InteractionDirection, NoteType
+from utils.phone import normalize_phone
+
+# (카테고리 이름, 페르소나 비율, 연락 유형 가중치 [Call, Message, Meeting])
+CATEGORY_PROFILES = [
+    ("가족", 0.15, (0.55, 0.35, 0.10)),
+    ("친구", 0.35, (0.25, 0.60, 0.15)),
+    ("직장", 0.35, (0.20, 0.55, 0.25)),
+    ("연인", 0.03, (0.40, 0.45, 0.15)),
+    ("기타", 0.12, (0.20, 0.70, 0.10)),
+]
+
+FIRST_NAMES = ["민준", "서연", "도윤", "서윤", "시우", "지우", "하준", "하은", "주원", "지유", "지호", "수아", "준서", "채원"]
+LAST_NAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+NOTE_TEXTS = ["좋아하는 음식: 떡볶이", "다음 달 이사 예정", "취업 준비 중이라 예민함", "아이 돌잔치 다녀옴", "생일 선물로 향수 좋아함"]
+SUMMARY_TEXTS = ["안부 인사", "주말 약속 잡음", "업무 관련 통화", "고민 상담", "생일 축하", None]
+
+# 테이블 이름 -> 스냅샷/INSERT 대상 (부모부터 순서대로)
+TABLE_ORDER = ("users", "categories", "personas", "interaction_logs", "persona_notes")
+
+Row = Dict[str, object]
+
+
+def _uuid(rng: random.Random) -> str:
+    """난수 스트림에서 만든 UUID4 (시드 재현 가능)"""
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _bursty_timestamps(rng: random.Random, count: int, start: datetime, days: int) -> List[datetime]:
+    """
+    몰아서 연락하는 패턴의 타임스탬프 (정렬됨)
+
+    80%는 1~5개 burst 중심 주변(지수 분포, 평균 이틀)에, 나머지는 기간 전체에 고르게 배치합니다.
+    """
+    span = days * 86400
+    centers = [rng.uniform(0, span) for _ in range(rng.randint(1, 5))]
+    offsets = []
+    for _ in range(count):
+        if rng.random() < 0.8:
+            offset = rng.choice(centers) + rng.expovariate(1 / (2 * 86400)) * rng.choice((-1, 1))
+        else:
+            offset = rng.uniform(0, span)
+        offsets.append(min(max(offset, 0), span))
+    offsets.sort()
+    return [start + timedelta(seconds=offset) for offset in offsets]
+
+
+def generate_user(
+    user_index: int,
+    seed: int,
+    personas_mean: float,
+    logs_mean: float,
+    notes_mean: float,
+    start: datetime,
+    days: int,
+    password_hash: Optional[str]
+) -> Iterator[Tuple[str, Row]]:
+    """
+    사용자 한 명과 하위 데이터를 (테이블 이름, 행) 순서로 생성
+
+    사용자마다 (seed, user_index)로 만든 독립 난수 스트림을 씁니다.
+    """
+    rng = random.Random(f"{seed}:{user_index}")
+    user_id = _uuid(rng)
+    created_at = start - timedelta(days=rng.randint(1, 30))
+    yield "users", {
+        "id": user_id,
+        "email": f"user{user_index}@synthetic.local",
+        "password_hash": password_hash,
+        "oauth_provider": OAuthProvider.EMAIL,
+        "oauth_id": None,
+        "profile_image": None,
+        "timezone": "Asia/Seoul",
+        "data_version": 0,
+        "created_at": created_at,
+        "updated_at": created_at,
+    }
+
+    category_ids = []
+    for name, _, _ in CATEGORY_PROFILES:
+        category_id = _uuid(rng)
+        category_ids.append(category_id)
+        yield "categories", {
+            "id": category_id, "user_id": user_id, "name": name,
+            "created_at": created_at, "updated_at": created_at, "deleted_at": None,
+        }
+
+    # 페르소나 수는 사용자마다 로그정규 분포 (평균 personas_mean)
+    persona_count = max(1, int(rng.lognormvariate(math.log(personas_mean) - 0.125, 0.5)))
+    partner_assigned = False
+    used_phones = set()  # (user_id, normalized_phone) 고유 인덱스
+    for p in range(persona_count):
+        index = rng.choices(range(len(CATEGORY_PROFILES)), [weight for _, weight, _ in CATEGORY_PROFILES])[0]
+        if CATEGORY_PROFILES[index][0] == "연인":
+            if partner_assigned:
+                index = 1  # 연인은 최대 1명, 나머지는 친구로
+            partner_assigned = True
+        type_weights = CATEGORY_PROFILES[index][2]
+
+        persona_id = _uuid(rng)
+        importance = min(100, max(0, int(rng.gauss(50, 20))))
+        phone_number = f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}"
+        while phone_number in used_phones:
+            phone_number = f"010-{rng.randrange(10000):04d}-{rng.randrange(10000):04d}"
+        used_phones.add(phone_number)
+        yield "personas", {
+            "id": persona_id,
+            "user_id": user_id,
+            "name": rng.choice(LAST_NAMES) + rng.choice(FIRST_NAMES),
+            "phone_number": phone_number,
+            "normalized_phone": normalize_phone(phone_number),
+            "category_id": category_ids[index],
+            "birth_date": datetime(rng.randint(1945, 2008), rng.randint(1, 12), rng.randint(1, 28)),
+            "anniversary_date": datetime(rng.randint(1990, 2024), rng.randint(1, 12), rng.randint(1, 28)),
+            "importance_weight": importance,
+            "relationship_temp": round(rng.uniform(10, 90), 1),
+            "created_at": created_at,
+            "updated_at": created_at,
+            "deleted_at": None,
+        }
+
+        # 중요한 사람일수록 연락이 많음
+        log_count = int(rng.lognormvariate(math.log(max(logs_mean, 1)) - 0.5, 1.0) * (0.5 + importance / 100))
+        outbound_ratio = rng.betavariate(2, 3)
+        sentiment = rng.gauss(0.2, 0.3)
+        for timestamp in _bursty_timestamps(rng, log_count, start, days):
+            sentiment = min(1.0, max(-1.0, sentiment + rng.gauss(0, 0.05)))
+            interaction_type = rng.choices(
+                (InteractionType.CALL, InteractionType.MESSAGE, InteractionType.MEETING), type_weights
+            )[0]
+            if interaction_type == InteractionType.CALL:
+                duration = int(rng.lognormvariate(math.log(180), 0.8))
+            elif interaction_type == InteractionType.MEETING:
+                duration = int(rng.lognormvariate(math.log(5400), 0.5))
+            else:
+                duration = None
+            yield "interaction_logs", {
+                "id": _uuid(rng),
+                "persona_id": persona_id,
+                "type": interaction_type,
+                "direction": InteractionDirection.OUTBOUND if rng.random() < outbound_ratio else InteractionDirection.INBOUND,
+                "timestamp": timestamp,
+                "duration": duration,
+                "sentiment_score": round(min(1.0, max(-1.0, sentiment + rng.gauss(0, 0.1))), 3),
+                "summary_text": rng.choice(SUMMARY_TEXTS),
+                "raw_vector_id": None,
+                "updated_at": timestamp,
+                "deleted_at": None,
+            }
+
+        for _ in range(min(20, int(rng.expovariate(1 / notes_mean)) if notes_mean > 0 else 0)):
+            note_at = start + timedelta(seconds=rng.uniform(0, days * 86400))
+            yield "persona_notes", {
+                "id": _uuid(rng),
+                "persona_id": persona_id,
+                "type": NoteType.MEMO if rng.random() < 0.8 else NoteType.QUESTION,
+                "content": rng.choice(NOTE_TEXTS),
+                "created_at": note_at,
+                "updated_at": note_at,
+                "deleted_at": None,
+            }
+
+
+class DatabaseSink:
+    """테이블별 배치를 모아 executemany로 INSERT (동기 엔진, 배치마다 커밋)"""
+
+    def __init__(self, database_url: str, batch_size: int, since: datetime):
+        from sqlalchemy import create_engine, event
+        from sqlalchemy.engine import make_url
+        from database import Base
+        from services.interaction_log_service import ensure_log_partitions
+        from services.search_service import ensure_search_index
+        import models  # noqa: F401 - 테이블 등록
+
+        url = make_url(database_url)
+        # 비동기 드라이버 URL(sqlite+aiosqlite 등)이면 기본 동기 드라이버로 교체
+        url = url.set(drivername=url.get_backend_name())
+        self.engine = create_engine(url)
+        if url.get_backend_name() == "sqlite":
+            @event.listens_for(self.engine, "connect")
+            def _fast_sqlite(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                # 대량 적재 전용 설정 (적재 중 장애 시 파일을 다시 만들면 됨)
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=OFF")
+                cursor.execute("PRAGMA foreign_keys=ON")
+                cursor.close()
+        Base.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            # 앱의 init_db와 같은 부가 스키마 (SQLite 전문 검색 트리거, PostgreSQL 월별 파티션)
+            ensure_search_index(conn)
+            ensure_log_partitions(conn, since=since)
+        self.tables = {name: Base.metadata.tables[name] for name in TABLE_ORDER}
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[Row]] = {name: [] for name in TABLE_ORDER}
+
+    def add(self, table: str, row: Row) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """부모 테이블부터 모든 버퍼를 한 트랜잭션으로 INSERT (외래 키 순서 보장)"""
+        with self.engine.begin() as conn:
+            for name in TABLE_ORDER:
+                if self.buffers[name]:
+                    conn.execute(self.tables[name].insert(), self.buffers[name])
+                    self.buffers[name] = []
+
+    def close(self) -> None:
+        self.flush()
+        self.engine.dispose()
+
+
+def _snapshot_value(value):
+    """스냅샷용 값 변환 (Enum은 API와 같은 값 문자열로)"""
+    return value.value if hasattr(value, "value") else value
+
+
+class SnapshotSink:
+    """테이블별 CSV 또는 Parquet 파일로 스트리밍 저장 (Parquet은 배치마다 row group 하나)"""
+
+    def __init__(self, directory: str, file_format: str, batch_size: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.format = file_format
+        self.batch_size = batch_size
+        self.buffers: Dict[str, List[Row]] = {name: [] for name in TABLE_ORDER}
+        self.writers: Dict[str, object] = {}
+        self.files = []
+        if file_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+                import pyarrow.parquet  # noqa: F401
+            except ImportError:
+                sys.exit("Parquet 스냅샷에는 pyarrow가 필요합니다: pip install pyarrow (또는 --format csv)")
+
+    def add(self, table: str, row: Row) -> None:
+        buffer = self.buffers[table]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self._write(table)
+
+    def _write(self, table: str) -> None:
+        rows = self.buffers[table]
+        if not rows:
+            return
+        self.buffers[table] = []
+        columns = list(rows[0].keys())
+        if self.format == "csv":
+            writer = self.writers.get(table)
+            if writer is None:
+                handle = open(os.path.join(self.directory, f"{table}.csv"), "w", newline="", encoding="utf-8")
+                self.files.append(handle)
+                writer = self.writers[table] = csv.writer(handle)
+                writer.writerow(columns)
+            writer.writerows([_snapshot_value(row[column]) for column in columns] for row in rows)
+            return
+
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        batch = pa.Table.from_pydict({column: [_snapshot_value(row[column]) for row in rows] for column in columns})
+        writer = self.writers.get(table)
+        if writer is None:
+            writer = self.writers[table] = pq.ParquetWriter(os.path.join(self.directory, f"{table}.parquet"), batch.schema)
+        writer.write_table(batch.cast(writer.schema))
+
+    def close(self) -> None:
+        for table in TABLE_ORDER:
+            self._write(table)
+        if self.format == "parquet":
+            for writer in self.writers.values():
+                writer.close()
+        for handle in self.files:
+            handle.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 합성 데이터 생성기")
+    parser.add_argument("--users", type=int, default=100, help="사용자 수")
+    parser.add_argument("--personas", type=float, default=25, help="사용자당 평균 페르소나 수")
+    parser.add_argument("--logs", type=float, default=40, help="페르소나당 평균 상호작용 로그 수")
+    parser.add_argument("--notes", type=float, default=1.5, help="페르소나당 평균 노트 수")
+    parser.add_argument("--days", type=int, default=365, help="로그 기간 (일, 오늘 기준 과거)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--start-user", type=int, default=0, help="시작 사용자 번호 (여러 프로세스로 나눠 생성할 때)")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./app.db"), help="대상 DB URL")
+    parser.add_argument("--no-db", action="store_true", help="DB에 넣지 않고 스냅샷만 생성")
+    parser.add_argument("--snapshot-dir", help="CSV/Parquet 스냅샷 저장 디렉터리")
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv", help="스냅샷 형식")
+    parser.add_argument("--batch-size", type=int, default=10000, help="INSERT/쓰기 배치 크기")
+    parser.add_argument("--password", default="password", help="생성된 모든 사용자의 비밀번호 (로그인 테스트용)")
+    args = parser.parse_args()
+
+    if args.no_db and not args.snapshot_dir:
+        parser.error("--no-db에는 --snapshot-dir가 필요합니다")
+
+    from utils.auth import get_password_hash
+
+    # 시드 재현을 위해 기간의 기준 시각도 시드에서 고정 (실행 날짜와 무관)
+    end = datetime(2025, 1, 1) + timedelta(days=args.seed % 365)
+    start = end - timedelta(days=args.days)
+
+    sinks = []
+    if not args.no_db:
+        sinks.append(DatabaseSink(args.database_url, args.batch_size, since=start))
+    if args.snapshot_dir:
+        sinks.append(SnapshotSink(args.snapshot_dir, args.format, args.batch_size))
+    password_hash = get_password_hash(args.password)  # bcrypt는 느리므로 한 번만
+
+    counts = {name: 0 for name in TABLE_ORDER}
+    started = time.perf_counter()
+    last_report = started
+    for user_index in range(args.start_user, args.start_user + args.users):
+        for table, row in generate_user(
+            user_index, args.seed, args.personas, args.logs, args.notes, start, args.days, password_hash
+        ):
+            counts[table] += 1
+            for sink in sinks:
+                sink.add(table, row)
+        if time.perf_counter() - last_report > 5:
+            last_report = time.perf_counter()
+            rate = counts["interaction_logs"] / (last_report - started)
+            print(f"사용자 {user_index + 1 - args.start_user}/{args.users}, 로그 {counts['interaction_logs']:,}행 ({rate:,.0f}행/초)", file=sys.stderr)
+
+    for sink in sinks:
+        sink.close()
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    print(", ".join(f"{name} {count:,}" for name, count in counts.items()))
+    print(f"총 {total:,}행, {elapsed:.1f}초 ({total / elapsed:,.0f}행/초)")
+
+
+if __name__ == "__main__":
+    main()
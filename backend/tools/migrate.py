@@ -0,0 +1,43 @@
+"""
+스키마 마이그레이션 CLI
+migrations/의 마이그레이션을 적용하거나 적용 상태를 보여줍니다.
+여러 워커로 배포할 때 MIGRATE_ON_STARTUP=false로 두고 배포 전에 한 번 실행하면, 앱 시작 시에는 확인만 합니다.
+
+실행:
+    cd backend
+    python -m tools.migrate            # .env의 DATABASE_URL에 적용
+    python -m tools.migrate --status   # 적용/미적용 목록만 출력
+"""
+import argparse
+import asyncio
+import logging
+
+
+async def run(status_only: bool) -> None:
+    from database import engine
+    from utils.migrations import load_migrations, migrate, pending_migrations
+
+    try:
+        migrations = load_migrations()
+        if not status_only:
+            applied = await migrate(engine, migrations)
+            print(f"적용: {', '.join(applied) if applied else '없음 (최신)'}")
+        pending = {migration.version for migration in await pending_migrations(engine, migrations)}
+        for migration in migrations:
+            state = "대기" if migration.version in pending else "적용됨"
+            print(f"{migration.version}  {state:4}  {migration.description}")
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용하지 않고 상태만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    asyncio.run(run(args.status))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+서킷 브레이커 유틸리티
+외부 API(NIM 등)가 연속으로 실패하면 일정 시간 호출을 차단하여, 장애가 요청 지연으로 번지지 않도록 합니다.
+
+상태 전이
+- closed: 정상 호출, 연속 실패가 failure_threshold에 도달하면 open
+- open: reset_timeout 동안 즉시 실패, 이후 half_open
+- half_open: 시험 호출 1개만 허용, 성공하면 closed / 실패하면 다시 open
+"""
+import time
+from typing import Dict
+
+
+class CircuitOpenError(Exception):
+    """서킷이 열려 있어 호출이 차단됨"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} 서킷이 열려 있습니다. {retry_after:.0f}초 후 재시도")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    연속 실패 횟수 기반 서킷 브레이커 (이벤트 루프 단일 스레드에서 사용)
+
+    사용 예:
+        breaker.before_call()  # 열려 있으면 CircuitOpenError
+        try:
+            result = await call()
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._trial_started_at = None  # half_open 시험 호출 시작 시각
+
+    @property
+    def state(self) -> str:
+        if self.consecutive_failures < self.failure_threshold:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        """
+        호출 가능 여부 확인
+
+        Raises:
+            CircuitOpenError: 서킷이 열려 있거나 half_open 시험 호출이 이미 진행 중일 때
+        """
+        state = self.state
+        if state == "closed":
+            return
+        now = time.monotonic()
+        # 시험 호출이 취소되어 결과가 기록되지 않은 경우에도 reset_timeout 후에는 다시 시험
+        if state == "half_open" and (self._trial_started_at is None or now - self._trial_started_at >= self.reset_timeout):
+            self._trial_started_at = now
+            return
+        retry_after = max(1.0, self.reset_timeout - (now - self.opened_at))
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_started_at = None
+        if self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, object]:
+        """헬스 체크 응답용 상태"""
+        return {"state": self.state, "consecutive_failures": self.consecutive_failures}
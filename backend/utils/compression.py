@@ -0,0 +1,276 @@
+"""
+응답 압축 미들웨어 (ASGI)
+Accept-Encoding에 따라 zstd / br / gzip 중 하나로 응답 본문을 압축합니다.
+
+- 작은 응답(minimum_size 미만)은 압축하지 않습니다 (CPU 낭비 방지).
+- 스트리밍 응답(SSE, NDJSON 등)은 버퍼링하지 않고 청크마다 압축 후 바로 flush합니다.
+- brotli / zstandard 패키지는 선택 사항이며, 설치되지 않았으면 gzip만 사용합니다.
+"""
+import zlib
+from typing import Optional
+
+from config import settings
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+# 압축 대상 Content-Type (이미지 등 이미 압축된 형식은 제외)
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+# 항상 스트리밍으로 압축하는 Content-Type (이벤트 단위로 즉시 전달되어야 함)
+STREAMING_TYPES = (
+    "text/event-stream",
+    "application/x-ndjson",
+)
+
+# 같은 q 값일 때 서버 선호 순서 (CPU 대비 압축률 기준)
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+
+def available_encodings() -> tuple:
+    """현재 환경에서 사용 가능한 인코딩 목록"""
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return tuple(encodings)
+
+
+def choose_encoding(accept_encoding: str, supported: tuple) -> Optional[str]:
+    """
+    Accept-Encoding 헤더에서 사용할 인코딩 선택
+
+    q 값이 가장 높은 인코딩을 고르고, 같으면 ENCODING_PREFERENCE 순서를 따릅니다.
+
+    Args:
+        accept_encoding: Accept-Encoding 헤더 값 (예: "gzip, br;q=0.9")
+        supported: 서버에서 사용 가능한 인코딩 목록
+
+    Returns:
+        선택된 인코딩 이름 또는 None (압축하지 않음)
+    """
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in supported:
+            continue
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class _Compressor:
+    """인코딩별 스트리밍 압축기 (compress = 청크 압축 + flush, finish = 스트림 종료)"""
+
+    def __init__(self, encoding: str, levels: dict):
+        self.encoding = encoding
+        if encoding == "zstd":
+            self._obj = zstandard.ZstdCompressor(level=levels["zstd"]).compressobj()
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=levels["br"])
+        else:
+            self._obj = zlib.compressobj(levels["gzip"], zlib.DEFLATED, 31)  # 31 = gzip 헤더
+
+    def compress(self, data: bytes) -> bytes:
+        """청크를 압축하고, 클라이언트가 바로 해제할 수 있도록 flush"""
+        if self.encoding == "zstd":
+            return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.flush()
+        return self._obj.compress(data) + self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        """스트림 종료 (남은 데이터와 트레일러 반환)"""
+        if self.encoding == "zstd":
+            return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+    def compress_all(self, data: bytes) -> bytes:
+        """한 번에 전체 본문 압축 (비스트리밍 응답용)"""
+        if self.encoding == "zstd":
+            return self._obj.compress(data) + self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+        if self.encoding == "br":
+            return self._obj.process(data) + self._obj.finish()
+        return self._obj.compress(data) + self._obj.flush()
+
+
+class CompressionMiddleware:
+    """
+    응답 압축 ASGI 미들웨어
+
+    사용 예: app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    Args:
+        app: ASGI 앱
+        minimum_size: 이 크기(바이트) 미만의 응답은 압축하지 않음
+        gzip_level: gzip 압축 레벨 (1~9)
+        brotli_quality: brotli 품질 (0~11)
+        zstd_level: zstd 압축 레벨 (1~22)
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: Optional[int] = None,
+        gzip_level: Optional[int] = None,
+        brotli_quality: Optional[int] = None,
+        zstd_level: Optional[int] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.compression_min_size
+        # 기본 레벨은 benchmarks/compression_bench.py 결과 기준 (CPU 대비 압축률이 꺾이는 지점)
+        # 로그 1만 건(4.5MB) 기준: zstd 1 = 9ms/6.4배, br 4 = 105ms/6.7배, gzip 5 = 100ms/5.1배
+        self.levels = {
+            "gzip": gzip_level if gzip_level is not None else settings.compression_gzip_level,
+            "br": brotli_quality if brotli_quality is not None else settings.compression_brotli_quality,
+            "zstd": zstd_level if zstd_level is not None else settings.compression_zstd_level,
+        }
+        self.supported = available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = choose_encoding(accept_encoding, self.supported) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressionResponder(send, encoding, self.levels, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """요청 하나의 응답 메시지를 가로채서 압축하는 헬퍼"""
+
+    def __init__(self, send, encoding: str, levels: dict, minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.levels = levels
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.started = False
+
+    async def send(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = {key.lower(): value for key, value in message.get("headers", [])}
+            content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+            self.passthrough = (
+                b"content-encoding" in headers
+                or message["status"] in (204, 304)
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            if not self.passthrough and content_type.startswith(STREAMING_TYPES):
+                # 스트리밍 형식은 첫 이벤트를 기다리지 않고 헤더부터 바로 전송
+                await self._start_streaming()
+            return
+
+        if message_type != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._flush_start()
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            if not more_body:
+                # 비스트리밍 응답: 작은 본문은 그대로, 큰 본문은 한 번에 압축
+                if len(body) < self.minimum_size:
+                    await self._flush_start()
+                    await self._send(message)
+                    return
+                compressed = _Compressor(self.encoding, self.levels).compress_all(body)
+                self._set_encoding_headers(len(compressed))
+                await self._flush_start()
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+
+            await self._start_streaming()
+
+        chunk = self.compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self.compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    async def _start_streaming(self):
+        """스트리밍 모드 시작: Content-Length 없이 청크마다 압축 후 flush"""
+        self.compressor = _Compressor(self.encoding, self.levels)
+        self._set_encoding_headers(None)
+        await self._flush_start()
+
+    def _set_encoding_headers(self, content_length: Optional[int]):
+        """Content-Encoding / Vary / Content-Length 헤더 갱신"""
+        headers = [
+            (key, value) for key, value in self.start_message.get("headers", [])
+            if key.lower() not in (b"content-length", b"content-encoding")
+        ]
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+
+        vary = [value for key, value in headers if key.lower() == b"vary"]
+        if not any(b"accept-encoding" in value.lower() for value in vary):
+            headers.append((b"vary", b"Accept-Encoding"))
+
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+
+        # 압축 후에는 바이트가 달라지므로 강한 ETag를 약한 ETag로 변환
+        headers = [
+            (key, b"W/" + value if key.lower() == b"etag" and not value.startswith(b"W/") else value)
+            for key, value in headers
+        ]
+        self.start_message = {**self.start_message, "headers": headers}
+
+    async def _flush_start(self):
+        """보류 중인 http.response.start 메시지 전송"""
+        if not self.started:
+            self.started = True
+            await self._send(self.start_message)
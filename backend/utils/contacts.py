@@ -0,0 +1,207 @@
+"""
+연락처 파일 파서 (vCard, CSV)
+휴대폰/구글 주소록에서 내보낸 파일을 페르소나 가져오기용 레코드로 변환합니다.
+
+- vCard 2.1 / 3.0 / 4.0 (줄 접기, QUOTED-PRINTABLE, 그룹 접두어 item1.TEL 지원)
+- CSV: 첫 줄 헤더 (이름/전화번호/카테고리/생일/기념일, 영문 및 구글 주소록 헤더도 인식)
+- 인코딩: UTF-8(BOM 포함) 우선, 실패하면 CP949 (한국어 Windows에서 저장한 CSV)
+"""
+import csv
+import io
+import quopri
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+
+class ContactRecord(NamedTuple):
+    """연락처 한 건 (없는 값은 None)"""
+    name: Optional[str]
+    phone_number: Optional[str]
+    category: Optional[str]
+    birth_date: Optional[datetime]
+    anniversary_date: Optional[datetime]
+
+
+# CSV 헤더 (소문자, 공백 유지) → 필드
+_CSV_HEADERS: Dict[str, str] = {
+    "name": "name", "이름": "name", "full name": "name", "display name": "name", "성명": "name",
+    "phone": "phone_number", "phone_number": "phone_number", "전화번호": "phone_number", "휴대폰": "phone_number",
+    "휴대전화": "phone_number", "mobile": "phone_number", "mobile phone": "phone_number", "phone 1 - value": "phone_number",
+    "category": "category", "카테고리": "category", "group": "category", "그룹": "category",
+    "group membership": "category", "labels": "category",
+    "birth_date": "birth_date", "birthday": "birth_date", "생일": "birth_date", "생년월일": "birth_date",
+    "anniversary_date": "anniversary_date", "anniversary": "anniversary_date", "기념일": "anniversary_date",
+}
+
+_DATE_FORMATS = ("%Y-%m-%d", "%Y%m%d", "%Y.%m.%d", "%Y/%m/%d", "%Y. %m. %d")
+
+
+def decode_text(data: bytes) -> str:
+    """업로드 파일 디코딩 (UTF-8, 실패하면 CP949)"""
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp949", errors="replace")
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    연락처 날짜 해석 (형식을 모르면 None)
+
+    연도가 없는 vCard 생일(--0503, --05-03)은 날짜로 저장할 수 없으므로 None (임의의 연도를 채우지 않음)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.startswith("--"):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        pass
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value.rstrip("."), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _clean(value: Optional[str]) -> Optional[str]:
+    value = (value or "").strip()
+    return value or None
+
+
+def _unescape(value: str) -> str:
+    """vCard 값 이스케이프 해제 (\\n, \\, \\; \\\\)"""
+    return (
+        value.replace("\\n", "\n").replace("\\N", "\n")
+        .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\")
+    )
+
+
+def _unfold(text: str) -> List[str]:
+    """vCard 줄 접기 해제 (공백으로 시작하는 줄, QUOTED-PRINTABLE의 '='로 끝나는 줄)"""
+    lines: List[str] = []
+    for line in text.splitlines():
+        if lines and line[:1] in (" ", "\t"):
+            lines[-1] += line[1:]
+        elif lines and lines[-1].endswith("=") and "QUOTED-PRINTABLE" in lines[-1].upper():
+            lines[-1] = lines[-1][:-1] + line
+        else:
+            lines.append(line)
+    return lines
+
+
+def _property(line: str):
+    """'item1.TEL;TYPE=CELL:010-...' → ("TEL", {"TYPE": "CELL"}, "010-...")"""
+    head, _, value = line.partition(":")
+    parts = head.split(";")
+    name = parts[0].rsplit(".", 1)[-1].upper()
+    params: Dict[str, str] = {}
+    for part in parts[1:]:
+        key, sep, param_value = part.partition("=")
+        if sep:
+            params[key.upper()] = param_value
+        else:
+            params.setdefault("TYPE", "")
+            params["TYPE"] += "," + key  # vCard 2.1: TEL;CELL:...
+    if params.get("ENCODING", "").upper() == "QUOTED-PRINTABLE":
+        charset = params.get("CHARSET", "utf-8")
+        value = quopri.decodestring(value.encode("ascii", errors="ignore")).decode(charset, errors="replace")
+    return name, params, value
+
+
+def parse_vcard(text: str) -> List[ContactRecord]:
+    """vCard 파일의 모든 연락처 (BEGIN:VCARD ~ END:VCARD)"""
+    records: List[ContactRecord] = []
+    card: Optional[dict] = None
+    for line in _unfold(text):
+        if not line.strip():
+            continue
+        name, params, value = _property(line)
+        if name == "BEGIN" and value.strip().upper() == "VCARD":
+            card = {"phones": []}
+        elif name == "END" and card is not None:
+            phones = sorted(card["phones"], key=lambda phone: phone[0])  # 휴대폰 번호 우선
+            records.append(ContactRecord(
+                name=_clean(card.get("FN")) or _clean(card.get("N")),
+                phone_number=phones[0][1] if phones else None,
+                category=_clean(card.get("CATEGORIES")),
+                birth_date=parse_date(card.get("BDAY")),
+                anniversary_date=parse_date(card.get("ANNIVERSARY")),
+            ))
+            card = None
+        elif card is None:
+            continue
+        elif name == "TEL":
+            phone = _clean(value.removeprefix("tel:"))
+            if phone:
+                card["phones"].append((0 if "CELL" in params.get("TYPE", "").upper() else 1, phone))
+        elif name == "FN":
+            card["FN"] = _unescape(value)
+        elif name == "N":
+            # 성;이름;중간 이름;... → 한글은 "홍길동", 그 외는 "Gil-dong Hong"
+            family, given = (_unescape(value).split(";") + ["", ""])[:2]
+            hangul = any("가" <= char <= "힣" for char in family + given)
+            card["N"] = (family + given) if hangul else f"{given} {family}"
+        elif name == "CATEGORIES":
+            card["CATEGORIES"] = _unescape(value).split(",")[0]
+        elif name in ("BDAY", "ANNIVERSARY", "X-ANNIVERSARY"):
+            card[name.removeprefix("X-")] = value
+    return records
+
+
+def parse_csv(text: str) -> List[ContactRecord]:
+    """
+    헤더가 있는 CSV 연락처
+
+    Raises:
+        ValueError: 이름/전화번호 열을 찾을 수 없을 때
+    """
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if header is None:
+        return []
+    columns = {_CSV_HEADERS[title.strip().lower()]: index for index, title in enumerate(header) if title.strip().lower() in _CSV_HEADERS}
+    if "phone_number" not in columns:
+        raise ValueError("CSV에 전화번호 열이 없습니다. (예: 이름,전화번호,카테고리,생일,기념일)")
+
+    def cell(row: List[str], field: str) -> Optional[str]:
+        index = columns.get(field)
+        return _clean(row[index]) if index is not None and index < len(row) else None
+
+    records: List[ContactRecord] = []
+    for row in reader:
+        if not any(value.strip() for value in row):
+            continue
+        category = cell(row, "category")
+        if category and ":::" in category:
+            # 구글 주소록 "* myContacts ::: 친구" → 시스템 그룹을 뺀 첫 라벨
+            labels = [label.strip() for label in category.split(":::") if not label.strip().startswith("*")]
+            category = labels[0] if labels else None
+        records.append(ContactRecord(
+            name=cell(row, "name"),
+            phone_number=cell(row, "phone_number"),
+            category=category,
+            birth_date=parse_date(cell(row, "birth_date")),
+            anniversary_date=parse_date(cell(row, "anniversary_date")),
+        ))
+    return records
+
+
+def parse_contacts(data: bytes, file_format: Optional[str] = None) -> List[ContactRecord]:
+    """
+    연락처 파일 해석 (형식을 주지 않으면 내용으로 판단)
+
+    Args:
+        data: 업로드된 파일 내용
+        file_format: "vcard" 또는 "csv" (None이면 BEGIN:VCARD 포함 여부로 판단)
+
+    Raises:
+        ValueError: 파일을 해석할 수 없을 때
+    """
+    text = decode_text(data)
+    if file_format is None:
+        file_format = "vcard" if "BEGIN:VCARD" in text[:4096].upper() else "csv"
+    return parse_vcard(text) if file_format == "vcard" else parse_csv(text)
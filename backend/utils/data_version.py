@@ -0,0 +1,86 @@
+"""
+사용자 데이터 버전 관리 유틸리티
+서비스 레이어의 모든 쓰기 작업에서 사용자별 data_version을 증가시키고,
+이 값을 기반으로 HTTP 캐싱용 강한(strong) ETag를 생성합니다.
+"""
+import hashlib
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import User, Persona
+
+
+async def bump_data_version(db: AsyncSession, user_id: str) -> None:
+    """
+    사용자의 data_version을 1 증가
+
+    쓰기 작업과 같은 트랜잭션에서 실행되므로, 변경 내용과 버전이 함께 커밋됩니다.
+
+    Args:
+        db: 데이터베이스 세션
+        user_id: 사용자 ID
+    """
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def bump_data_version_by_persona(db: AsyncSession, persona_id: str) -> None:
+    """
+    페르소나 소유자의 data_version을 1 증가 (로그/노트처럼 user_id가 없는 쓰기용)
+
+    Args:
+        db: 데이터베이스 세션
+        persona_id: 페르소나 ID
+    """
+    owner_id = select(Persona.user_id).where(Persona.id == persona_id).scalar_subquery()
+    await db.execute(
+        update(User)
+        .where(User.id == owner_id)
+        .values(data_version=User.data_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_etag(user_id: str, data_version: int, resource_key: str) -> str:
+    """
+    사용자 데이터 버전 기반 강한 ETag 생성
+
+    같은 사용자, 같은 데이터 버전, 같은 리소스(경로 + 쿼리)이면 항상 같은 값을 반환합니다.
+
+    Args:
+        user_id: 사용자 ID
+        data_version: 사용자 데이터 버전
+        resource_key: 리소스 식별자 (예: "/api/personas/?")
+
+    Returns:
+        따옴표로 감싼 ETag 문자열
+    """
+    digest = hashlib.sha256(f"{user_id}:{data_version}:{resource_key}".encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    If-None-Match 헤더가 ETag와 일치하는지 확인 (약한 비교, RFC 9110)
+
+    Args:
+        if_none_match: If-None-Match 헤더 값
+        etag: 현재 리소스의 ETag
+
+    Returns:
+        일치 여부
+    """
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
@@ -2,7 +2,7 @@
 FastAPI 의존성 함수들
 인증, 권한 확인 등에 사용
 """
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -10,6 +10,8 @@ from sqlalchemy import select
 from database import get_db
 from models import User
 from utils.auth import decode_access_token
+from utils.data_version import build_etag, etag_matches
+from utils.ndjson import wants_ndjson
 
 # HTTP Bearer 토큰 스키마 설정 (Swagger UI에서 사용하기 쉬움)
 security = HTTPBearer(
@@ -20,7 +22,7 @@ security = HTTPBearer(
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db, scope="function")
 ) -> User:
     """
     JWT 토큰에서 현재 사용자 정보 가져오기
@@ -36,8 +38,23 @@ async def get_current_user(
         HTTPException: 토큰이 유효하지 않거나 사용자를 찾을 수 없을 때
     """
     # Bearer 토큰에서 실제 토큰 추출
-    token = credentials.credentials
+    return await authenticate_token(db, credentials.credentials)
+
+
+async def authenticate_token(db: AsyncSession, token: str) -> User:
+    """
+    액세스 토큰으로 사용자 조회 (HTTP 의존성 밖에서도 사용, 예: WebSocket 연결)
     
+    Args:
+        db: 데이터베이스 세션
+        token: JWT 액세스 토큰
+        
+    Returns:
+        토큰의 사용자 객체
+        
+    Raises:
+        HTTPException: 토큰이 유효하지 않거나 사용자를 찾을 수 없을 때 (401)
+    """
     # 토큰 디코딩
     payload = decode_access_token(token)
     if payload is None:
@@ -70,3 +87,42 @@ async def get_current_user(
     
     return user
 
+
+
+async def conditional_get(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user)
+) -> str:
+    """
+    ETag 기반 조건부 GET 처리
+
+    사용자 data_version으로 ETag를 만들고, If-None-Match가 일치하면
+    라우트 본문(목록 쿼리)을 실행하지 않고 바로 304를 반환합니다.
+    data_version은 get_current_user에서 이미 조회한 사용자 행에 포함되어 있어 추가 쿼리가 없습니다.
+
+    사용 예: @router.get("/", dependencies=[Depends(conditional_get)])
+
+    Args:
+        request: 현재 요청
+        response: 응답 (ETag 헤더 설정용)
+        current_user: 현재 사용자
+
+    Returns:
+        현재 리소스의 ETag
+
+    Raises:
+        HTTPException: If-None-Match가 일치할 때 (304 Not Modified)
+    """
+    resource_key = f"{request.url.path}?{request.url.query}"
+    if wants_ndjson(request):
+        resource_key += "#ndjson"  # 같은 URL이라도 NDJSON 표현은 다른 ETag
+    etag = build_etag(current_user.id, current_user.data_version, resource_key)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return etag
@@ -0,0 +1,68 @@
+"""
+한글 자모 유틸리티
+이름 자동 완성에서 초성 검색(ㅎㄱㄷ → 홍길동)과 입력 중인 글자(홍기 → 홍길동)를 처리하기 위해
+완성형 음절을 자모 단위로 분해합니다.
+"""
+from typing import Dict
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_LAST = 0xD7A3
+_JUNGSEONG_COUNT = 21
+_JONGSEONG_COUNT = 28
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+
+# 겹모음/겹받침은 키보드 입력 순서대로 나눔 (입력 중인 "고"가 "과"의 앞부분이 되도록)
+_COMPOUND: Dict[str, str] = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+
+
+def _is_syllable(char: str) -> bool:
+    return _SYLLABLE_BASE <= ord(char) <= _SYLLABLE_LAST
+
+
+def decompose(text: str) -> str:
+    """
+    완성형 한글을 자모 시퀀스로 분해 (한글이 아닌 문자는 소문자로 그대로 유지)
+
+    예: "홍길동" → "ㅎㅗㅇㄱㅣㄹㄷㅗㅇ", "과" → "ㄱㅗㅏ"
+    """
+    result = []
+    for char in text.lower():
+        if _is_syllable(char):
+            offset = ord(char) - _SYLLABLE_BASE
+            jongseong = offset % _JONGSEONG_COUNT
+            jungseong = (offset // _JONGSEONG_COUNT) % _JUNGSEONG_COUNT
+            parts = CHOSEONG[offset // (_JUNGSEONG_COUNT * _JONGSEONG_COUNT)] + JUNGSEONG[jungseong]
+            if jongseong:
+                parts += JONGSEONG[jongseong]
+        else:
+            parts = char
+        result.append("".join(_COMPOUND.get(part, part) for part in parts))
+    return "".join(result)
+
+
+def initials(text: str) -> str:
+    """
+    초성만 추출 (한글이 아닌 문자는 소문자로 그대로 유지, 공백은 제거)
+
+    예: "홍길동" → "ㅎㄱㄷ", "우리 엄마" → "ㅇㄹㅇㅁ"
+    """
+    result = []
+    for char in text.lower():
+        if _is_syllable(char):
+            result.append(CHOSEONG[(ord(char) - _SYLLABLE_BASE) // (_JUNGSEONG_COUNT * _JONGSEONG_COUNT)])
+        elif not char.isspace():
+            result.append(char)
+    return "".join(result)
+
+
+def is_initials_query(text: str) -> bool:
+    """입력이 초성(자음)으로만 이루어졌는지 확인 (예: "ㅎㄱㄷ")"""
+    stripped = text.replace(" ", "")
+    return bool(stripped) and all(char in CHOSEONG for char in stripped)
@@ -0,0 +1,182 @@
+"""
+헬스 체크 모니터
+DB와 NIM 상태를 백그라운드 태스크에서 주기적으로 확인하고 결과를 캐시합니다.
+/health/ready는 캐시된 결과만 읽으므로 로드밸런서가 자주 호출해도 DB/NIM에 부하를 주지 않습니다.
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+from config import settings
+from services.nim_service import nim_breaker, _get_client
+
+
+class ProbeResult:
+    """프로브 1회 결과"""
+
+    def __init__(self, status: str, latency_ms: Optional[float] = None, error: Optional[str] = None):
+        self.status = status  # ok / error / skipped
+        self.latency_ms = latency_ms
+        self.error = error
+        self.checked_at = time.monotonic()
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "status": self.status,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+            "age_seconds": round(time.monotonic() - self.checked_at, 1),
+        }
+
+
+async def _timed_probe(task: asyncio.Task) -> ProbeResult:
+    """
+    실행 중인 프로브 태스크를 시간 제한 안에서 기다리고 결과 반환 (예외는 error 결과로 변환)
+
+    시간이 초과되어도 프로브 자체는 취소하지 않고(shield) 끝까지 실행해 커넥션을 정상 반납합니다.
+    SQLite 쿼리 도중 취소되면 읽기 잠금을 쥔 커넥션이 풀에 남아, 이후 모든 쓰기 커밋이 "database is locked"로 실패합니다.
+    """
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(asyncio.shield(task), timeout=settings.health_probe_timeout)
+    except asyncio.TimeoutError:
+        return ProbeResult("error", error=f"{settings.health_probe_timeout}초 내에 응답 없음")
+    except Exception as e:
+        return ProbeResult("error", error=f"{e.__class__.__name__}: {e}")
+    return ProbeResult("ok", latency_ms=round((time.perf_counter() - started) * 1000, 2))
+
+
+def pool_status(engine) -> Dict[str, object]:
+    """
+    커넥션 풀 사용 현황 (QueuePool 계열만 지원, 그 외 풀은 kind만 반환)
+
+    saturation = 사용 중 커넥션 / (pool_size + max_overflow)
+    """
+    pool = engine.sync_engine.pool
+    status = {"kind": type(pool).__name__}
+    if hasattr(pool, "checkedout") and hasattr(pool, "size"):
+        capacity = pool.size() + max(getattr(pool, "_max_overflow", 0), 0)
+        checked_out = pool.checkedout()
+        status.update({
+            "size": pool.size(),
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": round(checked_out / capacity, 3) if capacity else None,
+        })
+    return status
+
+
+class HealthMonitor:
+    """
+    DB / NIM 백그라운드 프로브
+
+    사용 예 (lifespan):
+        monitor = HealthMonitor(engine)
+        await monitor.probe_db()  # 준비 상태에 필요한 DB만 (NIM은 첫 백그라운드 주기에서)
+        monitor.start()
+        ...
+        await monitor.stop()
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.db: ProbeResult = ProbeResult("unknown")
+        self.nim: ProbeResult = ProbeResult("unknown")
+        self._next_nim_probe = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # 대상별로 실행 중인 프로브 (시간 초과 후에도 끝날 때까지 유지)
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in self._inflight.values():
+            task.cancel()
+        self._inflight.clear()
+
+    async def _run(self) -> None:
+        # 시작 시 lifespan에서 DB는 확인했으므로 대기부터 (NIM 첫 확인도 여기서, 워커 시작을 NIM 호출로 늦추지 않음)
+        while True:
+            await asyncio.sleep(settings.health_probe_interval)
+            await self.probe_once()
+
+    async def probe_db(self) -> None:
+        """DB만 확인"""
+        self.db = await self._probe("db", self._probe_db)
+
+    async def probe_once(self) -> None:
+        """DB는 매번, NIM은 HEALTH_NIM_INTERVAL마다 확인"""
+        await self.probe_db()
+        if time.monotonic() >= self._next_nim_probe:
+            self._next_nim_probe = time.monotonic() + settings.health_nim_interval
+            if settings.nvidia_api_key:
+                self.nim = await self._probe("nim", self._probe_nim)
+            else:
+                self.nim = ProbeResult("skipped", error="NVIDIA_API_KEY 없음 (더미 응답 모드)")
+
+    async def _probe(self, name: str, probe) -> ProbeResult:
+        """
+        대상별로 프로브를 하나만 실행
+
+        이전 주기의 프로브가 시간 초과 후에도 아직 실행 중이면 새로 시작하지 않고 그 태스크를 다시 기다립니다.
+        (DB가 멈췄을 때 주기마다 프로브가 쌓여 각각 커넥션을 쥐고 풀을 고갈시키지 않도록)
+        """
+        task = self._inflight.get(name)
+        if task is None or task.done():
+            task = asyncio.create_task(probe())
+            self._inflight[name] = task
+        return await _timed_probe(task)
+
+    async def _probe_db(self) -> None:
+        """
+        풀에서 커넥션 하나를 빌려 가벼운 조회 실행 (풀이 가득 차 있으면 타임아웃으로 감지됨)
+        SQLite는 SELECT 1이 파일을 읽지 않으므로 스키마 테이블을 읽어 잠금 상태까지 확인
+        """
+        query = "SELECT 1 FROM sqlite_master LIMIT 1" if self.engine.dialect.name == "sqlite" else "SELECT 1"
+        async with self.engine.connect() as conn:
+            await conn.execute(text(query))
+
+    async def _probe_nim(self) -> None:
+        """모델 목록 조회로 NIM 도달 가능 여부만 확인 (토큰 소모 없음)"""
+        await _get_client().models.list()
+
+    def is_stale(self) -> bool:
+        """마지막 DB 프로브가 너무 오래됨 (백그라운드 태스크가 멈춤)"""
+        return time.monotonic() - self.db.checked_at > settings.health_probe_interval * 3 + settings.health_probe_timeout
+
+    def readiness(self) -> Dict[str, object]:
+        """
+        캐시된 프로브 결과로 준비 상태 계산 (DB/NIM 호출 없음)
+
+        NIM 장애는 모든 파드에 공통이므로 준비 상태에는 영향을 주지 않고 degraded로만 표시합니다.
+        """
+        pool = pool_status(self.engine)
+        saturation = pool.get("saturation")
+        ready = (
+            self.db.status == "ok"
+            and not self.is_stale()
+            and (saturation is None or saturation < settings.health_pool_saturation_limit)
+        )
+        breaker = nim_breaker.snapshot()
+        degraded = self.nim.status == "error" or breaker["state"] != "closed"
+        return {
+            "status": "ready" if ready else "not_ready",
+            "degraded": degraded,
+            "checks": {
+                "database": self.db.as_dict(),
+                "nim": self.nim.as_dict(),
+            },
+            "pool": pool,
+            "breakers": {"nim": breaker},
+        }
@@ -0,0 +1,531 @@
+"""
+백그라운드 작업 프레임워크
+요청 밖에서 실행할 작업(보존 정리, 알림, 점수 계산, AI 보강 등)을 background_jobs 테이블에 기록하고
+각 uvicorn 워커의 JobRunner가 lifespan 동안 폴링해 실행합니다.
+
+- 내구성: 작업은 DB 행이므로 재시작해도 사라지지 않고, 실패하면 지수 백오프로 max_attempts까지 재시도합니다.
+- 중복 실행 방지: 작업을 가져갈 때 조건부 UPDATE(상태가 그대로일 때만)로 임대(lease)를 얻고,
+  실행 중에는 하트비트로 임대를 연장합니다. 워커가 죽어 임대가 만료되면 다른 워커가 다시 가져갑니다.
+  (SQLite에는 SKIP LOCKED가 없으므로 두 DB에서 같은 방식을 사용)
+- cron: @job(cron="30 3 * * *")으로 등록한 작업은 실행 시각마다 dedupe_key로 한 번만 등록되어,
+  워커가 여러 개여도 한 워커에서만 실행됩니다. (UTC 기준)
+- 큐별 동시 실행 수 제한 (JOB_QUEUES), 종료 시 실행 중인 작업을 JOB_DRAIN_TIMEOUT초까지 기다리고
+  끝나지 않은 작업은 임대를 반납해 다른 워커가 바로 이어서 실행합니다.
+
+at-least-once이므로 핸들러는 여러 번 실행되어도 안전해야 합니다.
+payload에 user_id가 있는 작업(AI 보강 등 사용자 요청 작업)은 끝나면 같은 트랜잭션에서
+job.succeeded/job.failed 이벤트를 아웃박스에 기록합니다. (WebSocket 푸시 등)
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import dialect_insert
+from models import BackgroundJob, utcnow
+from utils import metrics
+from utils.outbox import record_event
+
+logger = logging.getLogger(__name__)
+
+def parse_queues(value: str) -> Dict[str, int]:
+    """'default=4,maintenance=1' → {"default": 4, "maintenance": 1}"""
+    queues = {}
+    for item in value.split(","):
+        name, _, concurrency = item.strip().partition("=")
+        if name:
+            queues[name] = max(int(concurrency or 1), 1)
+    return queues
+
+
+# ========== cron ==========
+def _parse_cron_field(field: str, low: int, high: int) -> Set[int]:
+    """cron 필드 하나 ('*', '*/15', '1-5', '0,30', '10-50/10')"""
+    values: Set[int] = set()
+    for part in field.split(","):
+        base, _, step = part.partition("/")
+        if base == "*":
+            start, end = low, high
+        elif "-" in base:
+            start, end = (int(bound) for bound in base.split("-", 1))
+        else:
+            start = int(base)
+            end = high if step else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron 값이 범위({low}-{high})를 벗어났습니다: {part}")
+        values.update(range(start, end + 1, int(step) if step else 1))
+    return values
+
+
+class CronSchedule:
+    """
+    5필드 cron 표현식 (분 시 일 월 요일, UTC)
+
+    요일은 0(일요일)~6, 7도 일요일로 취급합니다.
+    일과 요일을 둘 다 지정하면 표준 cron처럼 둘 중 하나만 맞아도 실행합니다.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드여야 합니다: {expression!r}")
+        self.expression = expression
+        self.minutes = _parse_cron_field(fields[0], 0, 59)
+        self.hours = _parse_cron_field(fields[1], 0, 23)
+        self.days = _parse_cron_field(fields[2], 1, 31)
+        self.months = _parse_cron_field(fields[3], 1, 12)
+        self.weekdays = {day % 7 for day in _parse_cron_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, value: datetime) -> bool:
+        day_ok = value.day in self.days
+        weekday_ok = (value.weekday() + 1) % 7 in self.weekdays  # 파이썬은 월요일이 0
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """after 이후(같은 분 제외) 첫 실행 시각"""
+        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = current + timedelta(days=366 * 4)  # 2월 29일만 지정한 경우까지
+        while current < limit:
+            if current.month not in self.months:
+                months = current.year * 12 + current.month  # 다음 달 1일
+                current = datetime(months // 12, months % 12 + 1, 1)
+            elif not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+            elif current.hour not in self.hours:
+                current = current.replace(minute=0) + timedelta(hours=1)
+            elif current.minute not in self.minutes:
+                current += timedelta(minutes=1)
+            else:
+                return current
+        raise ValueError(f"실행 시각이 없는 cron 표현식입니다: {self.expression!r}")
+
+
+# ========== 작업 등록 ==========
+JobHandler = Callable[[AsyncSession, dict], Awaitable[Optional[dict]]]
+
+
+class JobDefinition(NamedTuple):
+    """등록된 작업"""
+    name: str
+    handler: JobHandler
+    queue: str
+    cron: Optional[CronSchedule]
+    max_attempts: int
+    timeout: Optional[float]  # 초, None이면 제한 없음
+
+
+class JobRegistry:
+    """작업 이름 → 핸들러"""
+
+    def __init__(self):
+        self._jobs: Dict[str, JobDefinition] = {}
+
+    def job(
+        self,
+        name: str,
+        queue: str = "default",
+        cron: Optional[str] = None,
+        max_attempts: int = 3,
+        timeout: Optional[float] = None
+    ) -> Callable[[JobHandler], JobHandler]:
+        """
+        작업 핸들러 등록 데코레이터
+
+        핸들러는 async def handler(db, payload) 형태이며, 반환값(dict)은 작업 결과로 저장됩니다.
+        핸들러가 끝나면 JobRunner가 db를 커밋합니다. (긴 작업은 핸들러 안에서 나눠 커밋해도 됨)
+
+        Args:
+            name: 작업 이름 (enqueue에 사용)
+            queue: 실행할 큐 (큐별로 동시 실행 수 제한)
+            cron: 주기 실행 cron 표현식 (UTC, 선택적)
+            max_attempts: 최대 시도 횟수
+            timeout: 1회 실행 제한 시간 (초)
+        """
+        def decorator(handler: JobHandler) -> JobHandler:
+            if name in self._jobs:
+                raise ValueError(f"이미 등록된 작업입니다: {name}")
+            self._jobs[name] = JobDefinition(
+                name, handler, queue, CronSchedule(cron) if cron else None, max_attempts, timeout
+            )
+            return handler
+        return decorator
+
+    def get(self, name: str) -> JobDefinition:
+        definition = self._jobs.get(name)
+        if definition is None:
+            raise ValueError(f"등록되지 않은 작업입니다: {name}")
+        return definition
+
+    def names(self, queue: str) -> List[str]:
+        return [definition.name for definition in self._jobs.values() if definition.queue == queue]
+
+    def queues(self) -> Set[str]:
+        return {definition.queue for definition in self._jobs.values()}
+
+    def scheduled(self) -> List[JobDefinition]:
+        return [definition for definition in self._jobs.values() if definition.cron is not None]
+
+
+job_registry = JobRegistry()
+job = job_registry.job
+
+
+async def enqueue(
+    db: AsyncSession,
+    name: str,
+    payload: Optional[dict] = None,
+    run_at: Optional[datetime] = None,
+    dedupe_key: Optional[str] = None,
+    registry: JobRegistry = job_registry
+) -> Optional[str]:
+    """
+    작업 등록 (커밋은 호출한 쪽에서, 요청 트랜잭션과 함께 커밋되므로 롤백되면 작업도 등록되지 않음)
+
+    Args:
+        db: 데이터베이스 세션
+        name: 등록된 작업 이름
+        payload: 핸들러에 전달할 인자 (JSON 직렬화 가능해야 함)
+        run_at: 이 시각 이후에 실행 (기본값: 즉시)
+        dedupe_key: 같은 키의 작업이 이미 있으면 등록하지 않음
+
+    Returns:
+        작업 ID (dedupe_key가 겹쳐 등록하지 않았으면 None)
+    """
+    definition = registry.get(name)
+    now = utcnow()
+    statement = dialect_insert(BackgroundJob).values(
+        id=str(uuid.uuid4()),
+        queue=definition.queue,
+        name=name,
+        payload=json.dumps(payload or {}, ensure_ascii=False, default=str),
+        status="queued",
+        dedupe_key=dedupe_key,
+        max_attempts=definition.max_attempts,
+        run_at=run_at or now,
+        created_at=now,
+    )
+    if dedupe_key is not None:
+        statement = statement.on_conflict_do_nothing(index_elements=[BackgroundJob.dedupe_key])
+    result = await db.execute(statement.returning(BackgroundJob.id))
+    return result.scalar_one_or_none()
+
+
+async def purge_finished_jobs(db: AsyncSession, older_than: Optional[datetime] = None) -> int:
+    """보관 기간이 지난 완료/실패 작업 행 삭제 (커밋은 호출자가)"""
+    cutoff = older_than or utcnow() - timedelta(days=settings.job_retention_days)
+    result = await db.execute(
+        delete(BackgroundJob)
+        .where(BackgroundJob.status.in_(("succeeded", "failed")), BackgroundJob.finished_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+# ========== 실행기 ==========
+class ClaimedJob(NamedTuple):
+    """임대를 얻은 작업"""
+    id: str
+    queue: str
+    name: str
+    payload: Optional[str]
+    attempts: int
+    max_attempts: int
+    run_at: datetime
+
+
+class JobRunner:
+    """
+    워커 프로세스마다 하나씩 실행되는 작업 폴러
+
+    사용 예 (lifespan):
+        runner = JobRunner(AsyncSessionLocal)
+        runner.start()
+        ...
+        await runner.stop()
+    """
+
+    def __init__(self, session_factory, registry: JobRegistry = job_registry, queues: Optional[Dict[str, int]] = None):
+        self.session_factory = session_factory
+        self.registry = registry
+        self.concurrency = parse_queues(settings.job_queues) if queues is None else dict(queues)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._running: Dict[str, asyncio.Task] = {}
+        self._running_count: Dict[str, int] = {}
+        self._lost_leases: Set[str] = set()
+        self._next_fire: Dict[str, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def queues(self) -> Set[str]:
+        return set(self.concurrency) | self.registry.queues()
+
+    def start(self) -> None:
+        if self._task is None:
+            now = utcnow()
+            # 꺼져 있던 동안 놓친 cron 실행은 몰아서 하지 않고 다음 시각부터
+            self._next_fire = {definition.name: definition.cron.next_after(now) for definition in self.registry.scheduled()}
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = settings.job_drain_timeout) -> None:
+        """새 작업을 가져오지 않고, 실행 중인 작업을 timeout초까지 기다린 뒤 남은 작업은 취소하고 임대 반납"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        tasks = list(self._running.values())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                logger.warning("종료 대기 시간 초과로 작업 %d개를 중단하고 임대를 반납합니다", len(pending))
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("백그라운드 작업 폴링 실패")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.job_poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def poll_once(self) -> int:
+        """
+        폴링 1회: 때가 된 cron 작업 등록, 대기열 길이 갱신, 큐별 빈 슬롯만큼 작업을 가져와 실행
+
+        Returns:
+            실행을 시작한 작업 수
+        """
+        now = utcnow()
+        await self._schedule_due(now)
+        if metrics.enabled:
+            await self._update_depth(now)
+        started = 0
+        for queue in self.queues():
+            free = self.concurrency.get(queue, 1) - self._running_count.get(queue, 0)
+            if free <= 0 or self._stopping:
+                continue
+            for claimed in await self._claim(queue, free, now):
+                self._spawn(claimed)
+                started += 1
+        return started
+
+    async def _schedule_due(self, now: datetime) -> None:
+        """실행 시각이 된 cron 작업 등록 (모든 워커가 등록을 시도하지만 dedupe_key로 한 번만 들어감)"""
+        due = [(name, fire) for name, fire in self._next_fire.items() if fire <= now]
+        if not due:
+            return
+        async with self.session_factory() as db:
+            for name, fire in due:
+                await enqueue(db, name, run_at=fire, dedupe_key=f"cron:{name}:{fire:%Y-%m-%dT%H:%M}", registry=self.registry)
+            await db.commit()
+        for name, fire in due:
+            self._next_fire[name] = self.registry.get(name).cron.next_after(max(fire, now))
+
+    async def _update_depth(self, now: datetime) -> None:
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(BackgroundJob.queue, func.count())
+                .where(BackgroundJob.status == "queued", BackgroundJob.run_at <= now)
+                .group_by(BackgroundJob.queue)
+            )
+            depth = dict(rows.all())
+        for queue in self.queues() | set(depth):
+            metrics.job_queue_depth.set(depth.get(queue, 0), (queue,))
+
+    async def _claim(self, queue: str, limit: int, now: datetime) -> List[ClaimedJob]:
+        """
+        대기 중이거나 임대가 만료된 작업을 limit개까지 가져옴
+
+        후보를 읽은 뒤 같은 조건을 건 UPDATE ... RETURNING으로 하나씩 임대를 얻으므로,
+        여러 워커가 같은 후보를 읽어도 UPDATE에 성공한 워커 하나만 실행합니다.
+        이 워커에 등록된 작업만 가져옵니다. (배포 중 구버전/신버전 워커가 섞여 있을 때)
+        """
+        names = self.registry.names(queue)
+        if not names:
+            return []
+        claimable = or_(
+            and_(BackgroundJob.status == "queued", BackgroundJob.run_at <= now),
+            and_(BackgroundJob.status == "running", BackgroundJob.lease_expires_at < now),
+        )
+        claimed: List[ClaimedJob] = []
+        async with self.session_factory() as db:
+            candidates = (await db.execute(
+                select(BackgroundJob.id)
+                .where(BackgroundJob.queue == queue, BackgroundJob.name.in_(names), claimable)
+                .order_by(BackgroundJob.run_at)
+                .limit(limit)
+            )).scalars().all()
+            for job_id in candidates:
+                row = (await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id == job_id, claimable)
+                    .values(
+                        status="running",
+                        locked_by=self.worker_id,
+                        lease_expires_at=now + timedelta(seconds=settings.job_lease_seconds),
+                        started_at=now,
+                        attempts=BackgroundJob.attempts + 1,
+                    )
+                    .returning(
+                        BackgroundJob.id, BackgroundJob.queue, BackgroundJob.name, BackgroundJob.payload,
+                        BackgroundJob.attempts, BackgroundJob.max_attempts, BackgroundJob.run_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )).first()
+                await db.commit()
+                if row is not None:
+                    claimed.append(ClaimedJob(*row))
+        return claimed
+
+    def _spawn(self, claimed: ClaimedJob) -> None:
+        task = asyncio.create_task(self._execute(claimed))
+        self._running[claimed.id] = task
+        self._running_count[claimed.queue] = self._running_count.get(claimed.queue, 0) + 1
+        metrics.jobs_running.inc((claimed.queue,))
+
+        def _done(_task: asyncio.Task) -> None:
+            self._running.pop(claimed.id, None)
+            self._lost_leases.discard(claimed.id)
+            self._running_count[claimed.queue] -= 1
+            metrics.jobs_running.dec((claimed.queue,))
+            self._wakeup.set()  # 빈 슬롯을 바로 채우도록
+
+        task.add_done_callback(_done)
+
+    async def _execute(self, claimed: ClaimedJob) -> None:
+        """작업 1회 실행 (성공/재시도/실패 기록)"""
+        labels = (claimed.queue, claimed.name)
+        if claimed.attempts > claimed.max_attempts:
+            # 실행 중 워커가 죽어 임대가 만료된 작업이 시도 횟수를 다 쓴 경우
+            await self._finish(claimed.id, status="failed", last_error="최대 시도 횟수 초과 (임대 만료)")
+            metrics.job_runs_total.inc(labels + ("failed",))
+            return
+        if metrics.enabled:
+            wait = (utcnow() - claimed.run_at).total_seconds()
+            metrics.job_wait_seconds.observe(max(wait, 0.0), (claimed.queue,))
+
+        definition = self.registry.get(claimed.name)
+        payload = json.loads(claimed.payload or "{}")
+        heartbeat = asyncio.create_task(self._heartbeat(claimed.id, asyncio.current_task()))
+        started = time.perf_counter()
+        try:
+            try:
+                async with self.session_factory() as db:
+                    result = await asyncio.wait_for(
+                        definition.handler(db, payload), timeout=definition.timeout
+                    )
+                    await db.commit()
+            finally:
+                heartbeat.cancel()
+        except asyncio.CancelledError:
+            if claimed.id not in self._lost_leases:
+                # 종료 중 중단: 시도 횟수를 되돌리고 임대를 반납해 다른 워커가 바로 가져가게 함
+                await self._finish(
+                    claimed.id, status="queued", locked_by=None, lease_expires_at=None, finished_at=None,
+                    attempts=BackgroundJob.attempts - 1, run_at=utcnow()
+                )
+            metrics.job_runs_total.inc(labels + ("interrupted",))
+            raise
+        except Exception as exc:
+            error = f"{exc.__class__.__name__}: {exc}"[:1000]
+            if claimed.attempts < claimed.max_attempts:
+                delay = settings.job_retry_base_seconds * 2 ** (claimed.attempts - 1)
+                logger.warning("작업 실패, %.0f초 후 재시도 (%s %s): %s", delay, claimed.name, claimed.id, error)
+                await self._finish(
+                    claimed.id, status="queued", locked_by=None, lease_expires_at=None, finished_at=None,
+                    last_error=error, run_at=utcnow() + timedelta(seconds=delay)
+                )
+                outcome = "retried"
+            else:
+                logger.exception("작업 실패 (%s %s)", claimed.name, claimed.id)
+                await self._finish(
+                    claimed.id, status="failed", last_error=error,
+                    event=self._event("job.failed", claimed, payload, {"error": error})
+                )
+                outcome = "failed"
+        else:
+            await self._finish(
+                claimed.id, status="succeeded",
+                result=json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                event=self._event("job.succeeded", claimed, payload, {"result": result})
+            )
+            outcome = "succeeded"
+        metrics.job_runs_total.inc(labels + (outcome,))
+        metrics.job_duration_seconds.observe(time.perf_counter() - started, labels)
+
+    @staticmethod
+    def _event(event_type: str, claimed: ClaimedJob, payload: dict, data: dict) -> Optional[Tuple[str, str, dict]]:
+        """사용자 요청 작업(payload에 user_id)이면 기록할 완료 이벤트 (유형, 사용자 ID, 데이터)"""
+        user_id = payload.get("user_id") if isinstance(payload, dict) else None
+        if not user_id:
+            return None
+        return event_type, user_id, {"job_id": claimed.id, "name": claimed.name, **data}
+
+    async def _finish(self, job_id: str, event: Optional[Tuple[str, str, dict]] = None, **values) -> None:
+        """작업 결과 기록 (이 워커가 임대를 갖고 있을 때만, 완료 이벤트도 같은 트랜잭션으로)"""
+        values.setdefault("finished_at", utcnow())
+        values.setdefault("lease_expires_at", None)
+        try:
+            async with self.session_factory() as db:
+                result = await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id == job_id, BackgroundJob.locked_by == self.worker_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if event is not None and result.rowcount == 1:
+                    event_type, user_id, data = event
+                    await record_event(db, event_type, job_id, user_id=user_id, payload=data)
+                await db.commit()
+        except Exception:
+            # 기록하지 못하면 임대가 만료된 뒤 다시 실행됨 (at-least-once)
+            logger.exception("작업 상태 기록 실패 (job %s)", job_id)
+
+    async def _heartbeat(self, job_id: str, task: asyncio.Task) -> None:
+        """임대 연장, 다른 워커가 임대를 가져갔으면 실행 중인 작업을 취소"""
+        while True:
+            await asyncio.sleep(settings.job_lease_seconds / 3)
+            try:
+                async with self.session_factory() as db:
+                    result = await db.execute(
+                        update(BackgroundJob)
+                        .where(
+                            BackgroundJob.id == job_id,
+                            BackgroundJob.locked_by == self.worker_id,
+                            BackgroundJob.status == "running",
+                        )
+                        .values(lease_expires_at=utcnow() + timedelta(seconds=settings.job_lease_seconds))
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+            except Exception:
+                # SQLite에서 작업 자신의 긴 쓰기 트랜잭션에 막힌 경우 등, 다음 주기에 다시 시도
+                logger.warning("하트비트 실패 (job %s)", job_id, exc_info=True)
+                continue
+            if result.rowcount == 0:
+                logger.warning("임대를 잃어 작업을 중단합니다 (job %s)", job_id)
+                self._lost_leases.add(job_id)
+                task.cancel()
+                return
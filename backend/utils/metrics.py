@@ -0,0 +1,428 @@
+"""
+Prometheus 형식 메트릭 수집 유틸리티
+외부 라이브러리 없이 카운터/게이지/히스토그램을 메모리에 집계하고 /metrics에서 텍스트로 노출합니다.
+
+- 요청 경로(이벤트 루프 스레드)에서 값 갱신은 dict 조회 + 정수 덧셈뿐이며 락을 쓰지 않습니다.
+  (asyncio는 단일 스레드, SQLAlchemy 엔진 이벤트도 같은 스레드의 greenlet에서 실행됨)
+- 히스토그램은 버킷 경계를 미리 정해두고 bisect로 버킷 하나만 증가시킵니다.
+- uvicorn 워커가 여러 개면 워커마다 값이 따로 집계됩니다. (Prometheus에서 인스턴스별로 합산)
+"""
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+from config import settings
+
+# 런타임 토글 (METRICS_ENABLED=false면 미들웨어와 DB 이벤트가 아무것도 하지 않음)
+enabled = settings.metrics_enabled
+
+# 지연 시간 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# NIM 호출은 수 초 단위이므로 버킷을 넓게
+NIM_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+# 요청당 쿼리 수 버킷
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+# 백그라운드 작업 대기/실행 시간 버킷 (초)
+JOB_LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape_label(value) -> str:
+    """라벨 값의 역슬래시, 큰따옴표, 줄바꿈 이스케이프"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    """라벨을 Prometheus 텍스트 형식으로 변환 (예: {method="GET",route="/api/personas/"})"""
+    parts = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    """정수는 소수점 없이, 실수는 repr로 출력"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """메트릭 공통 속성 (이름, 설명, 라벨 이름)"""
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """단조 증가 카운터"""
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+            for labels, value in list(self._values.items())
+        ]
+
+
+class Gauge(Metric):
+    """증가/감소 가능한 현재 값 (예: 처리 중인 요청 수)"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels: LabelValues = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, labels: LabelValues = ()) -> None:
+        self._values[labels] = value
+
+    def get(self, labels: LabelValues = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_number(value)}"
+            for labels, value in list(self._values.items())
+        ]
+
+
+class Histogram(Metric):
+    """
+    미리 정한 버킷 경계를 쓰는 히스토그램
+
+    관측 시에는 해당 버킷 하나만 증가시키고, 누적 합(le)은 출력할 때 계산합니다.
+    """
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., +Inf 개수, 합계]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        series = self._values.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def sum(self, labels: LabelValues = ()) -> float:
+        series = self._values.get(labels)
+        return series[-1] if series else 0.0
+
+    def samples(self) -> List[str]:
+        lines = []
+        for labels, series in list(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else _format_number(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_number(series[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """메트릭 등록 및 텍스트 출력"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus 텍스트 노출 형식 (text/plain; version=0.0.4)"""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+# HTTP
+http_requests_total = registry.counter(
+    "http_requests_total", "처리한 HTTP 요청 수", ("method", "route", "status")
+)
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간 (초)", ("method", "route")
+)
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "현재 처리 중인 HTTP 요청 수", ("method",)
+)
+
+# DB
+db_queries_total = registry.counter(
+    "db_queries_total", "실행한 SQL 문 수", ("operation",)
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds", "SQL 문 실행 시간 (초)", ("operation",)
+)
+db_queries_per_request = registry.histogram(
+    "db_queries_per_request", "HTTP 요청 하나당 실행한 SQL 문 수", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+db_pool_checkout_seconds = registry.histogram(
+    "db_pool_checkout_seconds", "커넥션 풀에서 커넥션을 얻기까지 기다린 시간 (초)"
+)
+
+# NVIDIA NIM
+nim_requests_total = registry.counter(
+    "nim_requests_total", "NIM API 호출 수", ("model", "outcome")
+)
+nim_request_duration_seconds = registry.histogram(
+    "nim_request_duration_seconds", "NIM API 응답 시간 (초)", ("model",), NIM_LATENCY_BUCKETS
+)
+nim_tokens_total = registry.counter(
+    "nim_tokens_total", "NIM API 사용 토큰 수", ("model", "kind")
+)
+
+# 백그라운드 작업 (utils/jobs.py)
+job_runs_total = registry.counter(
+    "job_runs_total", "실행한 백그라운드 작업 수", ("queue", "name", "outcome")
+)
+job_duration_seconds = registry.histogram(
+    "job_duration_seconds", "백그라운드 작업 실행 시간 (초)", ("queue", "name"), JOB_LATENCY_BUCKETS
+)
+job_wait_seconds = registry.histogram(
+    "job_wait_seconds", "예정 시각부터 실행을 시작하기까지 기다린 시간 (초)", ("queue",), JOB_LATENCY_BUCKETS
+)
+job_queue_depth = registry.gauge(
+    "job_queue_depth", "실행 시각이 되어 대기 중인 백그라운드 작업 수 (모든 워커 합계)", ("queue",)
+)
+jobs_running = registry.gauge(
+    "jobs_running", "이 워커에서 실행 중인 백그라운드 작업 수", ("queue",)
+)
+
+# 아웃박스 (utils/outbox.py)
+outbox_events_delivered_total = registry.counter(
+    "outbox_events_delivered_total", "소비자에게 전달한 아웃박스 이벤트 수", ("consumer",)
+)
+outbox_dispatch_errors_total = registry.counter(
+    "outbox_dispatch_errors_total", "소비자 처리 실패 수 (같은 이벤트를 다시 전달)", ("consumer",)
+)
+outbox_event_age_seconds = registry.histogram(
+    "outbox_event_age_seconds", "이벤트 기록부터 소비자 처리 완료까지 걸린 시간 (초)", ("consumer",), JOB_LATENCY_BUCKETS
+)
+outbox_consumer_lag = registry.gauge(
+    "outbox_consumer_lag", "소비자가 아직 처리하지 않은 이벤트 수 (id 기준)", ("consumer",)
+)
+
+# 실시간 푸시 (utils/push.py)
+ws_connections = registry.gauge("ws_connections", "이 워커에 열려 있는 푸시 WebSocket 연결 수")
+push_messages_total = registry.counter(
+    "push_messages_total", "WebSocket으로 보낸 푸시 메시지 수 (연결 기준, ping 제외)", ("type",)
+)
+
+
+# 현재 요청에서 실행한 SQL 문 수 (요청마다 MetricsMiddleware가 [0]으로 설정)
+_request_query_count: ContextVar[Optional[List[int]]] = ContextVar("request_query_count", default=None)
+
+
+def _route_template(scope) -> str:
+    """
+    매칭된 라우트의 경로 템플릿 (예: /api/personas/{persona_id})
+
+    라벨 수가 폭증하지 않도록 실제 경로 대신 사용합니다.
+    include_router의 prefix가 route.path에 포함되지 않는 FastAPI 버전도 있으므로,
+    실제 경로에서 경로 파라미터 값과 같은 세그먼트를 {이름}으로 되돌려 만듭니다.
+    """
+    if scope.get("route") is None:
+        return "unmatched"  # 404 스캔 등으로 라벨이 늘어나지 않도록 하나로 묶음
+    params = {str(value): name for name, value in scope.get("path_params", {}).items()}
+    if not params:
+        return scope["path"]
+    return "/".join(
+        "{" + params[segment] + "}" if segment in params else segment
+        for segment in scope["path"].split("/")
+    )
+
+
+class MetricsMiddleware:
+    """
+    요청별 지연 시간/상태 코드/처리 중 요청 수/요청당 쿼리 수를 기록하는 ASGI 미들웨어
+
+    사용 예: app.add_middleware(MetricsMiddleware)
+    """
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ("/metrics", "/health", "/health/live", "/health/ready")):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if not enabled or scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        query_count = [0]
+        token = _request_query_count.set(query_count)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc((method,))
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec((method,))
+            _request_query_count.reset(token)
+            route = _route_template(scope)
+            http_requests_total.inc((method, route, str(status_code)))
+            http_request_duration_seconds.observe(elapsed, (method, route))
+            db_queries_per_request.observe(query_count[0], (method, route))
+
+
+def _statement_operation(statement: str) -> str:
+    """SQL 문의 첫 키워드 (SELECT/INSERT/UPDATE/DELETE/...)"""
+    head = statement.lstrip()[:16].split(None, 1)
+    return head[0].upper() if head else "OTHER"
+
+
+def instrument_engine(engine) -> None:
+    """
+    SQLAlchemy 엔진에 쿼리 수/지연 시간, 커넥션 풀 대기 시간 측정을 연결
+
+    Args:
+        engine: AsyncEngine 또는 Engine
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if enabled:
+            conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_stack = conn.info.get("query_started")
+        if not started_stack:
+            return
+        elapsed = time.perf_counter() - started_stack.pop()
+        operation = _statement_operation(statement)
+        db_queries_total.inc((operation,))
+        db_query_duration_seconds.observe(elapsed, (operation,))
+        query_count = _request_query_count.get()
+        if query_count is not None:
+            query_count[0] += 1
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        # 실패한 쿼리의 시작 시각이 스택에 남지 않도록 정리
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+    # 풀에는 "체크아웃 전" 이벤트가 없으므로 pool.connect를 감싸서 대기 시간을 잼
+    _instrument_pool(sync_engine.pool)
+
+    @event.listens_for(sync_engine, "engine_disposed")
+    def _engine_disposed(disposed_engine):
+        # dispose()는 새 풀을 만들므로 다시 감싸기
+        _instrument_pool(disposed_engine.pool)
+
+
+def _instrument_pool(pool) -> None:
+    """pool.connect 호출 시간을 db_pool_checkout_seconds에 기록 (중복 적용 방지)"""
+    if getattr(pool, "_metrics_instrumented", False):
+        return
+    original_connect = pool.connect
+
+    def timed_connect():
+        if not enabled:
+            return original_connect()
+        started = time.perf_counter()
+        try:
+            return original_connect()
+        finally:
+            db_pool_checkout_seconds.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+    pool._metrics_instrumented = True
+
+
+def record_nim_call(model: str, elapsed: float, outcome: str, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+    """
+    NIM API 호출 결과 기록
+
+    Args:
+        model: 모델 이름
+        elapsed: 응답 시간 (초)
+        outcome: "success" 또는 "error"
+        prompt_tokens: 입력 토큰 수
+        completion_tokens: 출력 토큰 수
+    """
+    if not enabled:
+        return
+    nim_requests_total.inc((model, outcome))
+    nim_request_duration_seconds.observe(elapsed, (model,))
+    if prompt_tokens:
+        nim_tokens_total.inc((model, "prompt"), prompt_tokens)
+    if completion_tokens:
+        nim_tokens_total.inc((model, "completion"), completion_tokens)
@@ -0,0 +1,359 @@
+"""
+버전별 스키마 마이그레이션
+앱 시작 시(init_db) 또는 tools/migrate.py로 migrations/ 패키지의 마이그레이션을 버전 순서대로 적용하고
+schema_migrations 테이블에 기록합니다.
+
+- 이미 최신이면 schema_migrations만 읽고 끝나므로, 시작할 때 DDL을 실행하지 않습니다.
+- 잠금: 여러 워커가 동시에 시작해도 한 워커만 적용하고, 나머지는 기다렸다가 최신인 것을 확인하고 넘어갑니다.
+  워커가 죽으면 잠금은 자동으로 풀립니다.
+  - PostgreSQL: 세션 advisory lock. pg_try_advisory_lock을 주기적으로 다시 시도하므로 기다리는 워커는 트랜잭션을 열고 있지 않아,
+    적용 중인 CREATE INDEX CONCURRENTLY가 기다리는 워커 때문에 멈추지 않습니다.
+  - SQLite: BEGIN IMMEDIATE 쓰기 트랜잭션 하나로 모든 마이그레이션을 적용 (DDL도 트랜잭션에 포함, 실패하면 전부 롤백)
+    테이블을 다시 만들 수 있도록 외래 키 검사를 끄고 적용한 뒤, 커밋 전에 PRAGMA foreign_key_check로 한 번에 확인합니다.
+- PostgreSQL에서 트랜잭션 밖에서 실행해야 하는 마이그레이션(CREATE INDEX CONCURRENTLY)은 TRANSACTIONAL = False로 선언합니다.
+
+마이그레이션 모듈 (migrations/vNNNN_<이름>.py):
+    DESCRIPTION = "설명"
+    TRANSACTIONAL = True  # 선택 (기본 True)
+    def upgrade(connection): ...  # 동기 커넥션 (run_sync)
+
+0001은 마이그레이션 도입 전(create_all)의 기준 스키마이고, 이후의 모든 스키마 변경은 마이그레이션으로만 추가합니다.
+마이그레이션은 models.py나 services/, utils/의 앱 코드를 참조하지 않고 그 시점의 테이블/컬럼/인덱스 정의와
+트리거 SQL, 데이터 변환 함수를 모듈 안에 고정해 두므로, 앱 코드가 나중에 바뀌어도 같은 DDL을 실행합니다. (새 DB와 기존 DB 모두 0001부터 같은 순서로 적용)
+models.py를 바꾸면 같은 변경을 하는 마이그레이션을 함께 추가합니다.
+
+마이그레이션 도입 중에 create_all로 만든 DB에도 적용할 수 있도록, 아래 헬퍼와 마이그레이션은 이미 있으면 건너뜁니다.
+"""
+import asyncio
+import importlib
+import logging
+import pkgutil
+import re
+import time
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+from sqlalchemy import (
+    CheckConstraint, Column, DateTime, ForeignKeyConstraint, Index, MetaData, String, Table, UniqueConstraint,
+    inspect, insert, select, text
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from config import settings
+from models import utcnow
+
+logger = logging.getLogger(__name__)
+
+_LOCK_RETRY_SECONDS = 1.0
+# PostgreSQL advisory lock 키 (이 앱의 마이그레이션 전용 고정 값)
+_PG_LOCK_KEY = 7_311_470_295
+
+# 마이그레이션 실행기만 사용 (0001보다 먼저 있어야 함)
+schema_migrations = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", String, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    """마이그레이션 모듈 하나"""
+    version: str  # "0001"
+    name: str  # 모듈 이름 (v0001_initial)
+    description: str
+    upgrade: Callable[[Connection], None]
+    transactional: bool
+
+
+def load_migrations(package: str = "migrations") -> List[Migration]:
+    """패키지에서 vNNNN_<이름> 모듈을 찾아 버전 순으로 반환"""
+    root = importlib.import_module(package)
+    migrations = []
+    for info in pkgutil.iter_modules(root.__path__):
+        match = re.fullmatch(r"v(\d{4})_\w+", info.name)
+        if match is None:
+            continue
+        module = importlib.import_module(f"{package}.{info.name}")
+        migrations.append(Migration(
+            match.group(1), info.name, module.DESCRIPTION, module.upgrade, getattr(module, "TRANSACTIONAL", True)
+        ))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f"마이그레이션 버전이 중복되었습니다: {versions}")
+    return migrations
+
+
+def applied_versions(connection: Connection) -> Set[str]:
+    """적용된 버전 (schema_migrations가 없으면 빈 집합)"""
+    if not connection.dialect.has_table(connection, schema_migrations.name):
+        return set()
+    return set(connection.execute(select(schema_migrations.c.version)).scalars())
+
+
+async def pending_migrations(engine: AsyncEngine, migrations: Optional[List[Migration]] = None) -> List[Migration]:
+    """아직 적용하지 않은 마이그레이션 (시작 시 "최신인지" 확인용, 쿼리 1~2개)"""
+    migrations = load_migrations() if migrations is None else migrations
+    async with engine.connect() as connection:
+        applied = await connection.run_sync(applied_versions)
+    return [migration for migration in migrations if migration.version not in applied]
+
+
+async def migrate(engine: AsyncEngine, migrations: Optional[List[Migration]] = None) -> List[str]:
+    """
+    적용하지 않은 마이그레이션을 잠금을 잡고 순서대로 적용
+
+    Args:
+        engine: 비동기 엔진
+        migrations: 적용할 마이그레이션 목록 (기본값: migrations/ 패키지)
+
+    Returns:
+        이 호출에서 적용한 버전 목록 (이미 최신이거나 다른 워커가 적용했으면 빈 목록)
+
+    Raises:
+        RuntimeError: MIGRATION_LOCK_TIMEOUT 동안 잠금을 얻지 못했을 때
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    if not await pending_migrations(engine, migrations):
+        return []
+    if engine.dialect.name == "postgresql":
+        return await _migrate_postgresql(engine, migrations)
+    return await _migrate_sqlite(engine, migrations)
+
+
+async def _migrate_sqlite(engine: AsyncEngine, migrations: List[Migration]) -> List[str]:
+    async with engine.connect() as connection:
+        # 드라이버의 자동 BEGIN을 끄고 BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡음
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        # 테이블을 다시 만드는 동안(rebuild_table) 참조가 끊기지 않도록 외래 키 검사를 끔 (트랜잭션 안에서는 바꿀 수 없음)
+        await connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+        try:
+            return await _apply_sqlite(connection, migrations)
+        finally:
+            await connection.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+async def _apply_sqlite(connection, migrations: List[Migration]) -> List[str]:
+    """SQLite: BEGIN IMMEDIATE로 쓰기 잠금을 잡고 한 트랜잭션으로 적용 (커밋 전에 외래 키 위반 확인)"""
+    deadline = time.monotonic() + settings.migration_lock_timeout
+    while True:
+        try:
+            await connection.exec_driver_sql("BEGIN IMMEDIATE")
+            break
+        except OperationalError as exc:
+            if "locked" not in str(exc) or time.monotonic() > deadline:
+                raise
+            logger.info("다른 워커가 마이그레이션 중입니다. 기다립니다.")
+            await asyncio.sleep(_LOCK_RETRY_SECONDS)
+    try:
+        done = await connection.run_sync(_apply_pending, migrations)
+        violations = (await connection.exec_driver_sql("PRAGMA foreign_key_check")).fetchall()
+        if violations:
+            raise RuntimeError(f"마이그레이션 후 외래 키 위반이 남아 있습니다: {violations[:10]}")
+        await connection.exec_driver_sql("COMMIT")
+    except BaseException:
+        await connection.exec_driver_sql("ROLLBACK")
+        raise
+    return done
+
+
+def _apply_pending(connection: Connection, migrations: List[Migration]) -> List[str]:
+    """SQLite: 잠금을 잡은 트랜잭션 안에서 남은 마이그레이션 모두 적용"""
+    schema_migrations.create(connection, checkfirst=True)
+    applied = applied_versions(connection)
+    done = []
+    for migration in migrations:
+        if migration.version not in applied:
+            _apply(connection, migration)
+            done.append(migration.version)
+    return done
+
+
+async def _migrate_postgresql(engine: AsyncEngine, migrations: List[Migration]) -> List[str]:
+    async with engine.connect() as lock_connection:
+        lock_connection = await lock_connection.execution_options(isolation_level="AUTOCOMMIT")
+        deadline = time.monotonic() + settings.migration_lock_timeout
+        while not (await lock_connection.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": _PG_LOCK_KEY}
+        )).scalar():
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{settings.migration_lock_timeout:.0f}초 동안 마이그레이션 잠금을 얻지 못했습니다.")
+            logger.info("다른 워커가 마이그레이션 중입니다. 기다립니다.")
+            await asyncio.sleep(_LOCK_RETRY_SECONDS)
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(schema_migrations.create, checkfirst=True)
+                applied = await connection.run_sync(applied_versions)
+            done = []
+            for migration in migrations:
+                if migration.version in applied:
+                    continue
+                if migration.transactional:
+                    # DDL과 버전 기록을 한 트랜잭션으로
+                    async with engine.begin() as connection:
+                        await connection.run_sync(_apply, migration)
+                else:
+                    # CREATE INDEX CONCURRENTLY 등: 문장마다 자동 커밋 (중간에 실패해도 다시 실행할 수 있게 작성)
+                    async with engine.connect() as connection:
+                        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                        await connection.run_sync(_apply, migration)
+                done.append(migration.version)
+        finally:
+            await lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": _PG_LOCK_KEY})
+    return done
+
+
+def _apply(connection: Connection, migration: Migration) -> None:
+    started = time.perf_counter()
+    migration.upgrade(connection)
+    connection.execute(
+        insert(schema_migrations).values(
+            version=migration.version, description=migration.description, applied_at=utcnow()
+        )
+    )
+    logger.info("마이그레이션 적용: %s (%.0fms)", migration.name, (time.perf_counter() - started) * 1000)
+
+
+def create_index(connection: Connection, index: Index, concurrently: bool = True) -> None:
+    """
+    기존 테이블에 인덱스 생성 (이미 있으면 건너뜀)
+
+    PostgreSQL은 CREATE INDEX CONCURRENTLY로 테이블 쓰기를 막지 않고 만듭니다. (TRANSACTIONAL = False 마이그레이션에서만,
+    파티션 테이블의 부모에는 CONCURRENTLY를 쓸 수 없으므로 concurrently=False)
+    이전 시도가 중간에 실패해 INVALID로 남은 인덱스는 지우고 다시 만듭니다.
+
+    Args:
+        connection: 동기 커넥션
+        index: 마이그레이션 모듈에 고정한 테이블 정의에 붙인 인덱스
+        concurrently: PostgreSQL CREATE INDEX CONCURRENTLY 사용 여부
+    """
+    concurrently = concurrently and connection.dialect.name == "postgresql"
+    if connection.dialect.name == "postgresql":
+        valid = connection.execute(
+            text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {"name": index.name}
+        ).scalar()
+        if valid:
+            return
+        if valid is False:
+            logger.warning("INVALID 인덱스를 다시 만듭니다: %s", index.name)
+            connection.exec_driver_sql(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {index.name}")
+    statement = str(CreateIndex(index, if_not_exists=True).compile(dialect=connection.dialect))
+    if concurrently:
+        statement = statement.replace(" INDEX ", " INDEX CONCURRENTLY ", 1)
+    connection.exec_driver_sql(statement)
+
+
+def add_column(connection: Connection, table_name: str, column: Column) -> None:
+    """
+    기존 테이블에 컬럼 추가 (이미 있으면 건너뜀)
+
+    행이 있는 테이블에 NOT NULL 컬럼을 추가하려면 server_default가 있어야 합니다.
+    SQLite는 ALTER TABLE로 상수가 아닌 기본값(CURRENT_TIMESTAMP 등)을 가진 컬럼을 추가할 수 없으므로 테이블을 다시 만듭니다.
+    외래 키 제약은 추가하지 않습니다. (SQLite는 ALTER TABLE로 제약을 추가할 수 없음)
+
+    Args:
+        connection: 동기 커넥션
+        table_name: 테이블 이름
+        column: 마이그레이션 모듈에 고정한 컬럼 정의 (테이블에 붙이지 않은 Column)
+    """
+    if column.name in {existing["name"] for existing in inspect(connection).get_columns(table_name)}:
+        return
+    default = column.server_default
+    if connection.dialect.name == "sqlite" and default is not None and not isinstance(default.arg, str):
+        rebuild_table(connection, table_name, columns=[column])
+        return
+    table = Table(table_name, MetaData(), column)
+    column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+    connection.exec_driver_sql(
+        f"ALTER TABLE {connection.dialect.identifier_preparer.format_table(table)} ADD COLUMN {column_ddl}"
+    )
+
+
+def drop_not_null(connection: Connection, table_name: str, column_names: Sequence[str]) -> None:
+    """
+    기존 컬럼이 NULL을 허용하도록 변경 (이미 허용하면 건너뜀)
+
+    SQLite는 ALTER TABLE로 제약을 바꿀 수 없으므로 테이블을 다시 만듭니다.
+
+    Args:
+        connection: 동기 커넥션
+        table_name: 테이블 이름
+        column_names: NULL을 허용할 컬럼 이름
+    """
+    existing = {column["name"]: column["nullable"] for column in inspect(connection).get_columns(table_name)}
+    names = [name for name in column_names if not existing[name]]
+    if not names:
+        return
+    if connection.dialect.name == "sqlite":
+        rebuild_table(connection, table_name, nullable=names)
+        return
+    quote = connection.dialect.identifier_preparer.quote
+    connection.exec_driver_sql(
+        f"ALTER TABLE {quote(table_name)} "
+        + ", ".join(f"ALTER COLUMN {quote(name)} DROP NOT NULL" for name in names)
+    )
+
+
+def rebuild_table(
+    connection: Connection,
+    table_name: str,
+    columns: Iterable[Column] = (),
+    primary_key: Optional[Sequence[str]] = None,
+    nullable: Iterable[str] = ()
+) -> None:
+    """
+    SQLite: 테이블을 새로 만들어 행을 옮김 (ALTER TABLE로 할 수 없는 컬럼 추가, 기본 키 변경, NOT NULL 해제)
+
+    현재 테이블을 읽어(reflect) 같은 컬럼과 제약에 columns를 더한 새 테이블을 만들고, 행을 복사한 뒤 이름을 바꿉니다.
+    테이블의 인덱스와 트리거는 sqlite_master의 DDL 그대로 다시 만듭니다.
+    외래 키 검사가 꺼진 마이그레이션 트랜잭션 안에서만 호출합니다. (다른 테이블의 참조는 이름이 같으므로 유지됨)
+
+    Args:
+        connection: 동기 커넥션
+        table_name: 테이블 이름
+        columns: 추가할 컬럼 (마이그레이션 모듈에 고정한 정의)
+        primary_key: 새 기본 키 컬럼 (기본값: 기존 기본 키)
+        nullable: NULL을 허용할 기존 컬럼 이름
+    """
+    metadata = MetaData()
+    old = Table(table_name, metadata, autoload_with=connection)
+    primary_key = list(primary_key or old.primary_key.columns.keys())
+    nullable = set(nullable)
+    copied = [
+        Column(
+            column.name, column.type, nullable=column.nullable or column.name in nullable,
+            primary_key=column.name in primary_key,
+            server_default=column.server_default.arg if column.server_default is not None else None,
+        )
+        for column in old.columns
+    ]
+    added = [column for column in columns if column.name not in old.columns]
+    constraints = []
+    for constraint in old.constraints:
+        if isinstance(constraint, ForeignKeyConstraint):
+            constraints.append(ForeignKeyConstraint(
+                constraint.column_keys, [element.target_fullname for element in constraint.elements],
+                ondelete=constraint.ondelete, onupdate=constraint.onupdate,
+            ))
+        elif isinstance(constraint, UniqueConstraint):
+            constraints.append(UniqueConstraint(*constraint.columns.keys()))
+        elif isinstance(constraint, CheckConstraint):
+            constraints.append(CheckConstraint(constraint.sqltext))
+    new = Table(f"{table_name}__new", metadata, *copied, *added, *constraints)
+
+    saved = connection.exec_driver_sql(
+        "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+        (table_name,)
+    ).scalars().all()
+    new.create(connection)
+    names = ", ".join(connection.dialect.identifier_preparer.quote(column.name) for column in old.columns)
+    connection.exec_driver_sql(f'INSERT INTO "{new.name}" ({names}) SELECT {names} FROM "{table_name}"')
+    connection.exec_driver_sql(f'DROP TABLE "{table_name}"')
+    connection.exec_driver_sql(f'ALTER TABLE "{new.name}" RENAME TO "{table_name}"')
+    for statement in saved:
+        connection.exec_driver_sql(statement)
+    logger.info("테이블을 다시 만들었습니다: %s", table_name)
@@ -0,0 +1,66 @@
+"""
+NDJSON 스트리밍 응답 유틸리티
+목록 엔드포인트에서 Accept: application/x-ndjson을 요청하면, 결과 전체를 리스트로 만들지 않고
+서버 측 커서(stream_scalars)로 청크씩 읽어 한 줄에 객체 하나씩 바로 전송합니다.
+결과 크기와 무관하게 워커 메모리 사용량은 청크 하나 분량으로 일정합니다.
+"""
+from typing import AsyncIterator, Optional, Type
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select
+
+from config import settings
+from database import AsyncSessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# OpenAPI 문서용 (목록 라우트의 responses=에 지정)
+NDJSON_RESPONSES = {
+    200: {
+        "content": {NDJSON_MEDIA_TYPE: {"schema": {"type": "string", "description": "한 줄에 JSON 객체 하나"}}},
+        "description": "Accept: application/x-ndjson이면 NDJSON 스트림",
+    }
+}
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    Accept 헤더가 NDJSON을 요청하는지 확인 (라우트 의존성으로 사용)
+
+    명시적으로 요청한 경우에만 스트리밍하므로, 기존 JSON 응답은 그대로입니다.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+async def _stream_rows(query: Select, schema: Type[BaseModel], chunk_rows: int) -> AsyncIterator[bytes]:
+    # 요청 세션은 응답 본문 전송 전에 닫히므로 스트리밍 전용 세션 사용
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(query.execution_options(yield_per=chunk_rows))
+        async for rows in result.partitions(chunk_rows):
+            yield b"".join(schema.model_validate(row).model_dump_json().encode() + b"\n" for row in rows)
+
+
+def ndjson_response(
+    query: Select,
+    schema: Type[BaseModel],
+    response: Optional[Response] = None,
+    chunk_rows: int = settings.ndjson_chunk_rows
+) -> StreamingResponse:
+    """
+    ORM SELECT 결과를 NDJSON으로 스트리밍
+
+    Args:
+        query: 실행할 ORM SELECT (정렬/limit 포함, 소유권 확인은 호출 전에 완료)
+        schema: 행을 직렬화할 응답 스키마 (예: InteractionLogResponse)
+        response: 의존성이 설정한 헤더(ETag 등)를 옮겨 올 응답 객체 (선택적)
+        chunk_rows: 한 번에 읽어 전송하는 행 수
+
+    Returns:
+        application/x-ndjson 스트리밍 응답
+    """
+    headers = dict(response.headers) if response is not None else {}
+    headers.pop("content-length", None)
+    headers["Vary"] = "Accept"
+    return StreamingResponse(_stream_rows(query, schema, chunk_rows), media_type=NDJSON_MEDIA_TYPE, headers=headers)
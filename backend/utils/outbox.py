@@ -0,0 +1,422 @@
+"""
+트랜잭션 아웃박스
+서비스 레이어의 쓰기(페르소나, 상호작용 로그, 노트)와 ORM으로 추가된 알림 로그마다
+같은 트랜잭션에서 outbox_events에 이벤트를 기록하고, OutboxDispatcher가 커밋된 이벤트를 묶어서 등록된 소비자에게 전달합니다.
+점수 계산, 캐시 갱신, 인덱싱처럼 쓰기에 따라오는 작업을 요청 경로 밖으로 옮기기 위한 것입니다.
+
+- at-least-once: 소비자 처리와 처리 위치(watermark) 갱신이 같은 트랜잭션이므로,
+  소비자가 실패하거나 워커가 죽으면 같은 이벤트를 다시 받습니다. (소비자는 멱등이어야 함)
+- 공유 소비자(기본): 처리 위치를 outbox_consumers에 저장하고, 임대를 가진 워커 하나만 전달합니다.
+- 로컬 소비자(local=True): 워커마다 실행되며 처리 위치는 메모리에만 있습니다. (워커별 메모리 캐시 갱신용,
+  시작 시점 이후 이벤트부터 받음)
+- 커밋 직후 같은 워커의 디스패처를 깨우므로 보통 폴링 간격을 기다리지 않고 바로 전달됩니다.
+
+PostgreSQL은 시퀀스 값이 커밋 순서와 다를 수 있으므로, id 사이에 빈 곳이 있으면 OUTBOX_GAP_TIMEOUT초 동안
+늦게 커밋되는 트랜잭션을 기다린 뒤 롤백된 것으로 보고 넘어갑니다. (SQLite는 쓰기가 직렬화되어 빈 곳이 생기지 않음)
+"""
+import asyncio
+import fnmatch
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Set
+
+from sqlalchemy import delete, event, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import dialect_insert
+from models import NotificationLog, OutboxConsumer, OutboxEvent, Persona, utcnow
+from utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# 소비자가 실패하면 1, 2, 4 ... 초 뒤 다시 시도 (최대)
+_MAX_RETRY_DELAY = 60.0
+
+
+class OutboxRecord(NamedTuple):
+    """소비자에게 전달되는 이벤트"""
+    id: int
+    event_type: str
+    entity_id: Optional[str]
+    user_id: Optional[str]
+    payload: dict
+    created_at: datetime
+
+
+ConsumerHandler = Callable[[AsyncSession, List[OutboxRecord]], Awaitable[None]]
+
+
+class ConsumerDefinition(NamedTuple):
+    """등록된 소비자"""
+    name: str
+    handler: ConsumerHandler
+    events: Sequence[str]  # 이벤트 유형 패턴 (예: "persona.*")
+    batch_size: int
+    local: bool
+
+
+class OutboxRegistry:
+    """소비자 이름 → 핸들러"""
+
+    def __init__(self):
+        self._consumers: Dict[str, ConsumerDefinition] = {}
+
+    def consumer(
+        self,
+        name: str,
+        events: Sequence[str] = ("*",),
+        batch_size: int = settings.outbox_batch_size,
+        local: bool = False
+    ) -> Callable[[ConsumerHandler], ConsumerHandler]:
+        """
+        소비자 등록 데코레이터
+
+        핸들러는 async def handler(db, events) 형태이며, 끝나면 처리 위치 갱신과 함께 db가 커밋됩니다.
+        예외가 나면 롤백하고 같은 이벤트를 다시 전달합니다.
+
+        Args:
+            name: 소비자 이름 (처리 위치 저장 키, 바꾸면 새 소비자로 취급)
+            events: 받을 이벤트 유형 패턴 (fnmatch)
+            batch_size: 한 번에 받을 최대 이벤트 수
+            local: True면 워커마다 실행 (처리 위치는 메모리)
+        """
+        def decorator(handler: ConsumerHandler) -> ConsumerHandler:
+            if name in self._consumers:
+                raise ValueError(f"이미 등록된 소비자입니다: {name}")
+            self._consumers[name] = ConsumerDefinition(name, handler, tuple(events), batch_size, local)
+            return handler
+        return decorator
+
+    def all(self) -> List[ConsumerDefinition]:
+        return list(self._consumers.values())
+
+
+outbox_registry = OutboxRegistry()
+consumer = outbox_registry.consumer
+
+
+async def record_event(
+    db: AsyncSession,
+    event_type: str,
+    entity_id: Optional[str],
+    user_id: Optional[str] = None,
+    persona_id: Optional[str] = None,
+    payload: Optional[dict] = None
+) -> None:
+    """
+    도메인 이벤트 기록 (쓰기와 같은 트랜잭션, 커밋은 호출한 쪽에서)
+
+    Args:
+        db: 데이터베이스 세션
+        event_type: 이벤트 유형 (<엔티티>.<created|updated|deleted|...>)
+        entity_id: 변경된 행 ID
+        user_id: 소유자 사용자 ID (없으면 persona_id로 찾음)
+        persona_id: 로그/노트처럼 user_id가 없는 쓰기에서 소유자를 찾을 페르소나 ID
+        payload: 소비자에게 전달할 데이터 (JSON 직렬화 가능해야 함)
+    """
+    owner = user_id
+    if owner is None and persona_id is not None:
+        owner = select(Persona.user_id).where(Persona.id == persona_id).scalar_subquery()
+    await db.execute(
+        insert(OutboxEvent).values(
+            event_type=event_type,
+            entity_id=entity_id,
+            user_id=owner,
+            payload=json.dumps(payload or {}, ensure_ascii=False, default=str),
+            created_at=utcnow(),
+        )
+    )
+    db.info["outbox_pending"] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _record_notifications(session, flush_context, instances):
+    """
+    session.add()로 추가된 알림 로그마다 notification.created 이벤트 기록 (알림을 만드는 쪽이 따로 기록하지 않아도 됨)
+
+    Core INSERT로 넣은 알림 로그는 잡히지 않으므로 record_event()를 직접 호출해야 합니다.
+    """
+    notifications = [obj for obj in session.new if isinstance(obj, NotificationLog)]
+    for notification in notifications:
+        # 기본값은 flush 때 채워지므로 페이로드에 넣을 값은 미리 정함
+        if notification.id is None:
+            notification.id = str(uuid.uuid4())
+        if notification.sent_at is None:
+            notification.sent_at = utcnow()
+        if notification.action_taken is None:
+            notification.action_taken = False
+        owner = notification.user_id
+        if owner is None and notification.persona_id is not None:
+            owner = select(Persona.user_id).where(Persona.id == notification.persona_id).scalar_subquery()
+        payload = {
+            "id": notification.id,
+            "persona_id": notification.persona_id,
+            "user_id": notification.user_id,
+            "type": getattr(notification.type, "value", notification.type),
+            "content": notification.content,
+            "sent_at": notification.sent_at.isoformat(),
+            "action_taken": notification.action_taken,
+        }
+        session.add(OutboxEvent(
+            event_type="notification.created",
+            entity_id=notification.id,
+            user_id=owner,
+            payload=json.dumps(payload, ensure_ascii=False),
+            created_at=utcnow(),
+        ))
+    if notifications:
+        session.info["outbox_pending"] = True
+
+
+# 커밋 직후 깨울 디스패처 (같은 워커)
+_wakeups: List[asyncio.Event] = []
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatchers(session):
+    if session.info.pop("outbox_pending", False):
+        for wakeup in _wakeups:
+            wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session):
+    session.info.pop("outbox_pending", None)
+
+
+async def purge_outbox_events(db: AsyncSession, older_than: Optional[datetime] = None) -> int:
+    """모든 공유 소비자가 처리했고 보관 기간이 지난 이벤트 삭제 (커밋은 호출자가)"""
+    cutoff = older_than or utcnow() - timedelta(hours=settings.outbox_retention_hours)
+    delivered = (await db.execute(select(func.min(OutboxConsumer.last_event_id)))).scalar()
+    query = delete(OutboxEvent).where(OutboxEvent.created_at < cutoff)
+    if delivered is not None:
+        query = query.where(OutboxEvent.id <= delivered)
+    result = await db.execute(query.execution_options(synchronize_session=False))
+    return result.rowcount
+
+
+class OutboxDispatcher:
+    """
+    워커 프로세스마다 하나씩 실행되는 아웃박스 디스패처
+
+    사용 예 (lifespan):
+        dispatcher = OutboxDispatcher(AsyncSessionLocal)
+        dispatcher.start()
+        ...
+        await dispatcher.stop()
+    """
+
+    def __init__(self, session_factory, registry: OutboxRegistry = outbox_registry):
+        self.session_factory = session_factory
+        self.registry = registry
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._watermarks: Dict[str, int] = {}
+        self._leases: Dict[str, datetime] = {}  # 가진 임대의 만료 시각
+        self._registered: Set[str] = set()
+        self._next_attempt: Dict[str, float] = {}  # 임대 재시도/실패 후 재전달 시각 (monotonic)
+        self._failures: Dict[str, int] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = False
+            _wakeups.append(self._wakeup)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """진행 중인 배치를 끝낸 뒤 멈추고, 가진 임대를 반납해 다른 워커가 바로 이어받게 함"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+        _wakeups.remove(self._wakeup)
+        if self._leases:
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(
+                        update(OutboxConsumer)
+                        .where(OutboxConsumer.name.in_(list(self._leases)), OutboxConsumer.locked_by == self.worker_id)
+                        .values(locked_by=None, lease_expires_at=None)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.commit()
+            except Exception:
+                logger.warning("아웃박스 임대 반납 실패 (만료되면 다른 워커가 이어받음)", exc_info=True)
+            self._leases.clear()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                delivered = await self.dispatch_once()
+            except Exception:
+                logger.exception("아웃박스 전달 실패")
+                delivered = 0
+            if delivered:
+                continue  # 밀린 이벤트가 있을 수 있으므로 바로 다음 배치
+            # 실패한 소비자의 재전달 시각이 폴링 간격보다 이르면 그때 깨어남
+            now = time.monotonic()
+            timeout = min([settings.outbox_poll_interval] + [at - now for at in self._next_attempt.values() if at > now])
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def dispatch_once(self) -> int:
+        """
+        모든 소비자에게 한 배치씩 전달
+
+        Returns:
+            전달한 이벤트 수 (소비자별 합계)
+        """
+        async with self.session_factory() as db:
+            max_id = (await db.execute(select(func.max(OutboxEvent.id)))).scalar() or 0
+        delivered = 0
+        for definition in self.registry.all():
+            if self._stopping:
+                break
+            if definition.local:
+                # 로컬 소비자는 시작 이후 이벤트부터
+                self._watermarks.setdefault(definition.name, max_id)
+            if time.monotonic() < self._next_attempt.get(definition.name, 0.0):
+                continue
+            try:
+                delivered += await self._dispatch(definition, max_id)
+            except Exception:
+                failures = self._failures[definition.name] = self._failures.get(definition.name, 0) + 1
+                delay = min(2.0 ** (failures - 1), _MAX_RETRY_DELAY)
+                self._next_attempt[definition.name] = time.monotonic() + delay
+                metrics.outbox_dispatch_errors_total.inc((definition.name,))
+                logger.exception("아웃박스 소비자 실패, %.0f초 후 다시 전달 (%s)", delay, definition.name)
+            else:
+                self._failures.pop(definition.name, None)
+        return delivered
+
+    async def _dispatch(self, definition: ConsumerDefinition, max_id: int) -> int:
+        """소비자 하나에 다음 배치 전달 (전달한 이벤트 수, 필터로 걸러진 이벤트 제외)"""
+        if definition.local:
+            watermark = self._watermarks[definition.name]
+        else:
+            watermark = await self._acquire(definition.name, max_id)
+            if watermark is None:
+                return 0  # 다른 워커가 전달 중
+        if metrics.enabled:
+            metrics.outbox_consumer_lag.set(max(max_id - watermark, 0), (definition.name,))
+        if watermark >= max_id:
+            return 0
+
+        async with self.session_factory() as db:
+            rows = (await db.execute(
+                select(
+                    OutboxEvent.id, OutboxEvent.event_type, OutboxEvent.entity_id,
+                    OutboxEvent.user_id, OutboxEvent.payload, OutboxEvent.created_at
+                )
+                .where(OutboxEvent.id > watermark)
+                .order_by(OutboxEvent.id)
+                .limit(definition.batch_size)
+            )).all()
+            events = self._contiguous(rows, watermark)
+            if not events:
+                return 0
+            last_id = events[-1].id
+            matching = [
+                OutboxRecord(row.id, row.event_type, row.entity_id, row.user_id, json.loads(row.payload or "{}"), row.created_at)
+                for row in events
+                if any(fnmatch.fnmatchcase(row.event_type, pattern) for pattern in definition.events)
+            ]
+            if matching:
+                await definition.handler(db, matching)
+            if not definition.local:
+                lease_expires_at = utcnow() + timedelta(seconds=settings.outbox_lease_seconds)
+                result = await db.execute(
+                    update(OutboxConsumer)
+                    .where(OutboxConsumer.name == definition.name, OutboxConsumer.locked_by == self.worker_id)
+                    .values(last_event_id=last_id, lease_expires_at=lease_expires_at)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    # 임대가 만료되어 다른 워커가 가져감: 처리 결과를 버리고 그 워커에 맡김
+                    await db.rollback()
+                    self._leases.pop(definition.name, None)
+                    return 0
+                self._leases[definition.name] = lease_expires_at
+            await db.commit()
+
+        self._watermarks[definition.name] = last_id
+        if matching and metrics.enabled:
+            metrics.outbox_events_delivered_total.inc((definition.name,), len(matching))
+            age = (utcnow() - matching[-1].created_at).total_seconds()
+            metrics.outbox_event_age_seconds.observe(max(age, 0.0), (definition.name,))
+        return len(matching)
+
+    @staticmethod
+    def _contiguous(rows, watermark: int) -> list:
+        """
+        id가 빈 곳 없이 이어지는 앞부분만 (빈 곳 뒤 이벤트가 OUTBOX_GAP_TIMEOUT초보다 오래되었으면 건너뜀)
+
+        빈 곳은 아직 커밋되지 않았거나 롤백된 트랜잭션의 id입니다.
+        """
+        gap_cutoff = utcnow() - timedelta(seconds=settings.outbox_gap_timeout)
+        accepted = []
+        last_id = watermark
+        for row in rows:
+            if row.id != last_id + 1 and row.created_at > gap_cutoff:
+                break
+            accepted.append(row)
+            last_id = row.id
+        return accepted
+
+    async def _acquire(self, name: str, max_id: int) -> Optional[int]:
+        """
+        공유 소비자의 임대를 얻거나 연장하고 처리 위치 반환 (다른 워커가 가지고 있으면 None)
+
+        임대가 충분히 남아 있으면 DB에 쓰지 않습니다. (배치를 전달할 때 처리 위치와 함께 연장됨)
+        """
+        now = utcnow()
+        held = self._leases.get(name)
+        if held is not None and (held - now).total_seconds() > settings.outbox_lease_seconds * 2 / 3:
+            return self._watermarks[name]
+
+        async with self.session_factory() as db:
+            if name not in self._registered:
+                # 새 소비자는 지금 이후의 이벤트부터 받음
+                await db.execute(
+                    dialect_insert(OutboxConsumer)
+                    .values(name=name, last_event_id=max_id, updated_at=now)
+                    .on_conflict_do_nothing(index_elements=[OutboxConsumer.name])
+                )
+            row = (await db.execute(
+                update(OutboxConsumer)
+                .where(
+                    OutboxConsumer.name == name,
+                    or_(
+                        OutboxConsumer.locked_by.is_(None),
+                        OutboxConsumer.locked_by == self.worker_id,
+                        OutboxConsumer.lease_expires_at < now,
+                    ),
+                )
+                .values(locked_by=self.worker_id, lease_expires_at=now + timedelta(seconds=settings.outbox_lease_seconds))
+                .returning(OutboxConsumer.last_event_id)
+                .execution_options(synchronize_session=False)
+            )).first()
+            await db.commit()
+        self._registered.add(name)
+
+        if row is None:
+            self._leases.pop(name, None)
+            self._next_attempt[name] = time.monotonic() + settings.outbox_lease_seconds / 3
+            return None
+        self._leases[name] = now + timedelta(seconds=settings.outbox_lease_seconds)
+        self._watermarks[name] = row.last_event_id
+        return row.last_event_id
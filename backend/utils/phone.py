@@ -0,0 +1,81 @@
+"""
+전화번호 정규화 유틸리티
+사용자가 입력한 다양한 형식(010-1234-5678, +82 10 1234 5678, 01012345678 등)을
+E.164 형식(+821012345678)으로 통일하여, 같은 번호를 하나의 키로 찾을 수 있게 합니다.
+"""
+import re
+from typing import List, Optional
+
+from config import settings
+
+_NON_DIGIT = re.compile(r"\D")
+
+# E.164: 국가 번호 포함 최대 15자리
+E164_MAX_DIGITS = 15
+# 지역 번호 없는 단축 번호(예: 1588-xxxx)까지 허용하는 최소 자릿수
+MIN_DIGITS = 7
+
+
+def phone_digits(raw: str) -> str:
+    """구분 기호를 제거한 숫자만 반환"""
+    return _NON_DIGIT.sub("", raw or "")
+
+
+def normalize_phone(raw: Optional[str], country_code: str = settings.phone_default_country_code) -> Optional[str]:
+    """
+    전화번호를 E.164 형식으로 정규화
+
+    - "+"로 시작하면 국가 번호가 포함된 것으로 보고 숫자만 남깁니다.
+    - "00"으로 시작하면 국제 전화 접두어로 보고 "+"로 바꿉니다.
+    - "0"으로 시작하면 국내 번호로 보고 앞의 0을 국가 번호로 바꿉니다. (010-1234-5678 → +821012345678)
+    - 그 외에는 국가 번호가 이미 붙어 있으면 그대로, 아니면 국가 번호를 붙입니다.
+
+    Args:
+        raw: 입력된 전화번호
+        country_code: 국가 번호가 없을 때 사용할 국가 번호
+
+    Returns:
+        E.164 형식 번호, 전화번호로 볼 수 없으면 None
+    """
+    if not raw:
+        return None
+    stripped = raw.strip()
+    digits = phone_digits(stripped)
+    if stripped.startswith("+"):
+        e164 = digits
+    elif digits.startswith("00"):
+        e164 = digits[2:]
+    elif digits.startswith("0"):
+        e164 = country_code + digits[1:]
+    elif digits.startswith(country_code) and len(digits) >= MIN_DIGITS + len(country_code):
+        e164 = digits
+    else:
+        e164 = country_code + digits
+    if not MIN_DIGITS <= len(e164) <= E164_MAX_DIGITS:
+        return None
+    return f"+{e164}"
+
+
+def national_digits(e164: str, country_code: str = settings.phone_default_country_code) -> str:
+    """
+    E.164 번호를 국내 표기 숫자로 변환 (+821012345678 → 01012345678)
+    다른 국가 번호는 "+" 없이 숫자만 반환합니다.
+    """
+    digits = e164.lstrip("+")
+    if digits.startswith(country_code):
+        return "0" + digits[len(country_code):]
+    return digits
+
+
+def phone_search_keys(e164: str, country_code: str = settings.phone_default_country_code) -> List[str]:
+    """
+    자동 완성용 검색 키 목록
+
+    국내 표기(0101234...), 국가 번호 포함 숫자(82101234...), 뒷자리 4개(5678)로
+    어느 쪽으로 입력을 시작해도 찾을 수 있게 합니다.
+    """
+    digits = e164.lstrip("+")
+    keys = [national_digits(e164, country_code), digits]
+    if len(digits) > 4:
+        keys.append(digits[-4:])
+    return list(dict.fromkeys(keys))
@@ -0,0 +1,253 @@
+"""
+실시간 푸시 허브 (WebSocket)
+사용자별로 기기당 하나의 WebSocket 연결을 관리하고, 알림/작업 완료 이벤트를 해당 사용자의 모든 기기로 보냅니다.
+
+- 이벤트 출처: 아웃박스 (notification.created, job.succeeded/failed, persona.imported)
+  커밋된 변경만 푸시되며, 클라이언트는 같은 id를 두 번 받을 수 있습니다. (at-least-once)
+- 백엔드 (PUSH_BACKEND)
+  - memory(기본): 각 워커가 아웃박스를 직접 읽어 자기 워커의 소켓으로 보냄 (추가 인프라 없음, 다른 워커에서
+    커밋된 이벤트는 OUTBOX_POLL_INTERVAL 이내에 도착)
+  - redis: 한 워커만 아웃박스를 읽고 Redis pub/sub으로 모든 워커에 보냄 (redis 패키지 필요)
+- 유휴 연결 비용을 줄이기 위해 연결마다 별도 태스크를 두지 않고, 하트비트는 허브의 태스크 하나가 모든 연결에 보냅니다.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from fastapi import WebSocket
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from utils import metrics
+from utils.outbox import OutboxRecord, consumer
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트로 보낼 아웃박스 이벤트 유형
+PUSH_EVENTS = ("notification.created", "job.succeeded", "job.failed", "persona.imported")
+
+# 종료 코드 (4000~4999는 애플리케이션 정의)
+CLOSE_REPLACED = 4000  # 같은 기기에서 새로 연결함
+CLOSE_IDLE = 4001  # 하트비트 응답 없음
+
+# 하트비트를 동시에 보낼 최대 연결 수 (멈춘 소켓이 PUSH_SEND_TIMEOUT 동안 다른 연결의 ping을 막지 않도록)
+HEARTBEAT_CONCURRENCY = 1000
+
+Deliver = Callable[[str, dict], Awaitable[None]]
+
+
+class PushConnection:
+    """WebSocket 연결 하나 (유휴 연결이 많으므로 __slots__로 메모리 절약)"""
+    __slots__ = ("websocket", "user_id", "device_id", "last_seen")
+
+    def __init__(self, websocket: WebSocket, user_id: str, device_id: str):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.device_id = device_id
+        self.last_seen = time.monotonic()
+
+
+class MemoryPushBackend:
+    """이 프로세스 안에서만 전달 (publish가 바로 이 워커의 소켓으로)"""
+
+    # 여러 워커에서 아웃박스를 각자 읽어야 하는지 (PUSH_EVENTS 소비자를 local로 등록)
+    broadcasts = False
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    async def stop(self) -> None:
+        self._deliver = None
+
+    async def publish(self, user_id: str, message: dict) -> None:
+        if self._deliver is not None:
+            await self._deliver(user_id, message)
+
+
+class RedisPushBackend:
+    """Redis pub/sub으로 모든 워커에 전달 (redis>=5 선택 의존성)"""
+
+    broadcasts = True
+    channel = "push"
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, deliver: Deliver) -> None:
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:  # 선택 의존성
+            raise RuntimeError("PUSH_BACKEND=redis에는 redis 패키지가 필요합니다. (pip install redis)")
+        self._client = redis_asyncio.from_url(self.url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(self.channel)
+        self._task = asyncio.create_task(self._listen(deliver))
+
+    async def _listen(self, deliver: Deliver) -> None:
+        async for item in self._pubsub.listen():
+            try:
+                envelope = json.loads(item["data"])
+                await deliver(envelope["user_id"], envelope["message"])
+            except Exception:
+                logger.exception("Redis 푸시 메시지 처리 실패")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel)
+            await self._pubsub.aclose()
+            await self._client.aclose()
+            self._pubsub = self._client = None
+
+    async def publish(self, user_id: str, message: dict) -> None:
+        await self._client.publish(
+            self.channel, json.dumps({"user_id": user_id, "message": message}, ensure_ascii=False, default=str)
+        )
+
+
+def make_backend(name: str = settings.push_backend):
+    if name == "redis":
+        return RedisPushBackend(settings.push_redis_url)
+    if name != "memory":
+        raise ValueError(f"알 수 없는 PUSH_BACKEND입니다: {name} (memory / redis)")
+    return MemoryPushBackend()
+
+
+class PushHub:
+    """
+    사용자 ID → 기기 ID → 연결
+
+    사용 예 (lifespan):
+        await push_hub.start()
+        ...
+        await push_hub.stop()
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or make_backend()
+        self._connections: Dict[str, Dict[str, PushConnection]] = {}
+        self._count = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connection_count(self) -> int:
+        return self._count
+
+    async def start(self) -> None:
+        if self._task is None:
+            await self.backend.start(self.deliver)
+            self._task = asyncio.create_task(self._heartbeat())
+
+    async def stop(self) -> None:
+        """하트비트를 멈추고 모든 연결을 1001(going away)로 닫아 클라이언트가 다른 워커로 다시 연결하게 함"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await asyncio.gather(
+            *(self._close(connection, 1001) for connection in self._all()), return_exceptions=True
+        )
+        await self.backend.stop()
+
+    def _all(self) -> List[PushConnection]:
+        return [connection for devices in self._connections.values() for connection in devices.values()]
+
+    async def register(self, connection: PushConnection) -> None:
+        """연결 등록 (같은 기기의 이전 연결과, 기기 수를 넘으면 가장 오래 조용한 연결을 닫음)"""
+        devices = self._connections.setdefault(connection.user_id, {})
+        previous = devices.pop(connection.device_id, None)
+        if previous is not None:
+            self._count -= 1
+            await self._close(previous, CLOSE_REPLACED)
+        if len(devices) >= settings.push_max_devices:
+            oldest = min(devices.values(), key=lambda item: item.last_seen)
+            self.unregister(oldest)
+            await self._close(oldest, CLOSE_REPLACED)
+        devices[connection.device_id] = connection
+        self._count += 1
+        metrics.ws_connections.set(self._count)
+
+    def unregister(self, connection: PushConnection) -> None:
+        """연결 해제 (이미 다른 연결로 바뀐 경우는 그대로 둠)"""
+        devices = self._connections.get(connection.user_id)
+        if devices is None or devices.get(connection.device_id) is not connection:
+            return
+        del devices[connection.device_id]
+        if not devices:
+            del self._connections[connection.user_id]
+        self._count -= 1
+        metrics.ws_connections.set(self._count)
+
+    async def publish(self, user_id: str, message: dict) -> None:
+        """사용자의 모든 기기로 보냄 (redis 백엔드면 다른 워커의 연결까지)"""
+        await self.backend.publish(user_id, message)
+
+    async def deliver(self, user_id: str, message: dict) -> None:
+        """이 워커에 연결된 사용자 기기로 전송 (직렬화는 한 번만)"""
+        devices = self._connections.get(user_id)
+        if not devices:
+            return
+        text = json.dumps(message, ensure_ascii=False, default=str)
+        await asyncio.gather(*(self._send(connection, text) for connection in list(devices.values())))
+        if metrics.enabled:
+            metrics.push_messages_total.inc((message.get("type", ""),), len(devices))
+
+    async def _send(self, connection: PushConnection, text: str) -> None:
+        """전송 (느리거나 끊긴 연결은 닫고 해제)"""
+        try:
+            await asyncio.wait_for(connection.websocket.send_text(text), timeout=settings.push_send_timeout)
+        except Exception:
+            self.unregister(connection)
+            await self._close(connection, 1011)
+
+    @staticmethod
+    async def _close(connection: PushConnection, code: int) -> None:
+        try:
+            await connection.websocket.close(code=code)
+        except Exception:
+            pass  # 이미 끊긴 연결
+
+    async def _heartbeat(self) -> None:
+        """
+        모든 연결에 ping, PUSH_IDLE_TIMEOUT 동안 아무것도 받지 못한 연결은 닫음
+
+        최대 HEARTBEAT_CONCURRENCY개씩 동시에 보내므로, 멈춘 연결은 자리 하나만 차지하고 다른 연결의 ping을 늦추지 않습니다.
+        """
+        ping = json.dumps({"type": "ping"})
+        slots = asyncio.Semaphore(HEARTBEAT_CONCURRENCY)
+
+        async def beat(connection: PushConnection, deadline: float) -> None:
+            async with slots:
+                if connection.last_seen < deadline:
+                    self.unregister(connection)
+                    await self._close(connection, CLOSE_IDLE)
+                else:
+                    await self._send(connection, ping)
+
+        while True:
+            await asyncio.sleep(settings.push_ping_interval)
+            deadline = time.monotonic() - settings.push_idle_timeout
+            await asyncio.gather(*(beat(connection, deadline) for connection in self._all()))
+
+
+push_hub = PushHub()
+
+
+@consumer("push", events=PUSH_EVENTS, local=not push_hub.backend.broadcasts)
+async def _push_events(db: AsyncSession, events: List[OutboxRecord]) -> None:
+    """아웃박스 이벤트를 소유자에게 푸시 ({"type", "id", "data"})"""
+    for event in events:
+        if event.user_id:
+            await push_hub.publish(event.user_id, {"type": event.event_type, "id": event.id, "data": event.payload})
@@ -0,0 +1,181 @@
+"""
+요청 단위 SQL 프로파일러 (N+1 탐지, 느린 쿼리 로그, Server-Timing 헤더)
+
+모드 (QUERY_PROFILER_MODE 환경 변수, 재시작 없이 PUT /api/debug/query-profiler로 변경 가능)
+- off: 아무것도 하지 않음 (기본값)
+- sample: sample_rate 비율의 요청만 프로파일링
+- on: 모든 요청 프로파일링 (개발용)
+
+프로파일링된 요청은
+- 같은 모양(파라미터 제외)의 SQL이 n_plus_one_threshold번 이상 반복되면 N+1 경고를 남기고
+- slow_query_ms보다 오래 걸린 쿼리를 파라미터를 가린 채 EXPLAIN 결과와 함께 기록하며
+- 응답에 Server-Timing 헤더(db 시간, 쿼리 수)를 추가합니다.
+"""
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+import config
+
+logger = logging.getLogger("query_profiler")
+
+PROFILER_MODES = ("off", "sample", "on")
+
+
+@dataclass
+class ProfilerSettings:
+    """프로파일러 설정 (런타임에 변경 가능)"""
+    mode: str = config.settings.query_profiler_mode
+    sample_rate: float = config.settings.query_profiler_sample_rate
+    slow_query_ms: float = config.settings.slow_query_ms
+    n_plus_one_threshold: int = config.settings.n_plus_one_threshold
+
+
+settings = ProfilerSettings()
+
+
+@dataclass
+class RequestProfile:
+    """요청 하나에서 실행된 SQL 기록"""
+    statement_count: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    slow_queries: List[Tuple[str, object, float]] = field(default_factory=list)
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("query_profile", default=None)
+
+# IN (?, ?, ?) / 숫자·문자열 리터럴을 하나로 묶어 "쿼리 모양" 비교
+_IN_LIST = re.compile(r"\(\s*(?:\?|%\(\w+\)s|:\w+|\$\d+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+|\$\d+))*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """파라미터/리터럴/IN 목록 길이를 무시한 SQL 모양"""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _IN_LIST.sub("(?)", shape)
+    return _LITERAL.sub("?", shape)
+
+
+def redact_parameters(parameters) -> object:
+    """바인딩 파라미터 값을 타입 이름으로 가림 (개인정보가 로그에 남지 않도록)"""
+    if isinstance(parameters, dict):
+        return {key: f"<{type(value).__name__}>" for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) if isinstance(value, (dict, list, tuple)) else f"<{type(value).__name__}>"
+                for value in parameters]
+    return f"<{type(parameters).__name__}>"
+
+
+def _should_profile() -> bool:
+    if settings.mode == "on":
+        return True
+    return settings.mode == "sample" and random.random() < settings.sample_rate
+
+
+class QueryProfilerMiddleware:
+    """
+    프로파일링 대상 요청에 RequestProfile을 연결하고, 응답에 Server-Timing 헤더를 추가하는 ASGI 미들웨어
+
+    사용 예: app.add_middleware(QueryProfilerMiddleware, engine=engine)
+    """
+
+    def __init__(self, app, engine):
+        self.app = app
+        self.engine = engine
+        self._explain_tasks = set()
+
+    async def __call__(self, scope, receive, send):
+        if settings.mode == "off" or scope["type"] != "http" or not _should_profile():
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                app_ms = (time.perf_counter() - started) * 1000
+                server_timing = (
+                    f'db;dur={profile.db_seconds * 1000:.1f};desc="{profile.statement_count} queries", '
+                    f"app;dur={app_ms:.1f}"
+                )
+                message = {**message, "headers": [*message.get("headers", []), (b"server-timing", server_timing.encode("latin-1"))]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            self._report(scope, profile)
+
+    def _report(self, scope, profile: RequestProfile) -> None:
+        """N+1 의심 쿼리 경고, 느린 쿼리는 별도 커넥션에서 EXPLAIN 후 기록"""
+        request_line = f"{scope['method']} {scope['path']}"
+        for shape, count in profile.shapes.items():
+            if count >= settings.n_plus_one_threshold:
+                logger.warning("N+1 의심: %s 에서 같은 쿼리가 %d번 실행됨: %s", request_line, count, shape)
+
+        for statement, parameters, elapsed in profile.slow_queries:
+            task = asyncio.create_task(self._log_slow_query(request_line, statement, parameters, elapsed))
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    async def _log_slow_query(self, request_line: str, statement: str, parameters, elapsed: float) -> None:
+        """응답 이후에 실행 계획을 조회해서 느린 쿼리 로그 남김 (요청 처리 시간에 영향 없음)"""
+        plan = "(EXPLAIN 불가)"
+        if statement.lstrip()[:6].upper() in ("SELECT", "UPDATE", "DELETE", "INSERT"):
+            prefix = "EXPLAIN QUERY PLAN " if self.engine.dialect.name == "sqlite" else "EXPLAIN "
+            try:
+                async with self.engine.connect() as conn:
+                    result = await conn.exec_driver_sql(prefix + statement, parameters)
+                    plan = "\n".join(" | ".join(str(value) for value in row) for row in result)
+            except Exception as e:
+                plan = f"(EXPLAIN 실패: {e.__class__.__name__})"
+        logger.warning(
+            "느린 쿼리 (%.1fms) %s\n%s\n파라미터: %s\n실행 계획:\n%s",
+            elapsed * 1000, request_line, statement, redact_parameters(parameters), plan
+        )
+
+
+def instrument_engine(engine) -> None:
+    """
+    SQLAlchemy 엔진 이벤트에 프로파일러 연결
+
+    프로파일링 중인 요청이 없으면 contextvar 조회 한 번으로 끝납니다.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        started_stack = conn.info.get("profiler_started")
+        if profile is None or not started_stack:
+            return
+        elapsed = time.perf_counter() - started_stack.pop()
+        profile.statement_count += 1
+        profile.db_seconds += elapsed
+        profile.shapes[statement_shape(statement)] += 1
+        if elapsed * 1000 >= settings.slow_query_ms and not executemany:
+            profile.slow_queries.append((statement, parameters, elapsed))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("profiler_started"):
+            conn.info["profiler_started"].pop()
@@ -0,0 +1,270 @@
+"""
+요청 속도 제한 (Rate Limiting) 유틸리티
+토큰 버킷 알고리즘으로 라우트 그룹별 요청 수를 제한합니다.
+
+- 인증된 라우트: 사용자 ID 기준 (get_current_user 재사용, 추가 쿼리 없음)
+- 인증 라우트(/api/auth): 클라이언트 IP 기준
+- AI 라우트: Bearer 토큰이 있으면 사용자 ID, 없으면 IP 기준
+
+백엔드는 교체 가능합니다.
+- memory (기본값): 워커 프로세스별 메모리, O(1)
+- sqlite: 같은 서버의 여러 워커가 공유하는 로컬 파일 (Redis 대용)
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+
+from config import settings
+from models import User
+from utils.auth import decode_access_token
+from utils.dependencies import get_current_user
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """토큰 버킷 설정 (capacity개까지 연속 허용, period초마다 capacity개 충전)"""
+    capacity: int
+    period: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """ "요청 수/초" 형식 문자열 파싱 (예: "10/60" = 60초에 10번) """
+        capacity, _, period = value.partition("/")
+        return cls(capacity=int(capacity), period=float(period or 60))
+
+
+# 라우트 그룹별 기본 제한 (환경 변수 RATE_LIMIT_<GROUP>으로 변경 가능)
+DEFAULT_LIMITS = {
+    "auth": "10/60",  # 로그인/회원가입: bcrypt CPU 보호
+    "ai": "20/60",  # NIM 호출: API 예산 보호
+    "api": "300/60",  # 일반 CRUD
+}
+
+
+@lru_cache(maxsize=None)
+def get_limit(group: str) -> RateLimit:
+    """라우트 그룹의 제한 설정 조회"""
+    value = settings.rate_limits.get(group) or DEFAULT_LIMITS.get(group, DEFAULT_LIMITS["api"])
+    return RateLimit.parse(value)
+
+
+def _take_token(
+    tokens: float,
+    updated_at: float,
+    now: float,
+    limit: RateLimit,
+    cost: float
+) -> Tuple[bool, float, float]:
+    """
+    토큰 버킷 계산 (순수 함수)
+
+    Returns:
+        (허용 여부, 남은 토큰 수, 재시도까지 남은 초)
+    """
+    tokens = min(limit.capacity, tokens + (now - updated_at) * limit.refill_per_second)
+    if tokens >= cost:
+        return True, tokens - cost, 0.0
+    return False, tokens, (cost - tokens) / limit.refill_per_second
+
+
+class RateLimitBackend(ABC):
+    """속도 제한 상태 저장소 인터페이스"""
+
+    @abstractmethod
+    async def acquire(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float, float]:
+        """
+        토큰 1개(cost) 사용 시도
+
+        Returns:
+            (허용 여부, 남은 토큰 수, 재시도까지 남은 초)
+        """
+
+
+class InMemoryBackend(RateLimitBackend):
+    """
+    프로세스 메모리 기반 백엔드 (O(1))
+
+    키 개수가 max_keys를 넘으면 가득 찬(오래 쓰이지 않은) 버킷을 정리하여 메모리를 제한합니다.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._sweep_at = max_keys
+        self._buckets: Dict[str, Tuple[float, float, RateLimit]] = {}
+
+    async def acquire(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float, float]:
+        now = time.monotonic()
+        tokens, updated_at, _ = self._buckets.get(key, (limit.capacity, now, limit))
+        allowed, tokens, retry_after = _take_token(tokens, updated_at, now, limit, cost)
+        self._buckets[key] = (tokens, now, limit)
+        if len(self._buckets) > self._sweep_at:
+            self._evict_idle(now)
+        return allowed, tokens, retry_after
+
+    def _evict_idle(self, now: float) -> None:
+        """이미 가득 찼을 버킷 제거 (제거해도 동작이 같음)"""
+        idle_keys = [
+            key for key, (tokens, updated_at, limit) in self._buckets.items()
+            if tokens + (now - updated_at) * limit.refill_per_second >= limit.capacity
+        ]
+        for key in idle_keys:
+            del self._buckets[key]
+        # 정리 후에도 많으면 다음 정리 시점을 늦춰 평균 O(1) 유지
+        self._sweep_at = max(self.max_keys, len(self._buckets) + self.max_keys // 10)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    로컬 SQLite 파일 기반 공유 백엔드
+
+    같은 서버에서 실행되는 여러 uvicorn 워커가 하나의 버킷 상태를 공유합니다.
+    (여러 서버로 확장할 때는 같은 인터페이스로 Redis 백엔드를 구현해 교체)
+
+    한 번 본 IP/토큰의 행이 계속 쌓이지 않도록, 각 워커가 prune_interval초마다 가득 찼을 버킷을 지웁니다.
+    가장 긴 그룹의 period 동안 쓰이지 않은 버킷은 어느 그룹이든 가득 찼으므로, 지워도 동작이 같습니다.
+    """
+
+    def __init__(self, path: str, prune_interval: float = 60.0):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_rate_limit_buckets_updated_at ON rate_limit_buckets (updated_at)"
+        )
+        self.prune_interval = prune_interval
+        self._prune_at = 0.0
+
+    def _prune(self, now: float) -> int:
+        """가득 찼을 버킷 삭제 (_lock을 잡은 상태에서 호출, 삭제한 행 수 반환)"""
+        groups = set(DEFAULT_LIMITS) | set(settings.rate_limits)
+        idle_after = max(get_limit(group).period for group in groups)
+        cursor = self._conn.execute("DELETE FROM rate_limit_buckets WHERE updated_at < ?", (now - idle_after,))
+        self._prune_at = now + self.prune_interval
+        return cursor.rowcount
+
+    def _acquire_sync(self, key: str, limit: RateLimit, cost: float) -> Tuple[bool, float, float]:
+        with self._lock:
+            now = time.time()  # 프로세스 간 비교가 가능한 시계
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                tokens, updated_at = row if row else (limit.capacity, now)
+                allowed, tokens, retry_after = _take_token(tokens, updated_at, now, limit, cost)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, tokens, now)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            if now >= self._prune_at:
+                self._prune(now)
+            return allowed, tokens, retry_after
+
+    async def acquire(self, key: str, limit: RateLimit, cost: float = 1.0) -> Tuple[bool, float, float]:
+        return await asyncio.to_thread(self._acquire_sync, key, limit, cost)
+
+
+_backend: Optional[RateLimitBackend] = None
+
+
+def get_rate_limit_backend() -> RateLimitBackend:
+    """환경 변수 RATE_LIMIT_BACKEND(memory/sqlite)에 따라 백엔드 생성 (최초 1회)"""
+    global _backend
+    if _backend is None:
+        if settings.rate_limit_backend == "sqlite":
+            _backend = SQLiteBackend(settings.rate_limit_sqlite_path)
+        else:
+            _backend = InMemoryBackend()
+    return _backend
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    """백엔드 교체 (예: Redis 구현체, 테스트용)"""
+    global _backend
+    _backend = backend
+
+
+async def _enforce(group: str, key: str, response: Response) -> None:
+    """
+    버킷에서 토큰을 사용하고, 초과 시 429 반환
+
+    Raises:
+        HTTPException: 요청 한도를 초과했을 때 (429)
+    """
+    limit = get_limit(group)
+    allowed, remaining, retry_after = await get_rate_limit_backend().acquire(f"{group}:{key}", limit)
+    headers = {
+        "X-RateLimit-Limit": str(limit.capacity),
+        "X-RateLimit-Remaining": str(int(remaining)),
+    }
+    if not allowed:
+        headers["Retry-After"] = str(max(1, int(retry_after + 0.999)))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"요청이 너무 많습니다. {headers['Retry-After']}초 후에 다시 시도해주세요.",
+            headers=headers
+        )
+    response.headers.update(headers)
+
+
+def _client_ip(request: Request) -> str:
+    """클라이언트 IP (프록시 뒤에서는 uvicorn --proxy-headers 설정 필요)"""
+    return request.client.host if request.client else "unknown"
+
+
+_optional_bearer = HTTPBearer(auto_error=False)
+
+
+def rate_limit(group: str, by: str = "user"):
+    """
+    속도 제한 의존성 생성
+
+    사용 예:
+        app.include_router(router, dependencies=[Depends(rate_limit("api"))])
+        app.include_router(auth.router, dependencies=[Depends(rate_limit("auth", by="ip"))])
+
+    Args:
+        group: 라우트 그룹 이름 (그룹별로 제한과 버킷이 분리됨)
+        by: 키 기준 - "user"(인증 필수), "ip", "token_or_ip"(토큰이 있으면 사용자, 없으면 IP)
+    """
+    if by == "user":
+        async def limit_by_user(response: Response, current_user: User = Depends(get_current_user)):
+            await _enforce(group, f"user:{current_user.id}", response)
+        return limit_by_user
+
+    if by == "ip":
+        async def limit_by_ip(request: Request, response: Response):
+            await _enforce(group, f"ip:{_client_ip(request)}", response)
+        return limit_by_ip
+
+    async def limit_by_token_or_ip(
+        request: Request,
+        response: Response,
+        credentials: Optional[HTTPAuthorizationCredentials] = Depends(_optional_bearer)
+    ):
+        payload = decode_access_token(credentials.credentials) if credentials else None
+        if payload and payload.get("sub"):
+            await _enforce(group, f"user:{payload['sub']}", response)
+        else:
+            await _enforce(group, f"ip:{_client_ip(request)}", response)
+    return limit_by_token_or_ip